@@ -0,0 +1,58 @@
+"""配置读取微基准 — cfg.get (点号路径) 与 cfg.key() 访问器
+
+    python bench/config_lookup.py [次数]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.base.config import Config  # noqa: E402
+
+
+def _legacy_get(lock, data, file, key, default=None):
+    """改造前的实现: 每次加锁并拆分路径"""
+    with lock:
+        d = data.get(file, {})
+    for part in key.split('.'):
+        if isinstance(d, dict):
+            d = d.get(part)
+        else:
+            return default
+        if d is None:
+            return default
+    return d
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'settings.yaml'), 'w', encoding='utf-8') as f:
+            f.write('server:\n  host: 0.0.0.0\n  port: 5201\nweb:\n  access:\n    token: abc\n')
+        c = Config()
+        c.init(tmp)
+        lock, data = threading.Lock(), c._data
+        port = c.key('settings', 'server.port', 5201)
+        token = c.key('settings', 'web.access.token', '')
+        cases = [
+            ('legacy get  server.port', lambda: _legacy_get(lock, data, 'settings', 'server.port', 5201)),
+            ('cfg.get     server.port', lambda: c.get('settings', 'server.port', 5201)),
+            ('cfg.key()   server.port', port),
+            ('legacy get  web.access.token', lambda: _legacy_get(lock, data, 'settings', 'web.access.token', '')),
+            ('cfg.get     web.access.token', lambda: c.get('settings', 'web.access.token', '')),
+            ('cfg.key()   web.access.token', token),
+        ]
+        print(f'{n} 次调用, 取 5 轮最小值')
+        for name, fn in cases:
+            best = min(timeit.repeat(fn, number=n, repeat=5))
+            print(f'  {name:<32} {best * 1e9 / n:7.1f} ns/次')
+        c.reload('settings')
+        assert port() == 5201 and token() == 'abc'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""配置页读写基准 — 纯 Python SafeLoader / libyaml CSafeLoader / 解析缓存
+
+    python bench/config_page.py [次数]
+
+读取: 与插件配置页 handle_read_config 相同 (读原文 + 解析 + 提取注释)
+保存: 与 handle_save_config 相同 (校验 + 按旧注释重建 + 原子写入) 后 cfg.reload
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.base import yaml_io  # noqa: E402
+from core.base.config import Config  # noqa: E402
+from web.tools.plugin_mgr import _extract_yaml_comments, _rebuild_yaml  # noqa: E402
+
+_EXAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'settings.example.yaml')
+
+
+def _read_legacy(path):
+    with open(path, encoding='utf-8') as f:
+        raw = f.read()
+    return yaml.safe_load(raw), _extract_yaml_comments.__wrapped__(raw)
+
+
+def _read_uncached(path):
+    with open(path, encoding='utf-8') as f:
+        raw = f.read()
+    return yaml_io.loads(raw), _extract_yaml_comments.__wrapped__(raw)
+
+
+def _read_cached(path):
+    raw, parsed = yaml_io.read(path)
+    return parsed, _extract_yaml_comments(raw)
+
+
+def _save_legacy(c, path, content):
+    parsed = yaml.safe_load(content)
+    with open(path, encoding='utf-8') as f:
+        content = '\n'.join(_rebuild_yaml(parsed, _extract_yaml_comments.__wrapped__(f.read()))) + '\n'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    with open(path, encoding='utf-8') as f:
+        c._swap('settings', yaml.safe_load(f) or {})
+
+
+def _save_new(c, path, content):
+    parsed = yaml_io.loads(content)
+    with open(path, encoding='utf-8') as f:
+        content = '\n'.join(_rebuild_yaml(parsed, _extract_yaml_comments(f.read()))) + '\n'
+    yaml_io.write_text(path, content)
+    c.reload('settings')
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f'libyaml: {"可用" if yaml_io.Loader is not yaml.SafeLoader else "不可用 (回退纯 Python)"}')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'settings.yaml')
+        shutil.copy2(_EXAMPLE, path)
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        c = Config()
+        c.init(tmp)
+        print(f'{os.path.basename(_EXAMPLE)} {len(content)} 字节, {n} 次, 取 5 轮最小值')
+        cases = [
+            ('读取  safe_load', lambda: _read_legacy(path)),
+            ('读取  CSafeLoader', lambda: _read_uncached(path)),
+            ('读取  CSafeLoader + 缓存', lambda: _read_cached(path)),
+            ('保存  safe_load + 直接写入', lambda: _save_legacy(c, path, content)),
+            ('保存  CSafeLoader + 原子写入', lambda: _save_new(c, path, content)),
+        ]
+        for name, fn in cases:
+            best = min(timeit.repeat(fn, number=n, repeat=5))
+            print(f'  {name:<28} {best * 1e6 / n:9.1f} µs/次')
+
+
+if __name__ == '__main__':
+    main()
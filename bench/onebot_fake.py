@@ -0,0 +1,195 @@
+"""本地模拟 OneBot 实现 — 供 bench/replay.py 驱动框架, 无需真实 QQ 客户端
+
+支持三种接入方式 (与 config/connections.yaml 的连接类型对应):
+
+    ws_reverse  模拟端主动连入框架 /OneBotv11, 事件与 API 共用该连接
+    ws_forward  模拟端监听 WS, 框架作为客户端连入
+    http        模拟端监听 HTTP API (POST /{action}), 事件经 HTTP 上报到框架
+
+send_* 返回递增的 message_id, get_* 返回最小的合法数据; 每次 API 应答前等待 latency_ms (± jitter_ms)。
+回复延迟按会话 (群号 / 私聊 QQ) 先进先出配对: 从事件发出到框架对同一会话调用 send_* 为止;
+同一会话中不触发回复的事件会让后续配对偏大, replay.py 默认给每条群消息分配独立群号避免这一点。
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import Counter, defaultdict, deque
+
+import aiohttp
+from aiohttp import web
+
+MODES = ('ws_reverse', 'ws_forward', 'http')
+
+
+def _target_of_event(frame: dict):
+    if frame.get('post_type') != 'message':
+        return None
+    if frame.get('message_type') == 'group':
+        return 'g', int(frame.get('group_id') or 0)
+    return 'p', int(frame.get('user_id') or 0)
+
+
+def _target_of_action(action: str, params: dict):
+    if params.get('group_id') and (action == 'send_group_msg' or params.get('message_type', 'group') == 'group'):
+        return 'g', int(params['group_id'])
+    if params.get('user_id'):
+        return 'p', int(params['user_id'])
+    return None
+
+
+class FakeOneBot:
+    """模拟 OneBot 端: 发送事件, 应答 API, 统计回复延迟"""
+
+    def __init__(self, mode: str, self_id: str, latency_ms: float = 5, jitter_ms: float = 0, concurrency: int = 32):
+        if mode not in MODES:
+            raise ValueError(f'未知模式: {mode}')
+        self.mode = mode
+        self.self_id = str(self_id)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.actions: Counter[str] = Counter()
+        self.latencies: list[float] = []  # 秒
+        self.last_action = 0.0
+        self.ready = asyncio.Event()
+        self._pending: defaultdict[tuple, deque[float]] = defaultdict(deque)  # 会话 -> 事件发出时间
+        self._ids = itertools.count(1)
+        self._rnd = random.Random(0)
+        self._ws: aiohttp.ClientWebSocketResponse | web.WebSocketResponse | None = None
+        self._session: aiohttp.ClientSession | None = None
+        self._runner: web.AppRunner | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._http_sem = asyncio.Semaphore(concurrency)
+        self._event_url = ''
+
+    # ==================== API 应答 ====================
+
+    def _response_data(self, action: str):
+        if action.startswith('send_'):
+            return {'message_id': next(self._ids)}
+        if action == 'get_login_info':
+            return {'user_id': int(self.self_id), 'nickname': 'bench'}
+        if action == 'get_status':
+            return {'online': True, 'good': True}
+        if action == 'get_version_info':
+            return {'app_name': 'fake-onebot', 'app_version': '0', 'protocol_version': 'v11'}
+        if action.endswith('_list'):
+            return []
+        return {}
+
+    async def _answer(self, action: str, params: dict) -> dict:
+        now = time.perf_counter()
+        self.actions[action] += 1
+        self.last_action = now
+        if action.startswith('send_'):
+            target = _target_of_action(action, params or {})
+            queue = self._pending.get(target)
+            if queue:
+                self.latencies.append(now - queue.popleft())
+        if action == 'get_login_info':
+            self.ready.set()
+        delay = self.latency_ms + (self._rnd.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        return {'status': 'ok', 'retcode': 0, 'data': self._response_data(action)}
+
+    async def _answer_ws(self, ws, data: dict):
+        resp = await self._answer(data.get('action', ''), data.get('params') or {})
+        resp['echo'] = data.get('echo')
+        if not ws.closed:
+            await ws.send_str(json.dumps(resp, ensure_ascii=False))
+
+    async def _read_ws(self, ws):
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                if msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                    break
+                continue
+            data = json.loads(msg.data)
+            if 'action' in data:
+                self._spawn(self._answer_ws(ws, data))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # ==================== 接入 ====================
+
+    async def start(self, framework_url: str, listen_port: int = 0):
+        """framework_url: 框架主服务地址 (http://host:port); listen_port: ws_forward / http 模式的监听端口"""
+        session = self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        if self.mode == 'ws_reverse':
+            ws_url = framework_url.replace('http', 'ws', 1) + '/OneBotv11'
+            self._ws = ws = await session.ws_connect(ws_url, headers={'X-Self-ID': self.self_id}, max_msg_size=0)
+            self._spawn(self._read_ws(ws))
+            self.ready.set()
+            return
+        app = web.Application(client_max_size=0)
+        if self.mode == 'ws_forward':
+            app.router.add_get('/', self._handle_forward_ws)
+        else:
+            app.router.add_post('/{action}', self._handle_http_action)
+            self._event_url = framework_url + '/OneBotv11'
+            self.ready.set()
+        runner = self._runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', listen_port).start()
+
+    async def _handle_forward_ws(self, request: web.Request):
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        self._ws = ws
+        try:
+            await self._read_ws(ws)
+        finally:
+            if self._ws is ws:
+                self._ws = None
+        return ws
+
+    async def _handle_http_action(self, request: web.Request):
+        params = await request.json() if request.can_read_body else {}
+        return web.json_response(await self._answer(request.match_info['action'], params))
+
+    # ==================== 事件 ====================
+
+    async def send(self, frame: dict):
+        target = _target_of_event(frame)
+        if target is not None:
+            self._pending[target].append(time.perf_counter())
+        text = json.dumps(frame, ensure_ascii=False)
+        if self.mode == 'http':
+            await self._http_sem.acquire()  # 限制同时在途的上报请求数
+            self._spawn(self._post_event(text))
+            return
+        if self._ws is None:
+            raise ConnectionError('框架尚未连接到模拟端')
+        await self._ws.send_str(text)
+
+    async def _post_event(self, text: str):
+        assert self._session is not None  # start() 之后才会发送事件
+        try:
+            async with self._session.post(
+                self._event_url, data=text.encode(),
+                headers={'Content-Type': 'application/json', 'X-Self-ID': self.self_id},
+            ) as resp:
+                await resp.read()
+        finally:
+            self._http_sem.release()
+
+    def reset(self):
+        self.latencies = []
+        self.actions.clear()
+        self._pending.clear()
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+        if self._session:
+            await self._session.close()
+        if self._runner:
+            await self._runner.cleanup()
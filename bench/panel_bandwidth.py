@@ -0,0 +1,107 @@
+"""面板实时推送带宽 — 每 1000 条消息日志在各种帧格式 / 压缩方式下的传输字节数
+
+    python bench/panel_bandwidth.py [每帧条数]
+
+模拟 new_log(message) 推送 (含 raw_message 原始事件 JSON), 按 WSBroadcast 的合帧方式分组;
+WS 帧头按服务端→客户端不加掩码计算, permessage-deflate 按保留上下文 (context takeover) 模拟。
+"""
+
+import json
+import os
+import random
+import sys
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web.ws import _encode, _Frame, _message, msgpack  # noqa: E402
+
+_N = 1000
+_WORDS = ['早上好', '今天吃什么', '哈哈哈', '收到', '[CQ:face,id=178]', '这个插件怎么配置', 'ok', '图片', '晚安', '有人吗']
+
+
+def _messages(n: int) -> list:
+    rnd = random.Random(42)
+    out = []
+    for i in range(n):
+        group = str(rnd.choice([123456789, 987654321, 555666777]))
+        user = str(rnd.randint(10000000, 99999999))
+        text = ' '.join(rnd.choice(_WORDS) for _ in range(rnd.randint(1, 6)))
+        raw = {
+            'self_id': 2000000001, 'user_id': int(user), 'time': 1760000000 + i, 'message_id': 100000 + i,
+            'message_seq': 100000 + i, 'real_id': 100000 + i, 'message_type': 'group', 'group_id': int(group),
+            'sender': {'user_id': int(user), 'nickname': f'用户{user[-4:]}', 'card': '', 'role': 'member'},
+            'raw_message': text, 'font': 14, 'sub_type': 'normal',
+            'message': [{'type': 'text', 'data': {'text': text}}], 'message_format': 'array', 'post_type': 'message',
+        }
+        out.append(_message('new_log', {
+            'log_type': 'message', 'timestamp': f'2026-10-18 12:{i // 60 % 60:02d}:{i % 60:02d}',
+            'content': text, 'user_id': user, 'group_id': group, 'message_id': str(100000 + i),
+            'message_type': 'group', 'sender': f'用户{user[-4:]}', 'bot_qq': '2000000001', 'direction': 'receive',
+            'raw_message': json.dumps(raw, ensure_ascii=False),
+        }))
+    return out
+
+
+def _frames(msgs: list, per_frame: int) -> list:
+    frames = []
+    for i in range(0, len(msgs), per_frame):
+        chunk = msgs[i:i + per_frame]
+        parts = [_encode(m) for m in chunk]
+        body = parts[0] if len(parts) == 1 else '{"type":"batch","data":[' + ','.join(parts) + ']}'
+        frames.append(_Frame(body.encode(), chunk))
+    return frames
+
+
+def _ws_header(n: int) -> int:
+    return 2 if n < 126 else 4 if n < 65536 else 10
+
+
+def _ws_bytes(payloads: list, deflate: bool) -> int:
+    comp = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15) if deflate else None
+    total = 0
+    for p in payloads:
+        if comp:
+            p = (comp.compress(p) + comp.flush(zlib.Z_SYNC_FLUSH))[:-4]  # RFC 7692: 去掉尾部 00 00 ff ff
+        total += _ws_header(len(p)) + len(p)
+    return total
+
+
+def _sse_bytes(frames: list, gzip: bool) -> int:
+    comp = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    total = 0
+    for f in frames:
+        data = f.sse
+        if comp:
+            data = comp.compress(data) + comp.flush(zlib.Z_SYNC_FLUSH)
+        total += len(data) + len(f'{len(data):x}\r\n\r\n')  # chunked 编码开销
+    return total
+
+
+def main():
+    per_frame = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    msgs = _messages(_N)
+    single, batched = _frames(msgs, 1), _frames(msgs, per_frame)
+    rows = [
+        ('WS  JSON 逐条 (改造前)', _ws_bytes([f.body for f in single], False)),
+        ('WS  JSON 逐条 + deflate', _ws_bytes([f.body for f in single], True)),
+        (f'WS  JSON 合帧({per_frame}条)', _ws_bytes([f.body for f in batched], False)),
+        (f'WS  JSON 合帧({per_frame}条) + deflate', _ws_bytes([f.body for f in batched], True)),
+        ('SSE JSON 逐条 (改造前)', _sse_bytes(single, False)),
+        (f'SSE JSON 合帧({per_frame}条) + gzip', _sse_bytes(batched, True)),
+    ]
+    if msgpack:
+        rows += [
+            (f'WS  MessagePack 合帧({per_frame}条)', _ws_bytes([f.packed for f in batched], False)),
+            (f'WS  MessagePack 合帧({per_frame}条) + deflate', _ws_bytes([f.packed for f in batched], True)),
+        ]
+    else:
+        print('(未安装 msgpack, 跳过 MessagePack)')
+    base = rows[0][1]
+    print(f'{_N} 条消息日志:')
+    for name, n in rows:
+        print(f'  {name:<36} {n / 1024:9.1f} KiB  {n / base * 100:6.1f}%')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,338 @@
+"""端到端回放压测 — 用模拟 OneBot 把事件语料灌入完整的 Application, 统计吞吐 / 回复延迟 / CPU / 内存
+
+    python bench/replay.py                                   # 合成 5000 条消息, 反向 WS
+    python bench/replay.py --corpus data/onebot_record.jsonl --mode http --rounds 5
+    python bench/replay.py --json result.json                # 保存结果
+    python bench/replay.py --baseline result.json            # 与基线对比, 退化超过容差时退出码为 1
+
+语料为 JSON Lines: 每行是 core/onebot/recorder.py 录制的 {"t", "self_id", "frame"}, 或直接是一条 OneBot 事件。
+框架在子进程中以临时目录为根启动 (配置 / 数据库 / 日志均在临时目录, 插件目录链接到仓库的 plugins/),
+CPU 与 RSS 只统计框架进程; 全程只监听 127.0.0.1, 不访问外部服务。
+
+每轮: 发送全部事件 → 等框架分发完 (elaina_dispatch_seconds_count) → 等回复静默;
+events/s = 事件数 / 分发完成耗时, 回复延迟 = 事件发出到模拟端收到对应 send_* 的时间。
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import aiohttp
+import psutil
+import yaml
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _ROOT)
+
+from onebot_fake import MODES, FakeOneBot  # noqa: E402
+
+_SELF_ID = '2000000001'
+_GROUP_BASE = 700000000
+# 子进程入口: 以临时目录为根启动 Application
+_CHILD = '''
+import asyncio, sys
+sys.path.insert(0, sys.argv[1])
+sys.dont_write_bytecode = True
+from core.application import Application
+app = Application()
+app._base_dir = sys.argv[2]
+asyncio.run(app.start())
+'''
+_WORDS = ['早上好', '今天吃什么', '哈哈哈', '收到', '[CQ:face,id=178]', '这个插件怎么配置', 'ok', '图片', '晚安', '有人吗']
+
+
+# ==================== 语料 ====================
+
+def _synthetic(n: int) -> list:
+    """合成语料: 约 1/4 命中示例插件 (ping / echo), 其余为普通聊天; 群聊 80%"""
+    rnd = random.Random(42)
+    frames = []
+    for i in range(n):
+        user = rnd.randint(10000000, 99999999)
+        r = rnd.random()
+        text = 'ping' if r < 0.15 else f'echo {rnd.choice(_WORDS)}' if r < 0.25 else \
+            ' '.join(rnd.choice(_WORDS) for _ in range(rnd.randint(1, 6)))
+        frame = {
+            'self_id': int(_SELF_ID), 'user_id': user, 'time': 1760000000 + i, 'message_id': 100000 + i,
+            'message_type': 'group', 'sub_type': 'normal', 'group_id': rnd.choice([123456789, 987654321, 555666777]),
+            'sender': {'user_id': user, 'nickname': f'用户{str(user)[-4:]}', 'card': '', 'role': 'member'},
+            'raw_message': text, 'font': 14, 'message': [{'type': 'text', 'data': {'text': text}}],
+            'message_format': 'array', 'post_type': 'message',
+        }
+        if rnd.random() < 0.2:
+            frame.update(message_type='private', sub_type='friend')
+            del frame['group_id']
+        frames.append(frame)
+    return frames
+
+
+def _load_corpus(path: str) -> list:
+    rows = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            rows.append(row if 'frame' in row else {'t': 0, 'frame': row})
+    rows.sort(key=lambda r: r.get('t', 0))
+    return [r['frame'] for r in rows if r['frame'].get('post_type') and r['frame']['post_type'] != 'meta_event']
+
+
+def _prepare(frames: list, keep_ids: bool) -> list:
+    """统一 self_id; 默认给每条群消息分配独立群号, 使回复能与事件一一配对"""
+    out = []
+    for i, frame in enumerate(frames):
+        frame = dict(frame, self_id=int(_SELF_ID))
+        if not keep_ids and frame.get('message_type') == 'group':
+            frame['group_id'] = _GROUP_BASE + i
+        out.append(frame)
+    return out
+
+
+# ==================== 框架进程 ====================
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _write_config(base: str, mode: str, port: int, fake_port: int):
+    os.makedirs(os.path.join(base, 'config'))
+    settings = {
+        'server': {'host': '127.0.0.1', 'port': port},
+        'logging': {'dir': 'log'},
+        'metrics': {'enabled': True, 'token': ''},
+        'pip': {'auto_install': False},
+    }
+    conns = []
+    if mode == 'ws_forward':
+        conns.append({'type': 'ws_forward', 'name': 'bench', 'enable': True,
+                      'url': f'ws://127.0.0.1:{fake_port}/', 'reconnect_interval': 1000})
+    elif mode == 'http':
+        conns.append({'type': 'http_client', 'name': 'bench-api', 'enable': True, 'url': f'http://127.0.0.1:{fake_port}'})
+        conns.append({'type': 'http_server', 'name': 'bench-post', 'enable': True,
+                      'host': '127.0.0.1', 'port': port, 'path': '/OneBotv11'})
+    for name, data in (('settings', settings), ('connections', {'connections': conns})):
+        with open(os.path.join(base, 'config', f'{name}.yaml'), 'w', encoding='utf-8') as f:
+            yaml.safe_dump(data, f, allow_unicode=True)
+    for name in ('plugins', 'modules'):
+        src = os.path.join(_ROOT, name)
+        if os.path.isdir(src):
+            os.symlink(src, os.path.join(base, name), target_is_directory=True)
+
+
+async def _scrape(session, url: str) -> dict:
+    """读取 /metrics 中需要的计数"""
+    async with session.get(url + '/metrics') as resp:
+        text = await resp.text()
+    out = {'dispatched': 0, 'handler_errors': 0}
+    for line in text.splitlines():
+        if line.startswith('elaina_dispatch_seconds_count'):
+            out['dispatched'] += int(float(line.rsplit(' ', 1)[1]))
+        elif line.startswith('elaina_handler_errors_total'):
+            out['handler_errors'] += int(float(line.rsplit(' ', 1)[1]))
+    return out
+
+
+async def _wait_http(session, url: str, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(url + '/health') as resp:
+                if resp.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f'框架在 {timeout:.0f}s 内未就绪')
+
+
+# ==================== 回放 ====================
+
+def _pct(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+async def _replay(fake: FakeOneBot, session, url: str, frames: list, rate: float, settle: float, timeout: float):
+    """发送一轮事件, 等分发完成与回复静默, 返回分发完成耗时(秒)"""
+    base = (await _scrape(session, url))['dispatched']
+    t0 = time.perf_counter()
+    for i, frame in enumerate(frames):
+        if rate > 0:
+            delay = t0 + i / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await fake.send(frame)
+    deadline = time.monotonic() + timeout
+    while True:
+        m = await _scrape(session, url)
+        if m['dispatched'] - base >= len(frames):
+            break
+        if time.monotonic() > deadline:
+            raise TimeoutError(f'分发超时: {m["dispatched"] - base}/{len(frames)}')
+        await asyncio.sleep(0.02)
+    elapsed = time.perf_counter() - t0
+    # 回复在处理器任务中异步发出, 等 API 调用静默 settle 秒
+    while time.perf_counter() - max(fake.last_action, t0) < settle and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    return elapsed
+
+
+def _proc_sample(proc: psutil.Process) -> tuple:
+    cpu = proc.cpu_times()
+    return cpu.user + cpu.system, proc.memory_info().rss
+
+
+async def run(args) -> dict:
+    frames = _load_corpus(args.corpus) if args.corpus else _synthetic(args.synthetic)
+    if not frames:
+        raise SystemExit('语料为空')
+    frames = _prepare(frames, args.keep_ids)
+    port, fake_port = _free_port(), _free_port()
+    base = tempfile.mkdtemp(prefix='elaina-bench-')
+    _write_config(base, args.mode, port, fake_port)
+    url = f'http://127.0.0.1:{port}'
+    fake = FakeOneBot(args.mode, _SELF_ID, args.api_latency_ms, args.jitter_ms, args.concurrency)
+    if args.mode != 'ws_reverse':
+        await fake.start(url, fake_port)  # 先监听, 框架启动时即可连上
+    log_path = os.path.join(base, 'framework.log')
+    log_file = open(log_path, 'w', encoding='utf-8')  # noqa: SIM115  子进程存活期间保持打开
+    child = subprocess.Popen([sys.executable, '-c', _CHILD, _ROOT, base], stdout=log_file, stderr=subprocess.STDOUT, cwd=base)
+    proc = psutil.Process(child.pid)
+    result = {'mode': args.mode, 'events': len(frames), 'rounds': []}
+    try:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+            await _wait_http(session, url, args.startup_timeout)
+            if args.mode == 'ws_reverse':
+                await fake.start(url, fake_port)
+            async with asyncio.timeout(args.startup_timeout):
+                await fake.ready.wait()
+            if args.warmup:
+                await _replay(fake, session, url, frames[:args.warmup], 0, args.settle, args.timeout)
+            fake.reset()
+            cpu0, rss0 = _proc_sample(proc)
+            result['rss_start_mb'] = round(rss0 / 2**20, 1)
+            for n in range(1, args.rounds + 1):
+                cpu_a, _ = _proc_sample(proc)
+                lat_from = len(fake.latencies)
+                elapsed = await _replay(fake, session, url, frames, args.rate, args.settle, args.timeout)
+                cpu_b, rss = _proc_sample(proc)
+                lats = fake.latencies[lat_from:]
+                row = {
+                    'round': n,
+                    'events_per_s': round(len(frames) / elapsed, 1),
+                    'replies': len(lats),
+                    'p50_ms': round(_pct(lats, 0.5) * 1000, 2),
+                    'p99_ms': round(_pct(lats, 0.99) * 1000, 2),
+                    'cpu_us_per_event': round((cpu_b - cpu_a) / len(frames) * 1e6, 1),
+                    'rss_mb': round(rss / 2**20, 1),
+                }
+                result['rounds'].append(row)
+                print(f'  第 {n} 轮: {row["events_per_s"]:>9.1f} events/s  回复 {row["replies"]:>6}  '
+                      f'p50 {row["p50_ms"]:>8.2f}ms  p99 {row["p99_ms"]:>8.2f}ms  '
+                      f'CPU {row["cpu_us_per_event"]:>7.1f}µs/事件  RSS {row["rss_mb"]:.1f}MB')
+            cpu1, rss1 = _proc_sample(proc)
+            total = len(frames) * args.rounds
+            rates = [r['events_per_s'] for r in result['rounds']]
+            result.update({
+                'events_per_s': round(sorted(rates)[len(rates) // 2], 1),
+                'p50_ms': round(_pct(fake.latencies, 0.5) * 1000, 2),
+                'p99_ms': round(_pct(fake.latencies, 0.99) * 1000, 2),
+                'replies': len(fake.latencies),
+                'cpu_us_per_event': round((cpu1 - cpu0) / total * 1e6, 1),
+                'rss_end_mb': round(rss1 / 2**20, 1),
+                'rss_growth_mb': round((rss1 - rss0) / 2**20, 1),
+                'actions': dict(fake.actions.most_common()),
+                'handler_errors': (await _scrape(session, url))['handler_errors'],
+            })
+    finally:
+        await fake.close()
+        child.send_signal(signal.SIGTERM)
+        try:
+            child.wait(15)
+        except subprocess.TimeoutExpired:
+            child.kill()
+            child.wait()
+        log_file.close()
+        if args.keep:
+            print(f'临时目录: {base} (框架日志 framework.log)')
+        else:
+            shutil.rmtree(base, ignore_errors=True)
+    return result
+
+
+# ==================== 基线对比 ====================
+
+# (指标, 越大越好)
+_CHECKS = [('events_per_s', True), ('p99_ms', False), ('cpu_us_per_event', False), ('rss_growth_mb', False)]
+
+
+def _compare(result: dict, baseline: dict, tolerance: float) -> list:
+    failures = []
+    for key, higher_better in _CHECKS:
+        old, new = baseline.get(key), result.get(key)
+        if not old or new is None:
+            continue
+        change = (new - old) / abs(old)
+        worse = change < -tolerance if higher_better else change > tolerance
+        mark = '退化' if worse else 'ok'
+        print(f'  {key:<18} {old:>10} -> {new:<10} ({change:+.1%}) {mark}')
+        if worse:
+            failures.append(key)
+    return failures
+
+
+def main():
+    p = argparse.ArgumentParser(description='ElainaBot 端到端回放压测')
+    p.add_argument('--corpus', help='事件语料 (JSON Lines); 不指定时使用合成语料')
+    p.add_argument('--synthetic', type=int, default=5000, help='合成语料条数')
+    p.add_argument('--mode', choices=MODES, default='ws_reverse')
+    p.add_argument('--rounds', type=int, default=3)
+    p.add_argument('--warmup', type=int, default=200, help='正式计时前先发送的事件数')
+    p.add_argument('--rate', type=float, default=0, help='发送速率 (事件/秒), 0 为不限速')
+    p.add_argument('--api-latency-ms', type=float, default=5, help='模拟端 API 应答延迟')
+    p.add_argument('--jitter-ms', type=float, default=0)
+    p.add_argument('--concurrency', type=int, default=32, help='http 模式同时在途的上报请求数')
+    p.add_argument('--keep-ids', action='store_true', help='保留语料原群号 (回复配对为近似值)')
+    p.add_argument('--settle', type=float, default=0.5, help='判定回复结束的 API 静默时间(秒)')
+    p.add_argument('--timeout', type=float, default=300, help='单轮超时(秒)')
+    p.add_argument('--startup-timeout', type=float, default=60)
+    p.add_argument('--json', help='结果写入该文件')
+    p.add_argument('--baseline', help='与该结果文件对比')
+    p.add_argument('--tolerance', type=float, default=0.15, help='允许的相对退化')
+    p.add_argument('--keep', action='store_true', help='保留临时目录 (含框架日志)')
+    args = p.parse_args()
+
+    print(f'模式 {args.mode}, 语料 {args.corpus or f"合成 {args.synthetic} 条"}, {args.rounds} 轮, '
+          f'API 延迟 {args.api_latency_ms}ms' + (f', 限速 {args.rate:g}/s' if args.rate else ''))
+    result = asyncio.run(run(args))
+    print(f'汇总: {result["events_per_s"]} events/s (中位轮)  回复 {result["replies"]}  '
+          f'p50 {result["p50_ms"]}ms  p99 {result["p99_ms"]}ms  CPU {result["cpu_us_per_event"]}µs/事件  '
+          f'RSS {result["rss_start_mb"]} -> {result["rss_end_mb"]}MB ({result["rss_growth_mb"]:+}MB)')
+    if result['handler_errors']:
+        print(f'注意: 处理器异常 / 超时 {result["handler_errors"]} 次 (--keep 查看框架日志)')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f'对比基线 {args.baseline} (容差 {args.tolerance:.0%}):')
+        if _compare(result, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
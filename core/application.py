@@ -6,6 +6,7 @@ import datetime
 import json
 import os
 import signal
+import time
 
 from core.base.config import cfg
 from core.base.logger import SYSTEM, get_logger
@@ -16,10 +17,14 @@ from core.onebot.adapter import OneBotAdapter
 from core.onebot.api import set_adapter, set_main_loop
 from core.onebot.connection import ConnectionManager
 from core.onebot.event import MessageEvent, MetaEvent, NoticeEvent
+from core.onebot.recorder import recorder
 from core.plugin.manager import PluginManager
 from core.server.http_server import HttpServer
+from core.services import metrics
 from core.services.config_watcher import ConfigWatcherService
-from core.storage.log import LogService
+from core.services.live_stats import live_stats
+from core.services.loop_monitor import loop_monitor
+from core.storage.backend import create_log_service
 
 log = get_logger(SYSTEM, '启动器')
 
@@ -99,6 +104,8 @@ class Application:
         self._http_server.init_app()
 
         # 4) 模块管理器
+        self._apply_hook_timeout()
+        cfg.on_change('settings', self._apply_hook_timeout)
         self._module_manager = ModuleManager(self._path('modules'), self._hook_manager)
         self._module_manager.discover()
         await self._module_manager.start_enabled()
@@ -114,13 +121,26 @@ class Application:
         # 6) 日志服务
         log_base = self._path('data', cfg.get('settings', 'logging.dir', 'log'))
         log_cfg = cfg.get('settings', 'logging') or {}
-        self._log_service = LogService(
+        if not isinstance(log_cfg, dict):
+            log_cfg = {}
+        self._log_service = create_log_service(
+            log_cfg.get('engine', 'sqlite'),
             base_dir=log_base,
-            wal_mode=log_cfg.get('wal_mode', True) if isinstance(log_cfg, dict) else True,
-            insert_interval=log_cfg.get('insert_interval', 2) if isinstance(log_cfg, dict) else 2,
-            retention_days=log_cfg.get('retention_days', 30) if isinstance(log_cfg, dict) else 30,
+            wal_mode=log_cfg.get('wal_mode', True),
+            insert_interval=log_cfg.get('insert_interval', 2),
+            retention_days=log_cfg.get('retention_days', 30),
+            compress_raw=log_cfg.get('compress_raw', True),
+            raw_codec=log_cfg.get('raw_codec', 'zlib'),
+            wal_checkpoint_mb=log_cfg.get('wal_checkpoint_mb', 64),
+            backup_dir=self._path('data', 'backup'),
+            backup_interval_hours=log_cfg.get('backup_interval_hours', 0),
+            backup_keep=log_cfg.get('backup_keep', 3),
+            archive_dir=self._path('data', 'archive'),
+            archive_before_cleanup=log_cfg.get('archive_before_cleanup', False),
         )
         await self._log_service.start()
+        # 今日实时统计: 在接入 OneBot 连接前回灌当日已入库数据
+        await live_stats.seed(self._log_service)
 
         # 7) Web 面板
         self._http_server.mount_web_panel()
@@ -136,6 +156,9 @@ class Application:
         self._config_watcher = ConfigWatcherService(interval=5.0)
         self._config_watcher.start()
 
+        # 10) 事件循环监视 (启动期的同步加载不计入)
+        loop_monitor.start()
+
         log.info(f'启动完成: {len(self._plugin_manager._plugins)} 个插件, {self._plugin_manager.handler_count} 个处理器')
 
         # 等待停止信号
@@ -166,6 +189,8 @@ class Application:
 
     async def shutdown(self):
         log.info('正在关闭...')
+        loop_monitor.stop()
+        recorder.flush()
         if self._plugin_manager:
             self._plugin_manager.stop_watcher()
         if self._connection_manager:
@@ -180,23 +205,34 @@ class Application:
             await self._http_server.stop()
         log.info('已关闭')
 
+    def _apply_hook_timeout(self):
+        timeout = cfg.get('settings', 'hooks.timeout', 10)
+        self._hook_manager.default_timeout = timeout if isinstance(timeout, (int, float)) and timeout > 0 else None
+
     async def process_event(self, event):
         """处理 OneBot 事件 (异步分发)"""
+        post_type = event.post_type or 'unknown'
+        metrics.events_total.labels(str(event.self_id or ''), post_type).inc()
         if isinstance(event, MetaEvent):
             return
+        t0 = time.perf_counter()
+        try:
+            # 注入 API 引用, 使插件可通过 event.reply() 调用
+            from core.onebot.api import get_api
+            event._api = get_api()
 
-        # 注入 API 引用, 使插件可通过 event.reply() 调用
-        from core.onebot.api import get_api
-        event._api = get_api()
-
-        # Hook: on_raw_event
-        await self._hook_manager.emit('on_raw_event', event)
+            # Hook: on_raw_event (无模块监听时不进入 emit)
+            if self._hook_manager.has('on_raw_event'):
+                await self._hook_manager.emit('on_raw_event', event)
 
-        # 日志记录
-        await self._log_event(event)
+            # 日志记录
+            await self._log_event(event)
 
-        # 异步分发到插件 (消息事件 + 通知/请求事件)
-        await self._plugin_manager.dispatch(event)
+            # 异步分发到插件 (消息事件 + 通知/请求事件)
+            await self._plugin_manager.dispatch(event)
+        finally:
+            # 出错的事件同样计入, 分发计数始终与收到的非心跳事件数一致 (bench/replay.py 依赖这一点)
+            metrics.dispatch_seconds.labels(post_type).observe(time.perf_counter() - t0)
 
     async def _log_event(self, event):
         """记录事件日志"""
@@ -232,6 +268,7 @@ class Application:
             # 消息内容属于「消息记录」(按 QQ 分库), 不应混入「框架日志」: web_skip=True
             log.info(f'[{event.self_id}] {msg_type} | {location} | {sender}: {display}',
                      extra={'web_skip': True})
+            live_stats.record_message(str(event.self_id or ''), str(event.group_id or ''), str(event.user_id or ''))
 
             # 写入 SQLite
             if self._log_service:
@@ -297,12 +334,7 @@ class Application:
             if self._log_service and event.notice_type in ('group_recall', 'friend_recall'):
                 recalled_mid = str(event.raw_data.get('message_id', '') or '')
                 if recalled_mid:
-                    await self._log_service.execute(
-                        'message',
-                        "UPDATE log SET extra = 'recalled' WHERE message_id = ?",
-                        (recalled_mid,),
-                        bot_qq=str(event.self_id or ''),
-                    )
+                    self._log_service.mark_recalled(recalled_mid, bot_qq=bot_qq)
 
     def push_web_log(self, log_type: str, entry: dict):
         if self._web_log_cb:
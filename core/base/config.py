@@ -1,23 +1,79 @@
-"""YAML 配置管理器 — 支持热加载"""
+"""YAML 配置管理器 — 支持热加载
 
+每个配置文件解析后是一份快照 (嵌套 dict), 修改与重载都先构造新快照再整体替换 (copy-on-write),
+读取无需加锁。get() 返回的 dict / list 属于快照本身, 调用方不得原地修改。
+热路径用 cfg.key() 取得访问器: 首次调用时解析路径, 之后直到该文件重载前都直接返回缓存值。
+"""
+
+import copy
 import logging
 import os
 import threading
+from functools import lru_cache
 from typing import Any
 
-import yaml
+from core.base import yaml_io
 
 log = logging.getLogger('ElainaBot.config')
 
 
+_MISSING = object()
+
+
+@lru_cache(maxsize=1024)
+def _split(key: str) -> tuple:
+    return tuple(key.split('.')) if key else ()
+
+
+def _resolve(data, parts: tuple):
+    for part in parts:
+        if not isinstance(data, dict):
+            return _MISSING
+        data = data.get(part)
+        if data is None:
+            return _MISSING
+    return data
+
+
+class ConfigKey:
+    """单个配置项的访问器 — 缓存解析结果, 以文件快照版本号判断是否失效"""
+
+    __slots__ = ('_cfg', 'file', 'key', 'default', '_parts', '_version', '_value')
+
+    def __init__(self, config: 'Config', file: str, key: str, default: Any = None):
+        self._cfg = config
+        self.file = file
+        self.key = key
+        self.default = default
+        self._parts = _split(key)
+        self._version = -1
+        self._value = _MISSING
+
+    def get(self, default: Any = _MISSING) -> Any:
+        version = self._cfg._versions.get(self.file, 0)  # 先取版本: 与重载交错时最多多解析一次
+        if version != self._version:
+            self._value = _resolve(self._cfg._data.get(self.file, {}), self._parts)
+            self._version = version
+        if self._value is _MISSING:
+            return self.default if default is _MISSING else default
+        return self._value
+
+    __call__ = get
+
+    def __repr__(self):
+        return f'ConfigKey({self.file!r}, {self.key!r})'
+
+
 class Config:
     """全局配置管理器"""
 
     def __init__(self):
         self._config_dir = ''
-        self._data = {}  # {filename_without_ext: dict}
-        self._lock = threading.Lock()
+        self._data = {}  # {filename_without_ext: dict}  只整体替换, 不原地修改
+        self._versions = {}  # {filename: int}  每次替换快照 +1
+        self._lock = threading.Lock()  # 只串行化写者 (加载 / 修改 / 保存)
         self._callbacks = {}  # {filename: [callbacks]}
+        self._keys = {}  # {(file, key, default): ConfigKey}
 
     def init(self, config_dir: str):
         """初始化配置目录，加载所有 yaml 文件"""
@@ -60,13 +116,17 @@ class Config:
         if not os.path.isfile(path):
             return
         try:
-            with open(path, encoding='utf-8') as f:
-                data = yaml.safe_load(f) or {}
+            data = yaml_io.load(path, {})
             with self._lock:
-                self._data[name] = data
+                self._swap(name, data)
         except Exception as e:
             log.error(f'加载配置失败 [{name}]: {e}')
 
+    def _swap(self, name: str, data: dict):
+        """替换文件快照 (调用方持有 _lock); 先换数据再增版本, 访问器据版本号失效"""
+        self._data[name] = data
+        self._versions[name] = self._versions.get(name, 0) + 1
+
     def reload(self, name: str = None):
         """重新加载配置"""
         if name:
@@ -79,34 +139,34 @@ class Config:
 
     def get(self, file: str, key: str, default: Any = None) -> Any:
         """获取配置值，支持点号路径 (如 'server.port')"""
-        with self._lock:
-            data = self._data.get(file, {})
+        data = self._data.get(file, {})
         if not key:
             return data or default
-        parts = key.split('.')
-        for part in parts:
-            if isinstance(data, dict):
-                data = data.get(part)
-            else:
-                return default
-            if data is None:
-                return default
-        return data
+        value = _resolve(data, _split(key))
+        return default if value is _MISSING else value
+
+    def key(self, file: str, key: str, default: Any = None) -> ConfigKey:
+        """配置项访问器, 供热路径反复读取: cfg.key('settings', 'server.port', 5201)()"""
+        k = (file, key, default) if isinstance(default, (str, int, float, bool, type(None))) else None
+        accessor = self._keys.get(k) if k else None
+        if accessor is None:
+            accessor = ConfigKey(self, file, key, default)
+            if k:
+                self._keys[k] = accessor
+        return accessor
 
     def set_value(self, file: str, key: str, value: Any):
         """设置配置值并保存"""
         with self._lock:
-            if file not in self._data:
-                self._data[file] = {}
-            data = self._data[file]
-
-        parts = key.split('.')
-        target = data
-        for part in parts[:-1]:
-            if part not in target or not isinstance(target[part], dict):
-                target[part] = {}
-            target = target[part]
-        target[parts[-1]] = value
+            data = copy.deepcopy(self._data.get(file, {}))
+            parts = key.split('.')
+            target = data
+            for part in parts[:-1]:
+                if part not in target or not isinstance(target[part], dict):
+                    target[part] = {}
+                target = target[part]
+            target[parts[-1]] = value
+            self._swap(file, data)
 
         self._save_file(file)
         self._fire_callbacks(file)
@@ -114,11 +174,9 @@ class Config:
     def _save_file(self, name: str):
         """保存配置到文件"""
         path = os.path.join(self._config_dir, f'{name}.yaml')
-        with self._lock:
-            data = self._data.get(name, {})
+        data = self._data.get(name, {})
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                yaml.dump(data, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+            yaml_io.dump(path, data)
         except Exception as e:
             log.error(f'保存配置失败 [{name}]: {e}')
 
@@ -137,14 +195,13 @@ class Config:
                 log.warning(f'配置回调异常 [{file}]: {e}')
 
     def get_raw(self, file: str) -> dict:
-        """获取文件完整配置"""
-        with self._lock:
-            return dict(self._data.get(file, {}))
+        """获取文件完整配置 (深拷贝, 可自由修改后交给 set_raw)"""
+        return copy.deepcopy(self._data.get(file, {}))
 
     def set_raw(self, file: str, data: dict):
         """设置文件完整配置"""
         with self._lock:
-            self._data[file] = data
+            self._swap(file, data)
         self._save_file(file)
         self._fire_callbacks(file)
 
@@ -1,22 +1,26 @@
 """基础上下文 — 模块/插件通用"""
 
+import asyncio
+import copy
 import os
+import types
 
-import yaml
-
+from core.base import local_config
 from core.base.logger import get_logger
 
 
 class BaseContext:
     """基础上下文，提供日志、配置、数据目录等通用能力"""
 
-    __slots__ = ('name', '_root_dir', '_module_type', 'log')
+    __slots__ = ('name', '_root_dir', '_module_type', 'log', '_config', '_config_args_warned')
 
     def __init__(self, name: str, root_dir: str, module_type: str):
         self.name = name
         self._root_dir = root_dir
         self._module_type = module_type
         self.log = get_logger(module_type, name)
+        self._config: local_config.LocalConfig | None = None
+        self._config_args_warned = False
 
     def get_data_path(self, filename: str = '') -> str:
         """获取数据目录路径（自动创建）"""
@@ -24,24 +28,42 @@ class BaseContext:
         os.makedirs(data_dir, exist_ok=True)
         return os.path.join(data_dir, filename) if filename else data_dir
 
-    def ensure_config(self, defaults: dict, comments: dict = None) -> dict:
-        """确保配置文件存在，返回配置字典"""
-        config_path = os.path.join(self._root_dir, 'config.yaml')
-        if os.path.isfile(config_path):
-            try:
-                with open(config_path, encoding='utf-8') as f:
-                    data = yaml.safe_load(f) or {}
-                # 合并默认值
-                merged = dict(defaults)
-                merged.update(data)
-                return merged
-            except Exception as e:
-                self.log.warning(f'读取配置失败: {e}')
-        # 写入默认配置
-        os.makedirs(os.path.dirname(config_path), exist_ok=True)
-        try:
-            with open(config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(defaults, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
-        except Exception:
-            pass
-        return dict(defaults)
+    def ensure_config(self, defaults: dict | None = None, comments: dict | None = None, schema=None):
+        """确保 config.yaml 存在并返回配置 (首次调用解析, 之后取缓存, 文件变更时自动热加载)
+
+        schema 为 dataclass 时返回其实例, 为 TypedDict 或 None 时返回 dict。
+        返回的是缓存的深拷贝, 归调用方所有 (可随意修改, 不影响缓存与其他读取方);
+        defaults / schema 以首次调用为准, 之后传入不同的值会记录警告并被忽略。
+        """
+        if self._config is None:
+            c = local_config.LocalConfig(os.path.join(self._root_dir, 'config.yaml'), defaults, comments, schema, self.log)
+            c.load()
+            local_config.register(c)
+            self._config = c
+        elif not self._config_args_warned and (
+                (schema is not None and schema is not self._config.schema)
+                or (defaults is not None and dict(defaults) != self._config.defaults)):
+            self._config_args_warned = True
+            self.log.warning('ensure_config 再次调用时传入了不同的 defaults / schema, 已忽略 (以首次调用为准)')
+        return copy.deepcopy(self._config.value)
+
+    @property
+    def config(self):
+        """当前配置的只读视图 (需先调用 ensure_config); dict 配置为 MappingProxyType, 修改请用 ensure_config 的拷贝"""
+        if self._config is None:
+            return None
+        value = self._config.value
+        return types.MappingProxyType(value) if isinstance(value, dict) else value
+
+    def on_config_change(self, func):
+        """装饰器: config.yaml 变更并校验通过后以新配置调用 func(config), 支持 async"""
+        if self._config is None:
+            raise RuntimeError('on_config_change 需在 ensure_config 之后注册')
+        self._config.callbacks.append((func, asyncio.iscoroutinefunction(func)))
+        return func
+
+    def release_config(self):
+        """卸载时注销配置监视 (回调持有旧模块的引用)"""
+        if self._config is not None:
+            local_config.unregister(self._config.path)
+            self._config = None
@@ -0,0 +1,241 @@
+"""模块/插件自带的 config.yaml — 缓存、按 schema 校验、随文件变更热加载
+
+ctx.ensure_config() 只在首次调用时读取并解析文件, 之后返回缓存配置的深拷贝 (ctx.config 为只读视图);
+文件改动由全局配置监视服务 (ConfigWatcherService) 轮询发现, 在工作线程中重新解析与校验,
+成功后替换缓存并触发 ctx.on_config_change 注册的回调; 校验失败时保留旧配置并记录警告。
+
+schema 可以是:
+    dataclass      返回该 dataclass 实例 (嵌套 dataclass 字段递归构造), 缺省值取字段默认值
+    TypedDict      返回 dict, 按注解检查类型
+    None           返回与默认值深度合并后的 dict (旧行为, 不做类型检查)
+"""
+
+import asyncio
+import copy
+import dataclasses
+import os
+import threading
+import types
+import typing
+
+from core.base import yaml_io
+
+_registry = {}  # {config_path: LocalConfig}
+_registry_lock = threading.Lock()
+
+
+class ConfigError(ValueError):
+    """配置内容与 schema 不符"""
+
+
+def _merge(defaults: dict, data: dict) -> dict:
+    """深度合并: data 中的值覆盖默认值, 两边都是 dict 时逐键合并"""
+    out = copy.deepcopy(defaults)
+    for k, v in data.items():
+        if isinstance(v, dict) and isinstance(out.get(k), dict):
+            out[k] = _merge(out[k], v)
+        else:
+            out[k] = v
+    return out
+
+
+def _is_typeddict(tp) -> bool:
+    return isinstance(tp, type) and issubclass(tp, dict) and hasattr(tp, '__annotations__') and hasattr(tp, '__total__')
+
+
+def _coerce(value, tp, path: str):
+    """按注解检查 / 转换单个值; 只处理配置文件里会出现的类型, 其余注解原样放行"""
+    if tp is typing.Any or tp is None:
+        return value
+    origin = typing.get_origin(tp)
+    if origin in (typing.Union, types.UnionType):
+        args = typing.get_args(tp)
+        if value is None and type(None) in args:
+            return None
+        errors = []
+        for arg in args:
+            if arg is type(None):
+                continue
+            try:
+                return _coerce(value, arg, path)
+            except ConfigError as e:
+                errors.append(str(e))
+        raise ConfigError(errors[0] if errors else f'{path}: 类型不符')
+    if origin is typing.Literal:
+        if value not in typing.get_args(tp):
+            raise ConfigError(f'{path}: 取值应为 {list(typing.get_args(tp))}, 实际为 {value!r}')
+        return value
+    if origin in (list, tuple, set, frozenset):
+        if not isinstance(value, (list, tuple)):
+            raise ConfigError(f'{path}: 应为列表, 实际为 {type(value).__name__}')
+        args = typing.get_args(tp)
+        item_tp = args[0] if args else typing.Any
+        return origin(_coerce(v, item_tp, f'{path}[{i}]') for i, v in enumerate(value))
+    if origin is dict:
+        if not isinstance(value, dict):
+            raise ConfigError(f'{path}: 应为字典, 实际为 {type(value).__name__}')
+        _, val_tp = typing.get_args(tp) or (None, typing.Any)
+        return {k: _coerce(v, val_tp, f'{path}.{k}') for k, v in value.items()}
+    if dataclasses.is_dataclass(tp):
+        return _build_dataclass(tp, value, path)
+    if _is_typeddict(tp):
+        return _check_typeddict(tp, value, path)
+    if not isinstance(tp, type):
+        return value
+    if tp is bool:
+        if not isinstance(value, bool):
+            raise ConfigError(f'{path}: 应为布尔值, 实际为 {value!r}')
+        return value
+    if tp in (int, float):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or (tp is int and isinstance(value, float)):
+            raise ConfigError(f'{path}: 应为{"整数" if tp is int else "数字"}, 实际为 {value!r}')
+        return tp(value)
+    if tp is str:
+        if isinstance(value, (dict, list)):
+            raise ConfigError(f'{path}: 应为字符串, 实际为 {type(value).__name__}')
+        return '' if value is None else str(value)  # YAML 中的数字 / 日期写进字符串字段时按文本处理
+    if not isinstance(value, tp):
+        raise ConfigError(f'{path}: 应为 {tp.__name__}, 实际为 {type(value).__name__}')
+    return value
+
+
+def _build_dataclass(schema, data, path: str = ''):
+    if not isinstance(data, dict):
+        raise ConfigError(f'{path or "配置"}: 应为字典, 实际为 {type(data).__name__}')
+    hints = typing.get_type_hints(schema)
+    kwargs = {}
+    for f in dataclasses.fields(schema):
+        if f.name in data:
+            kwargs[f.name] = _coerce(data[f.name], hints.get(f.name, typing.Any), f'{path}.{f.name}' if path else f.name)
+        elif f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING:
+            raise ConfigError(f'缺少配置项: {path}.{f.name}' if path else f'缺少配置项: {f.name}')
+    return schema(**kwargs)
+
+
+def _check_typeddict(schema, data, path: str = ''):
+    if not isinstance(data, dict):
+        raise ConfigError(f'{path or "配置"}: 应为字典, 实际为 {type(data).__name__}')
+    out = dict(data)
+    for name, tp in typing.get_type_hints(schema).items():
+        key = f'{path}.{name}' if path else name
+        if name in data:
+            out[name] = _coerce(data[name], tp, key)
+        elif name in schema.__required_keys__:
+            raise ConfigError(f'缺少配置项: {key}')
+    return out
+
+
+def schema_defaults(schema) -> dict:
+    """dataclass schema 的字段默认值 (写入初始 config.yaml); 其他 schema 返回空 dict"""
+    if isinstance(schema, type) and dataclasses.is_dataclass(schema):
+        try:
+            return dataclasses.asdict(schema())
+        except TypeError:  # 有无默认值的必填字段
+            return {}
+    return {}
+
+
+class LocalConfig:
+    """单个 config.yaml 的缓存视图"""
+
+    __slots__ = ('path', 'schema', 'defaults', 'comments', 'value', 'mtime', 'callbacks', 'log')
+
+    def __init__(self, path: str, defaults: dict | None, comments: dict | None = None, schema=None, logger=None):
+        self.path = path
+        self.schema = schema
+        self.defaults = dict(defaults or schema_defaults(schema))
+        self.comments = comments or {}
+        self.value: typing.Any = None
+        self.mtime: float | None = None
+        self.callbacks: list[tuple[typing.Callable, bool]] = []  # [(func, is_coro)]
+        self.log = logger
+
+    def _parse(self):
+        data = yaml_io.load(self.path, {})
+        if not isinstance(data, dict):
+            raise ConfigError('顶层应为字典')
+        merged = _merge(self.defaults, data)
+        if self.schema is None:
+            return merged
+        if dataclasses.is_dataclass(self.schema):
+            return _build_dataclass(self.schema, merged)
+        if _is_typeddict(self.schema):
+            return _check_typeddict(self.schema, merged)
+        raise ConfigError(f'不支持的配置 schema: {self.schema!r}')
+
+    def _write_defaults(self):
+        lines = []
+        for k, v in self.defaults.items():
+            if k in self.comments:
+                lines.append(f'# {self.comments[k]}\n')
+            lines.append(yaml_io.dumps({k: v}))
+        yaml_io.write_text(self.path, ''.join(lines))
+
+    def load(self):
+        """首次加载: 文件不存在时写入默认配置; 解析或校验失败时退回默认值"""
+        if not os.path.isfile(self.path):
+            try:
+                self._write_defaults()
+            except OSError as e:
+                self.log.warning(f'写入默认配置失败: {e}')
+        try:
+            self.mtime = os.path.getmtime(self.path)
+            self.value = self._parse()
+        except Exception as e:
+            try:
+                fallback = _build_dataclass(self.schema, self.defaults) if dataclasses.is_dataclass(self.schema) \
+                    else copy.deepcopy(self.defaults)
+            except ConfigError as err:
+                # schema 中有无默认值的必填字段, 默认配置本身无法通过校验
+                reason = '' if str(e) == str(err) else f'; 读取失败原因: {e}'
+                raise ConfigError(f'{self.path}: {err} (该字段没有默认值, 需在配置文件中填写){reason}') from None
+            self.log.warning(f'读取配置失败, 使用默认值: {e}')
+            self.value = fallback
+        return self.value
+
+    def poll(self) -> bool:
+        """文件变更时重新解析 (在工作线程中调用); 返回是否产生了新配置"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self.mtime:
+            return False
+        self.mtime = mtime
+        try:
+            self.value = self._parse()
+        except Exception as e:
+            self.log.warning(f'配置文件有误, 继续使用旧配置: {e}')
+            return False
+        self.log.info(f'配置热加载: {os.path.basename(self.path)}')
+        return True
+
+    async def notify(self):
+        for func, is_coro in list(self.callbacks):
+            value = copy.deepcopy(self.value)  # 回调各自持有拷贝, 修改不影响缓存
+            try:
+                await func(value) if is_coro else func(value)
+            except Exception as e:
+                self.log.warning(f'配置变更回调异常: {e}')
+
+
+def register(cfg: LocalConfig):
+    with _registry_lock:
+        _registry[cfg.path] = cfg
+
+
+def unregister(path: str):
+    with _registry_lock:
+        _registry.pop(path, None)
+
+
+def _poll_all() -> list:
+    with _registry_lock:
+        items = list(_registry.values())
+    return [c for c in items if c.poll()]
+
+
+async def poll_changes():
+    """由配置监视服务定期调用: 工作线程中检测并重新解析, 事件循环上触发回调"""
+    for c in await asyncio.to_thread(_poll_all):
+        await c.notify()
@@ -53,8 +53,8 @@ def on_error(callback):
     _error_callbacks.append(callback)
 
 
-def report_error(module_type: str, name: str, error: Exception, context: dict | None = None):
-    """报告错误 (context 为可选的附加调试信息)"""
+def report_error(module_type: str, name: str, error: Exception | str, context: dict | None = None, tb: str | None = None):
+    """报告错误 (context 为可选的附加调试信息; tb 指定调用栈文本, 默认取当前异常)"""
     import datetime
     import traceback
     log = get_logger(module_type, name)
@@ -64,7 +64,7 @@ def report_error(module_type: str, name: str, error: Exception, context: dict |
         'module_type': module_type,
         'module_name': name,
         'content': str(error),
-        'traceback': traceback.format_exc(),
+        'traceback': traceback.format_exc() if tb is None else tb,
     }
     if context:
         data['context'] = context
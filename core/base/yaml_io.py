@@ -0,0 +1,89 @@
+"""YAML 读写 — 优先使用 libyaml (CSafeLoader / CSafeDumper), 解析结果按 (路径, mtime, 大小) 缓存, 原子写入
+
+    load(path)          解析文件 (命中缓存时返回缓存结果的副本)
+    read(path)          (原文, 解析结果), 供需要保留注释 / 原文的编辑器使用
+    loads(text)         解析字符串
+    dump(path, data)    序列化后原子写入
+    write_text(path, text)  原子写入: 同目录临时文件 → fsync → os.replace, 中途崩溃不会留下半个文件
+"""
+
+import contextlib
+import copy
+import os
+import tempfile
+import threading
+
+import yaml
+
+Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+Dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+YAMLError = yaml.YAMLError
+
+_CACHE_MAX = 64
+_cache: dict[str, tuple] = {}  # {abs_path: (mtime_ns, size, text, data)}
+_cache_lock = threading.Lock()
+
+
+def loads(text: str):
+    return yaml.load(text, Loader=Loader)  # Loader 为 SafeLoader / CSafeLoader, 不构造任意对象
+
+
+def dumps(data, **kwargs) -> str:
+    kwargs.setdefault('allow_unicode', True)
+    kwargs.setdefault('default_flow_style', False)
+    kwargs.setdefault('sort_keys', False)
+    return yaml.dump(data, Dumper=Dumper, **kwargs)
+
+
+def _stat_key(path: str):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def read(path: str) -> tuple:
+    """返回 (原文, 解析结果); 解析结果是缓存的副本, 可自由修改"""
+    path = os.path.abspath(path)
+    mtime, size = _stat_key(path)
+    hit = _cache.get(path)
+    if hit and hit[0] == mtime and hit[1] == size:
+        return hit[2], copy.deepcopy(hit[3])
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    data = loads(text)
+    with _cache_lock:
+        if len(_cache) >= _CACHE_MAX:
+            _cache.pop(next(iter(_cache)))
+        _cache[path] = (mtime, size, text, data)
+    return text, copy.deepcopy(data)
+
+
+def load(path: str, default=None):
+    """解析 YAML 文件; 空文档返回 default"""
+    data = read(path)[1]
+    return default if data is None else data
+
+
+def write_text(path: str, text: str):
+    """原子写入文本文件 (保留原文件权限)"""
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        with contextlib.suppress(OSError):
+            os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+    with _cache_lock:
+        _cache.pop(path, None)
+
+
+def dump(path: str, data, **kwargs):
+    write_text(path, dumps(data, **kwargs))
@@ -1,80 +1,184 @@
-"""Hook 系统 — emit(广播) / pipeline(管道)"""
+"""Hook 系统 — emit(广播) / emit_parallel(并发广播) / pipeline(管道)
+
+每个 hook 名在首次触发时编译为按优先级排好的调用链 (元组), 注册 / 注销时作废重编;
+没有监听者的 hook 直接返回, 不产生任何开销。每个回调按 (owner, hook) 统计耗时直方图,
+可设超时: 超时视同异常, emit 跳过该回调, pipeline 保留上一步的数据。
+"""
 
 import asyncio
+import time
 from collections import defaultdict
 
 from core.base.logger import FRAMEWORK, get_logger
+from core.services.metrics import bucket_quantile
 
 log = get_logger(FRAMEWORK, 'Hook')
 
+_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)  # 直方图上界, 最后一格为 >1000ms
 
-class HookManager:
-    """通用 Hook 管理器"""
 
-    __slots__ = ('_hooks', '_sorted')
+class HookStats:
+    """单个 (owner, hook) 的耗时直方图"""
+
+    __slots__ = ('calls', 'total', 'max', 'errors', 'timeouts', 'buckets')
 
     def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.timeouts = 0
+        self.buckets = [0] * (len(_BUCKETS_MS) + 1)
+
+    def observe(self, ms: float):
+        self.calls += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+        for i, bound in enumerate(_BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def quantile(self, q: float) -> float:
+        """按直方图估算分位数 (返回所在桶的上界, 最后一格取实测最大值)"""
+        return bucket_quantile(_BUCKETS_MS, self.buckets, q, self.max)
+
+    def to_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'avg_ms': round(self.total / self.calls, 3) if self.calls else 0,
+            'p50_ms': round(self.quantile(0.5), 3),
+            'p95_ms': round(self.quantile(0.95), 3),
+            'max_ms': round(self.max, 3),
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'buckets': list(self.buckets),
+        }
+
+
+class _Hook:
+    __slots__ = ('priority', 'owner', 'callback', 'is_coro', 'inline', 'timeout', 'stats')
+
+    def __init__(self, priority, owner, callback, timeout, inline):
+        self.priority = priority
+        self.owner = owner
+        self.callback = callback
+        self.is_coro = asyncio.iscoroutinefunction(callback)
+        self.inline = inline and not self.is_coro
+        self.timeout = timeout
+        self.stats = None
+
+
+class HookManager:
+    """通用 Hook 管理器
+
+    default_timeout: 未单独指定 timeout 的回调的超时秒数, None / 0 为不限
+    """
+
+    __slots__ = ('_hooks', '_chains', '_stats', 'default_timeout')
+
+    BUCKETS_MS = _BUCKETS_MS
+
+    def __init__(self, default_timeout=None):
         self._hooks = defaultdict(list)
-        self._sorted = {}
+        self._chains = {}  # {hook_name: tuple[_Hook]}
+        self._stats = {}   # {(owner, hook_name): HookStats}
+        self.default_timeout = default_timeout
 
-    def register(self, hook_name, callback, *, owner='unknown', priority=100):
-        """注册 hook 回调"""
-        self._hooks[hook_name].append(
-            (priority, owner, callback, asyncio.iscoroutinefunction(callback))
-        )
-        self._sorted.pop(hook_name, None)
+    def register(self, hook_name, callback, *, owner='unknown', priority=100, timeout=None, inline=False):
+        """注册 hook 回调
+
+        timeout: 单个回调的超时秒数 (缺省取 default_timeout); 同步回调超时后线程仍会跑完, 只是不再等待
+        inline:  同步回调直接在事件循环中调用, 省去线程切换; 仅用于不阻塞的轻量回调 (不受超时约束)
+        """
+        self._hooks[hook_name].append(_Hook(priority, owner, callback, timeout, inline))
+        self._chains.pop(hook_name, None)
 
     def unregister(self, hook_name, callback):
         """注销单个回调"""
         entries = self._hooks.get(hook_name)
         if not entries:
             return
-        self._hooks[hook_name] = [e for e in entries if e[2] is not callback]
-        self._sorted.pop(hook_name, None)
+        self._hooks[hook_name] = [h for h in entries if h.callback is not callback]
+        self._chains.pop(hook_name, None)
 
     def unregister_owner(self, owner):
-        """注销某个 owner 的所有 hook"""
+        """注销某个 owner 的所有 hook (连同耗时统计)"""
         for name in list(self._hooks):
             orig = self._hooks[name]
-            filtered = [e for e in orig if e[1] != owner]
+            filtered = [h for h in orig if h.owner != owner]
             if len(filtered) == len(orig):
                 continue
-            self._sorted.pop(name, None)
+            self._chains.pop(name, None)
             if filtered:
                 self._hooks[name] = filtered
             else:
                 del self._hooks[name]
-
-    def _get_sorted(self, hook_name):
-        cached = self._sorted.get(hook_name)
-        if cached is not None:
-            return cached
-        result = sorted(self._hooks.get(hook_name, []), key=lambda x: x[0])
-        self._sorted[hook_name] = result
-        return result
+        for key in [k for k in self._stats if k[0] == owner]:
+            del self._stats[key]
+
+    def _compile(self, hook_name):
+        chain = tuple(sorted(self._hooks.get(hook_name, ()), key=lambda h: h.priority))
+        for h in chain:
+            h.stats = self._stats.setdefault((h.owner, hook_name), HookStats())
+        self._chains[hook_name] = chain
+        return chain
+
+    async def _call(self, hook_name, h, args, kwargs):
+        """执行单个回调; 返回 (是否成功, 返回值)"""
+        timeout = h.timeout if h.timeout is not None else self.default_timeout
+        t0 = time.perf_counter()
+        try:
+            if h.inline:
+                return True, h.callback(*args, **kwargs)
+            aw = h.callback(*args, **kwargs) if h.is_coro else asyncio.to_thread(h.callback, *args, **kwargs)
+            if timeout:
+                async with asyncio.timeout(timeout):
+                    return True, await aw
+            return True, await aw
+        except TimeoutError:
+            h.stats.timeouts += 1
+            log.warning(f"[{h.owner}] hook '{hook_name}' 超时 ({timeout}s)")
+        except Exception as e:
+            h.stats.errors += 1
+            log.warning(f"[{h.owner}] hook '{hook_name}': {e}")
+        finally:
+            h.stats.observe((time.perf_counter() - t0) * 1000)
+        return False, None
 
     async def emit(self, hook_name, *args, **kwargs):
-        """广播执行"""
-        for _, owner, cb, is_coro in self._get_sorted(hook_name):
-            try:
-                if is_coro:
-                    await cb(*args, **kwargs)
-                else:
-                    await asyncio.to_thread(cb, *args, **kwargs)
-            except Exception as e:
-                log.warning(f"[{owner}] hook '{hook_name}': {e}")
+        """广播执行 (按优先级依次 await)"""
+        chain = self._chains.get(hook_name)
+        if chain is None:
+            chain = self._compile(hook_name)
+        for h in chain:
+            await self._call(hook_name, h, args, kwargs)
+
+    async def emit_parallel(self, hook_name, *args, **kwargs):
+        """并发广播: 监听者互不依赖时使用, 总耗时取决于最慢的回调而非总和"""
+        chain = self._chains.get(hook_name)
+        if chain is None:
+            chain = self._compile(hook_name)
+        if len(chain) == 1:
+            await self._call(hook_name, chain[0], args, kwargs)
+        elif chain:
+            await asyncio.gather(*(self._call(hook_name, h, args, kwargs) for h in chain))
 
     async def pipeline(self, hook_name, data):
-        """管道执行"""
+        """管道执行: 回调返回 None 时中止; 出错或超时的回调被跳过"""
         if data is None:
             return None
-        for _, owner, cb, is_coro in self._get_sorted(hook_name):
-            try:
-                data = await cb(data) if is_coro else await asyncio.to_thread(cb, data)
-                if data is None:
+        chain = self._chains.get(hook_name)
+        if chain is None:
+            chain = self._compile(hook_name)
+        for h in chain:
+            ok, result = await self._call(hook_name, h, (data,), {})
+            if ok:
+                if result is None:
                     return None
-            except Exception as e:
-                log.warning(f"[{owner}] hook '{hook_name}': {e}")
+                data = result
         return data
 
     def has(self, hook_name):
@@ -82,13 +186,27 @@ class HookManager:
 
     def list_hooks(self):
         return {
-            name: [{'owner': e[1], 'priority': e[0]} for e in self._get_sorted(name)]
-            for name in self._hooks if self._hooks[name]
+            name: [{'owner': h.owner, 'priority': h.priority} for h in self._chains.get(name) or self._compile(name)]
+            for name in list(self._hooks) if self._hooks[name]
         }
 
+    def stats_by_owner(self) -> dict:
+        """{owner: [{'hook': 名称, calls, avg_ms, p95_ms, ...}]}, 供模块页面展示"""
+        out: dict[str, list] = {}
+        for (owner, name), st in self._stats.items():
+            out.setdefault(owner, []).append({'hook': name, **st.to_dict()})
+        for items in out.values():
+            items.sort(key=lambda x: x['hook'])
+        return out
+
+    def reset_stats(self):
+        for st in self._stats.values():
+            st.__init__()
+
     def clear(self):
         self._hooks.clear()
-        self._sorted.clear()
+        self._chains.clear()
+        self._stats.clear()
 
 
 _instance = None
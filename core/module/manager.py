@@ -40,18 +40,21 @@ class ModuleContext(BaseContext):
     def module_dir(self):
         return self._root_dir
 
-    def hook(self, hook_name, *, priority=100):
+    def hook(self, hook_name, *, priority=100, timeout=None, inline=False):
         def decorator(func):
-            self._hooks.register(hook_name, func, owner=self.name, priority=priority)
+            self._hooks.register(hook_name, func, owner=self.name, priority=priority, timeout=timeout, inline=inline)
             return func
         return decorator
 
-    def register_hook(self, hook_name, callback, *, priority=100):
-        self._hooks.register(hook_name, callback, owner=self.name, priority=priority)
+    def register_hook(self, hook_name, callback, *, priority=100, timeout=None, inline=False):
+        self._hooks.register(hook_name, callback, owner=self.name, priority=priority, timeout=timeout, inline=inline)
 
     async def emit(self, hook_name, *args, **kwargs):
         await self._hooks.emit(hook_name, *args, **kwargs)
 
+    async def emit_parallel(self, hook_name, *args, **kwargs):
+        await self._hooks.emit_parallel(hook_name, *args, **kwargs)
+
     async def pipeline(self, hook_name, data):
         return await self._hooks.pipeline(hook_name, data)
 
@@ -192,6 +195,8 @@ class ModuleManager:
             except Exception as e:
                 report_error(EXTENSION, name, e)
             self._hook_manager.unregister_owner(info.display_name or name)
+            if info.ctx is not None:
+                info.ctx.release_config()
             info.instance = info.ctx = None
             sys.modules.pop(f'modules.{name}', None)
             if _persist:
@@ -7,6 +7,7 @@ import logging
 from typing import Any
 
 from core.onebot.event import OneBotEvent, parse_event
+from core.services import metrics
 
 logger = logging.getLogger('ElainaBot.onebot.adapter')
 
@@ -22,6 +23,8 @@ class OneBotAdapter:
         # 鉴权按连接区分 (port, path) -> token/secret, 避免某连接 token 误用到其它连接
         self.reverse_ws_tokens: dict[tuple, str] = {}
         self.reverse_http_secrets: dict[tuple, str] = {}
+        metrics.registry.gauge_func('elaina_api_pending', '等待 OneBot 响应的 API 调用数 (echo future)', lambda: len(self.api_responses))
+        metrics.registry.gauge_func('elaina_bots_connected', '已连接的机器人数', lambda: len(self.websockets))
 
     def expected_ws_token(self, port=None, path=None) -> str:
         """返回指定 (端口, 路径) 反向 WS 入口应校验的 token; 找不到则不校验"""
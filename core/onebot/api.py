@@ -3,12 +3,18 @@
 import asyncio
 import json
 import logging
+import time
 import uuid
+from contextvars import ContextVar
+
+from core.services import metrics
 
 logger = logging.getLogger('ElainaBot.onebot.api')
 
 _main_loop = None
 _adapter_ref = None
+# 当前处理器内 API 调用的累计耗时 [秒]; 插件分发执行处理器前设置, 其余场景为 None
+api_time: ContextVar[list | None] = ContextVar('onebot_api_time', default=None)
 
 
 def set_main_loop(loop):
@@ -31,12 +37,26 @@ class OneBotAPI:
         """调用 OneBot API — 优先走 WebSocket, 无连接时回退到 HTTP 客户端"""
         if not self._adapter:
             return None
-
+        t0 = time.perf_counter()
+        try:
+            return await self._call(action, params, self_id)
+        finally:
+            dt = time.perf_counter() - t0
+            metrics.api_seconds.labels(action).observe(dt)
+            acc = api_time.get()
+            if acc is not None:
+                acc[0] += dt
+
+    async def _call(self, action: str, params: dict, self_id: str) -> dict | None:
         ws = self._adapter.get_bot_ws(self_id)
         if ws is None:  # WebSocketResponse 的 bool() 为 False, 必须用 is None 判空
             # 反向/正向 WS 都不可用时, 尝试 HTTP 客户端 (框架 -> OneBot HTTP API)
             if getattr(self._adapter, 'http_clients', None):
-                return await self._adapter.http_call_action(action, params or {})
+                result = await self._adapter.http_call_action(action, params or {})
+                if result is None:
+                    metrics.api_failures_total.labels(action, 'error').inc()
+                return result
+            metrics.api_failures_total.labels(action, 'no_connection').inc()
             logger.warning('API 调用失败: 无可用 WebSocket / HTTP 连接')
             return None
 
@@ -57,10 +77,12 @@ class OneBotAPI:
             async with asyncio.timeout(30):
                 return await future
         except TimeoutError:
+            metrics.api_failures_total.labels(action, 'timeout').inc()
             logger.warning(f'API 超时: {action}')
             self._adapter.api_responses.pop(echo, None)
             return None
         except Exception as e:
+            metrics.api_failures_total.labels(action, 'error').inc()
             logger.error(f'API 错误: {action} - {e}')
             self._adapter.api_responses.pop(echo, None)
             return None
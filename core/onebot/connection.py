@@ -31,14 +31,18 @@ def default_connections():
     return []
 
 
+_SERVER_HOST = cfg.key('settings', 'server.host', '0.0.0.0')
+_SERVER_PORT = cfg.key('settings', 'server.port', 5201)
+
+
 def normalize(conn: dict) -> dict:
     """补全连接配置的缺省字段"""
     c = dict(conn or {})
     c.setdefault('type', ConnType.WS_REVERSE)
     c.setdefault('name', c['type'])
     c['enable'] = bool(c.get('enable', False))
-    c.setdefault('host', cfg.get('settings', 'server.host', '0.0.0.0'))
-    c.setdefault('port', cfg.get('settings', 'server.port', 5201))
+    c.setdefault('host', _SERVER_HOST())
+    c.setdefault('port', _SERVER_PORT())
     c.setdefault('path', '/OneBotv11')
     c.setdefault('url', '')
     c.setdefault('token', '')
@@ -74,7 +78,7 @@ class ConnectionManager:
         return self._configs
 
     def _main_addr(self):
-        return (cfg.get('settings', 'server.host', '0.0.0.0'), int(cfg.get('settings', 'server.port', 5201)))
+        return _SERVER_HOST(), int(_SERVER_PORT())
 
     # ── 启动 / 停止 ──
     async def start(self):
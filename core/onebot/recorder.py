@@ -0,0 +1,80 @@
+"""OneBot 事件录制 — 为 bench/replay.py 采集真实事件语料 (默认关闭)
+
+settings.yaml 中 onebot.record_file 非空时, 把反向 WS / HTTP 上报收到的事件按 JSON Lines 追加写入该文件
+(相对路径基于 data/ 目录), 每行:
+
+    {"t": 距录制开始的秒数, "self_id": "机器人QQ", "frame": {原始事件}}
+
+API 响应与心跳不录制。写入每秒在线程池中批量进行一次, 不阻塞事件循环。
+录制内容含聊天原文, 仅用于本地压测; 采集完毕请清空配置并妥善处理文件。
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+
+from core.base.config import cfg
+
+logger = logging.getLogger('ElainaBot.onebot.recorder')
+
+_RECORD_FILE = cfg.key('settings', 'onebot.record_file', '')
+_FLUSH_DELAY = 1.0
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data')
+_io_lock = threading.Lock()
+
+
+def _append(path: str, lines: list):
+    try:
+        with _io_lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+    except OSError as e:
+        logger.warning(f'事件录制写入失败: {e}')
+
+
+class FrameRecorder:
+    """事件帧录制器 (仅在事件循环线程调用 record)"""
+
+    def __init__(self):
+        self._buf = []
+        self._t0 = None
+        self._scheduled = False
+        self._path = ''
+
+    def record(self, self_id, data: dict):
+        path = _RECORD_FILE()
+        if not path or data.get('post_type') == 'meta_event':
+            return
+        now = time.monotonic()
+        if self._t0 is None:
+            self._t0 = now
+        path = path if os.path.isabs(path) else os.path.join(_DATA_DIR, path)
+        if path != self._path:
+            if self._buf:
+                self.flush()
+            self._path = path
+            logger.info(f'OneBot 事件录制: {path}')
+        self._buf.append(json.dumps({'t': round(now - self._t0, 4), 'self_id': str(self_id or ''), 'frame': data},
+                                    ensure_ascii=False, separators=(',', ':')))
+        if not self._scheduled:
+            self._scheduled = True
+            asyncio.get_running_loop().call_later(_FLUSH_DELAY, self._flush_later)
+
+    def _flush_later(self):
+        self._scheduled = False
+        lines, self._buf = self._buf, []
+        if lines:
+            asyncio.get_running_loop().run_in_executor(None, _append, self._path, lines)
+
+    def flush(self):
+        """同步写出缓冲 (关闭时调用)"""
+        lines, self._buf = self._buf, []
+        if lines:
+            _append(self._path, lines)
+
+
+recorder = FrameRecorder()
@@ -4,6 +4,9 @@ import asyncio
 import time
 
 from core.base.logger import PLUGIN, get_logger, report_error
+from core.onebot.api import api_time
+from core.services import metrics
+from core.services.live_stats import live_stats
 
 log = get_logger(PLUGIN, '管理器')
 
@@ -18,6 +21,11 @@ class _DispatchMixin:
 
         msg, generic, typed = [], [], {}
         for h in self._all_handlers:
+            # 预取指标子项, 执行时免去标签查找
+            labels = (h.get('_plugin', ''), h['name'])
+            h['_m_matched'] = metrics.handler_matched_total.labels(*labels)
+            h['_m_seconds'] = metrics.handler_seconds.labels(*labels)
+            self._attach_stats(h)
             event_types = h['event_types']
             if not event_types:
                 msg.append(h)
@@ -70,7 +78,10 @@ class _DispatchMixin:
                     break
             if not matched:
                 return False
-            asyncio.create_task(self._run_chain(matched, event))
+            bot_qq = str(event.self_id or '')
+            for h, _ in matched:
+                live_stats.record_command(bot_qq, h['name'])
+            asyncio.create_task(self._run_chain(matched, event, time.perf_counter()))
             return True
 
         # 通知/请求/元事件 — 候选 = 通用桶 + 该事件类型桶, 按优先级合并
@@ -98,27 +109,37 @@ class _DispatchMixin:
                     break
             if not matched:
                 return False
-            asyncio.create_task(self._run_chain(matched, event))
+            asyncio.create_task(self._run_chain(matched, event, time.perf_counter()))
             return True
 
-    async def _run_chain(self, matched, event):
+    async def _run_chain(self, matched, event, matched_at):
         """顺序执行命中的处理器链 (回复顺序与 priority 一致)"""
         for h, match in matched:
-            await self._run_handler(h, event, match)
+            await self._run_handler(h, event, match, matched_at)
 
-    async def _run_handler(self, h, event, match):
-        """执行单个处理器 (带超时和异常捕获)"""
+    async def _run_handler(self, h, event, match, matched_at):
+        """执行单个处理器 (带超时和异常捕获); 记录墙钟 / 排队 / API 耗时"""
         plugin_name = h['name'] or h.get('_plugin', '')
+        h['_m_matched'].inc()
+        api_acc = [0.0]
+        token = api_time.set(api_acc)
+        status = ''
+        t0 = time.perf_counter()
         try:
             fn = h['func']
+            sampler = self._sampler_for(h)
             async with asyncio.timeout(300):
                 if h['is_coro']:
-                    await fn(event, match)
+                    await (sampler.wrap_coro(fn(event, match)) if sampler else fn(event, match))
                 else:
-                    await asyncio.to_thread(fn, event, match)
+                    await asyncio.to_thread(sampler.wrap_sync(fn) if sampler else fn, event, match)
         except TimeoutError:
+            status = 'timeout'
+            metrics.handler_errors_total.labels(h.get('_plugin', ''), h['name'], 'timeout').inc()
             report_error(PLUGIN, plugin_name, f'处理器 [{h["name"]}] 超时(300s)')
         except Exception as e:
+            status = 'error'
+            metrics.handler_errors_total.labels(h.get('_plugin', ''), h['name'], 'error').inc()
             report_error(
                 PLUGIN, plugin_name, e,
                 context={
@@ -128,3 +149,8 @@ class _DispatchMixin:
                     'content': (event.content if hasattr(event, 'content') else '')[:200],
                 },
             )
+        finally:
+            api_time.reset(token)
+            elapsed = time.perf_counter() - t0
+            h['_m_seconds'].observe(elapsed)
+            self._record_run(h, event, elapsed * 1000, (t0 - matched_at) * 1000, api_acc[0] * 1000, status)
@@ -205,6 +205,8 @@ class _LoaderMixin:
         if not plugin:
             return
         await _run_hooks(plugin.on_unload_funcs, name)
+        if plugin.ctx is not None:
+            plugin.ctx.release_config()
         try:
             from core.plugin.web_pages import clear_routes_by_owner
 
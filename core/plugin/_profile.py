@@ -0,0 +1,253 @@
+"""处理器耗时统计 / 慢处理器告警 / 按插件 cProfile 采样 — PluginManager 的 Mixin
+
+每次执行记录三项耗时 (毫秒): 墙钟、从命中到开始执行的排队时间、执行期间 OneBot API 调用的累计时间;
+处理器与插件各保留最近 _WINDOW 次, 查询时排序求 p50 / p95 / p99。
+超过 profiler.slow_handler_ms 的执行经 report_error 告警 (同一处理器每分钟最多一次)。
+
+采样一次只针对一个插件: 协程处理器只在它自己的执行片段内开启 cProfile (不混入同时运行的其它任务),
+同步处理器在工作线程内单独开启后合并。
+"""
+
+import cProfile
+import io
+import pstats
+import threading
+import time
+from collections import deque
+
+from core.base.config import cfg
+from core.base.logger import PLUGIN, get_logger, report_error
+from core.services.metrics import percentile
+
+log = get_logger(PLUGIN, '性能')
+
+_WINDOW = 512          # 每个处理器 / 插件保留的最近执行次数
+_ALERT_INTERVAL = 60   # 同一处理器慢告警的最小间隔(秒)
+_MAX_SAMPLE_SECONDS = 600
+_SLOW_MS = cfg.key('settings', 'profiler.slow_handler_ms', 3000)
+
+
+class RollingStats:
+    """最近 _WINDOW 次执行的耗时窗口 + 累计计数"""
+
+    __slots__ = ('calls', 'errors', 'timeouts', 'slow', 'wall', 'queue', 'api', 'last_alert')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.slow = 0
+        self.wall = deque(maxlen=_WINDOW)
+        self.queue = deque(maxlen=_WINDOW)
+        self.api = deque(maxlen=_WINDOW)
+        self.last_alert = 0.0
+
+    def observe(self, wall_ms: float, queue_ms: float, api_ms: float):
+        self.calls += 1
+        self.wall.append(wall_ms)
+        self.queue.append(queue_ms)
+        self.api.append(api_ms)
+
+    def to_dict(self) -> dict:
+        wall = sorted(self.wall)
+        n = len(wall)
+        return {
+            'calls': self.calls,
+            'p50_ms': round(percentile(wall, 0.5), 2),
+            'p95_ms': round(percentile(wall, 0.95), 2),
+            'p99_ms': round(percentile(wall, 0.99), 2),
+            'max_ms': round(wall[-1], 2) if n else 0,
+            'queue_ms': round(sum(self.queue) / n, 2) if n else 0,
+            'api_ms': round(sum(self.api) / n, 2) if n else 0,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'slow': self.slow,
+        }
+
+
+def _enable(prof) -> bool:
+    """开启分析器; 已有其它分析器占用 (3.12+ 全局只允许一个) 时放弃本次采样"""
+    try:
+        prof.enable()
+        return True
+    except ValueError:
+        return False
+
+
+class _ProfiledCoro:
+    """逐步驱动协程, 只在协程自身的执行片段内开启分析器"""
+
+    __slots__ = ('_coro', '_prof')
+
+    def __init__(self, coro, prof):
+        self._coro = coro
+        self._prof = prof
+
+    def __await__(self):
+        coro, prof = self._coro, self._prof
+        value, exc = None, None
+        while True:
+            on = _enable(prof)
+            try:
+                fut = coro.throw(exc) if exc is not None else coro.send(value)
+            except StopIteration as e:
+                return e.value
+            finally:
+                if on:
+                    prof.disable()
+            try:
+                value, exc = (yield fut), None
+            except BaseException as e:  # 取消 / 超时原样抛回协程
+                value, exc = None, e
+
+
+class _Sampler:
+    """单个插件在一段时间内的 cProfile 采样"""
+
+    def __init__(self, plugin: str, seconds: float):
+        self.plugin = plugin
+        self.seconds = seconds
+        self.started = time.time()
+        self.deadline = time.monotonic() + seconds
+        self.calls = 0
+        self._prof = cProfile.Profile()  # 事件循环线程 (协程处理器)
+        self._thread_stats: pstats.Stats | None = None  # 工作线程 (同步处理器) 的合并结果
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return time.monotonic() < self.deadline
+
+    def wrap_coro(self, coro):
+        self.calls += 1
+        return _ProfiledCoro(coro, self._prof)
+
+    def wrap_sync(self, fn):
+        self.calls += 1
+
+        def run(*args):
+            prof = cProfile.Profile()
+            if not _enable(prof):
+                return fn(*args)
+            try:
+                return fn(*args)
+            finally:
+                prof.disable()
+                with self._lock:
+                    if self._thread_stats is None:
+                        self._thread_stats = pstats.Stats(prof)
+                    else:
+                        self._thread_stats.add(prof)
+
+        return run
+
+    def report(self, sort: str = 'cumulative', limit: int = 60) -> str:
+        buf = io.StringIO()
+        state = '采样中' if self.active else '已结束'
+        started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started))
+        buf.write(f'插件: {self.plugin}  开始: {started}  时长: {self.seconds:g}s ({state})  采样执行次数: {self.calls}\n\n')
+        with self._lock:
+            sources: list = [self._prof] if self._prof.getstats() else []
+            if self._thread_stats is not None:
+                sources.append(self._thread_stats)
+            stats = pstats.Stats(*sources, stream=buf) if sources else None
+        if stats is None:
+            buf.write('暂无数据 (采样期间该插件的处理器未被触发)\n')
+        else:
+            stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return buf.getvalue()
+
+
+class _ProfileMixin:
+    """处理器耗时统计与采样"""
+
+    _handler_stats: dict[tuple[str, str], RollingStats]  # {(插件, 处理器名): RollingStats}
+    _plugin_stats: dict[str, RollingStats]  # {插件: RollingStats}
+    _sampler: _Sampler | None
+
+    def _attach_stats(self, h):
+        """为处理器挂上统计对象 (按 插件/处理器名 复用, 重载后统计延续)"""
+        plugin = h.get('_plugin', '')
+        h['_stats'] = self._handler_stats.setdefault((plugin, h['name'] or h['pattern']), RollingStats())
+        h['_pstats'] = self._plugin_stats.setdefault(plugin, RollingStats())
+
+    def _sampler_for(self, h):
+        s = self._sampler
+        return s if s is not None and s.plugin == h.get('_plugin') and s.active else None
+
+    def _record_run(self, h, event, wall_ms: float, queue_ms: float, api_ms: float, status: str):
+        hs, ps = h['_stats'], h['_pstats']
+        for st in (hs, ps):
+            st.observe(wall_ms, queue_ms, api_ms)
+            if status == 'timeout':
+                st.timeouts += 1
+            elif status == 'error':
+                st.errors += 1
+        slow_ms = _SLOW_MS()
+        if status == 'timeout' or not slow_ms or wall_ms < slow_ms:
+            return
+        hs.slow += 1
+        ps.slow += 1
+        now = time.monotonic()
+        if now - hs.last_alert < _ALERT_INTERVAL:
+            return
+        hs.last_alert = now
+        report_error(
+            PLUGIN, h.get('_plugin') or h['name'],
+            f'慢处理器 [{h["name"]}]: {wall_ms:.0f}ms (排队 {queue_ms:.0f}ms, API {api_ms:.0f}ms, 阈值 {slow_ms}ms)',
+            context={
+                'handler': h['name'],
+                'user_id': str(getattr(event, 'user_id', '')),
+                'group_id': str(getattr(event, 'group_id', '')),
+                'content': (getattr(event, 'content', '') or '')[:200],
+            },
+        )
+
+    @staticmethod
+    def handler_stats(h) -> dict | None:
+        st = h.get('_stats')
+        return st.to_dict() if st and st.calls else None
+
+    def plugin_stats(self, plugin: str) -> dict | None:
+        st = self._plugin_stats.get(plugin)
+        return st.to_dict() if st and st.calls else None
+
+    @staticmethod
+    def slow_handler_ms() -> int:
+        return _SLOW_MS()
+
+    def reset_stats(self):
+        self._handler_stats.clear()
+        self._plugin_stats.clear()
+        self._build_dispatch_index()
+
+    # ==================== 采样 ====================
+
+    def start_profiling(self, plugin: str, seconds: float = 60):
+        """开始对某个插件采样 (替换正在进行的采样)"""
+        seconds = max(1.0, min(float(seconds), _MAX_SAMPLE_SECONDS))
+        self._sampler = _Sampler(plugin, seconds)
+        log.info(f'开始采样插件 {plugin} ({seconds:g}s)')
+
+    def stop_profiling(self):
+        s = self._sampler
+        if s is not None and s.active:
+            s.deadline = time.monotonic()
+
+    def profiling_status(self) -> dict | None:
+        s = self._sampler
+        if s is None:
+            return None
+        return {
+            'plugin': s.plugin,
+            'active': s.active,
+            'remaining': max(0, round(s.deadline - time.monotonic())),
+            'calls': s.calls,
+        }
+
+    def profile_report(self, sort: str = 'cumulative') -> str:
+        if self._sampler is None:
+            return '尚未开始采样'
+        if sort not in ('cumulative', 'tottime', 'calls'):
+            sort = 'cumulative'
+        return self._sampler.report(sort)
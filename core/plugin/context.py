@@ -2,22 +2,22 @@
 
 import os
 
-from core.base.logger import PLUGIN, get_logger
+from core.base.context import BaseContext
+from core.base.logger import PLUGIN
 
 # 当前正在加载的插件上下文 (由 PluginManager 在加载期间赋值)
 ctx = None
 
 
-class PluginContext:
-    """插件上下文 — 提供 data/ 读写能力"""
+class PluginContext(BaseContext):
+    """插件上下文 — 提供 data/ 读写与 config.yaml 能力"""
 
-    __slots__ = ('name', 'plugin_dir', 'data_dir', 'log')
+    __slots__ = ('plugin_dir', 'data_dir')
 
     def __init__(self, name, plugin_dir):
-        self.name = name
+        super().__init__(name, plugin_dir, PLUGIN)
         self.plugin_dir = plugin_dir
         self.data_dir = os.path.join(plugin_dir, 'data')
-        self.log = get_logger(PLUGIN, name)
         os.makedirs(self.data_dir, exist_ok=True)
 
     def get_data_path(self, filename):
@@ -8,13 +8,14 @@ from collections import OrderedDict
 from core.base.logger import PLUGIN, get_logger
 from core.plugin._dispatch import _DispatchMixin
 from core.plugin._loader import _LoaderMixin
+from core.plugin._profile import _ProfileMixin
 from core.plugin._watcher import _WatcherMixin
 
 log = get_logger(PLUGIN, '管理器')
 
 
-class PluginManager(_LoaderMixin, _WatcherMixin, _DispatchMixin):
-    """插件管理器 — 通过 Mixin 组合加载/分发/监视能力"""
+class PluginManager(_LoaderMixin, _WatcherMixin, _DispatchMixin, _ProfileMixin):
+    """插件管理器 — 通过 Mixin 组合加载/分发/监视/性能统计能力"""
 
     def __init__(self, plugins_dir: str):
         self._dir = os.path.abspath(plugins_dir)
@@ -32,6 +33,10 @@ class PluginManager(_LoaderMixin, _WatcherMixin, _DispatchMixin):
         self._watcher_task = None
         self._watcher_running = False
         self._owner_ids = []
+        # 处理器耗时统计 (见 _profile.py)
+        self._handler_stats = {}  # {(插件, 处理器名): RollingStats}
+        self._plugin_stats = {}   # {插件: RollingStats}
+        self._sampler = None
         self._load_disabled_plugins()
 
     @property
@@ -109,6 +114,7 @@ class PluginManager(_LoaderMixin, _WatcherMixin, _DispatchMixin):
                 'load_time': round(p.load_time, 3),
                 'error': p.error,
                 'is_large': p.is_large,
+                'stats': self.plugin_stats(p.name),
             }
             for p in self._plugins.values()
         ]
@@ -122,6 +128,7 @@ class PluginManager(_LoaderMixin, _WatcherMixin, _DispatchMixin):
                 'plugin': h.get('_plugin', ''),
                 'owner_only': h['owner_only'],
                 'priority': h['priority'],
+                'stats': self.handler_stats(h),
             }
             for h in self._all_handlers
         ]
@@ -137,13 +144,14 @@ class PluginManager(_LoaderMixin, _WatcherMixin, _DispatchMixin):
                     'desc': h.get('desc', ''),
                     'owner_only': h.get('owner_only', False),
                     'group_only': h.get('group_only', False),
+                    'stats': self.handler_stats(h),
                 }
                 for h in p.handlers
             ]
             desc = ''
             if p.module and getattr(p.module, '__doc__', None):
                 desc = p.module.__doc__.strip().split('\n')[0]
-            result[p.name] = {'commands': cmds, 'description': desc, 'meta': p.meta}
+            result[p.name] = {'commands': cmds, 'description': desc, 'meta': p.meta, 'stats': self.plugin_stats(p.name)}
         return result
 
     def list_plugins(self) -> list:
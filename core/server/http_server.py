@@ -2,15 +2,24 @@
 
 import asyncio
 import contextlib
+import hmac
+import ipaddress
 import json
 
 from aiohttp import web
 
 from core.base.config import cfg
 from core.base.logger import SYSTEM, get_logger
+from core.onebot.recorder import recorder
+from core.services import metrics
 
 log = get_logger(SYSTEM, 'HTTP')
 
+_SERVER_HOST = cfg.key('settings', 'server.host', '0.0.0.0')
+_SERVER_PORT = cfg.key('settings', 'server.port', 5201)
+_METRICS_ENABLED = cfg.key('settings', 'metrics.enabled', False)
+_METRICS_TOKEN = cfg.key('settings', 'metrics.token', '')
+
 
 def _local_port(request: web.Request):
     """获取该请求实际进入的本地监听端口 (用于按连接区分鉴权)"""
@@ -23,6 +32,17 @@ def _local_port(request: web.Request):
     return request.url.port
 
 
+def _is_loopback(request: web.Request) -> bool:
+    """直连对端是否为本机 (不看 X-Forwarded-For, 避免伪造)"""
+    try:
+        ip = ipaddress.ip_address(request.remote or '')
+    except ValueError:
+        return False
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_loopback
+
+
 class HttpServer:
     """aiohttp HTTP 服务器"""
 
@@ -54,6 +74,8 @@ class HttpServer:
 
         # Health check
         self._app.router.add_get('/health', self._handle_health)
+        # Prometheus 指标
+        self._app.router.add_get('/metrics', self._handle_metrics)
 
     def mount_web_panel(self):
         """挂载 Web 面板"""
@@ -65,8 +87,8 @@ class HttpServer:
 
     async def start(self):
         """启动 HTTP 服务器"""
-        host = cfg.get('settings', 'server.host', '0.0.0.0')
-        port = cfg.get('settings', 'server.port', 5201)
+        host = _SERVER_HOST()
+        port = _SERVER_PORT()
 
         self._runner = web.AppRunner(self._app, shutdown_timeout=3)
         await self._runner.setup()
@@ -110,6 +132,7 @@ class HttpServer:
         port, path = _local_port(request), request.path
         success, event = adapter.handle_http_callback(body, dict(request.headers), port=port, path=path)
         if event:
+            recorder.record(event.self_id, event.raw_data)
             asyncio.create_task(self._app_instance.process_event(event))
 
         return web.Response(status=204)
@@ -142,6 +165,7 @@ class HttpServer:
                         data = json.loads(msg.data)
                         event = adapter.parse_event(data)
                         if event:
+                            recorder.record(self_id, data)
                             asyncio.create_task(self._app_instance.process_event(event))
                         elif "echo" in data and data["echo"] in adapter.api_responses:
                             future = adapter.api_responses.pop(data["echo"])
@@ -159,3 +183,17 @@ class HttpServer:
 
     async def _handle_health(self, request: web.Request):
         return web.json_response({'status': 'ok'})
+
+    async def _handle_metrics(self, request: web.Request):
+        """Prometheus 抓取端点 (metrics.enabled 显式开启); 配置了 metrics.token 时要求 Authorization: Bearer <token>,
+        未配置 token 时只允许本机抓取 (指标含机器人 QQ、插件 / 处理器名与 API 名)"""
+        if not _METRICS_ENABLED():
+            return web.Response(status=404)
+        token = str(_METRICS_TOKEN() or '')
+        if token:
+            if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+                return web.Response(status=401, text='Unauthorized')
+        elif not _is_loopback(request):
+            return web.Response(status=403, text='metrics.token 未配置, 仅允许本机抓取')
+        return web.Response(body=metrics.registry.render().encode(),
+                            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'})
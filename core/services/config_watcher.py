@@ -1,8 +1,9 @@
-"""配置文件监视服务 (异步架构)"""
+"""配置文件监视服务 (异步架构) — 框架 config/*.yaml 与模块/插件自带的 config.yaml"""
 
 import asyncio
 import os
 
+from core.base import local_config
 from core.base.config import cfg
 from core.base.logger import SYSTEM, get_logger
 
@@ -39,6 +40,7 @@ class ConfigWatcherService:
                 for name in changed:
                     cfg.reload(name)
                     log.info(f'配置热加载: {name}.yaml')
+                await local_config.poll_changes()
             except asyncio.CancelledError:
                 break
             except Exception:
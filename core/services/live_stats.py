@@ -0,0 +1,191 @@
+"""今日实时统计 — 由 Application._log_event / 插件分发直接喂数, 面板查询「今日」为 O(1)
+
+每个机器人一份当日计数器:
+    消息总数 / 私聊数 / 24 小时分桶
+    群、用户、命令的 Top-K (Space-Saving 近似重击者)
+    活跃用户、活跃群的去重计数 (HyperLogLog)
+跨过本地零点时自动清零; 启动时从汇总表 (core/storage/rollup.py) 回灌当日已入库的数据。
+"""
+
+import datetime
+import math
+import time
+
+from core.base.logger import SYSTEM, get_logger
+
+log = get_logger(SYSTEM, '实时统计')
+
+_TOP_K = 64
+
+
+class HyperLogLog:
+    """HyperLogLog 基数估计 (p=12 时 4096 个寄存器, 标准误差约 1.6%)"""
+
+    __slots__ = ('_p', '_m', '_regs', '_alpha')
+
+    def __init__(self, p: int = 12):
+        self._p = p
+        self._m = 1 << p
+        self._regs = bytearray(self._m)
+        self._alpha = 0.7213 / (1 + 1.079 / self._m)
+
+    def add(self, item: str):
+        x = hash(item) & 0xFFFFFFFFFFFFFFFF
+        rest_bits = 64 - self._p
+        idx = x >> rest_bits
+        rest = x & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        if rank > self._regs[idx]:
+            self._regs[idx] = rank
+
+    def count(self) -> int:
+        m = self._m
+        zeros = self._regs.count(0)
+        if zeros == m:
+            return 0
+        est = self._alpha * m * m / sum(2.0 ** -r for r in self._regs)
+        if est <= 2.5 * m and zeros:
+            est = m * math.log(m / zeros)  # 小基数区间用线性计数修正
+        return round(est)
+
+
+class SpaceSaving:
+    """Space-Saving Top-K: 固定 k 个槽位, 满时替换计数最小者 (计数上界误差 ≤ 被替换者计数)"""
+
+    __slots__ = ('_k', '_counts')
+
+    def __init__(self, k: int = _TOP_K):
+        self._k = k
+        self._counts: dict[str, int] = {}
+
+    def add(self, key: str, n: int = 1):
+        counts = self._counts
+        if key in counts:
+            counts[key] += n
+        elif len(counts) < self._k:
+            counts[key] = n
+        else:
+            victim = min(counts, key=counts.__getitem__)
+            counts[key] = counts.pop(victim) + n
+
+    def top(self, n: int = 10) -> list:
+        return sorted(self._counts.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+class _DayCounters:
+    """单个机器人当日的计数器"""
+
+    __slots__ = ('messages', 'private', 'hourly', 'groups', 'users', 'commands', 'user_hll', 'group_hll')
+
+    def __init__(self):
+        self.messages = 0
+        self.private = 0
+        self.hourly = [0] * 24
+        self.groups = SpaceSaving()
+        self.users = SpaceSaving()
+        self.commands = SpaceSaving()
+        self.user_hll = HyperLogLog()
+        self.group_hll = HyperLogLog()
+
+
+def _next_midnight(now: float) -> float:
+    tomorrow = datetime.date.fromtimestamp(now) + datetime.timedelta(days=1)
+    return time.mktime(tomorrow.timetuple())
+
+
+class LiveStats:
+    """按机器人维护当日实时计数, 跨零点整体清零"""
+
+    def __init__(self):
+        self._bots: dict[str, _DayCounters] = {}
+        self._day = ''
+        self._rollover_at = 0.0
+
+    def _check_rollover(self):
+        now = time.time()
+        if now >= self._rollover_at:
+            self._bots.clear()
+            self._day = datetime.date.fromtimestamp(now).strftime('%Y-%m-%d')
+            self._rollover_at = _next_midnight(now)
+
+    @property
+    def day(self) -> str:
+        self._check_rollover()
+        return self._day
+
+    def _bot(self, bot_qq: str) -> _DayCounters:
+        c = self._bots.get(bot_qq)
+        if c is None:
+            c = self._bots[bot_qq] = _DayCounters()
+        return c
+
+    def record_message(self, bot_qq: str, group_id: str = '', user_id: str = ''):
+        """记录一条消息 (收/发均计入, 与 message.db 的统计口径一致)"""
+        self._check_rollover()
+        c = self._bot(bot_qq)
+        c.messages += 1
+        c.hourly[time.localtime().tm_hour] += 1
+        if group_id:
+            c.groups.add(group_id)
+            c.group_hll.add(group_id)
+        else:
+            c.private += 1
+        if user_id:
+            c.users.add(user_id)
+            c.user_hll.add(user_id)
+
+    def record_command(self, bot_qq: str, name: str):
+        """记录一次命中的处理器 (命令排行)"""
+        if not name:
+            return
+        self._check_rollover()
+        self._bot(bot_qq).commands.add(name)
+
+    def snapshot(self, bot_qq: str) -> dict:
+        """当日统计快照 (字段与 statistics 接口一致)"""
+        self._check_rollover()
+        c = self._bots.get(bot_qq) or _DayCounters()
+        return {
+            'total_messages': c.messages,
+            'private_messages': c.private,
+            'active_users': c.user_hll.count(),
+            'active_groups': c.group_hll.count(),
+            'hourly': {f'{h:02d}': n for h, n in enumerate(c.hourly) if n},
+            'top_groups': [{'group_id': k, 'message_count': n} for k, n in c.groups.top(10)],
+            'top_users': [{'user_id': k, 'message_count': n} for k, n in c.users.top(10)],
+            'top_commands': [{'command': k, 'count': n} for k, n in c.commands.top(10)],
+        }
+
+    async def seed(self, log_service):
+        """从汇总表回灌当日已入库的消息计数 (应在接入 OneBot 连接前调用, 避免重复计数)"""
+        day = self.day
+        for bot_qq in log_service.known_bots('message'):
+            try:
+                hours = await log_service.query(
+                    'message', 'SELECT hour, total, private FROM stat_hourly WHERE day = ?', (day,), bot_qq=bot_qq)
+                groups = await log_service.query(
+                    'message', 'SELECT group_id, cnt FROM stat_group_daily WHERE day = ?', (day,), bot_qq=bot_qq)
+                users = await log_service.query(
+                    'message', 'SELECT user_id, cnt FROM stat_user_daily WHERE day = ?', (day,), bot_qq=bot_qq)
+            except Exception as e:
+                log.warning(f'回灌今日统计失败 [{bot_qq}]: {e}')
+                continue
+            if not hours:
+                continue
+            c = self._bot(bot_qq)
+            for r in hours:
+                h = int(r.get('hour') or 0)
+                if 0 <= h < 24:
+                    c.hourly[h] += r.get('total', 0) or 0
+                c.messages += r.get('total', 0) or 0
+                c.private += r.get('private', 0) or 0
+            for r in groups:
+                c.groups.add(r['group_id'], r.get('cnt', 0) or 0)
+                c.group_hll.add(r['group_id'])
+            for r in users:
+                c.users.add(r['user_id'], r.get('cnt', 0) or 0)
+                c.user_hll.add(r['user_id'])
+
+
+# 全局单例
+live_stats = LiveStats()
@@ -0,0 +1,195 @@
+"""事件循环健康监视 — 调度延迟采样 + 卡顿堆栈捕获
+
+心跳协程每 interval 休眠一次, 实际唤醒时间与预期之差即调度延迟 (loop lag), 进入滑动窗口与
+Prometheus 直方图。看门狗线程定期检查心跳; 心跳停止超过 stall_ms 说明事件循环被同步代码阻塞,
+此时用 sys._current_frames() 抓取事件循环线程当前的调用栈。
+
+事件循环恢复后由心跳协程结算本次卡顿: 按调用栈中最内层的项目代码位置归并为"卡顿点",
+累计次数与耗时, 首次出现或明显超过以往最大耗时时经 report_error 写入错误日志 (同一位置限频)。
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from core.base.config import cfg
+from core.base.logger import SYSTEM, get_logger, report_error
+from core.services import metrics
+
+log = get_logger(SYSTEM, '事件循环')
+
+_WINDOW = 1200           # 滑动窗口样本数 (默认间隔下约 2 分钟)
+_MAX_OFFENDERS = 50      # 保留的卡顿点数量上限
+_REPORT_INTERVAL = 300   # 同一卡顿点两次上报的最小间隔(秒)
+_REPORT_WORSE = 1.5      # 超过已记录最大耗时的该倍数时不受间隔限制
+_STACK_LIMIT = 30        # 记录的栈帧数上限
+_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ENABLED = cfg.key('settings', 'loop_monitor.enabled', True)
+_INTERVAL_MS = cfg.key('settings', 'loop_monitor.interval_ms', 100)
+_STALL_MS = cfg.key('settings', 'loop_monitor.stall_ms', 250)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_LIB_MARKERS = (os.sep + 'site-packages' + os.sep, os.sep + 'dist-packages' + os.sep)
+
+lag_seconds = metrics.registry.histogram('elaina_loop_lag_seconds', '事件循环调度延迟', buckets=_LAG_BUCKETS)
+stalls_total = metrics.registry.counter('elaina_loop_stalls_total', '事件循环卡顿 (超过 loop_monitor.stall_ms) 次数')
+
+
+def _is_project(filename: str) -> bool:
+    return filename.startswith(_PROJECT_ROOT) and not any(m in filename for m in _LIB_MARKERS)
+
+
+def _blame(stack: traceback.StackSummary) -> str:
+    """归并键: 最内层的项目代码帧 (没有则取最内层帧), 形如 core/x.py:12 in func"""
+    frames = [f for f in stack if _is_project(f.filename)] or list(stack)
+    if not frames:
+        return '?'
+    f = frames[-1]
+    path = os.path.relpath(f.filename, _PROJECT_ROOT) if _is_project(f.filename) else os.path.basename(f.filename)
+    return f'{path.replace(os.sep, "/")}:{f.lineno} in {f.name}'
+
+
+class LoopMonitor:
+    """事件循环延迟采样与卡顿检测"""
+
+    def __init__(self):
+        self._lags = deque(maxlen=_WINDOW)  # 毫秒
+        self._task = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._loop_tid = 0
+        self._beat = 0.0       # 心跳协程最近一次运行的 monotonic 时间 (看门狗线程只读)
+        self._captured = None  # 看门狗抓到的 (心跳时间, 调用栈)
+        self._stall_count = 0
+        self._offenders = {}   # {卡顿点: 统计}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if self.running or not _ENABLED():
+            return
+        self._loop_tid = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.ensure_future(self._heartbeat())
+        self._thread = threading.Thread(target=self._watchdog, name='loop-watchdog', daemon=True)
+        self._thread.start()
+        metrics.registry.gauge_func('elaina_loop_lag_ms', '最近窗口内的事件循环调度延迟分位数(毫秒)',
+                                    self._quantiles, ('quantile',))
+        log.info(f'事件循环监视已启动 (采样间隔 {_INTERVAL_MS()}ms, 卡顿阈值 {_STALL_MS()}ms)')
+
+    def stop(self):
+        self._stop.set()
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self._thread = None
+
+    # ==================== 采样 ====================
+
+    async def _heartbeat(self):
+        while True:
+            interval = max(10, _INTERVAL_MS()) / 1000
+            t0 = time.monotonic()
+            self._beat = t0
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            lag = max(0.0, now - t0 - interval)
+            self._beat = now
+            self._lags.append(lag * 1000)
+            lag_seconds.observe(lag)
+            if lag * 1000 >= _STALL_MS():
+                self._settle(t0, lag)
+
+    def _watchdog(self):
+        """独立线程: 心跳超时即抓取事件循环线程的当前调用栈 (每次卡顿只抓一次)"""
+        while not self._stop.is_set():
+            stall_s = max(10, _STALL_MS()) / 1000
+            self._stop.wait(min(0.1, stall_s / 4))
+            beat = self._beat
+            captured = self._captured
+            if captured is not None and captured[0] == beat:
+                continue
+            if time.monotonic() - beat < stall_s + max(10, _INTERVAL_MS()) / 1000:
+                continue
+            frame = sys._current_frames().get(self._loop_tid)
+            if frame is None:
+                continue
+            try:
+                stack = traceback.extract_stack(frame, limit=_STACK_LIMIT)
+            finally:
+                del frame
+            self._captured = (beat, stack)
+
+    def _settle(self, beat: float, lag: float):
+        """事件循环恢复后结算一次卡顿 (在事件循环线程执行)"""
+        self._stall_count += 1
+        stalls_total.inc()
+        lag_ms = lag * 1000
+        captured, self._captured = self._captured, None
+        if captured is None or captured[0] != beat:
+            # 卡顿时长介于阈值与看门狗检查间隔之间, 未来得及抓栈
+            log.warning(f'事件循环卡顿 {lag_ms:.0f}ms (未捕获调用栈)')
+            return
+        stack = captured[1]
+        where = _blame(stack)
+        off = self._offenders.get(where)
+        if off is None:
+            if len(self._offenders) >= _MAX_OFFENDERS:
+                del self._offenders[min(self._offenders, key=lambda k: self._offenders[k]['total_ms'])]
+            off = self._offenders[where] = {'where': where, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                                            'last_time': '', 'stack': '', '_reported': 0.0}
+        off['count'] += 1
+        off['total_ms'] += lag_ms
+        off['last_time'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        worse = lag_ms >= off['max_ms'] * _REPORT_WORSE
+        if lag_ms > off['max_ms']:
+            off['max_ms'] = lag_ms
+            off['stack'] = ''.join(stack.format())
+        now = time.monotonic()
+        if not worse and now - off['_reported'] < _REPORT_INTERVAL:
+            return
+        off['_reported'] = now
+        report_error(
+            SYSTEM, '事件循环',
+            f'事件循环阻塞 {lag_ms:.0f}ms @ {where} (累计 {off["count"]} 次)',
+            context={'where': where, 'lag_ms': round(lag_ms, 1), 'count': off['count']},
+            tb=''.join(stack.format()),
+        )
+
+    # ==================== 查询 ====================
+
+    def _quantiles(self):
+        if not self._lags:
+            return None
+        lags = sorted(self._lags)
+        return {(q,): round(metrics.percentile(lags, float(q)), 3) for q in ('0.5', '0.95', '0.99')}
+
+    def snapshot(self, top: int = 5) -> dict:
+        lags = sorted(self._lags)
+        offenders = sorted(self._offenders.values(), key=lambda o: -o['total_ms'])[:top]
+        return {
+            'running': self.running,
+            'interval_ms': _INTERVAL_MS(),
+            'stall_ms': _STALL_MS(),
+            'samples': len(lags),
+            'p50_ms': round(metrics.percentile(lags, 0.5), 2),
+            'p95_ms': round(metrics.percentile(lags, 0.95), 2),
+            'p99_ms': round(metrics.percentile(lags, 0.99), 2),
+            'max_ms': round(lags[-1], 2) if lags else 0,
+            'stalls': self._stall_count,
+            'offenders': [
+                {k: round(v, 1) if isinstance(v, float) else v for k, v in o.items() if not k.startswith('_')}
+                for o in offenders
+            ],
+        }
+
+
+loop_monitor = LoopMonitor()
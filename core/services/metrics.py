@@ -0,0 +1,271 @@
+"""Prometheus / OpenMetrics 指标 — 无第三方依赖的最小实现, 由 GET /metrics 导出 (文本格式 0.0.4)
+
+热路径只做一次字典查找 + 整数自增: 指标在模块加载时预先创建, labels() 返回的子项按标签元组缓存,
+调用方可再把子项挂在自己的对象上 (如处理器 dict) 省掉查找。每个指标的标签组合数有上限,
+超出后归入 '_other', 插件随意调用 call_api 也不会造成标签爆炸。
+
+队列深度、连接数、线程池占用等瞬时值不在热路径维护, 由 gauge_func 在抓取时读取。
+"""
+
+import asyncio
+import time
+from bisect import bisect_left
+
+from core.base.logger import SYSTEM, get_logger
+
+log = get_logger(SYSTEM, '指标')
+
+_MAX_SERIES = 256  # 单个指标的标签组合上限
+_OTHER = '_other'
+# 秒; 覆盖 1ms 的正则匹配到 30s 的 API 超时
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+# ==================== 分位数 (各组件的滑动窗口 / 直方图统计共用) ====================
+
+def percentile(values: list, q: float) -> float:
+    """已排序样本的分位数 (取第 q·n 个样本, 无样本为 0)"""
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def bucket_quantile(bounds, counts, q: float, max_value: float) -> float:
+    """按直方图估算分位数: 返回所在桶的上界 (不超过实测最大值)
+
+    counts 比 bounds 多一格溢出桶, 落在溢出桶时返回 max_value。
+    """
+    total = sum(counts)
+    if not total:
+        return 0.0
+    rank, seen = q * total, 0
+    for i, n in enumerate(counts):
+        seen += n
+        if seen >= rank:
+            return min(bounds[i], max_value) if i < len(bounds) else max_value
+    return max_value
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _fmt(v) -> str:
+    if v == float('inf'):
+        return '+Inf'
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+def _labels_text(names, values, extra='') -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name, doc, labelnames=()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._plain = None if self.labelnames else self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """取得 (并缓存) 某组标签值对应的子项; 超过上限的新组合归入 '_other'"""
+        child = self._children.get(values)
+        if child is None:
+            if len(self._children) >= _MAX_SERIES:
+                values = (_OTHER,) * len(self.labelnames)
+                child = self._children.get(values)
+                if child is not None:
+                    return child
+            child = self._children[values] = self._new_child()
+        return child
+
+    def remove(self, *values):
+        self._children.pop(values, None)
+
+    def _series(self):
+        if self._plain is not None:
+            return [((), self._plain)]
+        return list(self._children.items())
+
+    def render(self, out: list):
+        out.append(f'# HELP {self.name} {self.doc}')
+        out.append(f'# TYPE {self.name} {self.kind}')
+        for values, child in self._series():
+            self._render_child(out, values, child)
+
+    def _render_child(self, out, values, child):
+        out.append(f'{self.name}{_labels_text(self.labelnames, values)} {_fmt(child.value)}')
+
+
+class _Value:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, n=1):
+        self.value += n
+
+    def dec(self, n=1):
+        self.value -= n
+
+    def set(self, v):
+        self.value = v
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, n=1):
+        self._plain.value += n
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, v):
+        self._plain.value = v
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, v: float):
+        self.counts[bisect_left(self.bounds, v)] += 1
+        self.sum += v
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, doc, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.bounds = tuple(buckets)
+        super().__init__(name, doc, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, v: float):
+        self._plain.observe(v)
+
+    def _render_child(self, out, values, child):
+        acc = 0
+        for bound, n in zip((*self.bounds, float('inf')), child.counts, strict=True):
+            acc += n
+            le = 'le="' + _fmt(bound) + '"'
+            out.append(f'{self.name}_bucket{_labels_text(self.labelnames, values, le)} {acc}')
+        suffix = _labels_text(self.labelnames, values)
+        out.append(f'{self.name}_sum{suffix} {_fmt(child.sum)}')
+        out.append(f'{self.name}_count{suffix} {acc}')
+
+
+class _FuncGauge(_Metric):
+    """抓取时调用 func 取值; func 返回数值, 或有标签时返回 {标签值元组: 数值}"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, doc, func, labelnames=()):
+        self._func = func
+        super().__init__(name, doc, labelnames)
+
+    def _new_child(self):
+        return None
+
+    def render(self, out: list):
+        try:
+            data = self._func()
+        except Exception as e:
+            log.debug(f'{self.name} 采集失败: {e}')
+            return
+        if data is None:
+            return
+        out.append(f'# HELP {self.name} {self.doc}')
+        out.append(f'# TYPE {self.name} gauge')
+        items = data.items() if self.labelnames else [((), data)]
+        for values, v in items:
+            out.append(f'{self.name}{_labels_text(self.labelnames, values)} {_fmt(v)}')
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def _add(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f'指标重复注册: {metric.name}')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, doc, labelnames=()) -> Counter:
+        return self._add(Counter(name, doc, labelnames))
+
+    def gauge(self, name, doc, labelnames=()) -> Gauge:
+        return self._add(Gauge(name, doc, labelnames))
+
+    def histogram(self, name, doc, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, doc, labelnames, buckets))
+
+    def gauge_func(self, name, doc, func, labelnames=()):
+        """注册 / 替换抓取时求值的 gauge (可重复调用, 便于组件重建后重新绑定)"""
+        self._metrics.pop(name, None)
+        return self._add(_FuncGauge(name, doc, func, labelnames))
+
+    def render(self) -> str:
+        out: list[str] = []
+        for m in list(self._metrics.values()):
+            m.render(out)
+        out.append('')
+        return '\n'.join(out)
+
+
+registry = Registry()
+
+# ==================== 框架指标 ====================
+
+START_TIME = time.time()
+
+events_total = registry.counter('elaina_events_total', 'OneBot 事件接收数', ('bot', 'post_type'))
+dispatch_seconds = registry.histogram('elaina_dispatch_seconds', '单个事件从进入 process_event 到分发完成的耗时', ('post_type',))
+handler_matched_total = registry.counter('elaina_handler_matched_total', '处理器命中次数', ('plugin', 'handler'))
+handler_seconds = registry.histogram('elaina_handler_seconds', '处理器执行耗时', ('plugin', 'handler'))
+handler_errors_total = registry.counter('elaina_handler_errors_total', '处理器异常 / 超时次数', ('plugin', 'handler', 'reason'))
+api_seconds = registry.histogram('elaina_api_call_seconds', 'OneBot API 调用耗时', ('action',))
+api_failures_total = registry.counter('elaina_api_failures_total', 'OneBot API 调用失败次数', ('action', 'reason'))
+log_flush_seconds = registry.histogram('elaina_log_flush_seconds', 'LogService 单次批量写入耗时')
+log_flushed_total = registry.counter('elaina_log_flushed_entries_total', 'LogService 已写入的日志条数')
+
+
+def _executor_stats():
+    """默认线程池 (asyncio.to_thread / run_in_executor(None)) 的占用情况"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    ex = getattr(loop, '_default_executor', None)
+    if ex is None:
+        return {('max_workers',): 0, ('threads',): 0, ('queued',): 0}
+    return {
+        ('max_workers',): getattr(ex, '_max_workers', 0),
+        ('threads',): len(getattr(ex, '_threads', ())),
+        ('queued',): ex._work_queue.qsize() if hasattr(ex, '_work_queue') else 0,
+    }
+
+
+registry.gauge_func('elaina_uptime_seconds', '进程运行时长', lambda: round(time.time() - START_TIME, 3))
+registry.gauge_func('elaina_executor', '默认线程池: 最大线程数 / 已启动线程数 / 排队任务数', _executor_stats, ('stat',))
+registry.gauge_func('elaina_asyncio_tasks', '事件循环中未完成的任务数', lambda: len(asyncio.all_tasks()))
@@ -0,0 +1,131 @@
+"""日志归档 — 按 类型/机器人/日期 分区导出为 Parquet (需安装 pyarrow) 或 gzip NDJSON
+
+    {archive_dir}/{log_type}/bot={bot_qq|global}/day=YYYY-MM-DD.parquet
+                                                 day=YYYY-MM-DD.ndjson.gz   (未安装 pyarrow 时)
+
+逐日、分块读取 (日志服务的 iter_find, 与存储引擎无关), 每块写出后即释放, 内存占用与库大小无关。
+分区先写临时文件再原子替换; 已存在的分区默认跳过, 重复执行是幂等的。当天数据未完整, 不归档。
+"""
+
+import asyncio
+import contextlib
+import datetime
+import gzip
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 可选依赖
+    pa = pq = None
+
+from core.base.logger import SYSTEM, get_logger
+
+log = get_logger(SYSTEM, '日志归档')
+
+LOG_TYPES = ('message', 'lifecycle', 'framework', 'error')
+PER_BOT_TYPES = ('message', 'lifecycle')  # 按机器人 QQ 分库的日志类型
+
+_CHUNK_SIZE = 5000
+_TEXT_COLUMNS = ('timestamp', 'content', 'source', 'level', 'user_id', 'group_id',
+                 'message_id', 'message_type', 'raw_data', 'extra')
+
+_SCHEMA = pa.schema(
+    [('id', pa.int64())] + [(c, pa.string()) for c in _TEXT_COLUMNS] + [('recalled', pa.int8())]
+) if pa else None
+
+_lock = asyncio.Lock()  # 面板触发与定时任务不并发导出
+
+
+def file_format() -> str:
+    return 'parquet' if pq else 'ndjson.gz'
+
+
+def partition_path(base_dir: str, log_type: str, bot_qq: str, day: str) -> str:
+    return os.path.join(base_dir, log_type, f'bot={bot_qq or "global"}', f'day={day}.{file_format()}')
+
+
+def _normalize(row: dict) -> dict:
+    out: dict[str, int | str] = {'id': int(row.get('id') or 0), 'recalled': int(row.get('recalled') or 0)}
+    for c in _TEXT_COLUMNS:
+        v = row.get(c)
+        out[c] = '' if v is None else str(v)
+    return out
+
+
+class _ParquetSink:
+    def __init__(self, path):
+        self._writer = pq.ParquetWriter(path, _SCHEMA, compression='zstd')
+
+    def write(self, rows):
+        self._writer.write_table(pa.Table.from_pylist(rows, schema=_SCHEMA))  # 每块一个 row group
+
+    def close(self):
+        self._writer.close()
+
+
+class _NdjsonSink:
+    def __init__(self, path):
+        self._f = gzip.open(path, 'wt', encoding='utf-8')  # noqa: SIM115  跨多次 write 持有, 由 close() 关闭
+
+    def write(self, rows):
+        self._f.writelines(json.dumps(r, ensure_ascii=False) + '\n' for r in rows)
+
+    def close(self):
+        self._f.close()
+
+
+async def _export_day(log_service, log_type: str, bot_qq: str, day: str, path: str) -> int:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    sink_cls: type[_ParquetSink | _NdjsonSink] = _ParquetSink if pq else _NdjsonSink
+    sink: _ParquetSink | _NdjsonSink = await asyncio.to_thread(sink_cls, tmp)
+    rows = 0
+    try:
+        async for chunk in log_service.iter_find(log_type, bot_qq, chunk_size=_CHUNK_SIZE, order='asc',
+                                                 start=day, end=f'{day} 23:59:59'):
+            await asyncio.to_thread(sink.write, [_normalize(r) for r in chunk])
+            rows += len(chunk)
+        await asyncio.to_thread(sink.close)
+    except BaseException:
+        with contextlib.suppress(Exception):
+            sink.close()
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+    if rows:
+        os.replace(tmp, path)
+    else:
+        os.remove(tmp)
+    return rows
+
+
+async def export(log_service, base_dir: str, log_types=None, bots=None, until_day: str = '',
+                 overwrite: bool = False) -> dict:
+    """导出 until_day (不含, 默认今天) 之前的完整日期分区, 返回 {format, files, rows, skipped}"""
+    until_day = until_day or datetime.date.today().isoformat()
+    summary: dict = {'format': file_format(), 'files': 0, 'rows': 0, 'skipped': 0}
+    async with _lock:
+        for log_type in log_types or LOG_TYPES:
+            if bots is not None:
+                targets = list(bots)
+            elif log_type in PER_BOT_TYPES:
+                targets = log_service.known_bots(log_type)
+            else:
+                targets = ['']
+            for bot_qq in targets:
+                if not log_service.has_db(log_type, bot_qq):
+                    continue
+                for day in await log_service.list_days(log_type, bot_qq, until_day):
+                    path = partition_path(base_dir, log_type, bot_qq, day)
+                    if os.path.exists(path) and not overwrite:
+                        summary['skipped'] += 1
+                        continue
+                    n = await _export_day(log_service, log_type, bot_qq, day, path)
+                    if n:
+                        summary['files'] += 1
+                        summary['rows'] += n
+    if summary['files']:
+        log.info(f'日志归档完成: {summary["files"]} 个分区, {summary["rows"]} 行 ({summary["format"]}) → {base_dir}')
+    return summary
@@ -0,0 +1,292 @@
+"""日志存储后端接口 — SQLite 引擎 (core/storage/log.py) 与追加写分段引擎 (core/storage/segment.py) 的共同基类
+
+写入: add / add_nowait / mark_recalled 只进内存队列, 由 _flush_loop 定期整批交给引擎的 _write_entries
+读取: web/tools 只使用下列接口, 不再直接拼 log 表 SQL
+    find / iter_find    按 时间 / 群 / 用户 / 私聊 / 关键词 / id 游标 过滤的范围查询
+    search              关键词搜索, 返回带高亮片段的行与所用模式
+    count / list_days   近似行数 / 有数据的日期
+    query               在引擎的 SQLite 统计库上执行 SQL (汇总表 stat_* 与 log_meta, 见 rollup.py)
+保留期: cleanup → 引擎的 _cleanup_sync (delete-before)
+"""
+
+import abc
+import asyncio
+import datetime
+import os
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+
+from core.base.logger import SYSTEM, get_logger
+from core.services import metrics
+from core.storage import archive
+
+log = get_logger(SYSTEM, '日志存储')
+
+ENGINES = ('sqlite', 'segment')
+
+_MAINTAIN_INTERVAL = 60  # 维护轮询间隔 (秒)
+_CLEANUP_INTERVAL = 86400  # 过期日志清理间隔 (秒)
+
+
+def log_filter(start: str = '', end: str = '', group_id: str = '', user_id: str = '', private: bool = False,
+               before_id: int = 0, after_id: int = 0, keywords=None) -> dict:
+    """范围查询条件; start / end 为含边界的时间戳前缀比较, keywords 为不区分大小写的子串 (AND)"""
+    return {
+        'start': start or '', 'end': end or '',
+        'group_id': str(group_id or ''), 'user_id': str(user_id or ''), 'private': bool(private),
+        'before_id': int(before_id or 0), 'after_id': int(after_id or 0),
+        'keywords': [k for k in (keywords or []) if k],
+    }
+
+
+def filter_sql(f: dict, alias: str = '') -> tuple:
+    """log_filter → (WHERE 子句片段列表, 参数列表), 供 SQLite 引擎使用"""
+    p = f'{alias}.' if alias else ''
+    where, params = [], []
+    if f['start']:
+        where.append(f'{p}timestamp >= ?')
+        params.append(f['start'])
+    if f['end']:
+        where.append(f'{p}timestamp <= ?')
+        params.append(f['end'])
+    if f['group_id']:
+        where.append(f'{p}group_id = ?')
+        params.append(f['group_id'])
+    elif f['private']:
+        where.append(f"{p}group_id = ''")
+    if f['user_id']:
+        where.append(f'{p}user_id = ?')
+        params.append(f['user_id'])
+    if f['before_id'] > 0:
+        where.append(f'{p}id < ?')
+        params.append(f['before_id'])
+    if f['after_id'] > 0:
+        where.append(f'{p}id > ?')
+        params.append(f['after_id'])
+    for k in f['keywords']:
+        where.append(f"{p}content LIKE ? ESCAPE '\\'")
+        params.append('%' + k.replace('\\', '\\\\').replace('%', r'\%').replace('_', r'\_') + '%')
+    return where, params
+
+
+def row_matches(row: dict, f: dict) -> bool:
+    """在 Python 侧判断单行是否满足 log_filter (分段引擎解压块后逐行过滤)"""
+    rid, ts = row.get('id', 0), row.get('timestamp', '')
+    if f['before_id'] > 0 and rid >= f['before_id']:
+        return False
+    if f['after_id'] > 0 and rid <= f['after_id']:
+        return False
+    if f['start'] and ts < f['start']:
+        return False
+    if f['end'] and ts > f['end']:
+        return False
+    gid = row.get('group_id', '')
+    if f['group_id']:
+        if gid != f['group_id']:
+            return False
+    elif f['private'] and gid:
+        return False
+    if f['user_id'] and row.get('user_id', '') != f['user_id']:
+        return False
+    if f['keywords']:
+        content = (row.get('content') or '').lower()
+        return all(k.lower() in content for k in f['keywords'])
+    return True
+
+
+class LogBackend(abc.ABC):
+    """日志服务基类 — 内存队列、定时批量写入、定期维护/清理; 存取由子类引擎实现 (缺少任一抽象方法时无法实例化)"""
+
+    engine = ''
+    _instance = None
+
+    def __init__(self, base_dir: str, insert_interval: float = 2.0, retention_days: int = 30,
+                 archive_dir: str = '', archive_before_cleanup: bool = False):
+        self._base_dir = base_dir
+        self._insert_interval = insert_interval
+        self._retention_days = retention_days
+        self._archive_dir = archive_dir or os.path.join(os.path.dirname(os.path.abspath(base_dir)), 'archive')
+        self._archive_before_cleanup = archive_before_cleanup
+        self._queues: dict[tuple[str, str], deque] = {}  # {(log_type, bot_qq): deque}
+        self._recalls: dict[tuple[str, str], set] = {}  # {(log_type, bot_qq): {message_id}}  待标记撤回, 随下一批写入提交
+        self._last_cleanup = 0.0
+        self._running = False
+        self._flush_task = None
+        self._maintain_task = None
+        LogBackend._instance = self
+
+    async def start(self):
+        os.makedirs(self._base_dir, exist_ok=True)
+        self._running = True
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        self._maintain_task = asyncio.create_task(self._maintain_loop())
+        metrics.registry.gauge_func('elaina_log_queue_depth', 'LogService 内存队列中待写入的条数', self._queue_depth, ('log_type',))
+        log.info(f'日志服务启动 [{self.engine}]: {self._base_dir}')
+
+    async def shutdown(self):
+        self._running = False
+        for task in (self._flush_task, self._maintain_task):
+            if task:
+                task.cancel()
+        await self._flush_all()
+        self._close()
+
+    # ──────────── 写入队列 ────────────
+
+    def add_nowait(self, log_type: str, entry: dict, bot_qq: str = ''):
+        """同步入队 (供同步上下文使用, 如日志 handler); 仅追加到内存队列, 不做 IO"""
+        key = (log_type, bot_qq or '')
+        if key not in self._queues:
+            self._queues[key] = deque()
+        self._queues[key].append(entry)
+
+    async def add(self, log_type: str, entry: dict, bot_qq: str = ''):
+        """异步添加日志条目到队列"""
+        self.add_nowait(log_type, entry, bot_qq)
+
+    def mark_recalled(self, message_id: str, bot_qq: str = '', log_type: str = 'message'):
+        """标记消息已撤回; 与插入共用写入队列, 下一次批量写入时一并提交"""
+        if message_id:
+            self._recalls.setdefault((log_type, bot_qq or ''), set()).add(str(message_id))
+
+    async def _flush_loop(self):
+        while self._running:
+            await asyncio.sleep(self._insert_interval)
+            await self._flush_all()
+
+    def _queue_depth(self) -> dict:
+        depth: dict[tuple, int] = {}
+        for (log_type, _bot), q in list(self._queues.items()):
+            depth[(log_type,)] = depth.get((log_type,), 0) + len(q)
+        return depth
+
+    async def _flush_all(self):
+        t0, written = time.perf_counter(), 0
+        for key in list(self._queues.keys() | self._recalls.keys()):
+            queue = self._queues.get(key)
+            entries = []
+            while queue:
+                entries.append(queue.popleft())
+            recalls = self._recalls.pop(key, None)
+            if not entries and not recalls:
+                continue
+            log_type, bot_qq = key
+            await asyncio.to_thread(self._write_entries, log_type, bot_qq, entries, recalls)
+            written += len(entries)
+        if written:
+            metrics.log_flushed_total.inc(written)
+            metrics.log_flush_seconds.observe(time.perf_counter() - t0)
+
+    # ──────────── 维护 / 保留期 ────────────
+
+    async def _maintain_loop(self):
+        while self._running:
+            await asyncio.sleep(_MAINTAIN_INTERVAL)
+            try:
+                await self._maintain()
+                if time.time() - self._last_cleanup >= _CLEANUP_INTERVAL:
+                    self._last_cleanup = time.time()
+                    await self.cleanup()
+            except Exception as e:
+                log.warning(f'日志库维护失败: {e}')
+
+    async def archive(self, log_types=None, bots=None, until_day: str = '', overwrite: bool = False) -> dict:
+        """按 机器人/日期 分区导出到归档目录 (见 core/storage/archive.py)"""
+        return await archive.export(self, self._archive_dir, log_types, bots, until_day, overwrite)
+
+    async def cleanup(self):
+        """异步清理过期日志; 开启 archive_before_cleanup 时先归档将被删除的日期, 归档失败则跳过本次清理"""
+        if self._retention_days <= 0:
+            return
+        if self._archive_before_cleanup:
+            cutoff = datetime.date.today() - datetime.timedelta(days=self._retention_days)
+            try:
+                await self.archive(until_day=(cutoff + datetime.timedelta(days=1)).isoformat())
+            except Exception as e:
+                log.warning(f'清理前归档失败, 本次跳过清理: {e}')
+                return
+        await asyncio.to_thread(self._cleanup_sync)
+
+    def _cutoff(self) -> str:
+        return (datetime.datetime.now() - datetime.timedelta(days=self._retention_days)).strftime('%Y-%m-%d %H:%M:%S')
+
+    # ──────────── 库定位 ────────────
+
+    @abc.abstractmethod
+    def _store_path(self, log_type: str, bot_qq: str = '') -> str:
+        """(log_type, bot_qq) 对应的库文件 / 目录路径"""
+
+    def has_db(self, log_type: str, bot_qq: str = '') -> bool:
+        return os.path.exists(self._store_path(log_type, bot_qq))
+
+    def known_bots(self, log_type: str = 'message') -> list:
+        """已存在该类型日志库的机器人 QQ 列表 (按 QQ 分库的子目录)"""
+        if not os.path.isdir(self._base_dir):
+            return []
+        return sorted(
+            d for d in os.listdir(self._base_dir)
+            if os.path.isdir(os.path.join(self._base_dir, d)) and self.has_db(log_type, d)
+        )
+
+    # ──────────── 引擎实现 ────────────
+
+    @abc.abstractmethod
+    def _write_entries(self, log_type: str, bot_qq: str, entries: list, recalls=None):
+        """在工作线程中写入一批条目并提交撤回标记"""
+
+    @abc.abstractmethod
+    def _cleanup_sync(self):
+        """在工作线程中删除早于 _cutoff() 的日志"""
+
+    async def _maintain(self):  # noqa: B027  可选钩子, 默认无操作
+        """每个维护周期调用一次"""
+
+    def _close(self):  # noqa: B027  可选钩子, 默认无操作
+        """关闭全部文件/连接 (shutdown 时在写队列清空后调用)"""
+
+    @abc.abstractmethod
+    async def find(self, log_type: str, bot_qq: str = '', *, limit: int = 100, offset: int = 0,
+                   order: str = 'desc', **filters) -> list:
+        """按 id 顺序 (order) 扫描, 返回满足 log_filter(**filters) 的前 limit 行 (跳过 offset 行)"""
+
+    @abc.abstractmethod
+    def iter_find(self, log_type: str, bot_qq: str = '', *, chunk_size: int = 500, limit: int = 0,
+                  order: str = 'asc', **filters) -> AsyncIterator[list]:
+        """find 的分块异步迭代版本 (导出 / 流式输出, 子类以 async 生成器实现); limit=0 不限条数, 出错时向调用方抛出"""
+
+    @abc.abstractmethod
+    async def search(self, log_type: str, bot_qq: str, terms: list, *, limit: int = 50, **filters) -> tuple:
+        """关键词搜索, 按 id 倒序; 返回 (rows, mode), 每行带已转义高亮的 snippet"""
+
+    @abc.abstractmethod
+    async def count(self, log_type: str, bot_qq: str = '') -> int:
+        """近似行数 (O(1))"""
+
+    @abc.abstractmethod
+    async def list_days(self, log_type: str, bot_qq: str = '', until_day: str = '') -> list:
+        """有数据的日期 (YYYY-MM-DD, 升序), 不含 until_day 及之后"""
+
+    @abc.abstractmethod
+    async def query(self, log_type: str, sql: str, params=None, bot_qq: str = '') -> list:
+        """在统计库上执行只读 SQL (stat_* 汇总表 / log_meta)"""
+
+    async def backup(self, log_type: str, bot_qq: str = '') -> str:
+        """可选能力: 不支持的引擎抛 NotImplementedError (面板返回 501)"""
+        raise NotImplementedError(f'{self.engine} 存储引擎不支持快照备份')
+
+    async def compact(self, log_type: str, bot_qq: str = '') -> dict:
+        raise NotImplementedError(f'{self.engine} 存储引擎不支持整理')
+
+
+def create_log_service(engine: str = 'sqlite', **kwargs) -> LogBackend:
+    """按 logging.engine 创建日志服务; 未知引擎回退 SQLite"""
+    if engine == 'segment':
+        from core.storage.segment import SegmentLogService
+
+        return SegmentLogService(**kwargs)
+    if engine != 'sqlite':
+        log.warning(f'未知的日志存储引擎 {engine!r}, 使用 sqlite')
+    from core.storage.log import LogService
+
+    return LogService(**kwargs)
@@ -0,0 +1,146 @@
+"""raw_data 压缩编码 — 原始 OneBot 事件 JSON 以 BLOB 存入 log.raw_blob
+
+编码格式: 1 字节标记 + 压缩数据
+    0x01  zlib (deflate) + 预置字典 v1
+    0x02  zstd + 同一份预置字典 (raw content 字典; 需安装 zstandard)
+过短的 JSON 压缩无收益, 仍以明文留在 raw_data 列。
+
+新写入的编码由 logging.raw_codec 显式选择 (默认 zlib), 不随环境中是否装了 zstandard 变化;
+选择 zstd 而未安装 zstandard 时拒绝启动。已写入 zstd 行的库之后必须保留 zstandard, 否则这些行无法解码。
+
+预置字典由典型 OneBot v11 事件帧拼接而成 (键名、枚举值、消息段结构、QQ 多媒体 URL 前缀),
+单条 1~3 KB 的事件也能引用字典中的公共片段。字典内容一经发布不可修改, 如需调整请新增标记字节。
+"""
+
+import zlib
+
+try:
+    import zstandard as _zstd
+except ImportError:  # 可选依赖
+    _zstd = None
+
+from core.base.logger import SYSTEM, get_logger
+
+log = get_logger(SYSTEM, '日志存储')
+
+TAG_ZLIB = 0x01
+TAG_ZSTD = 0x02
+MIN_SIZE = 96  # 小于该长度 (字节) 的 raw_data 不压缩
+
+# deflate 窗口 32KB, 越常见的片段越靠后 (距离越短编码越省)
+_DICT_V1 = (
+    '{"time": 1700000000, "self_id": 10000, "post_type": "meta_event", "meta_event_type": "heartbeat", '
+    '"status": {"online": true, "good": true}, "interval": 30000}'
+    '{"time": 1700000000, "self_id": 10000, "post_type": "meta_event", "meta_event_type": "lifecycle", '
+    '"sub_type": "connect"}'
+    '{"time": 1700000000, "self_id": 10000, "post_type": "request", "request_type": "friend", '
+    '"user_id": 10000, "comment": "", "flag": ""}'
+    '{"time": 1700000000, "self_id": 10000, "post_type": "notice", "notice_type": "group_increase", '
+    '"sub_type": "approve", "group_id": 100000, "operator_id": 10000, "user_id": 10000}'
+    '{"time": 1700000000, "self_id": 10000, "post_type": "notice", "notice_type": "group_decrease", '
+    '"sub_type": "leave", "group_id": 100000, "operator_id": 0, "user_id": 10000}'
+    '{"time": 1700000000, "self_id": 10000, "post_type": "notice", "notice_type": "group_ban", '
+    '"sub_type": "ban", "group_id": 100000, "operator_id": 10000, "user_id": 10000, "duration": 600}'
+    '{"time": 1700000000, "self_id": 10000, "post_type": "notice", "notice_type": "notify", '
+    '"sub_type": "poke", "target_id": 10000, "group_id": 100000, "user_id": 10000, "raw_info": []}'
+    '{"time": 1700000000, "self_id": 10000, "post_type": "notice", "notice_type": "friend_recall", '
+    '"user_id": 10000, "message_id": 100000}'
+    '{"time": 1700000000, "self_id": 10000, "post_type": "notice", "notice_type": "group_recall", '
+    '"group_id": 100000, "user_id": 10000, "operator_id": 10000, "message_id": 100000}'
+    '{"type": "video", "data": {"file": "", "url": "", "file_size": ""}}'
+    '{"type": "record", "data": {"file": "", "path": "", "url": "", "file_size": ""}}'
+    '{"type": "file", "data": {"file": "", "file_id": "", "file_size": ""}}'
+    '{"type": "json", "data": {"data": "{\\"app\\":\\"com.tencent.miniapp\\",\\"meta\\":{\\"detail_1\\":{'
+    '\\"appid\\":\\"\\",\\"title\\":\\"\\",\\"desc\\":\\"\\",\\"preview\\":\\"\\",\\"qqdocurl\\":\\"\\"}},'
+    '\\"prompt\\":\\"\\",\\"ver\\":\\"1.0.0.19\\",\\"view\\":\\"detail_1\\"}"}}'
+    '{"type": "forward", "data": {"id": ""}}'
+    '{"type": "mface", "data": {"summary": "", "url": "", "emoji_id": "", "emoji_package_id": 0, "key": ""}}'
+    '{"type": "face", "data": {"id": "0", "raw": {"faceIndex": 0, "faceText": "", "faceType": 1}, "resultId": null, '
+    '"chainCount": null}}'
+    '{"type": "reply", "data": {"id": "100000"}}'
+    '{"type": "at", "data": {"qq": "all", "name": ""}}{"type": "at", "data": {"qq": "10000"}}'
+    '{"type": "image", "data": {"summary": "[动画表情]", "file": ".jpg", "sub_type": 1, '
+    '"url": "https://multimedia.nt.qq.com.cn/download?appid=1407&fileid=&rkey=", "file_size": "0"}}'
+    '{"type": "image", "data": {"summary": "", "file": ".png", "sub_type": 0, '
+    '"url": "https://multimedia.nt.qq.com.cn/download?appid=1406&fileid=&rkey=", "file_size": "0"}}'
+    '{"self_id": 10000, "user_id": 10000, "time": 1700000000, "message_id": 100000, "message_seq": 100000, '
+    '"real_id": 100000, "real_seq": "100000", "message_type": "private", "sender": {"user_id": 10000, '
+    '"nickname": "", "card": ""}, "raw_message": "", "font": 14, "sub_type": "friend", '
+    '"message": [{"type": "text", "data": {"text": ""}}], "message_format": "array", "post_type": "message", '
+    '"target_id": 10000}'
+    '{"self_id": 10000, "user_id": 10000, "time": 1700000000, "message_id": 100000, "message_seq": 100000, '
+    '"real_id": 100000, "real_seq": "100000", "message_type": "group", "sender": {"user_id": 10000, '
+    '"nickname": "", "card": "", "role": "member", "title": ""}, "raw_message": "[CQ:image,file=,sub_type=0,'
+    'url=https://multimedia.nt.qq.com.cn/download?appid=1407&amp;fileid=,file_size=]", "font": 14, '
+    '"sub_type": "normal", "message": [{"type": "reply", "data": {"id": "100000"}}, {"type": "at", "data": '
+    '{"qq": "10000"}}, {"type": "text", "data": {"text": " "}}], "message_format": "array", '
+    '"post_type": "message", "group_id": 100000, "group_name": ""}'
+).encode()
+
+_zstd_cctx = _zstd_dctx = None
+if _zstd is not None:
+    try:
+        _zdict = _zstd.ZstdCompressionDict(_DICT_V1, dict_type=_zstd.DICT_TYPE_RAWCONTENT)
+        _zstd_cctx = _zstd.ZstdCompressor(level=3, dict_data=_zdict)
+        _zstd_dctx = _zstd.ZstdDecompressor(dict_data=_zdict)
+    except Exception as e:
+        log.warning(f'zstd 字典初始化失败, 回退 zlib: {e}')
+
+_warned_zstd = False
+_use_zstd = False
+
+
+def configure(name: str = 'zlib'):
+    """设置新写入使用的编码 ('zlib' / 'zstd'); zstd 不可用时抛 RuntimeError"""
+    global _use_zstd
+    name = str(name or 'zlib').lower()
+    if name not in ('zlib', 'zstd'):
+        raise ValueError(f'未知的 raw_data 编码: {name!r} (可选 zlib / zstd)')
+    if name == 'zstd' and _zstd_cctx is None:
+        raise RuntimeError('logging.raw_codec 为 zstd, 但 zstandard 未安装或初始化失败 (pip install zstandard)')
+    _use_zstd = name == 'zstd'
+
+
+def encode(raw: str):
+    """返回 (raw_data, raw_blob): 足够长的 JSON 压缩进 blob, 否则原样保留在 raw_data"""
+    if not raw:
+        return '', None
+    data = raw.encode('utf-8')
+    if len(data) < MIN_SIZE:
+        return raw, None
+    if _use_zstd and _zstd_cctx is not None:
+        return '', bytes((TAG_ZSTD,)) + _zstd_cctx.compress(data)
+    c = zlib.compressobj(6, zlib.DEFLATED, -15, zdict=_DICT_V1)
+    return '', bytes((TAG_ZLIB,)) + c.compress(data) + c.flush()
+
+
+def decode(blob) -> str:
+    """解码 raw_blob; 无法识别或缺少 zstandard 时返回空串"""
+    global _warned_zstd
+    if not blob:
+        return ''
+    tag, body = blob[0], bytes(blob[1:])
+    try:
+        if tag == TAG_ZLIB:
+            d = zlib.decompressobj(-15, zdict=_DICT_V1)
+            return (d.decompress(body) + d.flush()).decode('utf-8')
+        if tag == TAG_ZSTD:
+            if _zstd_dctx is None:
+                if not _warned_zstd:
+                    _warned_zstd = True
+                    log.error('日志库中存在 zstd 压缩的 raw_data (logging.raw_codec: zstd 写入), 但未安装 zstandard, '
+                              '这些行无法解码; 请重新安装 zstandard')
+                return ''
+            return _zstd_dctx.decompress(body).decode('utf-8')
+    except Exception as e:
+        log.warning(f'raw_data 解码失败: {e}')
+    return ''
+
+
+def decode_row(row: dict) -> dict:
+    """把查询结果中的 raw_blob 还原到 raw_data (原位修改并返回)"""
+    if 'raw_blob' in row:
+        blob = row.pop('raw_blob')
+        if blob:
+            row['raw_data'] = decode(blob)
+    return row
@@ -0,0 +1,76 @@
+"""消息全文索引 — SQLite FTS5 (trigram 分词, 适配中文无空格文本)
+
+log_fts 为 log 表的外部内容索引 (content='log'), 由触发器随 INSERT/DELETE/UPDATE
+在同一事务内维护; 首次建表时对已有数据执行一次 rebuild。
+trigram 只能匹配 ≥3 个字符的片段, 更短的关键词由调用方退化为 LIKE 查询。
+"""
+
+import html
+
+MIN_TERM_LEN = 3
+
+# snippet() 先用控制字符标记命中位置, 转义 HTML 后再替换为 <mark>, 避免消息内容注入标签
+_HL_OPEN, _HL_CLOSE = '\x02', '\x03'
+
+_TRIGGERS = (
+    'CREATE TRIGGER IF NOT EXISTS log_fts_ai AFTER INSERT ON log BEGIN '
+    'INSERT INTO log_fts (rowid, content) VALUES (new.id, new.content); END',
+    'CREATE TRIGGER IF NOT EXISTS log_fts_ad AFTER DELETE ON log BEGIN '
+    "INSERT INTO log_fts (log_fts, rowid, content) VALUES ('delete', old.id, old.content); END",
+    'CREATE TRIGGER IF NOT EXISTS log_fts_au AFTER UPDATE OF content ON log BEGIN '
+    "INSERT INTO log_fts (log_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+    'INSERT INTO log_fts (rowid, content) VALUES (new.id, new.content); END',
+)
+
+
+def ensure_schema(conn, log_type: str) -> bool:
+    """为 message 库建立全文索引; SQLite 不支持 trigram 时返回 False (调用方负责 commit)"""
+    if log_type != 'message':
+        return False
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'log_fts'").fetchone()
+    if not exists:
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE log_fts USING fts5(content, content='log', content_rowid='id', tokenize='trigram')")
+        except Exception:
+            return False
+        conn.execute("INSERT INTO log_fts (log_fts) VALUES ('rebuild')")
+    for sql in _TRIGGERS:
+        conn.execute(sql)
+    return True
+
+
+def split_terms(keyword: str) -> list:
+    return [t for t in (keyword or '').split() if t]
+
+
+def can_match(terms: list) -> bool:
+    """所有关键词都足够长时才能走 FTS 索引"""
+    return bool(terms) and all(len(t) >= MIN_TERM_LEN for t in terms)
+
+
+def match_expr(terms: list) -> str:
+    """多个关键词按 AND 组合, 每个作为短语引用 (避免 FTS 语法字符被解释)"""
+    return ' AND '.join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def snippet_sql(tokens: int = 24) -> str:
+    return f"snippet(log_fts, 0, '{_HL_OPEN}', '{_HL_CLOSE}', '…', {tokens})"
+
+
+def render_snippet(marked: str) -> str:
+    """把 snippet() 结果转义为安全 HTML, 命中片段包裹 <mark>"""
+    return html.escape(marked or '').replace(_HL_OPEN, '<mark>').replace(_HL_CLOSE, '</mark>')
+
+
+def like_snippet(content: str, terms: list, width: int = 40) -> str:
+    """LIKE 兜底查询时在 Python 侧截取并高亮首个命中位置"""
+    content = content or ''
+    low = content.lower()
+    pos = min((i for i in (low.find(t.lower()) for t in terms) if i >= 0), default=0)
+    start = max(0, pos - width // 2)
+    text = content[start:start + width * 2]
+    out = html.escape(text)
+    for t in terms:
+        out = out.replace(html.escape(t), f'<mark>{html.escape(t)}</mark>')
+    return ('…' if start else '') + out + ('…' if start + width * 2 < len(content) else '')
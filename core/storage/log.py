@@ -1,61 +1,96 @@
-"""SQLite 日志存储服务 (异步架构)"""
+"""SQLite 日志存储引擎 (异步架构) — logging.engine: sqlite (默认)"""
 
 import asyncio
+import contextlib
 import datetime
 import os
 import sqlite3
-from collections import deque
+import threading
+import time
 
 from core.base.logger import SYSTEM, get_logger
+from core.storage import codec, fts, rollup
+from core.storage.backend import LogBackend, filter_sql, log_filter
 
 log = get_logger(SYSTEM, '日志存储')
 
+_READ_POOL_SIZE = 4  # 每个库保留的只读连接数 (WAL 下读写互不阻塞, 多个查询可并行)
 
-class LogService:
-    """SQLite 日志服务 — 异步批量写入与定期清理"""
+# 维护任务
+_IDLE_SECONDS = 30  # 距上次写入超过该时长视为空闲窗口, 才做 incremental_vacuum
+_VACUUM_MIN_FREE = 256  # 空闲页少于该值不回收
+_VACUUM_STEP_PAGES = 2048  # 单次 incremental_vacuum 回收页数上限, 控制持锁时长
+_BACKUP_THROTTLE_OPS = 50000  # VACUUM INTO 每执行这么多条 VM 指令让出一次 IO
+_BACKUP_THROTTLE_SLEEP = 0.002
 
-    _instance = None
+_SEARCH_COLS = ('l.id, l.timestamp, l.content, l.source, l.user_id, l.group_id, l.message_id, '
+                'l.message_type, l.extra, l.recalled')
+
+# 保留期清理前统计将被删除的各会话消息数 (用于回减 stat_chats)
+_CHATS_BEFORE_SQL = (
+    "SELECT CASE WHEN group_id != '' THEN 'group' ELSE 'user' END AS kind, "
+    "CASE WHEN group_id != '' THEN group_id ELSE user_id END AS chat_id, COUNT(*) AS n "
+    "FROM log WHERE timestamp < ? AND (group_id != '' OR user_id != '') GROUP BY 1, 2"
+)
+
+
+class LogService(LogBackend):
+    """SQLite 日志服务 — 每个 (日志类型, 机器人) 一个库, 批量事务写入, 只读连接池并发查询"""
+
+    engine = 'sqlite'
 
     def __init__(self, base_dir: str, wal_mode: bool = True,
-                 insert_interval: float = 2.0, retention_days: int = 30):
-        self._base_dir = base_dir
+                 insert_interval: float = 2.0, retention_days: int = 30, compress_raw: bool = True,
+                 raw_codec: str = 'zlib', wal_checkpoint_mb: int = 64, backup_dir: str = '', backup_interval_hours: float = 0,
+                 backup_keep: int = 3, archive_dir: str = '', archive_before_cleanup: bool = False):
+        super().__init__(base_dir, insert_interval, retention_days, archive_dir, archive_before_cleanup)
+        self._compress_raw = compress_raw
+        if compress_raw:
+            codec.configure(raw_codec)  # zstd 不可用时在启动阶段报错, 而不是悄悄换用 zlib
+        self._wal_limit = max(int(wal_checkpoint_mb), 1) * 1024 * 1024
+        self._backup_dir = backup_dir or os.path.join(os.path.dirname(os.path.abspath(base_dir)), 'backup')
+        self._backup_interval = float(backup_interval_hours or 0) * 3600
+        self._backup_keep = max(int(backup_keep), 1)
         self._wal_mode = wal_mode
-        self._insert_interval = insert_interval
-        self._retention_days = retention_days
-        self._queues = {}  # {(log_type, bot_qq): deque}
-        self._connections = {}  # {(log_type, bot_qq): sqlite3.Connection}
-        self._lock = asyncio.Lock()
-        self._running = False
-        self._flush_task = None
-        LogService._instance = self
-
-    async def start(self):
-        os.makedirs(self._base_dir, exist_ok=True)
-        self._running = True
-        self._flush_task = asyncio.create_task(self._flush_loop())
-        log.info(f'日志服务启动: {self._base_dir}')
-
-    async def shutdown(self):
-        self._running = False
-        if self._flush_task:
-            self._flush_task.cancel()
-        await self._flush_all()
+        self._connections = {}  # {(log_type, bot_qq): sqlite3.Connection}  写连接
+        self._read_pools: dict[tuple, list[sqlite3.Connection]] = {}  # {(log_type, bot_qq): [...]}  空闲只读连接
+        self._conn_lock = threading.Lock()  # 防止多个工作线程同时为同一 key 建连/建表
+        self._write_lock = threading.Lock()  # 写连接上的事务 (批量写入 / 清理 / 维护) 互斥
+        self._backup_lock = asyncio.Lock()  # 同一时间只做一个快照
+        self._last_write: dict[tuple, float] = {}  # {(log_type, bot_qq): monotonic}
+        self._last_backup = time.time()
+
+    def _close(self):
+        for pool in self._read_pools.values():
+            while pool:
+                pool.pop().close()
+        self._read_pools.clear()
         for conn in self._connections.values():
             conn.close()
         self._connections.clear()
 
+    def _db_path(self, log_type: str, bot_qq: str = '') -> str:
+        if bot_qq:
+            return os.path.join(self._base_dir, str(bot_qq), f'{log_type}.db')
+        return os.path.join(self._base_dir, f'{log_type}.db')
+
     def _get_conn(self, log_type: str, bot_qq: str = '') -> sqlite3.Connection:
         key = (log_type, bot_qq or '')
-        if key in self._connections:
-            return self._connections[key]
-        if bot_qq:
-            db_dir = os.path.join(self._base_dir, str(bot_qq))
-            os.makedirs(db_dir, exist_ok=True)
-            db_path = os.path.join(db_dir, f'{log_type}.db')
-        else:
-            db_path = os.path.join(self._base_dir, f'{log_type}.db')
+        conn = self._connections.get(key)
+        if conn is not None:
+            return conn
+        with self._conn_lock:
+            if key in self._connections:
+                return self._connections[key]
+            return self._open_conn(key, log_type, bot_qq)
+
+    def _open_conn(self, key, log_type: str, bot_qq: str) -> sqlite3.Connection:
+        db_path = self._db_path(log_type, bot_qq)
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
         conn = sqlite3.connect(db_path, check_same_thread=False)
         conn.row_factory = sqlite3.Row
+        # 仅对新建的库生效 (须在建表前设置); 旧库需一次完整 VACUUM 才能切换, 见 compact()
+        conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
         if self._wal_mode:
             conn.execute('PRAGMA journal_mode=WAL')
         conn.execute('''
@@ -70,26 +105,29 @@ class LogService:
                 message_id TEXT DEFAULT '',
                 message_type TEXT DEFAULT '',
                 raw_data TEXT DEFAULT '',
-                extra TEXT DEFAULT ''
+                extra TEXT DEFAULT '',
+                raw_blob BLOB,
+                recalled INTEGER DEFAULT 0
             )
         ''')
+        # 旧库升级: 历史行保持明文 raw_data; 撤回标记从 extra 迁到 recalled 列
+        columns = {r[1] for r in conn.execute('PRAGMA table_info(log)')}
+        if 'raw_blob' not in columns:
+            conn.execute('ALTER TABLE log ADD COLUMN raw_blob BLOB')
+        if 'recalled' not in columns:
+            conn.execute('ALTER TABLE log ADD COLUMN recalled INTEGER DEFAULT 0')
+            conn.execute("UPDATE log SET recalled = 1 WHERE extra = 'recalled'")
         conn.execute('CREATE INDEX IF NOT EXISTS idx_log_timestamp ON log(timestamp)')
         conn.execute('CREATE INDEX IF NOT EXISTS idx_log_group ON log(group_id)')
         conn.execute('CREATE INDEX IF NOT EXISTS idx_log_user ON log(user_id, group_id)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_log_message_id ON log(message_id)')
+        rollup.ensure_schema(conn, log_type)
+        fts.ensure_schema(conn, log_type)
         conn.commit()
         self._connections[key] = conn
         return conn
 
-    def add_nowait(self, log_type: str, entry: dict, bot_qq: str = ''):
-        """同步入队 (供同步上下文使用, 如日志 handler); 仅追加到内存队列, 不做 IO"""
-        key = (log_type, bot_qq or '')
-        if key not in self._queues:
-            self._queues[key] = deque()
-        self._queues[key].append(entry)
-
-    async def add(self, log_type: str, entry: dict, bot_qq: str = ''):
-        """异步添加日志条目到队列"""
-        self.add_nowait(log_type, entry, bot_qq)
+    _store_path = _db_path
 
     async def execute(self, log_type: str, sql: str, params=None, bot_qq: str = '') -> int:
         """异步执行写操作（UPDATE/DELETE）"""
@@ -98,8 +136,9 @@ class LogService:
     def _execute_sync(self, log_type: str, sql: str, params=None, bot_qq: str = '') -> int:
         try:
             conn = self._get_conn(log_type, bot_qq)
-            cursor = conn.execute(sql, params or [])
-            conn.commit()
+            with self._write_lock:
+                cursor = conn.execute(sql, params or [])
+                conn.commit()
             return cursor.rowcount
         except Exception as e:
             log.warning(f'执行写操作失败 [{log_type}]: {e}')
@@ -109,69 +148,255 @@ class LogService:
         """异步查询日志"""
         return await asyncio.to_thread(self._query_sync, log_type, sql, params, bot_qq)
 
+    def _acquire_reader(self, log_type: str, bot_qq: str = '') -> sqlite3.Connection:
+        """从只读连接池取一个连接; 池空时新建 (先经写连接确保库文件与表结构存在)"""
+        pool = self._read_pools.get((log_type, bot_qq or ''))
+        if pool:
+            with contextlib.suppress(IndexError):
+                return pool.pop()
+        self._get_conn(log_type, bot_qq)
+        conn = sqlite3.connect(f'file:{self._db_path(log_type, bot_qq)}?mode=ro', uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _release_reader(self, log_type: str, bot_qq: str, conn: sqlite3.Connection):
+        pool = self._read_pools.setdefault((log_type, bot_qq or ''), [])
+        if self._running and len(pool) < _READ_POOL_SIZE:
+            pool.append(conn)
+        else:
+            conn.close()
+
     def _query_sync(self, log_type: str, sql: str, params=None, bot_qq: str = '') -> list:
+        conn = None
         try:
-            conn = self._get_conn(log_type, bot_qq)
+            conn = self._acquire_reader(log_type, bot_qq)
             cursor = conn.execute(sql, params or [])
             rows = cursor.fetchall()
-            return [dict(r) for r in rows]
+            return [codec.decode_row(dict(r)) for r in rows]
         except Exception as e:
             log.warning(f'查询日志失败 [{log_type}]: {e}')
             return []
+        finally:
+            if conn is not None:
+                self._release_reader(log_type, bot_qq, conn)
 
-    async def _flush_loop(self):
-        while self._running:
-            await asyncio.sleep(self._insert_interval)
-            await self._flush_all()
-
-    async def _flush_all(self):
-        for key in list(self._queues.keys()):
-            queue = self._queues.get(key)
-            if not queue:
-                continue
-            entries = []
-            while queue:
-                entries.append(queue.popleft())
-            if not entries:
-                continue
-            log_type, bot_qq = key
-            await asyncio.to_thread(self._write_entries, log_type, bot_qq, entries)
+    async def count(self, log_type: str, bot_qq: str = '') -> int:
+        """log 表近似行数 (由汇总层维护, O(1))"""
+        rows = await self.query(log_type, "SELECT value FROM log_meta WHERE key = 'row_count'", bot_qq=bot_qq)
+        return int(rows[0].get('value') or 0) if rows else 0
+
+    async def _query_chunks(self, log_type: str, sql: str, params=None, bot_qq: str = '', chunk_size: int = 500):
+        """分块异步迭代查询结果 (大结果集边取边处理, 不一次性载入内存)
+
+        与 query() 不同, 出错时向调用方抛出: 半途失败的导出/流式输出不能被当作完整结果。
+        """
+        conn = await asyncio.to_thread(self._acquire_reader, log_type, bot_qq)
+        cursor = None
+        try:
+            cursor = await asyncio.to_thread(conn.execute, sql, params or [])
+            while True:
+                rows = await asyncio.to_thread(cursor.fetchmany, chunk_size)
+                if not rows:
+                    break
+                yield [codec.decode_row(dict(r)) for r in rows]
+        except Exception as e:
+            log.warning(f'分块查询日志失败 [{log_type}]: {e}')
+            raise
+        finally:
+            if cursor is not None:
+                cursor.close()  # 提前中止时结束读事务, 以免阻塞 WAL 检查点
+            self._release_reader(log_type, bot_qq, conn)
+
+    @staticmethod
+    def _find_sql(filters: dict, order: str) -> tuple:
+        where, params = filter_sql(log_filter(**filters))
+        cond = f' WHERE {" AND ".join(where)}' if where else ''
+        return f'SELECT * FROM log{cond} ORDER BY id {"ASC" if order == "asc" else "DESC"}', params
+
+    async def find(self, log_type: str, bot_qq: str = '', *, limit: int = 100, offset: int = 0,
+                   order: str = 'desc', **filters) -> list:
+        sql, params = self._find_sql(filters, order)
+        return await self.query(log_type, f'{sql} LIMIT ? OFFSET ?', [*params, limit, offset], bot_qq=bot_qq)
+
+    async def iter_find(self, log_type: str, bot_qq: str = '', *, chunk_size: int = 500, limit: int = 0,
+                        order: str = 'asc', **filters):
+        sql, params = self._find_sql(filters, order)
+        if limit:
+            sql, params = f'{sql} LIMIT ?', [*params, limit]
+        async for chunk in self._query_chunks(log_type, sql, params, bot_qq, chunk_size):
+            yield chunk
+
+    async def search(self, log_type: str, bot_qq: str, terms: list, *, limit: int = 50, **filters) -> tuple:
+        """FTS5 trigram 索引 (见 fts.py); 有短于 3 字符的关键词时退化为 LIKE"""
+        f = log_filter(**filters)
+        has_fts = await self.query(
+            log_type, "SELECT 1 AS ok FROM sqlite_master WHERE type = 'table' AND name = 'log_fts'", bot_qq=bot_qq)
+        use_fts = fts.can_match(terms) and bool(has_fts)
+        if use_fts:
+            where, params = filter_sql(f, 'l')
+            cond = ''.join(f' AND {w}' for w in where)
+            sql = (f'SELECT {_SEARCH_COLS}, {fts.snippet_sql()} AS snip FROM log_fts JOIN log l ON l.id = log_fts.rowid '
+                   f'WHERE log_fts MATCH ?{cond} ORDER BY l.id DESC LIMIT ?')
+            params = [fts.match_expr(terms), *params, limit]
+        else:
+            where, params = filter_sql({**f, 'keywords': terms}, 'l')
+            sql = f'SELECT {_SEARCH_COLS} FROM log l WHERE {" AND ".join(where)} ORDER BY l.id DESC LIMIT ?'
+            params = [*params, limit]
+        rows = await self.query(log_type, sql, params, bot_qq=bot_qq)
+        for r in rows:
+            r['snippet'] = fts.render_snippet(r.pop('snip')) if use_fts else fts.like_snippet(r.get('content', ''), terms)
+        return rows, 'fts' if use_fts else 'like'
+
+    async def list_days(self, log_type: str, bot_qq: str = '', until_day: str = '') -> list:
+        rows = await self.query(
+            log_type, 'SELECT substr(timestamp, 1, 10) AS day FROM log WHERE timestamp < ? GROUP BY 1 ORDER BY 1',
+            (until_day or '9999',), bot_qq=bot_qq)
+        return [r['day'] for r in rows if len(r.get('day') or '') == 10]
 
-    def _write_entries(self, log_type: str, bot_qq: str, entries: list):
+    def _write_entries(self, log_type: str, bot_qq: str, entries: list, recalls=None):
+        conn = None
         try:
             conn = self._get_conn(log_type, bot_qq)
+            now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            rows = []
             for entry in entries:
-                conn.execute(
-                    '''INSERT INTO log (timestamp, content, source, level, user_id, group_id, message_id, message_type, raw_data, extra)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                    (
-                        entry.get('timestamp', datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
-                        entry.get('content', ''),
-                        entry.get('source', ''),
-                        entry.get('level', 'INFO'),
-                        entry.get('user_id', ''),
-                        entry.get('group_id', ''),
-                        entry.get('message_id', ''),
-                        entry.get('message_type', ''),
-                        entry.get('raw_data', ''),
-                        entry.get('extra', ''),
+                if not entry.get('timestamp'):
+                    entry['timestamp'] = now
+                raw, blob = entry.get('raw_data', ''), None
+                if self._compress_raw:
+                    raw, blob = codec.encode(raw)  # 压缩在持锁之外完成
+                rows.append((
+                    entry['timestamp'],
+                    entry.get('content', ''),
+                    entry.get('source', ''),
+                    entry.get('level', 'INFO'),
+                    entry.get('user_id', ''),
+                    entry.get('group_id', ''),
+                    entry.get('message_id', ''),
+                    entry.get('message_type', ''),
+                    raw,
+                    entry.get('extra', ''),
+                    blob,
+                ))
+            with self._write_lock:
+                if rows:
+                    conn.executemany(
+                        '''INSERT INTO log (timestamp, content, source, level, user_id, group_id, message_id, message_type, raw_data, extra, raw_blob)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                        rows,
                     )
-                )
-            conn.commit()
+                    # AUTOINCREMENT + 单写者: 本批 id 连续, 由序列末值反推, 供汇总表记录会话最新消息 id
+                    last_id = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'log'").fetchone()[0]
+                    for i, entry in enumerate(entries):
+                        entry['id'] = last_id - len(entries) + 1 + i
+                    rollup.apply(conn, log_type, entries)
+                if recalls:
+                    # 插入在前: 同一批里先入库的消息也能被标记
+                    conn.executemany('UPDATE log SET recalled = 1 WHERE message_id = ?', [(m,) for m in recalls])
+                conn.commit()
+            self._last_write[(log_type, bot_qq or '')] = time.monotonic()
         except Exception as e:
+            if conn is not None:
+                with contextlib.suppress(Exception):
+                    conn.rollback()  # 日志与汇总表同事务, 失败时整体回滚保持一致
             log.warning(f'写入日志失败 [{log_type}]: {e}')
 
-    async def cleanup(self):
-        """异步清理过期日志"""
-        if self._retention_days <= 0:
-            return
-        await asyncio.to_thread(self._cleanup_sync)
-
     def _cleanup_sync(self):
-        cutoff = (datetime.datetime.now() - datetime.timedelta(days=self._retention_days)).strftime('%Y-%m-%d %H:%M:%S')
-        for conn in self._connections.values():
+        cutoff = self._cutoff()
+        for (log_type, _bot), conn in list(self._connections.items()):
             try:
-                conn.execute('DELETE FROM log WHERE timestamp < ?', (cutoff,))
-                conn.commit()
-            except Exception:
-                pass
+                with self._write_lock:
+                    if log_type == 'message':
+                        chats = {(r[0], r[1]): r[2] for r in conn.execute(_CHATS_BEFORE_SQL, (cutoff,))}
+                        rollup.release_chats(conn, chats)
+                    cursor = conn.execute('DELETE FROM log WHERE timestamp < ?', (cutoff,))
+                    rollup.adjust_count(conn, -cursor.rowcount)
+                    rollup.prune(conn, log_type, cutoff)
+                    conn.commit()
+            except Exception as e:
+                with contextlib.suppress(Exception):
+                    conn.rollback()
+                log.warning(f'清理过期日志失败 [{log_type}]: {e}')
+
+    # ──────────── 维护: WAL 检查点 / 空间回收 / 快照备份 ────────────
+
+    async def _maintain(self):
+        await asyncio.to_thread(self._maintain_sync)
+        if self._backup_interval and time.time() - self._last_backup >= self._backup_interval:
+            self._last_backup = time.time()
+            for log_type, bot_qq in list(self._connections):
+                await self.backup(log_type, bot_qq)
+
+    def _maintain_sync(self):
+        """WAL 超过阈值时 TRUNCATE 检查点; 空闲窗口内按步长 incremental_vacuum 回收空闲页"""
+        now = time.monotonic()
+        for key, conn in list(self._connections.items()):
+            log_type, bot_qq = key
+            try:
+                wal = self._db_path(log_type, bot_qq) + '-wal'
+                if self._wal_mode and os.path.exists(wal) and os.path.getsize(wal) > self._wal_limit:
+                    with self._write_lock:
+                        busy, _, _ = conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()
+                    if busy:
+                        log.debug(f'WAL 检查点未完成 (有读者占用) [{log_type}/{bot_qq}]')
+                if self._queues.get(key) or now - self._last_write.get(key, 0) < _IDLE_SECONDS:
+                    continue
+                if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                    continue
+                if conn.execute('PRAGMA freelist_count').fetchone()[0] >= _VACUUM_MIN_FREE:
+                    with self._write_lock:
+                        # execute() 对无结果列的语句只 step 一次 (只回收 1 页), executescript 才会执行到底
+                        conn.executescript(f'PRAGMA incremental_vacuum({_VACUUM_STEP_PAGES});')
+            except Exception as e:
+                log.debug(f'维护日志库失败 [{log_type}/{bot_qq}]: {e}')
+
+    async def compact(self, log_type: str, bot_qq: str = '') -> dict:
+        """手动整理: 检查点 + 回收全部空闲页; 旧库 (auto_vacuum=NONE) 做一次完整 VACUUM 并切换为 INCREMENTAL
+
+        完整 VACUUM 期间写入会等待, 仅供面板手动触发。
+        """
+        return await asyncio.to_thread(self._compact_sync, log_type, bot_qq)
+
+    def _compact_sync(self, log_type: str, bot_qq: str = '') -> dict:
+        path = self._db_path(log_type, bot_qq)
+        conn = self._get_conn(log_type, bot_qq)
+        before = _file_size(path)
+        with self._write_lock:
+            if conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2:
+                conn.executescript('PRAGMA incremental_vacuum;')
+            else:
+                conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+                conn.execute('VACUUM')
+            if self._wal_mode:
+                conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()
+        return {'before': before, 'after': _file_size(path)}
+
+    async def backup(self, log_type: str, bot_qq: str = '') -> str:
+        """VACUUM INTO 生成紧凑快照 (只读连接 + 进度回调限速, 不阻塞写入), 返回快照路径"""
+        async with self._backup_lock:
+            return await asyncio.to_thread(self._backup_sync, log_type, bot_qq)
+
+    def _backup_sync(self, log_type: str, bot_qq: str = '') -> str:
+        src = self._db_path(log_type, bot_qq)
+        if not os.path.isfile(src):
+            raise FileNotFoundError(src)
+        dest_dir = os.path.join(self._backup_dir, bot_qq) if bot_qq else self._backup_dir
+        os.makedirs(dest_dir, exist_ok=True)
+        now = datetime.datetime.now()
+        dest = os.path.join(dest_dir, f'{log_type}-{now:%Y%m%d-%H%M%S}-{now.microsecond // 1000:03d}.db')
+        conn = sqlite3.connect(f'file:{src}?mode=ro', uri=True, check_same_thread=False)
+        try:
+            conn.set_progress_handler(lambda: time.sleep(_BACKUP_THROTTLE_SLEEP), _BACKUP_THROTTLE_OPS)
+            conn.execute('VACUUM INTO ?', (dest,))
+        finally:
+            conn.close()
+        snaps = sorted(f for f in os.listdir(dest_dir) if f.startswith(f'{log_type}-') and f.endswith('.db'))
+        for old in snaps[:-self._backup_keep]:
+            with contextlib.suppress(OSError):
+                os.remove(os.path.join(dest_dir, old))
+        log.info(f'日志库快照完成: {dest}')
+        return dest
+
+
+def _file_size(path: str) -> int:
+    return sum(os.path.getsize(p) for p in (path, path + '-wal') if os.path.exists(p))
@@ -0,0 +1,225 @@
+"""统计汇总表 — 随日志入库增量维护, 统计面板只读汇总表 (O(天数) 而非 O(消息数))
+
+message.db:
+    stat_hourly       (day, hour)      -> total, private
+    stat_group_daily  (day, group_id)  -> cnt
+    stat_user_daily   (day, user_id)   -> cnt
+    stat_users        (user_id)        -> last_day   (去重用户集合, 供累计用户数)
+    stat_groups       (group_id)       -> last_day
+    stat_chats        (kind, chat_id)  -> last_id, last_time, cnt   (会话列表: 最新消息 id / 时间 / 保留期内消息数)
+lifecycle.db:
+    stat_event_daily  (day, event_type) -> cnt
+所有库:
+    log_meta['row_count']              -> log 表近似行数 (分页总数用, 免去 COUNT(*) 全表扫描)
+
+汇总表与 log 表在同一事务内写入; 首次建表时从已有 log 行回填一次。
+分段引擎 (segment.py) 没有 log 表, 汇总表放在旁路 stats.db 中, 建表时不回填 (backfill=False)。
+"""
+
+from collections import Counter
+
+ROLLUP_VERSION = 2
+
+_META_SQL = 'CREATE TABLE IF NOT EXISTS log_meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID'
+
+_SCHEMA = {
+    'message': (
+        'CREATE TABLE IF NOT EXISTS stat_hourly (day TEXT, hour INTEGER, total INTEGER DEFAULT 0, '
+        'private INTEGER DEFAULT 0, PRIMARY KEY (day, hour)) WITHOUT ROWID',
+        'CREATE TABLE IF NOT EXISTS stat_group_daily (day TEXT, group_id TEXT, cnt INTEGER DEFAULT 0, '
+        'PRIMARY KEY (day, group_id)) WITHOUT ROWID',
+        'CREATE TABLE IF NOT EXISTS stat_user_daily (day TEXT, user_id TEXT, cnt INTEGER DEFAULT 0, '
+        'PRIMARY KEY (day, user_id)) WITHOUT ROWID',
+        'CREATE TABLE IF NOT EXISTS stat_users (user_id TEXT PRIMARY KEY, last_day TEXT) WITHOUT ROWID',
+        'CREATE TABLE IF NOT EXISTS stat_groups (group_id TEXT PRIMARY KEY, last_day TEXT) WITHOUT ROWID',
+        'CREATE TABLE IF NOT EXISTS stat_chats (kind TEXT, chat_id TEXT, last_id INTEGER DEFAULT 0, '
+        'last_time TEXT, cnt INTEGER DEFAULT 0, PRIMARY KEY (kind, chat_id)) WITHOUT ROWID',
+    ),
+    'lifecycle': (
+        'CREATE TABLE IF NOT EXISTS stat_event_daily (day TEXT, event_type TEXT, cnt INTEGER DEFAULT 0, '
+        'PRIMARY KEY (day, event_type)) WITHOUT ROWID',
+    ),
+}
+
+_BACKFILL = {
+    'message': (
+        "INSERT OR REPLACE INTO stat_hourly (day, hour, total, private) "
+        "SELECT substr(timestamp, 1, 10), CAST(substr(timestamp, 12, 2) AS INTEGER), COUNT(*), "
+        "COUNT(CASE WHEN group_id = '' THEN 1 END) FROM log WHERE length(timestamp) >= 13 GROUP BY 1, 2",
+        "INSERT OR REPLACE INTO stat_group_daily (day, group_id, cnt) "
+        "SELECT substr(timestamp, 1, 10), group_id, COUNT(*) FROM log "
+        "WHERE group_id != '' AND length(timestamp) >= 10 GROUP BY 1, 2",
+        "INSERT OR REPLACE INTO stat_user_daily (day, user_id, cnt) "
+        "SELECT substr(timestamp, 1, 10), user_id, COUNT(*) FROM log "
+        "WHERE user_id != '' AND length(timestamp) >= 10 GROUP BY 1, 2",
+        "INSERT OR REPLACE INTO stat_users (user_id, last_day) "
+        "SELECT user_id, MAX(day) FROM stat_user_daily GROUP BY user_id",
+        "INSERT OR REPLACE INTO stat_groups (group_id, last_day) "
+        "SELECT group_id, MAX(day) FROM stat_group_daily GROUP BY group_id",
+        "INSERT OR REPLACE INTO stat_chats (kind, chat_id, last_id, last_time, cnt) "
+        "SELECT 'group', group_id, MAX(id), MAX(timestamp), COUNT(*) FROM log WHERE group_id != '' GROUP BY group_id",
+        "INSERT OR REPLACE INTO stat_chats (kind, chat_id, last_id, last_time, cnt) "
+        "SELECT 'user', user_id, MAX(id), MAX(timestamp), COUNT(*) FROM log "
+        "WHERE group_id = '' AND user_id != '' GROUP BY user_id",
+    ),
+    'lifecycle': (
+        "INSERT OR REPLACE INTO stat_event_daily (day, event_type, cnt) "
+        "SELECT substr(timestamp, 1, 10), message_type, COUNT(*) FROM log "
+        "WHERE length(timestamp) >= 10 GROUP BY 1, 2",
+    ),
+}
+
+_PRUNE = {
+    'message': (
+        'DELETE FROM stat_hourly WHERE day < ?',
+        'DELETE FROM stat_group_daily WHERE day < ?',
+        'DELETE FROM stat_user_daily WHERE day < ?',
+        'DELETE FROM stat_users WHERE last_day < ?',
+        'DELETE FROM stat_groups WHERE last_day < ?',
+    ),
+    'lifecycle': (
+        'DELETE FROM stat_event_daily WHERE day < ?',
+    ),
+}
+
+
+def has_rollup(log_type: str) -> bool:
+    return log_type in _SCHEMA
+
+
+def ensure_schema(conn, log_type: str, backfill: bool = True):
+    """建表; 汇总表版本落后于 ROLLUP_VERSION 时从 log 表全量回填 (调用方负责 commit)
+
+    backfill=False: 同库中没有 log 表 (分段引擎的 stats.db), 只建表
+    """
+    conn.execute(_META_SQL)
+    if conn.execute("SELECT 1 FROM log_meta WHERE key = 'row_count'").fetchone() is None:
+        # 只在首次建立计数时全表计数一次, 之后由写入 / 清理增量维护
+        count_sql = "SELECT 'row_count', COUNT(*) FROM log" if backfill else "VALUES ('row_count', '0')"
+        conn.execute(f'INSERT INTO log_meta (key, value) {count_sql}')
+    if log_type not in _SCHEMA:
+        return
+    for sql in _SCHEMA[log_type]:
+        conn.execute(sql)
+    row = conn.execute("SELECT value FROM log_meta WHERE key = 'rollup_version'").fetchone()
+    if row and str(row[0]) == str(ROLLUP_VERSION):
+        return
+    for sql in _BACKFILL[log_type] if backfill else ():
+        conn.execute(sql)
+    conn.execute("INSERT OR REPLACE INTO log_meta (key, value) VALUES ('rollup_version', ?)", (str(ROLLUP_VERSION),))
+
+
+def apply(conn, log_type: str, entries: list):
+    """把一批刚插入的日志条目累加到汇总表 (与 INSERT 同一事务)"""
+    adjust_count(conn, len(entries))
+    if log_type == 'message':
+        _apply_message(conn, entries)
+    elif log_type == 'lifecycle':
+        _apply_lifecycle(conn, entries)
+
+
+def _apply_message(conn, entries):
+    hours, groups, users = Counter(), Counter(), Counter()
+    private = Counter()
+    chats = {}  # {(kind, chat_id): [last_id, last_time, cnt]}
+    for e in entries:
+        ts = e.get('timestamp') or ''
+        day = ts[:10]
+        hour = int(ts[11:13]) if ts[11:13].isdigit() else 0
+        gid, uid = e.get('group_id') or '', e.get('user_id') or ''
+        hours[(day, hour)] += 1
+        if not gid:
+            private[(day, hour)] += 1
+        else:
+            groups[(day, gid)] += 1
+        if uid:
+            users[(day, uid)] += 1
+        key = chat_key(e)
+        if key:
+            c = chats.setdefault(key, [0, '', 0])
+            c[0], c[1], c[2] = max(c[0], e.get('id') or 0), max(c[1], ts), c[2] + 1
+
+    conn.executemany(
+        'INSERT INTO stat_hourly (day, hour, total, private) VALUES (?, ?, ?, ?) '
+        'ON CONFLICT (day, hour) DO UPDATE SET total = total + excluded.total, private = private + excluded.private',
+        [(d, h, c, private.get((d, h), 0)) for (d, h), c in hours.items()],
+    )
+    if groups:
+        conn.executemany(
+            'INSERT INTO stat_group_daily (day, group_id, cnt) VALUES (?, ?, ?) '
+            'ON CONFLICT (day, group_id) DO UPDATE SET cnt = cnt + excluded.cnt',
+            [(d, g, c) for (d, g), c in groups.items()],
+        )
+        conn.executemany(
+            'INSERT INTO stat_groups (group_id, last_day) VALUES (?, ?) '
+            'ON CONFLICT (group_id) DO UPDATE SET last_day = max(last_day, excluded.last_day)',
+            [(g, d) for d, g in groups],
+        )
+    if users:
+        conn.executemany(
+            'INSERT INTO stat_user_daily (day, user_id, cnt) VALUES (?, ?, ?) '
+            'ON CONFLICT (day, user_id) DO UPDATE SET cnt = cnt + excluded.cnt',
+            [(d, u, c) for (d, u), c in users.items()],
+        )
+        conn.executemany(
+            'INSERT INTO stat_users (user_id, last_day) VALUES (?, ?) '
+            'ON CONFLICT (user_id) DO UPDATE SET last_day = max(last_day, excluded.last_day)',
+            [(u, d) for d, u in users],
+        )
+    if chats:
+        conn.executemany(
+            'INSERT INTO stat_chats (kind, chat_id, last_id, last_time, cnt) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT (kind, chat_id) DO UPDATE SET last_id = max(last_id, excluded.last_id), '
+            'last_time = max(last_time, excluded.last_time), cnt = cnt + excluded.cnt',
+            [(k, c, *v) for (k, c), v in chats.items()],
+        )
+
+
+def chat_key(entry: dict):
+    """消息所属会话 ('group', 群号) / ('user', QQ); 无法归属时返回 None"""
+    gid, uid = entry.get('group_id') or '', entry.get('user_id') or ''
+    if gid:
+        return 'group', gid
+    if uid:
+        return 'user', uid
+    return None
+
+
+def release_chats(conn, counts: dict):
+    """保留期清理时回减会话消息数 ({(kind, chat_id): n}), 清空的会话从 stat_chats 移除"""
+    if not counts:
+        return
+    conn.executemany(
+        'UPDATE stat_chats SET cnt = cnt - ? WHERE kind = ? AND chat_id = ?',
+        [(n, k, c) for (k, c), n in counts.items()],
+    )
+    conn.execute('DELETE FROM stat_chats WHERE cnt <= 0')
+
+
+def _apply_lifecycle(conn, entries):
+    events = Counter((
+        (e.get('timestamp') or '')[:10], e.get('message_type') or '') for e in entries)
+    conn.executemany(
+        'INSERT INTO stat_event_daily (day, event_type, cnt) VALUES (?, ?, ?) '
+        'ON CONFLICT (day, event_type) DO UPDATE SET cnt = cnt + excluded.cnt',
+        [(d, t, c) for (d, t), c in events.items()],
+    )
+
+
+def adjust_count(conn, delta: int):
+    """增减 log_meta 中的近似行数"""
+    if delta:
+        conn.execute(
+            "UPDATE log_meta SET value = max(CAST(value AS INTEGER) + ?, 0) WHERE key = 'row_count'", (delta,))
+
+
+def row_count(conn) -> int:
+    row = conn.execute("SELECT value FROM log_meta WHERE key = 'row_count'").fetchone()
+    return int(row[0]) if row and row[0] is not None else 0
+
+
+def prune(conn, log_type: str, cutoff: str):
+    """按保留期清理汇总表 (cutoff 为 'YYYY-MM-DD HH:MM:SS', 按天粒度比较)"""
+    day = cutoff[:10]
+    for sql in _PRUNE.get(log_type, ()):
+        conn.execute(sql, (day,))
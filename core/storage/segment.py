@@ -0,0 +1,522 @@
+"""追加写分段日志引擎 — logging.engine: segment
+
+每个 (日志类型, 机器人) 一个目录:
+
+    {base_dir}/{bot_qq}/{log_type}.seg/
+        {day}-{first_id:012d}.seg      当天追加中的分段 (每次批量写入追加一个块)
+        {day}-{first_id:012d}-s.seg    已封存的分段 (隔天由维护任务重写为大块, 之后只读)
+        *.seg.del                      已过期待删除的分段 (下个维护周期 / 关闭 / 下次打开时删除)
+        recalls.tsv                    撤回标记 (day \\t message_id), 只追加
+        stats.db                       汇总表 stat_* / log_meta (见 rollup.py), 统计面板照常 query()
+
+块格式: struct '<4sII' (MAGIC, 头长度, 体长度) + JSON 头 + zlib(JSON 行数组)
+    头 = {n, first_id, last_id, min_ts, max_ts, private, groups, users}
+    groups / users 为块内出现的群号 / QQ (超过上限记为 null, 即"不确定")
+块头常驻内存作为稀疏索引: 按 id 游标 / 时间 / 群 / 用户过滤时先用块头跳过整块, 只解压可能命中的块。
+
+写入只在文件末尾追加, 崩溃后打开时截掉不完整的尾块。保留期按整个分段删除 (即按天粒度),
+不产生碎片, 也无需 VACUUM。分段引擎没有全文索引, 关键词搜索为解压扫描。
+"""
+
+import asyncio
+import contextlib
+import datetime
+import itertools
+import json
+import os
+import sqlite3
+import struct
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from typing import BinaryIO
+
+from core.base.logger import SYSTEM, get_logger
+from core.storage import fts, rollup
+from core.storage.backend import LogBackend, log_filter, row_matches
+
+log = get_logger(SYSTEM, '日志存储')
+
+MAGIC = b'ELS1'
+_HEAD = struct.Struct('<4sII')
+
+_SEALED_BLOCK_ROWS = 4096  # 封存分段的块大小
+_INDEX_MAX_KEYS = 128  # 块头中记录的群号 / QQ 个数上限
+_BLOCK_CACHE_SIZE = 32  # 解压后块的 LRU 缓存 (翻页时相邻请求命中同一块)
+
+_COLUMNS = ('timestamp', 'content', 'source', 'level', 'user_id', 'group_id',
+            'message_id', 'message_type', 'raw_data', 'extra')
+_DEFAULTS = {'level': 'INFO'}
+_TOMBSTONE = '.del'
+
+
+def _index_keys(values):
+    keys = sorted({v for v in values if v})
+    return keys if len(keys) <= _INDEX_MAX_KEYS else None
+
+
+def _encode_block(rows: list) -> tuple:
+    """返回 (块头, 块字节)"""
+    head = {
+        'n': len(rows),
+        'first_id': rows[0]['id'], 'last_id': rows[-1]['id'],
+        'min_ts': min(r['timestamp'] for r in rows), 'max_ts': max(r['timestamp'] for r in rows),
+        'private': sum(1 for r in rows if not r['group_id']),
+        'groups': _index_keys(r['group_id'] for r in rows),
+        'users': _index_keys(r['user_id'] for r in rows),
+    }
+    hdata = json.dumps(head, separators=(',', ':')).encode()
+    body = zlib.compress(json.dumps(rows, ensure_ascii=False, separators=(',', ':')).encode(), 6)
+    return head, _HEAD.pack(MAGIC, len(hdata), len(body)) + hdata + body
+
+
+def _block_may_match(h: dict, f: dict) -> bool:
+    """按块头判断块内是否可能有满足条件的行"""
+    if f['before_id'] > 0 and h['first_id'] >= f['before_id']:
+        return False
+    if f['after_id'] > 0 and h['last_id'] <= f['after_id']:
+        return False
+    if f['start'] and h['max_ts'] < f['start']:
+        return False
+    if f['end'] and h['min_ts'] > f['end']:
+        return False
+    if f['group_id']:
+        if h['groups'] is not None and f['group_id'] not in h['groups']:
+            return False
+    elif f['private'] and not h['private']:
+        return False
+    return not (f['user_id'] and h['users'] is not None and f['user_id'] not in h['users'])
+
+
+class _Segment:
+    __slots__ = ('path', 'day', 'first_id', 'sealed', 'blocks', 'size')
+
+    def __init__(self, path: str, day: str, first_id: int, sealed: bool):
+        self.path = path
+        self.day = day
+        self.first_id = first_id
+        self.sealed = sealed
+        self.blocks: list[tuple[int, dict]] = []  # [(offset, head)]
+        self.size = 0
+
+    @property
+    def rows(self) -> int:
+        return sum(h['n'] for _, h in self.blocks)
+
+    @property
+    def max_ts(self) -> str:
+        return max((h['max_ts'] for _, h in self.blocks), default='')
+
+    def load(self):
+        """读取全部块头; 遇到不完整或损坏的尾部时截断 (未封存的分段) 并返回 False"""
+        self.blocks, pos = [], 0
+        with open(self.path, 'rb') as fp:
+            end = os.fstat(fp.fileno()).st_size
+            while pos < end:
+                try:
+                    magic, hlen, blen = _HEAD.unpack(fp.read(_HEAD.size))
+                    if magic != MAGIC or pos + _HEAD.size + hlen + blen > end:
+                        raise ValueError('块不完整')
+                    head = json.loads(fp.read(hlen))
+                except (struct.error, ValueError) as e:
+                    log.warning(f'日志分段 {os.path.basename(self.path)} 在偏移 {pos} 处损坏 ({e}), 丢弃之后的数据')
+                    break
+                self.blocks.append((pos, head))
+                pos += _HEAD.size + hlen + blen
+                fp.seek(pos)
+        self.size = pos
+        if pos < end:
+            with open(self.path, 'r+b') as fp:
+                fp.truncate(pos)
+            return False
+        return True
+
+
+class _Store:
+    """单个 (日志类型, 机器人) 的分段目录"""
+
+    def __init__(self, path: str, log_type: str):
+        self.path = path
+        self.lock = threading.Lock()  # 追加写 / 分段列表变更
+        self.stats_lock = threading.Lock()  # stats.db 连接
+        self.segments: list[_Segment] = []  # 按 first_id 升序
+        self.recalls: dict[str, str] = {}  # {message_id: day}
+        self.next_id = 1
+        self.fh: BinaryIO | None = None  # 当前追加分段的文件句柄
+        self.trash: list[str] = []  # 待删除的旧分段文件 (读者可能仍在读, 下个维护周期再删)
+
+        os.makedirs(path, exist_ok=True)
+        self.stats = sqlite3.connect(os.path.join(path, 'stats.db'), check_same_thread=False)
+        self.stats.row_factory = sqlite3.Row
+        self.stats.execute('PRAGMA journal_mode=WAL')
+        rollup.ensure_schema(self.stats, log_type, backfill=False)
+        self.stats.commit()
+
+        names = sorted(os.listdir(path))
+        for name in names:
+            full = os.path.join(path, name)
+            if name.endswith(('.tmp', _TOMBSTONE)) or (not name.endswith('-s.seg') and name[:-4] + '-s.seg' in names):
+                # 未完成的封存 / 已过期或封存后未及删除的旧分段
+                with contextlib.suppress(OSError):
+                    os.remove(full)
+                continue
+            if not name.endswith('.seg'):
+                continue
+            try:
+                seg = _Segment(full, name[:10], int(name[11:23]), name.endswith('-s.seg'))
+                seg.load()
+            except (ValueError, OSError) as e:
+                log.warning(f'跳过无法识别的日志分段 {name}: {e}')
+                continue
+            if seg.blocks:
+                self.segments.append(seg)
+        self.segments.sort(key=lambda s: s.first_id)
+
+        row = self.stats.execute("SELECT value FROM log_meta WHERE key = 'next_id'").fetchone()
+        last = max((h['last_id'] for s in self.segments for _, h in s.blocks), default=0)
+        self.next_id = max(int(row[0]) if row else 1, last + 1)
+
+        recalls_path = os.path.join(path, 'recalls.tsv')
+        if os.path.exists(recalls_path):
+            with open(recalls_path, encoding='utf-8') as fp:
+                for line in fp:
+                    day, _, mid = line.rstrip('\n').partition('\t')
+                    if mid:
+                        self.recalls[mid] = day
+
+    def append(self, day: str, rows: list):
+        """追加一个块到当天的分段 (调用方持有 lock)"""
+        seg = self.segments[-1] if self.segments else None
+        if seg is None or seg.sealed or seg.day != day:
+            self._close_fh()
+            seg = _Segment(os.path.join(self.path, f'{day}-{rows[0]["id"]:012d}.seg'), day, rows[0]['id'], False)
+            self.segments.append(seg)
+        if self.fh is None or self.fh.name != seg.path:
+            self._close_fh()
+            self.fh = open(seg.path, 'ab')  # noqa: SIM115  跨多次写入持有, 换段 / 关闭时释放
+        head, data = _encode_block(rows)
+        self.fh.write(data)
+        self.fh.flush()
+        seg.blocks.append((seg.size, head))
+        seg.size += len(data)
+
+    def add_recalls(self, day: str, message_ids):
+        new = [m for m in message_ids if m not in self.recalls]
+        if not new:
+            return
+        with open(os.path.join(self.path, 'recalls.tsv'), 'a', encoding='utf-8') as fp:
+            fp.writelines(f'{day}\t{m}\n' for m in new)
+        for m in new:
+            self.recalls[m] = day
+
+    def prune_recalls(self, day: str):
+        keep = {m: d for m, d in self.recalls.items() if d >= day}
+        if len(keep) == len(self.recalls):
+            return
+        path = os.path.join(self.path, 'recalls.tsv')
+        with open(path + '.tmp', 'w', encoding='utf-8') as fp:
+            fp.writelines(f'{d}\t{m}\n' for m, d in keep.items())
+        os.replace(path + '.tmp', path)
+        self.recalls = keep
+
+    def _close_fh(self):
+        if self.fh is not None:
+            self.fh.close()
+            self.fh = None
+
+    def close(self):
+        self._close_fh()
+        self.stats.close()
+
+
+class SegmentLogService(LogBackend):
+    """追加写分段日志服务 — 写入只做顺序追加, 过期按分段整体删除"""
+
+    engine = 'segment'
+
+    def __init__(self, base_dir: str, insert_interval: float = 2.0, retention_days: int = 30,
+                 archive_dir: str = '', archive_before_cleanup: bool = False, **_sqlite_options):
+        # wal_mode / compress_raw / raw_codec / backup_* 等为 SQLite 引擎选项, 此处忽略 (块本身已整体压缩)
+        super().__init__(base_dir, insert_interval, retention_days, archive_dir, archive_before_cleanup)
+        self._stores: dict[tuple[str, str], _Store] = {}  # {(log_type, bot_qq): _Store}
+        self._stores_lock = threading.Lock()
+        self._cache: OrderedDict[tuple[str, int], list] = OrderedDict()  # {(path, offset): rows}
+        self._cache_lock = threading.Lock()
+
+    def _store_path(self, log_type: str, bot_qq: str = '') -> str:
+        if bot_qq:
+            return os.path.join(self._base_dir, str(bot_qq), f'{log_type}.seg')
+        return os.path.join(self._base_dir, f'{log_type}.seg')
+
+    def _get_store(self, log_type: str, bot_qq: str = '') -> _Store:
+        key = (log_type, bot_qq or '')
+        store = self._stores.get(key)
+        if store is not None:
+            return store
+        with self._stores_lock:
+            if key not in self._stores:
+                self._stores[key] = _Store(self._store_path(log_type, bot_qq), log_type)
+            return self._stores[key]
+
+    def _close(self):
+        for store in self._stores.values():
+            store.close()
+            self._empty_trash(store)
+        self._stores.clear()
+
+    # ──────────── 写入 ────────────
+
+    def _write_entries(self, log_type: str, bot_qq: str, entries: list, recalls=None):
+        try:
+            store = self._get_store(log_type, bot_qq)
+            now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            with store.lock:
+                rows = []
+                for entry in entries:
+                    if not entry.get('timestamp'):
+                        entry['timestamp'] = now
+                    entry['id'] = store.next_id
+                    store.next_id += 1
+                    row = {'id': entry['id']}
+                    for c in _COLUMNS:
+                        row[c] = str(entry.get(c) or _DEFAULTS.get(c, ''))
+                    rows.append(row)
+                for day, group in itertools.groupby(rows, key=lambda r: r['timestamp'][:10]):
+                    store.append(day, list(group))
+                if recalls:
+                    store.add_recalls(now[:10], recalls)
+                with store.stats_lock:
+                    if entries:
+                        rollup.apply(store.stats, log_type, entries)
+                    store.stats.execute("INSERT OR REPLACE INTO log_meta (key, value) VALUES ('next_id', ?)",
+                                        (str(store.next_id),))
+                    store.stats.commit()
+        except Exception as e:
+            log.warning(f'写入日志失败 [{log_type}]: {e}')
+
+    # ──────────── 读取 ────────────
+
+    def _read_block(self, path: str, offset: int) -> list:
+        key = (path, offset)
+        with self._cache_lock:
+            rows = self._cache.get(key)
+            if rows is not None:
+                self._cache.move_to_end(key)
+                return rows
+        with open(path, 'rb') as fp:
+            fp.seek(offset)
+            _, hlen, blen = _HEAD.unpack(fp.read(_HEAD.size))
+            fp.seek(hlen, os.SEEK_CUR)
+            rows = json.loads(zlib.decompress(fp.read(blen)))
+        with self._cache_lock:
+            self._cache[key] = rows
+            while len(self._cache) > _BLOCK_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return rows
+
+    def _scan(self, log_type: str, bot_qq: str, f: dict, order: str):
+        """逐块产出满足条件的行 (块内已按 order 排序); 缓存中的行只读, 产出前复制"""
+        if not self.has_db(log_type, bot_qq):
+            return
+        store = self._get_store(log_type, bot_qq)
+        with store.lock:
+            blocks = [(seg.path, off, h) for seg in store.segments for off, h in seg.blocks]
+        recalls = store.recalls
+        if order != 'asc':
+            blocks.reverse()
+        for path, off, h in blocks:
+            if not _block_may_match(h, f):
+                continue
+            try:
+                rows = self._read_block(path, off)
+            except FileNotFoundError:
+                continue  # 取快照后该分段已过期删除
+            matched = []
+            for r in (rows if order == 'asc' else reversed(rows)):
+                if row_matches(r, f):
+                    matched.append({**r, 'recalled': 1 if r['message_id'] in recalls else 0})
+            if matched:
+                yield matched
+
+    def _find_sync(self, log_type: str, bot_qq: str, f: dict, limit: int, offset: int, order: str) -> list:
+        out: list[dict] = []
+        try:
+            for rows in self._scan(log_type, bot_qq, f, order):
+                if offset >= len(rows):
+                    offset -= len(rows)
+                    continue
+                out.extend(rows[offset:offset + limit - len(out)])
+                offset = 0
+                if len(out) >= limit:
+                    break
+        except Exception as e:
+            log.warning(f'查询日志失败 [{log_type}]: {e}')
+        return out
+
+    async def find(self, log_type: str, bot_qq: str = '', *, limit: int = 100, offset: int = 0,
+                   order: str = 'desc', **filters) -> list:
+        return await asyncio.to_thread(self._find_sync, log_type, bot_qq, log_filter(**filters),
+                                       limit, max(offset, 0), order)
+
+    async def iter_find(self, log_type: str, bot_qq: str = '', *, chunk_size: int = 500, limit: int = 0,
+                        order: str = 'asc', **filters):
+        scan = self._scan(log_type, bot_qq, log_filter(**filters), order)
+        buf, total = [], 0
+        try:
+            while True:
+                rows = await asyncio.to_thread(next, scan, None)
+                if rows is None:
+                    break
+                if limit:
+                    rows = rows[:limit - total]
+                buf.extend(rows)
+                total += len(rows)
+                while len(buf) >= chunk_size:
+                    yield buf[:chunk_size]
+                    buf = buf[chunk_size:]
+                if limit and total >= limit:
+                    break
+            if buf:
+                yield buf
+        except Exception as e:
+            log.warning(f'分块查询日志失败 [{log_type}]: {e}')
+            raise
+        finally:
+            scan.close()
+
+    async def search(self, log_type: str, bot_qq: str, terms: list, *, limit: int = 50, **filters) -> tuple:
+        rows = await self.find(log_type, bot_qq, limit=limit, **{**filters, 'keywords': terms})
+        for r in rows:
+            r.pop('raw_data', None)
+            r['snippet'] = fts.like_snippet(r.get('content', ''), terms)
+        return rows, 'scan'
+
+    async def count(self, log_type: str, bot_qq: str = '') -> int:
+        return await asyncio.to_thread(self._count_sync, log_type, bot_qq)
+
+    def _count_sync(self, log_type: str, bot_qq: str) -> int:
+        # 首次访问时打开分段目录 (读取全部块头), 且可能等待写入线程释放 lock, 故在线程池执行
+        if not self.has_db(log_type, bot_qq):
+            return 0
+        store = self._get_store(log_type, bot_qq)
+        with store.lock:
+            return sum(seg.rows for seg in store.segments)
+
+    async def list_days(self, log_type: str, bot_qq: str = '', until_day: str = '') -> list:
+        return await asyncio.to_thread(self._list_days_sync, log_type, bot_qq, until_day)
+
+    def _list_days_sync(self, log_type: str, bot_qq: str, until_day: str) -> list:
+        if not self.has_db(log_type, bot_qq):
+            return []
+        store = self._get_store(log_type, bot_qq)
+        with store.lock:
+            days = {seg.day for seg in store.segments}
+        return sorted(d for d in days if not until_day or d < until_day)
+
+    async def query(self, log_type: str, sql: str, params=None, bot_qq: str = '') -> list:
+        return await asyncio.to_thread(self._query_sync, log_type, sql, params, bot_qq)
+
+    def _query_sync(self, log_type: str, sql: str, params=None, bot_qq: str = '') -> list:
+        try:
+            store = self._get_store(log_type, bot_qq)
+            with store.stats_lock:
+                return [dict(r) for r in store.stats.execute(sql, params or []).fetchall()]
+        except Exception as e:
+            log.warning(f'查询日志统计失败 [{log_type}]: {e}')
+            return []
+
+    # ──────────── 保留期 / 封存 ────────────
+
+    def _cleanup_sync(self):
+        cutoff = self._cutoff()
+        for (log_type, _bot), store in list(self._stores.items()):
+            try:
+                with store.lock:
+                    expired = [s for s in store.segments if s.max_ts < cutoff and s is not store.segments[-1]]
+                    if not expired:
+                        continue
+                    chats, removed = Counter(), 0
+                    for seg in expired:
+                        removed += seg.rows
+                        if log_type == 'message':
+                            for off, _h in seg.blocks:
+                                chats.update(filter(None, map(rollup.chat_key, self._read_block(seg.path, off))))
+                    # 先改名为墓碑再从内存移除: 之后即使未等到删除就重启, 打开时也不会当作有效分段重新载入
+                    store.trash.extend(self._tombstone(s.path) for s in expired)
+                    store.segments = [s for s in store.segments if s not in expired]
+                    store.prune_recalls(cutoff[:10])
+                with store.stats_lock:
+                    rollup.release_chats(store.stats, chats)
+                    rollup.adjust_count(store.stats, -removed)
+                    rollup.prune(store.stats, log_type, cutoff)
+                    store.stats.commit()
+            except Exception as e:
+                log.warning(f'清理过期日志失败 [{log_type}]: {e}')
+
+    async def _maintain(self):
+        await asyncio.to_thread(self._maintain_sync)
+
+    def _maintain_sync(self):
+        today = datetime.date.today().isoformat()
+        for store in list(self._stores.values()):
+            self._empty_trash(store)
+            with store.lock:
+                pending = [s for s in store.segments if not s.sealed and s.day < today]
+                for seg in pending:
+                    seg.sealed = True  # 之后的写入 (含迟到的同日数据) 另起新分段
+                    if store.fh is not None and store.fh.name == seg.path:
+                        store._close_fh()
+            for seg in pending:
+                try:
+                    self._seal(store, seg)
+                except Exception as e:
+                    log.warning(f'封存日志分段失败 {os.path.basename(seg.path)}: {e}')
+
+    def _seal(self, store: _Store, seg: _Segment):
+        """把追加期产生的小块流式重写为大块; 新文件就位后旧文件进入待删除列表"""
+        dest = seg.path[:-len('.seg')] + '-s.seg'
+        tmp = dest + '.tmp'
+        with open(tmp, 'wb') as out:
+            buf = []
+            for off, _h in seg.blocks:
+                buf.extend(self._read_block(seg.path, off))
+                while len(buf) >= _SEALED_BLOCK_ROWS:
+                    out.write(_encode_block(buf[:_SEALED_BLOCK_ROWS])[1])
+                    buf = buf[_SEALED_BLOCK_ROWS:]
+            if buf:
+                out.write(_encode_block(buf)[1])
+        os.replace(tmp, dest)
+        sealed = _Segment(dest, seg.day, seg.first_id, True)
+        sealed.load()
+        with store.lock:
+            store.segments = [sealed if s is seg else s for s in store.segments]
+            store.trash.append(seg.path)
+        log.info(f'日志分段已封存: {os.path.basename(dest)} ({sealed.rows} 行, {len(seg.blocks)} → {len(sealed.blocks)} 块)')
+
+    def _tombstone(self, path: str) -> str:
+        """过期分段改名为 *.del 并返回新路径; 改名失败 (Windows 下被占用) 时返回原路径, 由维护周期重试删除"""
+        with self._cache_lock:
+            for key in [k for k in self._cache if k[0] == path]:
+                del self._cache[key]
+        try:
+            os.replace(path, path + _TOMBSTONE)
+            return path + _TOMBSTONE
+        except OSError as e:
+            log.warning(f'标记过期日志分段失败 {os.path.basename(path)}: {e}')
+            return path
+
+    def _empty_trash(self, store: _Store):
+        left = []
+        for path in store.trash:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                left.append(path)  # Windows 下仍被打开的文件删不掉, 下个周期重试
+        removed = set(store.trash) - set(left)
+        store.trash = left
+        if removed:
+            with self._cache_lock:
+                for key in [k for k in self._cache if k[0] in removed]:
+                    del self._cache[key]
@@ -58,6 +58,8 @@ def get_routes() -> list:
         web.post('/api/plugins/reload', _(plugin_mgr.handle_reload_plugin)),
         web.post('/api/plugins/config-files', _(plugin_mgr.handle_plugin_config_files)),
         web.get('/api/plugins/bots', _(plugin_mgr.handle_get_plugin_bots)),
+        web.post('/api/plugins/profile', _(plugin_mgr.handle_profile_plugin)),
+        web.get('/api/plugins/profile/report', _(plugin_mgr.handle_profile_report)),
         web.post('/api/plugins/bots', _(plugin_mgr.handle_set_plugin_bots)),
         # ── 模块管理 ──
         web.get('/api/modules/scan', _(plugin_mgr.handle_scan_modules)),
@@ -75,6 +77,7 @@ def get_routes() -> list:
         # ── 消息 ──
         web.post('/api/message/chats', _(messages.handle_get_chats)),
         web.post('/api/message/history', _(messages.handle_get_chat_history)),
+        web.post('/api/message/search', _(messages.handle_search_messages)),
         web.post('/api/message/send', _(messages.handle_send_message)),
         web.post('/api/message/nickname', _(messages.handle_get_nickname)),
         web.post('/api/message/nicknames', _(messages.handle_get_nicknames_batch)),
@@ -129,6 +132,9 @@ def get_routes() -> list:
         web.post('/api/database/query', _(database.handle_query_table)),
         web.post('/api/database/sql', _(database.handle_execute_sql)),
         web.post('/api/database/delete', _(database.handle_delete_rows)),
+        web.post('/api/database/backup', _(database.handle_backup_database)),
+        web.post('/api/database/compact', _(database.handle_compact_database)),
+        web.post('/api/database/archive', _(database.handle_archive_logs)),
         # ── WebSocket / SSE ──
         web.get('/ws/panel', panel_ws.handle_ws),
         web.get('/api/sse/panel', panel_ws.handle_sse),
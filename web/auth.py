@@ -1,10 +1,18 @@
-"""会话管理与鉴权"""
+"""会话管理与鉴权
+
+会话与 IP 记录常驻内存, 鉴权只做一次字典查找 + 单调时钟比较; 过期由按截止时间排序的小顶堆
+摊还清理 (堆顶未到期时 O(1))。修改只置脏标记, 同一窗口内的多次修改合并为一次后台原子写盘,
+关闭时 flush() 落盘。
+"""
 
 import asyncio
 import base64
+import contextlib
 import hashlib
+import heapq
 import hmac
 import json
+import logging
 import os
 import threading
 import time
@@ -13,26 +21,34 @@ from datetime import datetime, timedelta
 
 from aiohttp import web
 
+from core.base import yaml_io
+
+log = logging.getLogger('ElainaBot.web.auth')
+
 _COOKIE_SECRET = ''
 _BAN_DURATION = 43200
-_SESSION_CLEANUP_INTERVAL = 300
-_IP_CLEANUP_INTERVAL = 3600
 _FAIL_WINDOW = 86400
 _MAX_SESSIONS = 10
 _MAX_FAIL_COUNT = 5
 _SESSION_DAYS = 7
 _TOKEN_EXPIRY = 86400 * 7
 _MAX_IP_RECORDS = 10000
+_FLUSH_DELAY = 2.0  # 写回合并窗口 (秒)
 
-valid_sessions: dict = {}
+valid_sessions: dict = {}  # {token: {'created', 'expires', 'ip', 'deadline'(monotonic)}}
 ip_access_data: dict = {}
-_last_session_cleanup = 0
-_last_ip_cleanup = 0
+_session_heap: list = []  # [(monotonic 截止, token)], 惰性删除: 出堆时与 valid_sessions 中的 deadline 比对
+_ban_heap: list = []      # [(monotonic 截止, ip)]
+_ban_deadline: dict = {}  # {ip: monotonic 截止}, 无 ban_time 的永久封禁不在其中
+_dirty: set = set()       # 待写回的文件: {'ip', 'sessions'}
+_flush_handle = None
+_generation = 0           # 快照序号, 防止较旧的快照覆盖较新的
+_written: dict = {}       # {path: 已写入的快照序号}
 _data_dir = ''
 _ip_file = ''
 _session_file = ''
 _secret_file = ''
-_io_lock = threading.Lock()  # 串行化文件写入, 避免内容交错损坏
+_io_lock = threading.Lock()  # 串行化文件写入
 
 
 def init(base_dir: str):
@@ -97,7 +113,7 @@ def is_hashed(stored: str) -> bool:
     return stored.startswith(_PWD_HASH_PREFIX)
 
 
-# ==================== JSON IO ====================
+# ==================== 持久化 (write-behind) ====================
 
 
 def _read_json(path, default=None):
@@ -110,39 +126,139 @@ def _read_json(path, default=None):
     return default or {}
 
 
-def _write_text_sync(path, text):
-    """同步写入文本 (在 executor 中调用)"""
-    with _io_lock:
+def _snapshot(kind) -> tuple:
+    """在事件循环线程中序列化 (保证一致性), 返回 (路径, 文本)"""
+    if kind == 'ip':
+        return _ip_file, json.dumps(ip_access_data, ensure_ascii=False, indent=2, default=str)
+    data = {
+        t: {'created': info['created'].isoformat(), 'expires': info['expires'].isoformat(), 'ip': info.get('ip', '')}
+        for t, info in valid_sessions.items()
+    }
+    return _session_file, json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def _take_dirty() -> list:
+    global _generation
+    jobs = []
+    for kind in sorted(_dirty):
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(text)
-        except Exception:
-            pass
+            path, text = _snapshot(kind)
+        except Exception as e:
+            log.warning(f'序列化 {kind} 失败: {e}')
+            continue
+        _generation += 1
+        jobs.append((path, text, _generation))
+    _dirty.clear()
+    return jobs
+
+
+def _write_jobs(jobs):
+    """写盘 (在 executor 中调用); 同一文件只保留最新快照"""
+    with _io_lock:
+        for path, text, gen in jobs:
+            if not path or gen <= _written.get(path, 0):
+                continue
+            try:
+                yaml_io.write_text(path, text)
+                _written[path] = gen
+            except Exception as e:
+                log.warning(f'写入 {os.path.basename(path)} 失败: {e}')
 
 
-def _write_json(path, data):
-    """异步友好的 JSON 写入: 主线程序列化 (一致性), executor 写盘 (不阻塞 loop)"""
-    try:
-        text = json.dumps(data, ensure_ascii=False, indent=2, default=str)
-    except Exception:
+def _flush_later():
+    global _flush_handle
+    _flush_handle = None
+    jobs = _take_dirty()
+    if jobs:
+        asyncio.get_running_loop().run_in_executor(None, _write_jobs, jobs)
+
+
+def _mark_dirty(kind):
+    """标记待写回; 窗口内的多次修改合并为一次写盘"""
+    global _flush_handle
+    _dirty.add(kind)
+    if _flush_handle is not None:
         return
     try:
         loop = asyncio.get_running_loop()
-        loop.run_in_executor(None, _write_text_sync, path, text)
     except RuntimeError:
-        _write_text_sync(path, text)
+        flush()
+        return
+    _flush_handle = loop.call_later(_FLUSH_DELAY, _flush_later)
+
+
+def flush():
+    """立即同步写回所有待写数据 (关闭时调用)"""
+    global _flush_handle
+    if _flush_handle is not None:
+        _flush_handle.cancel()
+        _flush_handle = None
+    jobs = _take_dirty()
+    if jobs:
+        _write_jobs(jobs)
+
+
+async def on_cleanup(app):
+    """aiohttp on_cleanup 回调: 关闭前落盘"""
+    flush()
 
 
 # ==================== IP ====================
 
 
+def _mono_deadline(dt: datetime) -> float:
+    """墙上时间截止点 → monotonic 截止点 (仅在加载 / 建立时换算一次)"""
+    return time.monotonic() + (dt - datetime.now()).total_seconds()
+
+
+def _ban(ip, deadline):
+    _ban_deadline[ip] = deadline
+    heapq.heappush(_ban_heap, (deadline, ip))
+
+
+def _reset_ban(d):
+    d['is_banned'] = False
+    d['ban_time'] = None
+    d['fail_times'] = []
+
+
 def _load_ip_data():
     global ip_access_data
     ip_access_data = _read_json(_ip_file, {})
-
-
-def _save_ip_data():
-    _write_json(_ip_file, ip_access_data)
+    _ban_deadline.clear()
+    _ban_heap.clear()
+    for ip, d in ip_access_data.items():
+        if d.get('is_banned') and d.get('ban_time'):
+            with contextlib.suppress(Exception):
+                _ban(ip, _mono_deadline(datetime.fromisoformat(d['ban_time']) + timedelta(seconds=_BAN_DURATION)))
+
+
+def _expire_bans():
+    """解除到期封禁; 堆顶未到期时 O(1)"""
+    now = time.monotonic()
+    changed = False
+    while _ban_heap and _ban_heap[0][0] <= now:
+        deadline, ip = heapq.heappop(_ban_heap)
+        if _ban_deadline.get(ip) != deadline:
+            continue  # 已手动解封 / 重新封禁
+        del _ban_deadline[ip]
+        d = ip_access_data.get(ip)
+        if d:
+            _reset_ban(d)
+            changed = True
+    if changed:
+        _mark_dirty('ip')
+
+
+def _trim_ip_records():
+    """超限时淘汰最旧的无封禁记录, 一次多淘汰 10% 以摊还排序开销"""
+    keep = _MAX_IP_RECORDS * 9 // 10
+    unbanned = sorted(
+        ((k, v) for k, v in ip_access_data.items() if not v.get('is_banned')),
+        key=lambda x: x[1].get('last_access', ''),
+    )
+    for k, _ in unbanned[: len(ip_access_data) - keep]:
+        del ip_access_data[k]
 
 
 def get_real_ip(request: web.Request) -> str:
@@ -158,9 +274,23 @@ def get_real_ip(request: web.Request) -> str:
     return peername[0] if peername else '127.0.0.1'
 
 
+def _recent_fails(d, now: datetime) -> list:
+    out = []
+    for t in d.get('fail_times', []):
+        try:
+            if (now - datetime.fromisoformat(t)).total_seconds() < _FAIL_WINDOW:
+                out.append(t)
+        except Exception:
+            pass
+    return out
+
+
 def record_ip_access(ip, access_type='success'):
-    now_iso = datetime.now().isoformat()
+    now = datetime.now()
+    now_iso = now.isoformat()
     if ip not in ip_access_data:
+        if len(ip_access_data) >= _MAX_IP_RECORDS:
+            _trim_ip_records()  # 先淘汰再插入, 新记录不会被本次淘汰掉
         ip_access_data[ip] = {
             'first_access': now_iso,
             'last_access': now_iso,
@@ -173,32 +303,18 @@ def record_ip_access(ip, access_type='success'):
     d['last_access'] = now_iso
     if access_type == 'fail':
         d['fail_count'] = d.get('fail_count', 0) + 1
-        d.setdefault('fail_times', []).append(now_iso)
-        now = datetime.now()
-        d['fail_times'] = [t for t in d['fail_times'] if (now - datetime.fromisoformat(t)).total_seconds() < _FAIL_WINDOW]
+        d['fail_times'] = _recent_fails(d, now) + [now_iso]
         if len(d['fail_times']) >= _MAX_FAIL_COUNT:
             d['is_banned'] = True
             d['ban_time'] = now_iso
-    _save_ip_data()
+            _ban(ip, time.monotonic() + _BAN_DURATION)
+    _mark_dirty('ip')
 
 
 def is_ip_banned(ip) -> bool:
+    _expire_bans()
     d = ip_access_data.get(ip)
-    if not d or not d.get('is_banned'):
-        return False
-    ban_time = d.get('ban_time')
-    if not ban_time:
-        return True
-    try:
-        if (datetime.now() - datetime.fromisoformat(ban_time)).total_seconds() >= _BAN_DURATION:
-            d['is_banned'] = False
-            d['ban_time'] = None
-            d['fail_times'] = []
-            _save_ip_data()
-            return False
-        return True
-    except Exception:
-        return True
+    return bool(d and d.get('is_banned'))
 
 
 def get_remaining_attempts(ip) -> int:
@@ -206,36 +322,12 @@ def get_remaining_attempts(ip) -> int:
     d = ip_access_data.get(ip)
     if not d:
         return _MAX_FAIL_COUNT
-    now = datetime.now()
-    recent = [t for t in d.get('fail_times', []) if (now - datetime.fromisoformat(t)).total_seconds() < _FAIL_WINDOW]
-    return max(0, _MAX_FAIL_COUNT - len(recent))
+    return max(0, _MAX_FAIL_COUNT - len(_recent_fails(d, datetime.now())))
 
 
 def cleanup_expired_ip_bans():
-    global _last_ip_cleanup
-    now = time.time()
-    if now - _last_ip_cleanup < _IP_CLEANUP_INTERVAL:
-        return
-    _last_ip_cleanup = now
-    now_dt = datetime.now()
-    for _ip, d in list(ip_access_data.items()):
-        if d.get('is_banned') and d.get('ban_time'):
-            try:
-                if (now_dt - datetime.fromisoformat(d['ban_time'])).total_seconds() >= _BAN_DURATION:
-                    d['is_banned'] = False
-                    d['ban_time'] = None
-                    d['fail_times'] = []
-            except Exception:
-                pass
-    # 超限时淘汰最旧的无封禁记录
-    if len(ip_access_data) > _MAX_IP_RECORDS:
-        unbanned = sorted(
-            ((k, v) for k, v in ip_access_data.items() if not v.get('is_banned')),
-            key=lambda x: x[1].get('last_access', ''),
-        )
-        for k, _ in unbanned[: len(ip_access_data) - _MAX_IP_RECORDS]:
-            del ip_access_data[k]
-    _save_ip_data()
+    """解除到期封禁 (保留旧接口, 由堆驱动, 可随时调用)"""
+    _expire_bans()
 
 
 # ==================== Token ====================
@@ -262,8 +354,15 @@ def _verify_sig(signed) -> tuple:
 # ==================== Session ====================
 
 
+def _add_session(token, info):
+    info['deadline'] = _mono_deadline(info['expires'])
+    valid_sessions[token] = info
+    heapq.heappush(_session_heap, (info['deadline'], token))
+
+
 def _load_session_data():
-    global valid_sessions
+    valid_sessions.clear()
+    _session_heap.clear()
     raw = _read_json(_session_file, {})
     now = datetime.now()
     for token, info in raw.items():
@@ -271,59 +370,50 @@ def _load_session_data():
             info['created'] = datetime.fromisoformat(info['created'])
             info['expires'] = datetime.fromisoformat(info['expires'])
             if now < info['expires']:
-                valid_sessions[token] = info
+                _add_session(token, info)
         except Exception:
             pass
 
 
-def _save_session_data():
-    data = {}
-    for t, info in valid_sessions.items():
-        data[t] = {
-            'created': info['created'].isoformat(),
-            'expires': info['expires'].isoformat(),
-            'ip': info.get('ip', ''),
-        }
-    _write_json(_session_file, data)
-
-
-def _cleanup_sessions():
-    global _last_session_cleanup
-    now_t = time.time()
-    if now_t - _last_session_cleanup < _SESSION_CLEANUP_INTERVAL:
-        return
-    _last_session_cleanup = now_t
-    now = datetime.now()
-    expired = [t for t, info in valid_sessions.items() if now >= info['expires']]
-    for t in expired:
-        del valid_sessions[t]
-    if expired:
-        _save_session_data()
+def _expire_sessions():
+    """弹出到期会话; 堆顶未到期时 O(1)"""
+    now = time.monotonic()
+    changed = False
+    while _session_heap and _session_heap[0][0] <= now:
+        deadline, token = heapq.heappop(_session_heap)
+        info = valid_sessions.get(token)
+        if info is not None and info['deadline'] == deadline:
+            del valid_sessions[token]
+            changed = True
+    if changed:
+        _mark_dirty('sessions')
 
 
 def create_session(request: web.Request) -> str:
     """创建会话并返回 bearer token"""
-    _cleanup_sessions()
-    if len(valid_sessions) > _MAX_SESSIONS:
+    _expire_sessions()
+    if len(valid_sessions) >= _MAX_SESSIONS:
         oldest = sorted(valid_sessions, key=lambda t: valid_sessions[t]['created'])
-        for t in oldest[: len(valid_sessions) - _MAX_SESSIONS]:
+        for t in oldest[: len(valid_sessions) - _MAX_SESSIONS + 1]:
             valid_sessions.pop(t)
+        # 被挤掉的会话在堆中留有失效项, 过多时重建
+        if len(_session_heap) > 4 * _MAX_SESSIONS:
+            _session_heap[:] = [(info['deadline'], t) for t, info in valid_sessions.items()]
+            heapq.heapify(_session_heap)
 
-    ip = get_real_ip(request)
     now = datetime.now()
     token = _generate_token()
-    valid_sessions[token] = {
+    _add_session(token, {
         'created': now,
         'expires': now + timedelta(days=_SESSION_DAYS),
-        'ip': ip,
-    }
-    _save_session_data()
+        'ip': get_real_ip(request),
+    })
+    _mark_dirty('sessions')
     return token
 
 
 def validate_token(request: web.Request) -> bool:
     """验证 Authorization: Bearer <token> 或 ?token= 查询参数"""
-    _cleanup_sessions()
     # 优先从 Authorization 头获取
     token = ''
     auth_header = request.headers.get('Authorization', '')
@@ -332,12 +422,12 @@ def validate_token(request: web.Request) -> bool:
     # 回退: 从 query 参数获取 (iframe/导航请求无法带 header)
     if not token:
         token = request.query.get('token', '')
-    if not token or token not in valid_sessions:
+    info = valid_sessions.get(token) if token else None
+    if info is None:
         return False
-    info = valid_sessions[token]
-    if datetime.now() >= info['expires']:
+    if time.monotonic() >= info['deadline']:
         valid_sessions.pop(token, None)
-        _save_session_data()
+        _mark_dirty('sessions')
         return False
     return True
 
@@ -362,39 +452,36 @@ def require_auth(handler):
 
 
 def get_login_logs() -> list:
-    raw = _read_json(_ip_file, {})
-    logs = []
-    for ip, d in raw.items():
-        logs.append(
-            {
-                'ip': ip,
-                'first_access': d.get('first_access', ''),
-                'last_access': d.get('last_access', ''),
-                'fail_count': d.get('fail_count', 0),
-                'is_banned': d.get('is_banned', False),
-                'ban_time': d.get('ban_time', ''),
-            }
-        )
+    _expire_bans()
+    logs = [
+        {
+            'ip': ip,
+            'first_access': d.get('first_access', ''),
+            'last_access': d.get('last_access', ''),
+            'fail_count': d.get('fail_count', 0),
+            'is_banned': d.get('is_banned', False),
+            'ban_time': d.get('ban_time', ''),
+        }
+        for ip, d in ip_access_data.items()
+    ]
     logs.sort(key=lambda x: x['last_access'] or '', reverse=True)
     return logs
 
 
 def unban_ip(ip) -> bool:
-    raw = _read_json(_ip_file, {})
-    if ip in raw:
-        raw[ip].update({'is_banned': False, 'ban_time': None, 'fail_times': [], 'fail_count': 0})
-        _write_json(_ip_file, raw)
-        if ip in ip_access_data:
-            ip_access_data[ip].update(raw[ip])
-        return True
-    return False
+    d = ip_access_data.get(ip)
+    if d is None:
+        return False
+    _reset_ban(d)
+    d['fail_count'] = 0
+    _ban_deadline.pop(ip, None)
+    _mark_dirty('ip')
+    return True
 
 
 def delete_ip_record(ip) -> bool:
-    raw = _read_json(_ip_file, {})
-    if ip in raw:
-        del raw[ip]
-        _write_json(_ip_file, raw)
-        ip_access_data.pop(ip, None)
-        return True
-    return False
+    if ip_access_data.pop(ip, None) is None:
+        return False
+    _ban_deadline.pop(ip, None)
+    _mark_dirty('ip')
+    return True
@@ -1 +1 @@
-var I=Math.pow;var Q=(S,y,o)=>new Promise((g,p)=>{var k=d=>{try{f(o.next(d))}catch(m){p(m)}},C=d=>{try{f(o.throw(d))}catch(m){p(m)}},f=d=>d.done?g(d.value):Promise.resolve(d.value).then(k,C);f((o=o.apply(S,y)).next())});import{C as nt,a as it,L as dt,P as ut,b as ct,i as vt,p as _t,c as pt,d as Y,e as ft}from"./charts.js";import{u as mt}from"./app.js";import{o as ht,a as yt}from"./ws.js";import{i as gt}from"./index.js";import{S as tt}from"./SvgIcon.js";import{_ as bt}from"./_plugin-vue_export-helper.js";import{o as kt,E as xt,a1 as _,a2 as t,a7 as a,F as wt,R as $t,L as Bt,Z as st,j as l,a6 as Ct,V as Mt,N as et,c as B,r as z,X as v}from"./vue.js";import"./vendor.js";import"./naive.js";const Ft={class:"dash"},It={class:"banner"},zt={class:"ui-stat-grid stat-grid"},St={class:"ui-stat-top"},Lt={class:"ui-stat-ic"},Nt={class:"ui-stat-label"},Rt={class:"ui-stat-val"},At={class:"main-row"},Dt={class:"sys-col"},Et={class:"res-card"},Vt={class:"res-header"},qt=["title"],Ht={class:"res-body"},Pt={class:"progress-ring"},Ut={viewBox:"0 0 72 72"},Gt=["stroke","stroke-dashoffset"],Zt={class:"ring-text"},jt={class:"res-info"},Ot={class:"res-card"},Tt={class:"res-header"},Wt={class:"res-sub"},Xt={class:"res-body"},Jt={class:"progress-ring"},Kt={viewBox:"0 0 72 72"},Qt=["stroke","stroke-dashoffset"],Yt={class:"ring-text"},ts={class:"res-info"},ss={class:"res-card"},es={key:0,class:"res-body"},os={class:"progress-ring"},as={viewBox:"0 0 72 72"},rs=["stroke","stroke-dashoffset"],ls={class:"ring-text"},ns={class:"res-info"},is={class:"res-card"},ds={class:"res-info-full"},us={class:"chart-col"},cs={class:"res-card chart-card"},vs={class:"chart-wrap"},_s={key:1,class:"chart-empty"},ps={__name:"Dashboard",setup(S){nt.register(it,dt,ut,ct,vt,_t,pt,Y);const y=mt(),o=B(()=>y.systemInfo||{}),g=z([]),p=z([]),k=z(!0),C=B(()=>{var u,c,h,x,w,$;const e=o.value,s=(u=e==null?void 0:e.total_users)!=null?u:0,n=(c=e==null?void 0:e.today_active)!=null?c:0,r=(h=e==null?void 0:e.total_groups)!=null?h:0,i=(x=e==null?void 0:e.active_groups)!=null?x:0;return[{label:"今日消息",value:(w=e==null?void 0:e.today_messages)!=null?w:0,icon:"chatbubbles",color:"c-blue"},{label:"插件处理器",value:($=e==null?void 0:e.plugins_count)!=null?$:0,icon:"extension-puzzle",color:"c-purple"},{label:"全部用户",value:`${s} (${n})`,icon:"people",color:"c-green"},{label:"全部群聊",value:`${r} (${i})`,icon:"group",color:"c-orange"}]}),f=e=>e?e>90?"var(--danger)":e>70?"var(--warning)":"var(--success)":"var(--accent)",d=e=>e?e>1024?`${(e/1024).toFixed(1)} GB`:`${Math.round(e)} MB`:"-",m=e=>{if(!e)return"-";const s=e/I(1024,3);return s>=1?`${s.toFixed(1)} GB`:`${(e/I(1024,2)).toFixed(0)} MB`};function M(e){if(!e)return"-";const s=Math.floor(e/86400),n=Math.floor(e%86400/3600),r=Math.floor(e%3600/60);return s>0?`${s}天${n}时${r}分`:n>0?`${n}时${r}分`:`${r}分`}const F=B(()=>{const e=new Date().getHours(),s=g.value.length===24?g.value:Array(24).fill(0),n=p.value.length===24?p.value:Array(24).fill(0),r=[],i=[];for(let u=11;u>=0;u--){const c=(e-u+24)%24,h=(c+1)%24;r.push(`${c}:00-${h}:00`),i.push(e-u<0?n[c]||0:s[c]||0)}return{labels:r,data:i}}),ot=B(()=>({labels:F.value.labels,datasets:[{label:"消息数",data:F.value.data,borderColor:"#58a6ff",backgroundColor:"rgba(88,166,255,0.1)",borderWidth:2,pointRadius:4,pointHoverRadius:6,pointBackgroundColor:"#58a6ff",tension:.3,fill:!0}]})),at=B(()=>F.value.data.some(e=>Number(e)>0)),rt={responsive:!0,maintainAspectRatio:!1,plugins:{legend:{display:!1},tooltip:{mode:"index",intersect:!1},datalabels:{color:"#58a6ff",font:{size:10,weight:600},anchor:"end",align:"top",offset:2,formatter:e=>e>0?e:""}},scales:{x:{grid:{color:"rgba(128,128,128,.15)"},ticks:{color:"#8b949e",font:{size:10},maxRotation:45,minRotation:30}},y:{beginAtZero:!0,grid:{color:"rgba(128,128,128,.15)"},ticks:{color:"#8b949e",font:{size:11},precision:0}}}};function lt(){return Q(this,null,function*(){var e,s,n;k.value=!0;try{const r=y.currentBotId||"",i=((e=(yield gt.get(`/api/statistics/hourly?bot_qq=${r}`)).data)==null?void 0:e.data)||{};(s=i.today_hourly_distribution)!=null&&s.length&&(g.value=i.today_hourly_distribution),(n=i.yesterday_hourly_distribution)!=null&&n.length&&(p.value=i.yesterday_hourly_distribution)}catch(r){g.value=[],p.value=[]}finally{k.value=!1}})}function L(e){y.systemInfo=e}let N;return kt(()=>{ht("system_info",L),N=setInterval(()=>y.fetchSystemInfo(),1e4),lt()}),xt(()=>{yt("system_info",L),clearInterval(N)}),(e,s)=>{var n,r,i,u,c,h,x,w,$,R,A,D,E,V,q,H,P,U,G,Z,j,O,T,W,X,J,K;return v(),_("div",Ft,[t("div",It,[s[0]||(s[0]=t("h2",null,"Elaina 管理面板",-1)),t("p",null,"运行 "+a(M((n=o.value)==null?void 0:n.uptime))+" · "+a(((r=o.value)==null?void 0:r.system_version)||""),1)]),t("div",zt,[(v(!0),_(wt,null,$t(C.value,b=>(v(),_("div",{key:b.label,class:Bt(["ui-stat",b.color])},[t("div",St,[t("div",Lt,[st(tt,{name:b.icon,size:16},null,8,["name"])]),t("div",Nt,a(b.label),1)]),t("div",Rt,a(b.value),1),st(tt,{class:"ui-stat-wm",name:b.icon,size:80},null,8,["name"])],2))),128))]),t("div",At,[t("div",Dt,[t("div",Et,[t("div",Vt,[t("span",{title:((i=o.value)==null?void 0:i.cpu_model)||""},"CPU",8,qt)]),t("div",Ht,[t("div",Pt,[(v(),_("svg",Ut,[s[1]||(s[1]=t("circle",{cx:"36",cy:"36",r:"30",fill:"none",stroke:"var(--border)","stroke-width":"5"},null,-1)),t("circle",{cx:"36",cy:"36",r:"30",fill:"none",stroke:f((u=o.value)==null?void 0:u.cpu_percent),"stroke-width":"5","stroke-linecap":"round","stroke-dasharray":188.5,"stroke-dashoffset":188.5-188.5*(((c=o.value)==null?void 0:c.cpu_percent)||0)/100,transform:"rotate(-90 36 36)"},null,8,Gt)])),t("span",Zt,a(Math.round(((h=o.value)==null?void 0:h.cpu_percent)||0))+"%",1)]),t("div",jt,[t("div",null,[s[2]||(s[2]=l("系统 ",-1)),t("b",null,a((((x=o.value)==null?void 0:x.cpu_percent)||0).toFixed(1))+"%",1)]),t("div",null,[s[3]||(s[3]=l("框架 ",-1)),t("b",null,a((((w=o.value)==null?void 0:w.framework_cpu_percent)||0).toFixed(1))+"%",1)]),t("div",null,[s[4]||(s[4]=l("核心 ",-1)),t("b",null,a((($=o.value)==null?void 0:$.cpu_cores)||"-"),1)])])])]),t("div",Ot,[t("div",Tt,[s[5]||(s[5]=t("span",null,"内存",-1)),t("span",Wt,a(d((R=o.value)==null?void 0:R.memory_total)),1)]),t("div",Xt,[t("div",Jt,[(v(),_("svg",Kt,[s[6]||(s[6]=t("circle",{cx:"36",cy:"36",r:"30",fill:"none",stroke:"var(--border)","stroke-width":"5"},null,-1)),t("circle",{cx:"36",cy:"36",r:"30",fill:"none",stroke:f((A=o.value)==null?void 0:A.memory_percent),"stroke-width":"5","stroke-linecap":"round","stroke-dasharray":188.5,"stroke-dashoffset":188.5-188.5*(((D=o.value)==null?void 0:D.memory_percent)||0)/100,transform:"rotate(-90 36 36)"},null,8,Qt)])),t("span",Yt,a(Math.round(((E=o.value)==null?void 0:E.memory_percent)||0))+"%",1)]),t("div",ts,[t("div",null,[s[7]||(s[7]=l("系统 ",-1)),t("b",null,a((((V=o.value)==null?void 0:V.memory_percent)||0).toFixed(1))+"%",1),l(" · "+a(d((q=o.value)==null?void 0:q.memory_used)),1)]),t("div",null,[s[8]||(s[8]=l("框架 ",-1)),t("b",null,a((((H=o.value)==null?void 0:H.framework_memory_percent)||0).toFixed(1))+"%",1),l(" · "+a((((P=o.value)==null?void 0:P.framework_memory_total)||0).toFixed(1))+" MB",1)])])])]),t("div",ss,[s[13]||(s[13]=t("div",{class:"res-header"},[t("span",null,"磁盘")],-1)),(U=o.value)!=null&&U.disk_info?(v(),_("div",es,[t("div",os,[(v(),_("svg",as,[s[9]||(s[9]=t("circle",{cx:"36",cy:"36",r:"30",fill:"none",stroke:"var(--border)","stroke-width":"5"},null,-1)),t("circle",{cx:"36",cy:"36",r:"30",fill:"none",stroke:f((Z=(G=o.value)==null?void 0:G.disk_info)==null?void 0:Z.percent),"stroke-width":"5","stroke-linecap":"round","stroke-dasharray":188.5,"stroke-dashoffset":188.5-188.5*(((O=(j=o.value)==null?void 0:j.disk_info)==null?void 0:O.percent)||0)/100,transform:"rotate(-90 36 36)"},null,8,rs)])),t("span",ls,a(Math.round(((W=(T=o.value)==null?void 0:T.disk_info)==null?void 0:W.percent)||0))+"%",1)]),t("div",ns,[t("div",null,[s[10]||(s[10]=l("总计 ",-1)),t("b",null,a(m(o.value.disk_info.total)),1)]),t("div",null,[s[11]||(s[11]=l("已用 ",-1)),t("b",null,a(m(o.value.disk_info.used)),1),l(" ("+a(o.value.disk_info.percent)+"%)",1)]),t("div",null,[s[12]||(s[12]=l("可用 ",-1)),t("b",null,a(m(o.value.disk_info.free)),1)])])])):Ct("",!0)]),t("div",is,[s[17]||(s[17]=t("div",{class:"res-header"},[t("span",null,"运行状态")],-1)),t("div",ds,[t("div",null,[s[14]||(s[14]=l("启动时间 ",-1)),t("b",null,a(((X=o.value)==null?void 0:X.start_time)||"-"),1)]),t("div",null,[s[15]||(s[15]=l("框架运行 ",-1)),t("b",null,a(M((J=o.value)==null?void 0:J.uptime)),1)]),t("div",null,[s[16]||(s[16]=l("系统运行 ",-1)),t("b",null,a(M((K=o.value)==null?void 0:K.system_uptime)),1)])])])]),t("div",us,[t("div",cs,[s[18]||(s[18]=t("div",{class:"res-header"},[t("span",null,"最近 12 小时消息分布")],-1)),t("div",vs,[at.value?(v(),Mt(et(ft),{key:0,data:ot.value,options:rt,plugins:[et(Y)]},null,8,["data","plugins"])):(v(),_("div",_s,a(k.value?"等待加载...":"暂无消息"),1))])])])])])}}},Bs=bt(ps,[["__scopeId","data-v-5c895a15"]]);export{Bs as default};
+var I=Math.pow;var Q=(S,y,o)=>new Promise((g,p)=>{var k=d=>{try{f(o.next(d))}catch(m){p(m)}},C=d=>{try{f(o.throw(d))}catch(m){p(m)}},f=d=>d.done?g(d.value):Promise.resolve(d.value).then(k,C);f((o=o.apply(S,y)).next())});import{C as nt,a as it,L as dt,P as ut,b as ct,i as vt,p as _t,c as pt,d as Y,e as ft}from"./charts.js";import{u as mt}from"./app.js";import{o as ht,a as yt}from"./ws.js";import{i as gt}from"./index.js";import{S as tt}from"./SvgIcon.js";import{_ as bt}from"./_plugin-vue_export-helper.js";import{o as kt,E as xt,a1 as _,a2 as t,a7 as a,F as wt,R as $t,L as Bt,Z as st,j as l,a6 as Ct,V as Mt,N as et,c as B,r as z,X as v}from"./vue.js";import"./vendor.js";import"./naive.js";const Ft={class:"dash"},It={class:"banner"},zt={class:"ui-stat-grid stat-grid"},St={class:"ui-stat-top"},Lt={class:"ui-stat-ic"},Nt={class:"ui-stat-label"},Rt={class:"ui-stat-val"},At={class:"main-row"},Dt={class:"sys-col"},Et={class:"res-card"},Vt={class:"res-header"},qt=["title"],Ht={class:"res-body"},Pt={class:"progress-ring"},Ut={viewBox:"0 0 72 72"},Gt=["stroke","stroke-dashoffset"],Zt={class:"ring-text"},jt={class:"res-info"},Ot={class:"res-card"},Tt={class:"res-header"},Wt={class:"res-sub"},Xt={class:"res-body"},Jt={class:"progress-ring"},Kt={viewBox:"0 0 72 72"},Qt=["stroke","stroke-dashoffset"],Yt={class:"ring-text"},ts={class:"res-info"},ss={class:"res-card"},es={key:0,class:"res-body"},os={class:"progress-ring"},as={viewBox:"0 0 72 72"},rs=["stroke","stroke-dashoffset"],ls={class:"ring-text"},ns={class:"res-info"},is={class:"res-card"},ds={class:"res-info-full"},us={class:"chart-col"},cs={class:"res-card chart-card"},vs={class:"chart-wrap"},_s={key:1,class:"chart-empty"},ps={__name:"Dashboard",setup(S){nt.register(it,dt,ut,ct,vt,_t,pt,Y);const y=mt(),o=B(()=>y.systemInfo||{}),g=z([]),p=z([]),k=z(!0),C=B(()=>{var u,c,h,x,w,$;const e=o.value,s=(u=e==null?void 0:e.total_users)!=null?u:0,n=(c=e==null?void 0:e.today_active)!=null?c:0,r=(h=e==null?void 0:e.total_groups)!=null?h:0,i=(x=e==null?void 0:e.active_groups)!=null?x:0;return[{label:"今日消息",value:(w=e==null?void 0:e.today_messages)!=null?w:0,icon:"chatbubbles",color:"c-blue"},{label:"插件处理器",value:($=e==null?void 0:e.plugins_count)!=null?$:0,icon:"extension-puzzle",color:"c-purple"},{label:"全部用户",value:`${s} (${n})`,icon:"people",color:"c-green"},{label:"全部群聊",value:`${r} (${i})`,icon:"group",color:"c-orange"}]}),f=e=>e?e>90?"var(--danger)":e>70?"var(--warning)":"var(--success)":"var(--accent)",d=e=>e?e>1024?`${(e/1024).toFixed(1)} GB`:`${Math.round(e)} MB`:"-",m=e=>{if(!e)return"-";const s=e/I(1024,3);return s>=1?`${s.toFixed(1)} GB`:`${(e/I(1024,2)).toFixed(0)} MB`};function lgMs(e){return e>=100?`${Math.round(e)}ms`:`${(e||0).toFixed(1)}ms`}function M(e){if(!e)return"-";const s=Math.floor(e/86400),n=Math.floor(e%86400/3600),r=Math.floor(e%3600/60);return s>0?`${s}天${n}时${r}分`:n>0?`${n}时${r}分`:`${r}分`}const F=B(()=>{const e=new Date().getHours(),s=g.value.length===24?g.value:Array(24).fill(0),n=p.value.length===24?p.value:Array(24).fill(0),r=[],i=[];for(let u=11;u>=0;u--){const c=(e-u+24)%24,h=(c+1)%24;r.push(`${c}:00-${h}:00`),i.push(e-u<0?n[c]||0:s[c]||0)}return{labels:r,data:i}}),ot=B(()=>({labels:F.value.labels,datasets:[{label:"消息数",data:F.value.data,borderColor:"#58a6ff",backgroundColor:"rgba(88,166,255,0.1)",borderWidth:2,pointRadius:4,pointHoverRadius:6,pointBackgroundColor:"#58a6ff",tension:.3,fill:!0}]})),at=B(()=>F.value.data.some(e=>Number(e)>0)),rt={responsive:!0,maintainAspectRatio:!1,plugins:{legend:{display:!1},tooltip:{mode:"index",intersect:!1},datalabels:{color:"#58a6ff",font:{size:10,weight:600},anchor:"end",align:"top",offset:2,formatter:e=>e>0?e:""}},scales:{x:{grid:{color:"rgba(128,128,128,.15)"},ticks:{color:"#8b949e",font:{size:10},maxRotation:45,minRotation:30}},y:{beginAtZero:!0,grid:{color:"rgba(128,128,128,.15)"},ticks:{color:"#8b949e",font:{size:11},precision:0}}}};function lt(){return Q(this,null,function*(){var e,s,n;k.value=!0;try{const r=y.currentBotId||"",i=((e=(yield gt.get(`/api/statistics/hourly?bot_qq=${r}`)).data)==null?void 0:e.data)||{};(s=i.today_hourly_distribution)!=null&&s.length&&(g.value=i.today_hourly_distribution),(n=i.yesterday_hourly_distribution)!=null&&n.length&&(p.value=i.yesterday_hourly_distribution)}catch(r){g.value=[],p.value=[]}finally{k.value=!1}})}function L(e){y.systemInfo=e}let N;return kt(()=>{ht("system_info",L),N=setInterval(()=>y.fetchSystemInfo(),1e4),lt()}),xt(()=>{yt("system_info",L),clearInterval(N)}),(e,s)=>{var n,r,i,u,c,h,x,w,$,R,A,D,E,V,q,H,P,U,G,Z,j,O,T,W,X,J,K;return v(),_("div",Ft,[t("div",It,[s[0]||(s[0]=t("h2",null,"Elaina 管理面板",-1)),t("p",null,"运行 "+a(M((n=o.value)==null?void 0:n.uptime))+" · "+a(((r=o.value)==null?void 0:r.system_version)||""),1)]),t("div",zt,[(v(!0),_(wt,null,$t(C.value,b=>(v(),_("div",{key:b.label,class:Bt(["ui-stat",b.color])},[t("div",St,[t("div",Lt,[st(tt,{name:b.icon,size:16},null,8,["name"])]),t("div",Nt,a(b.label),1)]),t("div",Rt,a(b.value),1),st(tt,{class:"ui-stat-wm",name:b.icon,size:80},null,8,["name"])],2))),128))]),t("div",At,[t("div",Dt,[t("div",Et,[t("div",Vt,[t("span",{title:((i=o.value)==null?void 0:i.cpu_model)||""},"CPU",8,qt)]),t("div",Ht,[t("div",Pt,[(v(),_("svg",Ut,[s[1]||(s[1]=t("circle",{cx:"36",cy:"36",r:"30",fill:"none",stroke:"var(--border)","stroke-width":"5"},null,-1)),t("circle",{cx:"36",cy:"36",r:"30",fill:"none",stroke:f((u=o.value)==null?void 0:u.cpu_percent),"stroke-width":"5","stroke-linecap":"round","stroke-dasharray":188.5,"stroke-dashoffset":188.5-188.5*(((c=o.value)==null?void 0:c.cpu_percent)||0)/100,transform:"rotate(-90 36 36)"},null,8,Gt)])),t("span",Zt,a(Math.round(((h=o.value)==null?void 0:h.cpu_percent)||0))+"%",1)]),t("div",jt,[t("div",null,[s[2]||(s[2]=l("系统 ",-1)),t("b",null,a((((x=o.value)==null?void 0:x.cpu_percent)||0).toFixed(1))+"%",1)]),t("div",null,[s[3]||(s[3]=l("框架 ",-1)),t("b",null,a((((w=o.value)==null?void 0:w.framework_cpu_percent)||0).toFixed(1))+"%",1)]),t("div",null,[s[4]||(s[4]=l("核心 ",-1)),t("b",null,a((($=o.value)==null?void 0:$.cpu_cores)||"-"),1)])])])]),t("div",Ot,[t("div",Tt,[s[5]||(s[5]=t("span",null,"内存",-1)),t("span",Wt,a(d((R=o.value)==null?void 0:R.memory_total)),1)]),t("div",Xt,[t("div",Jt,[(v(),_("svg",Kt,[s[6]||(s[6]=t("circle",{cx:"36",cy:"36",r:"30",fill:"none",stroke:"var(--border)","stroke-width":"5"},null,-1)),t("circle",{cx:"36",cy:"36",r:"30",fill:"none",stroke:f((A=o.value)==null?void 0:A.memory_percent),"stroke-width":"5","stroke-linecap":"round","stroke-dasharray":188.5,"stroke-dashoffset":188.5-188.5*(((D=o.value)==null?void 0:D.memory_percent)||0)/100,transform:"rotate(-90 36 36)"},null,8,Qt)])),t("span",Yt,a(Math.round(((E=o.value)==null?void 0:E.memory_percent)||0))+"%",1)]),t("div",ts,[t("div",null,[s[7]||(s[7]=l("系统 ",-1)),t("b",null,a((((V=o.value)==null?void 0:V.memory_percent)||0).toFixed(1))+"%",1),l(" · "+a(d((q=o.value)==null?void 0:q.memory_used)),1)]),t("div",null,[s[8]||(s[8]=l("框架 ",-1)),t("b",null,a((((H=o.value)==null?void 0:H.framework_memory_percent)||0).toFixed(1))+"%",1),l(" · "+a((((P=o.value)==null?void 0:P.framework_memory_total)||0).toFixed(1))+" MB",1)])])])]),t("div",ss,[s[13]||(s[13]=t("div",{class:"res-header"},[t("span",null,"磁盘")],-1)),(U=o.value)!=null&&U.disk_info?(v(),_("div",es,[t("div",os,[(v(),_("svg",as,[s[9]||(s[9]=t("circle",{cx:"36",cy:"36",r:"30",fill:"none",stroke:"var(--border)","stroke-width":"5"},null,-1)),t("circle",{cx:"36",cy:"36",r:"30",fill:"none",stroke:f((Z=(G=o.value)==null?void 0:G.disk_info)==null?void 0:Z.percent),"stroke-width":"5","stroke-linecap":"round","stroke-dasharray":188.5,"stroke-dashoffset":188.5-188.5*(((O=(j=o.value)==null?void 0:j.disk_info)==null?void 0:O.percent)||0)/100,transform:"rotate(-90 36 36)"},null,8,rs)])),t("span",ls,a(Math.round(((W=(T=o.value)==null?void 0:T.disk_info)==null?void 0:W.percent)||0))+"%",1)]),t("div",ns,[t("div",null,[s[10]||(s[10]=l("总计 ",-1)),t("b",null,a(m(o.value.disk_info.total)),1)]),t("div",null,[s[11]||(s[11]=l("已用 ",-1)),t("b",null,a(m(o.value.disk_info.used)),1),l(" ("+a(o.value.disk_info.percent)+"%)",1)]),t("div",null,[s[12]||(s[12]=l("可用 ",-1)),t("b",null,a(m(o.value.disk_info.free)),1)])])])):Ct("",!0)]),t("div",is,[s[17]||(s[17]=t("div",{class:"res-header"},[t("span",null,"运行状态")],-1)),t("div",ds,[t("div",null,[s[14]||(s[14]=l("启动时间 ",-1)),t("b",null,a(((X=o.value)==null?void 0:X.start_time)||"-"),1)]),t("div",null,[s[15]||(s[15]=l("框架运行 ",-1)),t("b",null,a(M((J=o.value)==null?void 0:J.uptime)),1)]),t("div",null,[s[16]||(s[16]=l("系统运行 ",-1)),t("b",null,a(M((K=o.value)==null?void 0:K.system_uptime)),1)])])]),o.value&&o.value.loop&&o.value.loop.running?(v(),_("div",{key:0,class:"res-card"},[t("div",{class:"res-header"},[s[19]||(s[19]=t("span",null,"事件循环",-1)),t("span",{class:"res-sub",title:`采样间隔 ${o.value.loop.interval_ms}ms · 卡顿阈值 ${o.value.loop.stall_ms}ms`},"卡顿 "+a(o.value.loop.stalls)+" 次",9,["title"])]),t("div",{class:"res-info-full"},[t("div",null,[l("调度延迟 P50 "),t("b",null,a(lgMs(o.value.loop.p50_ms)),1),l(" · P95 "),t("b",null,a(lgMs(o.value.loop.p95_ms)),1),l(" · P99 "),t("b",null,a(lgMs(o.value.loop.p99_ms)),1)]),(v(!0),_(wt,null,$t(o.value.loop.offenders.slice(0,3),c=>(v(),_("div",{key:c.where,class:"loop-offender",title:c.stack},[t("code",null,a(c.where),1),l(" "+a(c.count)+" 次 · 最长 ",1),t("b",null,a(lgMs(c.max_ms)),1)],8,["title"]))),128))])])):Ct("",!0)]),t("div",us,[t("div",cs,[s[18]||(s[18]=t("div",{class:"res-header"},[t("span",null,"最近 12 小时消息分布")],-1)),t("div",vs,[at.value?(v(),Mt(et(ft),{key:0,data:ot.value,options:rt,plugins:[et(Y)]},null,8,["data","plugins"])):(v(),_("div",_s,a(k.value?"等待加载...":"暂无消息"),1))])])])])])}}},Bs=bt(ps,[["__scopeId","data-v-5c895a15"]]);export{Bs as default};
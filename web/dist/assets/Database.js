@@ -1,4 +1,4 @@
-var h=(X,u,y)=>new Promise((b,L)=>{var q=v=>{try{f(y.next(v))}catch(c){L(c)}},g=v=>{try{f(y.throw(v))}catch(c){L(c)}},f=v=>v.done?b(v.value):Promise.resolve(v.value).then(q,g);f((y=y.apply(X,u)).next())});import{o as Ce,n as le,E as ze,w as Se,a1 as S,a2 as r,Z as m,Y as p,r as o,W as R,X as i,V as z,a6 as _,F as ne,R as oe,I as Re,a7 as k,N as F,j as U,ad as qe,a5 as Le,c as re,m as w}from"./vue.js";import{i as j}from"./index.js";import{S as Ee}from"./SvgIcon.js";import{_ as Te}from"./_plugin-vue_export-helper.js";import{u as Ne,N as ce,B as K,b as Be}from"./naive.js";import"./vendor.js";const Oe={class:"ui-page-head"},Ue={class:"ui-page-head-main"},je={class:"ui-page-icon"},Ke={class:"grid grid-cols-1 lg:grid-cols-4 gap-4 items-start"},$e={class:"space-y-1"},De=["onClick"],We={class:"truncate"},Me={class:"text-xs space-y-0.5"},Pe={class:"font-mono",style:{color:"var(--primary)"}},Fe={style:{color:"var(--text3)"}},Ie={class:"lg:col-span-3 space-y-3"},Ve={class:"flex gap-2"},He={class:"flex items-center justify-between"},Qe={class:"text-sm"},Xe={key:0,style:{color:"var(--text3)"}},Ye={class:"flex gap-2"},Ae={key:0,class:"flex justify-center mt-3"},$=50,Ge={__name:"Database",setup(X){const u=Ne(),y=o(!1),b=o(!1),L=o([]),q=o([]),g=o(""),f=o(""),v=o(null),c=o([]),D=o([]),W=o([]),x=o(0),E=o(1),T=o(""),N=o("table"),Y=o([]),A=o([]),C=o([]),I=o(!1),G=o(480),M=o(null),J=o(null);let P=null;const ie=re(()=>{const t=D.value.reduce((e,a)=>e+(a.type==="selection"?48:Number(a.width||a.minWidth||180)),0);return t>900?t:void 0}),ue={maxWidth:"min(560px, 78vw)",maxHeight:"42vh",overflow:"auto",whiteSpace:"pre-wrap",overflowWrap:"anywhere",wordBreak:"break-word"},de=t=>{const e=String(t).replace(/\s+/g," ").trim();return e.length>160?`${e.slice(0,160)}...`:e};function B(){const t=M.value,e=J.value;if(!t||!e)return;const a=t.getBoundingClientRect().bottom,n=e.getBoundingClientRect().top,d=N.value==="table"&&x.value>$?52:8;G.value=Math.max(Math.floor(a-n-d),280)}const Z=re(()=>{const t={};for(const a of L.value){const n=a.bot_qq;t[n]||(t[n]={label:a.label||a.bot_qq,bot_qq:a.bot_qq,children:[]});const l=a.date?`${a.date}/${a.name}`:a.name,d=(a.size/1024).toFixed(1);t[n].children.push({key:a.path,label:l,suffix:()=>w(ce,{size:"tiny",round:!0,bordered:!1},{default:()=>`${d}KB`})})}const e=[];for(const[a,n]of Object.entries(t))e.push({key:`bot_${a}`,label:n.label,children:n.children,isLeaf:!1});return e});function ve(t){const e=t==null,a=e?"NULL":String(t),n=w("div",{class:"db-cell-trigger"},[w("span",{class:["db-cell-text",{"db-cell-null":e}]},de(a))]);return w(Be,{trigger:"hover",placement:"top",style:ue},{trigger:()=>n,default:()=>w("div",{class:"db-popover-content"},[w("div",{class:"db-popover-actions"},[w("span",{class:"db-popover-title"},"完整数据"),w(K,{size:"tiny",type:"primary",secondary:!0,onClick:l=>{var d;(d=l==null?void 0:l.stopPropagation)==null||d.call(l),xe(a)}},{default:()=>"复制"})]),w("pre",{class:"db-popover-text"},a)])})}function ee(t,e=!1){W.value=t.map(l=>l.name);const a=t.map(l=>({title:l.name,key:l.name,minWidth:140,width:220,render:d=>ve(d[l.name])})),n={title:"操作",key:"__actions",width:80,render:l=>w(K,{size:"tiny",quaternary:!0,onClick:()=>we(l)},{default:()=>"复制"})};D.value=e?[{type:"selection"},...a,n]:[...a,n]}function pe(){return h(this,null,function*(){y.value=!0;try{L.value=(yield j.get("/api/database/list")).data.databases||[]}catch(t){u.error("获取数据库列表失败")}finally{y.value=!1}})}function fe(t){const e=t[0];!e||e.startsWith("bot_")||(A.value=[e],g.value=e,f.value="",v.value=null,c.value=[],D.value=[],W.value=[],x.value=0,me(e))}function me(t){return h(this,null,function*(){try{q.value=(yield j.post("/api/database/tables",{path:t})).data.tables||[]}catch(e){u.error("获取表列表失败")}})}function ye(t){return h(this,null,function*(){f.value=t.name,v.value=t,E.value=1,N.value="table",T.value=`SELECT * FROM "${t.name}" ORDER BY rowid DESC LIMIT 50`,yield V()})}function V(){return h(this,null,function*(){b.value=!0,C.value=[];try{const t=(yield j.post("/api/database/query",{path:g.value,table:f.value,page:E.value,page_size:$})).data;c.value=t.data||[],x.value=t.total||0,ee(t.columns||[],!0)}catch(t){u.error("查询失败")}finally{b.value=!1}})}function te(){return h(this,null,function*(){var t,e;if(!(!T.value.trim()||!g.value)){b.value=!0,N.value="sql";try{const a=yield j.post("/api/database/sql",{path:g.value,sql:T.value.trim()});a.data.success?(c.value=a.data.data||[],x.value=a.data.total||0,ee(a.data.columns||[],!1)):u.error(a.data.message||"查询失败")}catch(a){u.error(((e=(t=a.response)==null?void 0:t.data)==null?void 0:e.message)||"查询失败")}finally{b.value=!1}}})}function be(){return h(this,null,function*(){var t,e;if(C.value.length){I.value=!0;try{const a=yield j.post("/api/database/delete",{path:g.value,table:f.value,rowids:C.value});a.data.success?(u.success(`已删除 ${a.data.deleted} 条数据`),C.value=[],yield V()):u.error(a.data.message||"删除失败")}catch(a){u.error(((e=(t=a.response)==null?void 0:t.data)==null?void 0:e.message)||"删除失败")}finally{I.value=!1}}})}function ge(t){E.value=t,V()}function ae(t){return W.value.length?W.value:Object.keys(t||{}).filter(e=>!e.startsWith("_"))}function he(t){var a;const e={};for(const n of ae(t))e[n]=(a=t[n])!=null?a:null;return JSON.stringify(e,null,2)}function _e(t){const e=document.createElement("textarea");e.value=t,e.readOnly=!0,e.style.cssText="position:fixed;top:-1000px;left:-1000px;opacity:0",document.body.appendChild(e),e.select();const a=document.execCommand("copy");if(document.body.removeChild(e),!a)throw new Error("copy failed")}function se(t){return h(this,null,function*(){var e;if((e=navigator.clipboard)!=null&&e.writeText&&window.isSecureContext)try{yield navigator.clipboard.writeText(t);return}catch(a){}_e(t)})}function we(t){return h(this,null,function*(){try{yield se(he(t)),u.success("已复制该行数据")}catch(e){u.error("复制失败，请检查浏览器剪贴板权限")}})}function xe(t){return h(this,null,function*(){try{yield se(t),u.success("已复制该数据")}catch(e){u.error("复制失败，请检查浏览器剪贴板权限")}})}function ke(){if(!c.value.length)return;const t=ae(c.value[0]),e=t.join(","),a=c.value.map(H=>t.map(Q=>{const O=H[Q];if(O==null)return"";const s=String(O).replace(/"/g,'""');return s.includes(",")||s.includes(`
+var h=(X,u,y)=>new Promise((b,L)=>{var q=v=>{try{f(y.next(v))}catch(c){L(c)}},g=v=>{try{f(y.throw(v))}catch(c){L(c)}},f=v=>v.done?b(v.value):Promise.resolve(v.value).then(q,g);f((y=y.apply(X,u)).next())});import{o as Ce,n as le,E as ze,w as Se,a1 as S,a2 as r,Z as m,Y as p,r as o,W as R,X as i,V as z,a6 as _,F as ne,R as oe,I as Re,a7 as k,N as F,j as U,ad as qe,a5 as Le,c as re,m as w}from"./vue.js";import{i as j}from"./index.js";import{S as Ee}from"./SvgIcon.js";import{_ as Te}from"./_plugin-vue_export-helper.js";import{u as Ne,N as ce,B as K,b as Be}from"./naive.js";import"./vendor.js";const Oe={class:"ui-page-head"},Ue={class:"ui-page-head-main"},je={class:"ui-page-icon"},Ke={class:"grid grid-cols-1 lg:grid-cols-4 gap-4 items-start"},$e={class:"space-y-1"},De=["onClick"],We={class:"truncate"},Me={class:"text-xs space-y-0.5"},Pe={class:"font-mono",style:{color:"var(--primary)"}},Fe={style:{color:"var(--text3)"}},Ie={class:"lg:col-span-3 space-y-3"},Ve={class:"flex gap-2"},He={class:"flex items-center justify-between"},Qe={class:"text-sm"},Xe={key:0,style:{color:"var(--text3)"}},Ye={class:"flex gap-2"},Ae={key:0,class:"flex justify-center mt-3"},$=50,Ge={__name:"Database",setup(X){const u=Ne(),y=o(!1),b=o(!1),L=o([]),q=o([]),g=o(""),f=o(""),v=o(null),c=o([]),D=o([]),W=o([]),x=o(0),E=o(1),T=o(""),N=o("table"),Y=o([]),A=o([]),C=o([]),I=o(!1),G=o(480),M=o(null),J=o(null);let P=null;const ie=re(()=>{const t=D.value.reduce((e,a)=>e+(a.type==="selection"?48:Number(a.width||a.minWidth||180)),0);return t>900?t:void 0}),ue={maxWidth:"min(560px, 78vw)",maxHeight:"42vh",overflow:"auto",whiteSpace:"pre-wrap",overflowWrap:"anywhere",wordBreak:"break-word"},de=t=>{const e=String(t).replace(/\s+/g," ").trim();return e.length>160?`${e.slice(0,160)}...`:e};function B(){const t=M.value,e=J.value;if(!t||!e)return;const a=t.getBoundingClientRect().bottom,n=e.getBoundingClientRect().top,d=N.value==="table"&&x.value>$?52:8;G.value=Math.max(Math.floor(a-n-d),280)}const Z=re(()=>{const t={};for(const a of L.value){const n=a.bot_qq;t[n]||(t[n]={label:a.label||a.bot_qq,bot_qq:a.bot_qq,children:[]});const l=a.date?`${a.date}/${a.name}`:a.name,d=(a.size/1024).toFixed(1),f=a.fragmentation>=1?` · 碎片 ${a.fragmentation}%`:"";t[n].children.push({key:a.path,label:l,suffix:()=>w(ce,{size:"tiny",round:!0,bordered:!1},{default:()=>`${d}KB${f}`})})}const e=[];for(const[a,n]of Object.entries(t))e.push({key:`bot_${a}`,label:n.label,children:n.children,isLeaf:!1});return e});function ve(t){const e=t==null,a=e?"NULL":String(t),n=w("div",{class:"db-cell-trigger"},[w("span",{class:["db-cell-text",{"db-cell-null":e}]},de(a))]);return w(Be,{trigger:"hover",placement:"top",style:ue},{trigger:()=>n,default:()=>w("div",{class:"db-popover-content"},[w("div",{class:"db-popover-actions"},[w("span",{class:"db-popover-title"},"完整数据"),w(K,{size:"tiny",type:"primary",secondary:!0,onClick:l=>{var d;(d=l==null?void 0:l.stopPropagation)==null||d.call(l),xe(a)}},{default:()=>"复制"})]),w("pre",{class:"db-popover-text"},a)])})}function ee(t,e=!1){W.value=t.map(l=>l.name);const a=t.map(l=>({title:l.name,key:l.name,minWidth:140,width:220,render:d=>ve(d[l.name])})),n={title:"操作",key:"__actions",width:80,render:l=>w(K,{size:"tiny",quaternary:!0,onClick:()=>we(l)},{default:()=>"复制"})};D.value=e?[{type:"selection"},...a,n]:[...a,n]}function pe(){return h(this,null,function*(){y.value=!0;try{L.value=(yield j.get("/api/database/list")).data.databases||[]}catch(t){u.error("获取数据库列表失败")}finally{y.value=!1}})}function fe(t){const e=t[0];!e||e.startsWith("bot_")||(A.value=[e],g.value=e,f.value="",v.value=null,c.value=[],D.value=[],W.value=[],x.value=0,me(e))}function me(t){return h(this,null,function*(){try{q.value=(yield j.post("/api/database/tables",{path:t})).data.tables||[]}catch(e){u.error("获取表列表失败")}})}function ye(t){return h(this,null,function*(){f.value=t.name,v.value=t,E.value=1,N.value="table",T.value=`SELECT * FROM "${t.name}" ORDER BY rowid DESC LIMIT 50`,yield V()})}function V(){return h(this,null,function*(){b.value=!0,C.value=[];try{const t=(yield j.post("/api/database/query",{path:g.value,table:f.value,page:E.value,page_size:$})).data;c.value=t.data||[],x.value=t.total||0,ee(t.columns||[],!0)}catch(t){u.error("查询失败")}finally{b.value=!1}})}function te(){return h(this,null,function*(){var t,e;if(!(!T.value.trim()||!g.value)){b.value=!0,N.value="sql";try{const a=yield j.post("/api/database/sql",{path:g.value,sql:T.value.trim()});a.data.success?(c.value=a.data.data||[],x.value=a.data.total||0,ee(a.data.columns||[],!1)):u.error(a.data.message||"查询失败")}catch(a){u.error(((e=(t=a.response)==null?void 0:t.data)==null?void 0:e.message)||"查询失败")}finally{b.value=!1}}})}function be(){return h(this,null,function*(){var t,e;if(C.value.length){I.value=!0;try{const a=yield j.post("/api/database/delete",{path:g.value,table:f.value,rowids:C.value});a.data.success?(u.success(`已删除 ${a.data.deleted} 条数据`),C.value=[],yield V()):u.error(a.data.message||"删除失败")}catch(a){u.error(((e=(t=a.response)==null?void 0:t.data)==null?void 0:e.message)||"删除失败")}finally{I.value=!1}}})}function ge(t){E.value=t,V()}function ae(t){return W.value.length?W.value:Object.keys(t||{}).filter(e=>!e.startsWith("_"))}function he(t){var a;const e={};for(const n of ae(t))e[n]=(a=t[n])!=null?a:null;return JSON.stringify(e,null,2)}function _e(t){const e=document.createElement("textarea");e.value=t,e.readOnly=!0,e.style.cssText="position:fixed;top:-1000px;left:-1000px;opacity:0",document.body.appendChild(e),e.select();const a=document.execCommand("copy");if(document.body.removeChild(e),!a)throw new Error("copy failed")}function se(t){return h(this,null,function*(){var e;if((e=navigator.clipboard)!=null&&e.writeText&&window.isSecureContext)try{yield navigator.clipboard.writeText(t);return}catch(a){}_e(t)})}function we(t){return h(this,null,function*(){try{yield se(he(t)),u.success("已复制该行数据")}catch(e){u.error("复制失败，请检查浏览器剪贴板权限")}})}function xe(t){return h(this,null,function*(){try{yield se(t),u.success("已复制该数据")}catch(e){u.error("复制失败，请检查浏览器剪贴板权限")}})}function ke(){if(!c.value.length)return;const t=ae(c.value[0]),e=t.join(","),a=c.value.map(H=>t.map(Q=>{const O=H[Q];if(O==null)return"";const s=String(O).replace(/"/g,'""');return s.includes(",")||s.includes(`
 `)||s.includes('"')?`"${s}"`:s}).join(",")).join(`
 `),n=new Blob(["\uFEFF"+e+`
-`+a],{type:"text/csv;charset=utf-8;"}),l=URL.createObjectURL(n),d=document.createElement("a");d.href=l,d.download=`${f.value||"query"}_${new Date().toISOString().slice(0,10)}.csv`,d.click(),URL.revokeObjectURL(l)}return Ce(()=>{pe(),P=new ResizeObserver(()=>B()),le(()=>{M.value&&P.observe(M.value),B()}),window.addEventListener("resize",B)}),ze(()=>{P&&P.disconnect(),window.removeEventListener("resize",B)}),Se([c,q,()=>v.value,()=>x.value],()=>le(B)),(t,e)=>{const a=R("n-tree"),n=R("n-empty"),l=R("n-card"),d=R("n-input"),H=R("n-data-table"),Q=R("n-pagination"),O=R("n-spin");return i(),S("div",null,[r("div",Oe,[r("div",Ue,[r("div",je,[m(Ee,{name:"cube",size:24})]),e[4]||(e[4]=r("div",null,[r("h1",{class:"ui-page-title"},"数据库"),r("div",{class:"ui-page-sub"},"浏览和查询数据库表")],-1))])]),m(O,{show:y.value},{default:p(()=>[r("div",Ke,[r("div",{ref_key:"leftColRef",ref:M,class:"lg:col-span-1 space-y-3"},[m(l,{size:"small",title:"数据库",style:{background:"var(--bg2)",border:"1px solid var(--border)"}},{default:p(()=>[m(a,{data:Z.value,"selected-keys":A.value,"onUpdate:selectedKeys":fe,"block-line":"",selectable:"","expanded-keys":Y.value,"onUpdate:expandedKeys":e[0]||(e[0]=s=>Y.value=s)},null,8,["data","selected-keys","expanded-keys"]),!Z.value.length&&!y.value?(i(),z(n,{key:0,description:"暂无数据库",size:"small",class:"mt-2"})):_("",!0)]),_:1}),q.value.length?(i(),z(l,{key:0,size:"small",title:"表",style:{background:"var(--bg2)",border:"1px solid var(--border)"}},{default:p(()=>[r("div",$e,[(i(!0),S(ne,null,oe(q.value,s=>(i(),S("div",{key:s.name,class:"flex items-center justify-between px-2 py-1.5 rounded cursor-pointer text-sm transition-colors",style:Re({background:f.value===s.name?"var(--primary-alpha)":"transparent",color:"var(--text1)"}),onClick:Je=>ye(s)},[r("span",We,k(s.name),1),m(F(ce),{size:"tiny",round:""},{default:p(()=>[U(k(s.count),1)]),_:2},1024)],12,De))),128))])]),_:1})):_("",!0),v.value?(i(),z(l,{key:1,size:"small",title:"表结构",style:{background:"var(--bg2)",border:"1px solid var(--border)"}},{default:p(()=>[r("div",Me,[(i(!0),S(ne,null,oe(v.value.columns,s=>(i(),S("div",{key:s.name,class:"flex gap-2"},[r("span",Pe,k(s.name),1),r("span",Fe,k(s.type)+k(s.pk?" PK":"")+k(s.notnull?" NOT NULL":""),1)]))),128))])]),_:1})):_("",!0)],512),r("div",Ie,[m(l,{size:"small",style:{background:"var(--bg2)",border:"1px solid var(--border)"}},{default:p(()=>[r("div",Ve,[m(d,{value:T.value,"onUpdate:value":e[1]||(e[1]=s=>T.value=s),type:"textarea",placeholder:"输入 SQL 查询 (仅 SELECT)...",autosize:{minRows:1,maxRows:4},class:"flex-1 font-mono text-sm",onKeydown:qe(Le(te,["ctrl"]),["enter"])},null,8,["value","onKeydown"]),m(F(K),{type:"primary",onClick:te,loading:b.value,disabled:!g.value},{default:p(()=>[...e[5]||(e[5]=[U(" 执行 ",-1)])]),_:1},8,["loading","disabled"])]),e[6]||(e[6]=r("div",{class:"text-xs mt-1",style:{color:"var(--text3)"}}," Ctrl+Enter 执行 · 仅允许 SELECT 查询 · 自动限制 500 行 ",-1))]),_:1}),c.value.length||b.value?(i(),z(l,{key:0,size:"small",style:{background:"var(--bg2)",border:"1px solid var(--border)"}},{header:p(()=>[r("div",He,[r("span",Qe,[U(k(N.value==="sql"?"SQL 查询结果":f.value||"数据")+" ",1),x.value>0?(i(),S("span",Xe," ("+k(x.value)+" 行)",1)):_("",!0)]),r("div",Ye,[C.value.length?(i(),z(F(K),{key:0,size:"tiny",type:"error",onClick:be,loading:I.value},{default:p(()=>[U(" 删除选中 ("+k(C.value.length)+") ",1)]),_:1},8,["loading"])):_("",!0),c.value.length?(i(),z(F(K),{key:1,size:"tiny",quaternary:"",onClick:ke},{default:p(()=>[...e[7]||(e[7]=[U("导出 CSV",-1)])]),_:1})):_("",!0)])])]),default:p(()=>[m(O,{show:b.value},{default:p(()=>[r("div",{ref_key:"tableWrapRef",ref:J,class:"overflow-x-auto"},[m(H,{class:"db-data-table",columns:D.value,data:c.value,bordered:!1,"single-line":!1,size:"small","max-height":G.value,"scroll-x":ie.value,"row-key":s=>s._rowid,"checked-row-keys":C.value,"onUpdate:checkedRowKeys":e[2]||(e[2]=s=>C.value=s),striped:""},null,8,["columns","data","max-height","scroll-x","row-key","checked-row-keys"])],512),N.value==="table"&&x.value>$?(i(),S("div",Ae,[m(Q,{page:E.value,"onUpdate:page":[e[3]||(e[3]=s=>E.value=s),ge],"page-count":Math.ceil(x.value/$),"page-size":$,size:"small"},null,8,["page","page-count"])])):_("",!0)]),_:1},8,["show"])]),_:1})):_("",!0),!c.value.length&&!b.value&&g.value?(i(),z(n,{key:1,description:"选择左侧的表查看数据，或输入 SQL 查询",class:"mt-8"})):_("",!0),!g.value&&!y.value?(i(),z(n,{key:2,description:"选择左侧的数据库开始浏览",class:"mt-8"})):_("",!0)])])]),_:1},8,["show"])])}}},ot=Te(Ge,[["__scopeId","data-v-8af2d9cd"]]);export{ot as default};
+`+a],{type:"text/csv;charset=utf-8;"}),l=URL.createObjectURL(n),d=document.createElement("a");d.href=l,d.download=`${f.value||"query"}_${new Date().toISOString().slice(0,10)}.csv`,d.click(),URL.revokeObjectURL(l)}return Ce(()=>{pe(),P=new ResizeObserver(()=>B()),le(()=>{M.value&&P.observe(M.value),B()}),window.addEventListener("resize",B)}),ze(()=>{P&&P.disconnect(),window.removeEventListener("resize",B)}),Se([c,q,()=>v.value,()=>x.value],()=>le(B)),(t,e)=>{const a=R("n-tree"),n=R("n-empty"),l=R("n-card"),d=R("n-input"),H=R("n-data-table"),Q=R("n-pagination"),O=R("n-spin");return i(),S("div",null,[r("div",Oe,[r("div",Ue,[r("div",je,[m(Ee,{name:"cube",size:24})]),e[4]||(e[4]=r("div",null,[r("h1",{class:"ui-page-title"},"数据库"),r("div",{class:"ui-page-sub"},"浏览和查询数据库表")],-1))])]),m(O,{show:y.value},{default:p(()=>[r("div",Ke,[r("div",{ref_key:"leftColRef",ref:M,class:"lg:col-span-1 space-y-3"},[m(l,{size:"small",title:"数据库",style:{background:"var(--bg2)",border:"1px solid var(--border)"}},{default:p(()=>[m(a,{data:Z.value,"selected-keys":A.value,"onUpdate:selectedKeys":fe,"block-line":"",selectable:"","expanded-keys":Y.value,"onUpdate:expandedKeys":e[0]||(e[0]=s=>Y.value=s)},null,8,["data","selected-keys","expanded-keys"]),!Z.value.length&&!y.value?(i(),z(n,{key:0,description:"暂无数据库",size:"small",class:"mt-2"})):_("",!0)]),_:1}),q.value.length?(i(),z(l,{key:0,size:"small",title:"表",style:{background:"var(--bg2)",border:"1px solid var(--border)"}},{default:p(()=>[r("div",$e,[(i(!0),S(ne,null,oe(q.value,s=>(i(),S("div",{key:s.name,class:"flex items-center justify-between px-2 py-1.5 rounded cursor-pointer text-sm transition-colors",style:Re({background:f.value===s.name?"var(--primary-alpha)":"transparent",color:"var(--text1)"}),onClick:Je=>ye(s)},[r("span",We,k(s.name),1),m(F(ce),{size:"tiny",round:"",title:s.estimated?"估算值":""},{default:p(()=>[U(k(s.estimated?"≈":"")+k(s.count),1)]),_:2},1032,["title"])],12,De))),128))])]),_:1})):_("",!0),v.value?(i(),z(l,{key:1,size:"small",title:"表结构",style:{background:"var(--bg2)",border:"1px solid var(--border)"}},{default:p(()=>[r("div",Me,[(i(!0),S(ne,null,oe(v.value.columns,s=>(i(),S("div",{key:s.name,class:"flex gap-2"},[r("span",Pe,k(s.name),1),r("span",Fe,k(s.type)+k(s.pk?" PK":"")+k(s.notnull?" NOT NULL":""),1)]))),128))])]),_:1})):_("",!0)],512),r("div",Ie,[m(l,{size:"small",style:{background:"var(--bg2)",border:"1px solid var(--border)"}},{default:p(()=>[r("div",Ve,[m(d,{value:T.value,"onUpdate:value":e[1]||(e[1]=s=>T.value=s),type:"textarea",placeholder:"输入 SQL 查询 (仅 SELECT)...",autosize:{minRows:1,maxRows:4},class:"flex-1 font-mono text-sm",onKeydown:qe(Le(te,["ctrl"]),["enter"])},null,8,["value","onKeydown"]),m(F(K),{type:"primary",onClick:te,loading:b.value,disabled:!g.value},{default:p(()=>[...e[5]||(e[5]=[U(" 执行 ",-1)])]),_:1},8,["loading","disabled"])]),e[6]||(e[6]=r("div",{class:"text-xs mt-1",style:{color:"var(--text3)"}}," Ctrl+Enter 执行 · 仅允许 SELECT 查询 · 自动限制 500 行 ",-1))]),_:1}),c.value.length||b.value?(i(),z(l,{key:0,size:"small",style:{background:"var(--bg2)",border:"1px solid var(--border)"}},{header:p(()=>[r("div",He,[r("span",Qe,[U(k(N.value==="sql"?"SQL 查询结果":f.value||"数据")+" ",1),x.value>0?(i(),S("span",Xe," ("+k(x.value)+" 行)",1)):_("",!0)]),r("div",Ye,[C.value.length?(i(),z(F(K),{key:0,size:"tiny",type:"error",onClick:be,loading:I.value},{default:p(()=>[U(" 删除选中 ("+k(C.value.length)+") ",1)]),_:1},8,["loading"])):_("",!0),c.value.length?(i(),z(F(K),{key:1,size:"tiny",quaternary:"",onClick:ke},{default:p(()=>[...e[7]||(e[7]=[U("导出 CSV",-1)])]),_:1})):_("",!0)])])]),default:p(()=>[m(O,{show:b.value},{default:p(()=>[r("div",{ref_key:"tableWrapRef",ref:J,class:"overflow-x-auto"},[m(H,{class:"db-data-table",columns:D.value,data:c.value,bordered:!1,"single-line":!1,size:"small","max-height":G.value,"scroll-x":ie.value,"row-key":s=>s._rowid,"checked-row-keys":C.value,"onUpdate:checkedRowKeys":e[2]||(e[2]=s=>C.value=s),striped:""},null,8,["columns","data","max-height","scroll-x","row-key","checked-row-keys"])],512),N.value==="table"&&x.value>$?(i(),S("div",Ae,[m(Q,{page:E.value,"onUpdate:page":[e[3]||(e[3]=s=>E.value=s),ge],"page-count":Math.ceil(x.value/$),"page-size":$,size:"small"},null,8,["page","page-count"])])):_("",!0)]),_:1},8,["show"])]),_:1})):_("",!0),!c.value.length&&!b.value&&g.value?(i(),z(n,{key:1,description:"选择左侧的表查看数据，或输入 SQL 查询",class:"mt-8"})):_("",!0),!g.value&&!y.value?(i(),z(n,{key:2,description:"选择左侧的数据库开始浏览",class:"mt-8"})):_("",!0)])])]),_:1},8,["show"])])}}},ot=Te(Ge,[["__scopeId","data-v-8af2d9cd"]]);export{ot as default};
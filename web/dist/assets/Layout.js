@@ -1 +1 @@
-var S=(H,B,w)=>new Promise((t,$)=>{var P=u=>{try{b(w.next(u))}catch(C){$(C)}},E=u=>{try{b(w.throw(u))}catch(C){$(C)}},b=u=>u.done?t(u.value):Promise.resolve(u.value).then(P,E);b((w=w.apply(H,B)).next())});import{o as ye,E as ke,a1 as i,a6 as f,a2 as o,N as a,Z as n,F as g,R as N,L as h,a7 as d,j as y,V as D,Y as c,I as U,r as q,c as K,W as k,a4 as he,a3 as ge,X as l,a5 as ee,z as we,a8 as ze}from"./vue.js";import{u as qe}from"./app.js";import{u as Ce,a as Be,i as te}from"./index.js";import{c as We,o as se,a as ae,d as xe}from"./ws.js";import{S as v}from"./SvgIcon.js";import{_ as Se}from"./_plugin-vue_export-helper.js";import"./vendor.js";import"./naive.js";const $e={class:"layout-root"},Pe={class:"sidebar-logo"},Ee={key:0},Ae={key:0,class:"sidebar-bot-select"},De={class:"sidebar-nav"},Ue=["onClick"],Ie={key:0},Ne={key:0,class:"nav-divider"},Le=["onClick"],Me={key:0,class:"nav-label-with-badge"},Re={class:"main-area"},Te={class:"topbar"},Ve={class:"topbar-left"},He={class:"bot-selector"},Oe={class:"bot-qq"},Fe=["src"],Qe={key:1,class:"bot-avatar-letter"},je={class:"bot-name"},Ge={class:"bot-switch-list"},Xe={class:"bot-qq"},Ye=["onClick"],Ze=["src"],Je={key:3,class:"ws-dot offline"},Ke={class:"bot-info-col"},et={class:"bot-qq"},tt={key:2,class:"bot-selector"},st=["src"],at={key:1,class:"bot-avatar-letter"},ot={class:"bot-name"},nt={class:"bot-avatar-letter",style:{opacity:"0.4"}},lt={class:"bot-name",style:{opacity:"0.5"}},it={class:"topbar-right"},ct={href:"https://github.com/ElainaCore/ElainaBot-Onebot",target:"_blank",rel:"noopener",title:"GitHub",class:"github-link"},rt={class:"theme-picker"},dt=["onClick"],ut={class:"content"},pt={key:0,class:"bot-detail"},vt={class:"bd-header"},mt={key:1,class:"bd-avatar-placeholder"},_t={class:"bd-header-info"},bt={class:"bd-name"},ft={class:"bd-sub"},yt="/web/favicon.svg",kt={__name:"Layout",setup(H){const B=ge(),w=he(),t=qe(),$=Ce(),P=Be(),E=q(!1),b=q(!1),u=q(!1),C=q(!1),I=q(!1),oe=[{label:"仪表盘",key:"Dashboard",icon:"home"},{label:"全局日志",key:"Logs",icon:"document-text"},{label:"插件模块",key:"Plugins",icon:"extension-puzzle"},{label:"数据库",key:"Database",icon:"server"},{label:"消息记录",key:"Messages",icon:"chatbubbles"},{label:"可视统计",key:"Statistics",icon:"stats-chart"},{label:"插件市场",key:"Market",icon:"storefront"},{label:"网络配置",key:"Network",icon:"link"},{label:"框架配置",key:"Config",icon:"settings"},{label:"框架更新",key:"Update",icon:"cloud-download"}],ne=K(()=>w.name),le=K(()=>[...t.bots.length>1?[{label:"全部机器人",value:""}]:[],...t.bots.map(r=>({label:r.name||r.bot_qq,value:r.bot_qq}))]),L=q(!1),p=q(null),A=q("");function M(r,s){return S(this,null,function*(){var m,W;A.value=r.bot_qq;const z=yield t.toggleBot(r.bot_qq,s);A.value="",z?(m=window.$message)==null||m.success(s?"机器人已启用":"机器人已关闭"):(W=window.$message)==null||W.error("操作失败")})}function ie(r){B.push({name:r}),b.value=!1}function ce(r){B.push({name:"CustomPage",params:{key:r}}),b.value=!1}function re(){return S(this,null,function*(){var r,s;C.value=!0;try{yield te.post("/api/bot/restart"),(r=window.$message)!=null&&r.success("重启指令已发送，请等待服务恢复...")||alert("重启指令已发送")}catch(z){(s=window.$message)!=null&&s.error("重启失败")||alert("重启失败")}finally{C.value=!1}})}function R(){u.value=window.innerWidth<768}function O(){E.value=!0}function F(){E.value=!1}function Q(r){p.value=r,L.value=!0}function de(){B.push({name:"Config"})}function ue(){return S(this,null,function*(){var r,s;try{const z=yield te.get("/api/auth/password-status"),m=!!((r=z.data)!=null&&r.is_default||(s=z.data)!=null&&s.is_weak);I.value=m,m||localStorage.removeItem("elaina_weak_pwd");return}catch(z){}$.isWeakPassword&&(I.value=!0)})}function pe(){return S(this,null,function*(){try{if("caches"in window){const r=yield caches.keys();yield Promise.all(r.map(s=>caches.delete(s)))}if("serviceWorker"in navigator){const r=yield navigator.serviceWorker.getRegistrations();yield Promise.all(r.map(s=>s.unregister()))}localStorage.clear(),sessionStorage.clear(),window.location.href=window.location.pathname+"?_t="+Date.now()}catch(r){window.location.href=window.location.pathname+"?_t="+Date.now()}})}function ve(){$.logout(),B.push("/login")}return ye(()=>S(this,null,function*(){R(),window.addEventListener("resize",R),yield t.ensureBots(),t.fetchSystemInfo(),yield t.fetchWebPages(),We(),se("open",O),se("close",F),ue()})),ke(()=>{window.removeEventListener("resize",R),ae("open",O),ae("close",F),xe()}),(r,s)=>{const z=k("n-select"),m=k("n-tag"),W=k("n-switch"),x=k("n-button"),j=k("n-popover"),me=k("n-popconfirm"),_e=k("router-view"),G=k("n-modal"),be=k("n-avatar"),T=k("n-descriptions-item"),fe=k("n-descriptions");return l(),i("div",$e,[b.value?(l(),i("div",{key:0,class:"mobile-overlay",onClick:s[0]||(s[0]=e=>b.value=!1)})):f("",!0),o("aside",{class:h(["sidebar",{open:b.value,collapsed:a(t).sidebarCollapsed&&!u.value}])},[o("div",Pe,[o("img",{class:"logo-icon",src:yt,alt:"Elaina"}),!a(t).sidebarCollapsed||u.value?(l(),i("span",Ee,"Elaina")):f("",!0)]),(!a(t).sidebarCollapsed||u.value)&&a(t).bots.length>1?(l(),i("div",Ae,[n(z,{value:a(t).currentBotId,"onUpdate:value":[s[1]||(s[1]=e=>a(t).currentBotId=e),a(t).switchBot],options:le.value,size:"small",placeholder:"全部机器人"},null,8,["value","options","onUpdate:value"])])):f("",!0),o("nav",De,[(l(),i(g,null,N(oe,e=>o("a",{key:e.key,class:h(["nav-item",{active:ne.value===e.key}]),onClick:_=>ie(e.key)},[n(v,{name:e.icon,size:18},null,8,["name"]),!a(t).sidebarCollapsed||u.value?(l(),i("span",Ie,d(e.label),1)):f("",!0)],10,Ue)),64)),a(t).webPages.length?(l(),i(g,{key:0},[!a(t).sidebarCollapsed||u.value?(l(),i("div",Ne,"扩展页面")):f("",!0),(l(!0),i(g,null,N(a(t).webPages,e=>(l(),i("a",{key:e.key,class:h(["nav-item",{active:a(w).params.key===e.key&&a(w).name==="CustomPage"}]),onClick:_=>ce(e.key)},[n(v,{name:"extension-puzzle",size:18}),!a(t).sidebarCollapsed||u.value?(l(),i("span",Me,[y(d(e.label)+" ",1),n(v,{name:e.source==="module"?"cube":"link",size:12,class:"nav-badge"},null,8,["name"])])):f("",!0)],10,Le))),128))],64)):f("",!0)]),u.value?f("",!0):(l(),i("div",{key:1,class:"sidebar-toggle",onClick:s[2]||(s[2]=e=>a(t).sidebarCollapsed=!a(t).sidebarCollapsed)},[n(v,{name:a(t).sidebarCollapsed?"chevron-forward":"chevron-back",size:16},null,8,["name"])]))],2),o("div",Re,[o("header",Te,[o("div",Ve,[u.value?(l(),i("button",{key:0,class:"hamburger",onClick:s[3]||(s[3]=e=>b.value=!b.value)},[n(v,{name:"menu",size:22})])):f("",!0),a(t).bots.length>1?(l(),D(j,{key:1,trigger:"click",placement:"bottom-start"},{trigger:c(()=>{var e,_,V,X,Y,Z;return[o("div",He,[a(t).isAllBots?(l(),i(g,{key:0},[s[11]||(s[11]=o("span",{class:"ws-dot online"},null,-1)),s[12]||(s[12]=o("span",{class:"bot-name"},"全部机器人",-1)),o("span",Oe,d(a(t).bots.length)+" 个",1)],64)):(l(),i(g,{key:1},[(e=a(t).currentBot)!=null&&e.avatar?(l(),i("img",{key:0,src:a(t).currentBot.avatar,class:"bot-avatar-tiny"},null,8,Fe)):(l(),i("span",Qe,d((((_=a(t).currentBot)==null?void 0:_.name)||"?").charAt(0)),1)),o("span",{class:h(["ws-dot",(V=a(t).currentBot)!=null&&V.connected?"online":((X=a(t).currentBot)==null?void 0:X.connection_type)==="Webhook"?"waiting":"offline"])},null,2),o("span",je,d(((Y=a(t).currentBot)==null?void 0:Y.name)||"未知"),1),n(m,{bordered:!1,size:"tiny",type:((Z=a(t).currentBot)==null?void 0:Z.connection_type)==="Webhook"?"info":"success",style:{"font-size":"10px"}},{default:c(()=>{var J;return[y(d(((J=a(t).currentBot)==null?void 0:J.connection_type)==="Webhook"?"WH":"WS"),1)]}),_:1},8,["type"])],64)),n(v,{name:"chevron-forward",size:14,style:{transform:"rotate(90deg)",opacity:"0.5"}})])]}),default:c(()=>[o("div",Ge,[o("div",{class:h(["bot-switch-item",{active:a(t).isAllBots}]),onClick:s[4]||(s[4]=e=>a(t).switchBot(""))},[s[13]||(s[13]=o("span",{class:"ws-dot online"},null,-1)),s[14]||(s[14]=o("span",{class:"bot-name"},"全部机器人",-1)),o("span",Xe,d(a(t).bots.length)+" 个",1)],2),(l(!0),i(g,null,N(a(t).bots,e=>(l(),i("div",{key:e.bot_qq,class:h(["bot-switch-item",{active:e.bot_qq===a(t).currentBotId,disabled:e.enabled===!1}]),onClick:_=>e.enabled!==!1&&a(t).switchBot(e.bot_qq)},[e.avatar?(l(),i("img",{key:0,src:e.avatar,class:"bot-avatar-tiny",style:U(e.enabled===!1?"opacity:0.4":"")},null,12,Ze)):(l(),i("span",{key:1,class:"bot-avatar-letter",style:U(e.enabled===!1?"opacity:0.4":"")},d((e.name||e.bot_qq).charAt(0)),5)),e.enabled!==!1?(l(),i("span",{key:2,class:h(["ws-dot",e.connected?"online":e.connection_type==="Webhook"?"waiting":"offline"])},null,2)):(l(),i("span",Je)),o("span",Ke,[o("span",{class:"bot-name",style:U(e.enabled===!1?"opacity:0.5":"")},d(e.name||e.bot_qq),5),o("span",et,d(e.bot_qq),1)]),e.enabled!==!1?(l(),D(m,{key:4,bordered:!1,size:"tiny",type:e.connection_type==="Webhook"?"info":"success",style:{"font-size":"10px","flex-shrink":"0"}},{default:c(()=>[y(d(e.connection_type==="Webhook"?"WH":"WS"),1)]),_:2},1032,["type"])):(l(),D(m,{key:5,bordered:!1,size:"tiny",type:"warning",style:{"font-size":"10px","flex-shrink":"0"}},{default:c(()=>[...s[15]||(s[15]=[y("已关闭",-1)])]),_:1})),n(W,{size:"small",value:e.enabled!==!1,loading:A.value===e.bot_qq,onClick:s[5]||(s[5]=ee(()=>{},["stop"])),"onUpdate:value":_=>M(e,_)},null,8,["value","loading","onUpdate:value"]),n(x,{quaternary:"",circle:"",size:"tiny",onClick:ee(_=>Q(e),["stop"]),title:"详情",style:{"flex-shrink":"0"}},{icon:c(()=>[n(v,{name:"information-circle",size:14})]),_:1},8,["onClick"])],10,Ye))),128))])]),_:1})):a(t).bots.length===1?(l(),i("div",tt,[a(t).bots[0].enabled!==!1?(l(),i(g,{key:0},[a(t).bots[0].avatar?(l(),i("img",{key:0,src:a(t).bots[0].avatar,class:"bot-avatar-tiny"},null,8,st)):(l(),i("span",at,d((a(t).bots[0].name||"?").charAt(0)),1)),o("span",{class:h(["ws-dot",a(t).bots[0].connected?"online":a(t).bots[0].connection_type==="Webhook"?"waiting":"offline"])},null,2),o("span",ot,d(a(t).bots[0].name||"未知"),1),n(m,{bordered:!1,size:"tiny",type:a(t).bots[0].connection_type==="Webhook"?"info":"success",style:{"font-size":"10px"}},{default:c(()=>[y(d(a(t).bots[0].connection_type==="Webhook"?"WH":"WS"),1)]),_:1},8,["type"])],64)):(l(),i(g,{key:1},[o("span",nt,d((a(t).bots[0].name||"?").charAt(0)),1),s[17]||(s[17]=o("span",{class:"ws-dot offline"},null,-1)),o("span",lt,d(a(t).bots[0].name||"未知"),1),n(m,{bordered:!1,size:"tiny",type:"warning",style:{"font-size":"10px"}},{default:c(()=>[...s[16]||(s[16]=[y("已关闭",-1)])]),_:1})],64)),n(W,{size:"small",value:a(t).bots[0].enabled!==!1,loading:A.value===a(t).bots[0].bot_qq,"onUpdate:value":s[6]||(s[6]=e=>M(a(t).bots[0],e)),style:{"margin-left":"4px"}},null,8,["value","loading"]),n(x,{quaternary:"",circle:"",size:"tiny",onClick:s[7]||(s[7]=e=>Q(a(t).bots[0])),title:"详情"},{icon:c(()=>[n(v,{name:"information-circle",size:14})]),_:1})])):f("",!0),o("span",{class:h(["ws-dot ws-main",E.value?"online":"offline"]),title:"WebSocket"},null,2)]),o("div",it,[o("a",ct,[n(v,{name:"github",size:18})]),n(j,{trigger:"click",placement:"bottom-end"},{trigger:c(()=>[n(x,{quaternary:"",circle:"",size:"small",title:"主题"},{icon:c(()=>[n(v,{name:"color-palette",size:18})]),_:1})]),default:c(()=>[o("div",rt,[(l(!0),i(g,null,N(a(P).THEMES,(e,_)=>(l(),i("div",{key:_,class:h(["theme-opt",{active:a(P).themeName===_}]),onClick:V=>a(P).setTheme(_)},[o("span",{class:"theme-dot",style:U({background:e.accent})},null,4),y(" "+d(e.name),1)],10,dt))),128))])]),_:1}),n(x,{quaternary:"",circle:"",size:"small",title:"清除缓存",onClick:pe},{icon:c(()=>[n(v,{name:"trash",size:18})]),_:1}),n(me,{onPositiveClick:re,"positive-text":"确认重启","negative-text":"取消"},{trigger:c(()=>[n(x,{quaternary:"",circle:"",size:"small",loading:C.value},{icon:c(()=>[n(v,{name:"refresh",size:18})]),_:1},8,["loading"])]),default:c(()=>[s[18]||(s[18]=y(" 确定要重启机器人吗？重启期间服务将暂时不可用。 ",-1))]),_:1}),n(x,{quaternary:"",circle:"",size:"small",onClick:ve},{icon:c(()=>[n(v,{name:"log-out",size:18})]),_:1})])]),o("main",ut,[n(_e,null,{default:c(({Component:e})=>[n(we,{name:"page",mode:"out-in"},{default:c(()=>[(l(),D(ze(e)))]),_:2},1024)]),_:1})])]),n(G,{show:I.value,"onUpdate:show":s[8]||(s[8]=e=>I.value=e),preset:"dialog",type:"warning",title:"安全提醒","positive-text":"前往修改",onPositiveClick:de,closable:"","mask-closable":""},{default:c(()=>[...s[19]||(s[19]=[y(" 检测到当前 Web 面板使用的是默认密码，存在安全风险，请尽快修改。 ",-1)])]),_:1},8,["show"]),n(G,{show:L.value,"onUpdate:show":s[10]||(s[10]=e=>L.value=e),preset:"card",title:"机器人详情",style:U({width:u.value?"95vw":"600px",maxWidth:"600px",background:"var(--bg2)"})},{default:c(()=>[p.value?(l(),i("div",pt,[o("div",vt,[p.value.avatar?(l(),D(be,{key:0,src:p.value.avatar,size:72,round:""},null,8,["src"])):(l(),i("div",mt,d((p.value.name||p.value.bot_qq).charAt(0)),1)),o("div",_t,[o("div",bt,d(p.value.name||"未知机器人"),1),o("div",ft,"QQ: "+d(p.value.qq||p.value.bot_qq),1),s[20]||(s[20]=o("div",{class:"bd-sub"},"OneBot v11 协议机器人",-1))])]),n(fe,{column:2,"label-placement":"left",size:"small",class:"bd-info"},{default:c(()=>[n(T,{label:"机器人开关"},{default:c(()=>[n(W,{size:"small",value:p.value.enabled!==!1,loading:A.value===p.value.bot_qq,"onUpdate:value":s[9]||(s[9]=e=>M(p.value,e))},null,8,["value","loading"])]),_:1}),n(T,{label:"状态"},{default:c(()=>[n(m,{type:p.value.connected?"success":"error",size:"small"},{default:c(()=>[y(d(p.value.connected?"已连接":"未连接"),1)]),_:1},8,["type"])]),_:1}),n(T,{label:"连接方式"},{default:c(()=>[y(d(p.value.connection_type||"WebSocket"),1)]),_:1})]),_:1})])):f("",!0)]),_:1},8,["show","style"])])}}},St=Se(kt,[["__scopeId","data-v-d6ce85ee"]]);export{St as default};
+var S=(H,B,w)=>new Promise((t,$)=>{var P=u=>{try{b(w.next(u))}catch(C){$(C)}},E=u=>{try{b(w.throw(u))}catch(C){$(C)}},b=u=>u.done?t(u.value):Promise.resolve(u.value).then(P,E);b((w=w.apply(H,B)).next())});import{w as Sw,o as ye,E as ke,a1 as i,a6 as f,a2 as o,N as a,Z as n,F as g,R as N,L as h,a7 as d,j as y,V as D,Y as c,I as U,r as q,c as K,W as k,a4 as he,a3 as ge,X as l,a5 as ee,z as we,a8 as ze}from"./vue.js";import{u as qe}from"./app.js";import{u as Ce,a as Be,i as te}from"./index.js";import{c as We,o as se,a as ae,d as xe,s as Sb}from"./ws.js";import{S as v}from"./SvgIcon.js";import{_ as Se}from"./_plugin-vue_export-helper.js";import"./vendor.js";import"./naive.js";const $e={class:"layout-root"},Pe={class:"sidebar-logo"},Ee={key:0},Ae={key:0,class:"sidebar-bot-select"},De={class:"sidebar-nav"},Ue=["onClick"],Ie={key:0},Ne={key:0,class:"nav-divider"},Le=["onClick"],Me={key:0,class:"nav-label-with-badge"},Re={class:"main-area"},Te={class:"topbar"},Ve={class:"topbar-left"},He={class:"bot-selector"},Oe={class:"bot-qq"},Fe=["src"],Qe={key:1,class:"bot-avatar-letter"},je={class:"bot-name"},Ge={class:"bot-switch-list"},Xe={class:"bot-qq"},Ye=["onClick"],Ze=["src"],Je={key:3,class:"ws-dot offline"},Ke={class:"bot-info-col"},et={class:"bot-qq"},tt={key:2,class:"bot-selector"},st=["src"],at={key:1,class:"bot-avatar-letter"},ot={class:"bot-name"},nt={class:"bot-avatar-letter",style:{opacity:"0.4"}},lt={class:"bot-name",style:{opacity:"0.5"}},it={class:"topbar-right"},ct={href:"https://github.com/ElainaCore/ElainaBot-Onebot",target:"_blank",rel:"noopener",title:"GitHub",class:"github-link"},rt={class:"theme-picker"},dt=["onClick"],ut={class:"content"},pt={key:0,class:"bot-detail"},vt={class:"bd-header"},mt={key:1,class:"bd-avatar-placeholder"},_t={class:"bd-header-info"},bt={class:"bd-name"},ft={class:"bd-sub"},yt="/web/favicon.svg",kt={__name:"Layout",setup(H){const B=ge(),w=he(),t=qe(),$=Ce(),P=Be(),E=q(!1),b=q(!1),u=q(!1),C=q(!1),I=q(!1),oe=[{label:"仪表盘",key:"Dashboard",icon:"home"},{label:"全局日志",key:"Logs",icon:"document-text"},{label:"插件模块",key:"Plugins",icon:"extension-puzzle"},{label:"数据库",key:"Database",icon:"server"},{label:"消息记录",key:"Messages",icon:"chatbubbles"},{label:"可视统计",key:"Statistics",icon:"stats-chart"},{label:"插件市场",key:"Market",icon:"storefront"},{label:"网络配置",key:"Network",icon:"link"},{label:"框架配置",key:"Config",icon:"settings"},{label:"框架更新",key:"Update",icon:"cloud-download"}],ne=K(()=>w.name),le=K(()=>[...t.bots.length>1?[{label:"全部机器人",value:""}]:[],...t.bots.map(r=>({label:r.name||r.bot_qq,value:r.bot_qq}))]),L=q(!1),p=q(null),A=q("");function M(r,s){return S(this,null,function*(){var m,W;A.value=r.bot_qq;const z=yield t.toggleBot(r.bot_qq,s);A.value="",z?(m=window.$message)==null||m.success(s?"机器人已启用":"机器人已关闭"):(W=window.$message)==null||W.error("操作失败")})}function ie(r){B.push({name:r}),b.value=!1}function ce(r){B.push({name:"CustomPage",params:{key:r}}),b.value=!1}function re(){return S(this,null,function*(){var r,s;C.value=!0;try{yield te.post("/api/bot/restart"),(r=window.$message)!=null&&r.success("重启指令已发送，请等待服务恢复...")||alert("重启指令已发送")}catch(z){(s=window.$message)!=null&&s.error("重启失败")||alert("重启失败")}finally{C.value=!1}})}function R(){u.value=window.innerWidth<768}function O(){E.value=!0}function F(){E.value=!1}function Q(r){p.value=r,L.value=!0}function de(){B.push({name:"Config"})}function ue(){return S(this,null,function*(){var r,s;try{const z=yield te.get("/api/auth/password-status"),m=!!((r=z.data)!=null&&r.is_default||(s=z.data)!=null&&s.is_weak);I.value=m,m||localStorage.removeItem("elaina_weak_pwd");return}catch(z){}$.isWeakPassword&&(I.value=!0)})}function pe(){return S(this,null,function*(){try{if("caches"in window){const r=yield caches.keys();yield Promise.all(r.map(s=>caches.delete(s)))}if("serviceWorker"in navigator){const r=yield navigator.serviceWorker.getRegistrations();yield Promise.all(r.map(s=>s.unregister()))}localStorage.clear(),sessionStorage.clear(),window.location.href=window.location.pathname+"?_t="+Date.now()}catch(r){window.location.href=window.location.pathname+"?_t="+Date.now()}})}function ve(){$.logout(),B.push("/login")}return ye(()=>S(this,null,function*(){R(),window.addEventListener("resize",R),yield t.ensureBots(),t.fetchSystemInfo(),yield t.fetchWebPages(),Sb(t.currentBotId?{bots:[t.currentBotId]}:null),We(),se("open",O),se("close",F),ue()})),Sw(()=>t.currentBotId,Q=>Sb(Q?{bots:[Q]}:null)),ke(()=>{window.removeEventListener("resize",R),ae("open",O),ae("close",F),xe()}),(r,s)=>{const z=k("n-select"),m=k("n-tag"),W=k("n-switch"),x=k("n-button"),j=k("n-popover"),me=k("n-popconfirm"),_e=k("router-view"),G=k("n-modal"),be=k("n-avatar"),T=k("n-descriptions-item"),fe=k("n-descriptions");return l(),i("div",$e,[b.value?(l(),i("div",{key:0,class:"mobile-overlay",onClick:s[0]||(s[0]=e=>b.value=!1)})):f("",!0),o("aside",{class:h(["sidebar",{open:b.value,collapsed:a(t).sidebarCollapsed&&!u.value}])},[o("div",Pe,[o("img",{class:"logo-icon",src:yt,alt:"Elaina"}),!a(t).sidebarCollapsed||u.value?(l(),i("span",Ee,"Elaina")):f("",!0)]),(!a(t).sidebarCollapsed||u.value)&&a(t).bots.length>1?(l(),i("div",Ae,[n(z,{value:a(t).currentBotId,"onUpdate:value":[s[1]||(s[1]=e=>a(t).currentBotId=e),a(t).switchBot],options:le.value,size:"small",placeholder:"全部机器人"},null,8,["value","options","onUpdate:value"])])):f("",!0),o("nav",De,[(l(),i(g,null,N(oe,e=>o("a",{key:e.key,class:h(["nav-item",{active:ne.value===e.key}]),onClick:_=>ie(e.key)},[n(v,{name:e.icon,size:18},null,8,["name"]),!a(t).sidebarCollapsed||u.value?(l(),i("span",Ie,d(e.label),1)):f("",!0)],10,Ue)),64)),a(t).webPages.length?(l(),i(g,{key:0},[!a(t).sidebarCollapsed||u.value?(l(),i("div",Ne,"扩展页面")):f("",!0),(l(!0),i(g,null,N(a(t).webPages,e=>(l(),i("a",{key:e.key,class:h(["nav-item",{active:a(w).params.key===e.key&&a(w).name==="CustomPage"}]),onClick:_=>ce(e.key)},[n(v,{name:"extension-puzzle",size:18}),!a(t).sidebarCollapsed||u.value?(l(),i("span",Me,[y(d(e.label)+" ",1),n(v,{name:e.source==="module"?"cube":"link",size:12,class:"nav-badge"},null,8,["name"])])):f("",!0)],10,Le))),128))],64)):f("",!0)]),u.value?f("",!0):(l(),i("div",{key:1,class:"sidebar-toggle",onClick:s[2]||(s[2]=e=>a(t).sidebarCollapsed=!a(t).sidebarCollapsed)},[n(v,{name:a(t).sidebarCollapsed?"chevron-forward":"chevron-back",size:16},null,8,["name"])]))],2),o("div",Re,[o("header",Te,[o("div",Ve,[u.value?(l(),i("button",{key:0,class:"hamburger",onClick:s[3]||(s[3]=e=>b.value=!b.value)},[n(v,{name:"menu",size:22})])):f("",!0),a(t).bots.length>1?(l(),D(j,{key:1,trigger:"click",placement:"bottom-start"},{trigger:c(()=>{var e,_,V,X,Y,Z;return[o("div",He,[a(t).isAllBots?(l(),i(g,{key:0},[s[11]||(s[11]=o("span",{class:"ws-dot online"},null,-1)),s[12]||(s[12]=o("span",{class:"bot-name"},"全部机器人",-1)),o("span",Oe,d(a(t).bots.length)+" 个",1)],64)):(l(),i(g,{key:1},[(e=a(t).currentBot)!=null&&e.avatar?(l(),i("img",{key:0,src:a(t).currentBot.avatar,class:"bot-avatar-tiny"},null,8,Fe)):(l(),i("span",Qe,d((((_=a(t).currentBot)==null?void 0:_.name)||"?").charAt(0)),1)),o("span",{class:h(["ws-dot",(V=a(t).currentBot)!=null&&V.connected?"online":((X=a(t).currentBot)==null?void 0:X.connection_type)==="Webhook"?"waiting":"offline"])},null,2),o("span",je,d(((Y=a(t).currentBot)==null?void 0:Y.name)||"未知"),1),n(m,{bordered:!1,size:"tiny",type:((Z=a(t).currentBot)==null?void 0:Z.connection_type)==="Webhook"?"info":"success",style:{"font-size":"10px"}},{default:c(()=>{var J;return[y(d(((J=a(t).currentBot)==null?void 0:J.connection_type)==="Webhook"?"WH":"WS"),1)]}),_:1},8,["type"])],64)),n(v,{name:"chevron-forward",size:14,style:{transform:"rotate(90deg)",opacity:"0.5"}})])]}),default:c(()=>[o("div",Ge,[o("div",{class:h(["bot-switch-item",{active:a(t).isAllBots}]),onClick:s[4]||(s[4]=e=>a(t).switchBot(""))},[s[13]||(s[13]=o("span",{class:"ws-dot online"},null,-1)),s[14]||(s[14]=o("span",{class:"bot-name"},"全部机器人",-1)),o("span",Xe,d(a(t).bots.length)+" 个",1)],2),(l(!0),i(g,null,N(a(t).bots,e=>(l(),i("div",{key:e.bot_qq,class:h(["bot-switch-item",{active:e.bot_qq===a(t).currentBotId,disabled:e.enabled===!1}]),onClick:_=>e.enabled!==!1&&a(t).switchBot(e.bot_qq)},[e.avatar?(l(),i("img",{key:0,src:e.avatar,class:"bot-avatar-tiny",style:U(e.enabled===!1?"opacity:0.4":"")},null,12,Ze)):(l(),i("span",{key:1,class:"bot-avatar-letter",style:U(e.enabled===!1?"opacity:0.4":"")},d((e.name||e.bot_qq).charAt(0)),5)),e.enabled!==!1?(l(),i("span",{key:2,class:h(["ws-dot",e.connected?"online":e.connection_type==="Webhook"?"waiting":"offline"])},null,2)):(l(),i("span",Je)),o("span",Ke,[o("span",{class:"bot-name",style:U(e.enabled===!1?"opacity:0.5":"")},d(e.name||e.bot_qq),5),o("span",et,d(e.bot_qq),1)]),e.enabled!==!1?(l(),D(m,{key:4,bordered:!1,size:"tiny",type:e.connection_type==="Webhook"?"info":"success",style:{"font-size":"10px","flex-shrink":"0"}},{default:c(()=>[y(d(e.connection_type==="Webhook"?"WH":"WS"),1)]),_:2},1032,["type"])):(l(),D(m,{key:5,bordered:!1,size:"tiny",type:"warning",style:{"font-size":"10px","flex-shrink":"0"}},{default:c(()=>[...s[15]||(s[15]=[y("已关闭",-1)])]),_:1})),n(W,{size:"small",value:e.enabled!==!1,loading:A.value===e.bot_qq,onClick:s[5]||(s[5]=ee(()=>{},["stop"])),"onUpdate:value":_=>M(e,_)},null,8,["value","loading","onUpdate:value"]),n(x,{quaternary:"",circle:"",size:"tiny",onClick:ee(_=>Q(e),["stop"]),title:"详情",style:{"flex-shrink":"0"}},{icon:c(()=>[n(v,{name:"information-circle",size:14})]),_:1},8,["onClick"])],10,Ye))),128))])]),_:1})):a(t).bots.length===1?(l(),i("div",tt,[a(t).bots[0].enabled!==!1?(l(),i(g,{key:0},[a(t).bots[0].avatar?(l(),i("img",{key:0,src:a(t).bots[0].avatar,class:"bot-avatar-tiny"},null,8,st)):(l(),i("span",at,d((a(t).bots[0].name||"?").charAt(0)),1)),o("span",{class:h(["ws-dot",a(t).bots[0].connected?"online":a(t).bots[0].connection_type==="Webhook"?"waiting":"offline"])},null,2),o("span",ot,d(a(t).bots[0].name||"未知"),1),n(m,{bordered:!1,size:"tiny",type:a(t).bots[0].connection_type==="Webhook"?"info":"success",style:{"font-size":"10px"}},{default:c(()=>[y(d(a(t).bots[0].connection_type==="Webhook"?"WH":"WS"),1)]),_:1},8,["type"])],64)):(l(),i(g,{key:1},[o("span",nt,d((a(t).bots[0].name||"?").charAt(0)),1),s[17]||(s[17]=o("span",{class:"ws-dot offline"},null,-1)),o("span",lt,d(a(t).bots[0].name||"未知"),1),n(m,{bordered:!1,size:"tiny",type:"warning",style:{"font-size":"10px"}},{default:c(()=>[...s[16]||(s[16]=[y("已关闭",-1)])]),_:1})],64)),n(W,{size:"small",value:a(t).bots[0].enabled!==!1,loading:A.value===a(t).bots[0].bot_qq,"onUpdate:value":s[6]||(s[6]=e=>M(a(t).bots[0],e)),style:{"margin-left":"4px"}},null,8,["value","loading"]),n(x,{quaternary:"",circle:"",size:"tiny",onClick:s[7]||(s[7]=e=>Q(a(t).bots[0])),title:"详情"},{icon:c(()=>[n(v,{name:"information-circle",size:14})]),_:1})])):f("",!0),o("span",{class:h(["ws-dot ws-main",E.value?"online":"offline"]),title:"WebSocket"},null,2)]),o("div",it,[o("a",ct,[n(v,{name:"github",size:18})]),n(j,{trigger:"click",placement:"bottom-end"},{trigger:c(()=>[n(x,{quaternary:"",circle:"",size:"small",title:"主题"},{icon:c(()=>[n(v,{name:"color-palette",size:18})]),_:1})]),default:c(()=>[o("div",rt,[(l(!0),i(g,null,N(a(P).THEMES,(e,_)=>(l(),i("div",{key:_,class:h(["theme-opt",{active:a(P).themeName===_}]),onClick:V=>a(P).setTheme(_)},[o("span",{class:"theme-dot",style:U({background:e.accent})},null,4),y(" "+d(e.name),1)],10,dt))),128))])]),_:1}),n(x,{quaternary:"",circle:"",size:"small",title:"清除缓存",onClick:pe},{icon:c(()=>[n(v,{name:"trash",size:18})]),_:1}),n(me,{onPositiveClick:re,"positive-text":"确认重启","negative-text":"取消"},{trigger:c(()=>[n(x,{quaternary:"",circle:"",size:"small",loading:C.value},{icon:c(()=>[n(v,{name:"refresh",size:18})]),_:1},8,["loading"])]),default:c(()=>[s[18]||(s[18]=y(" 确定要重启机器人吗？重启期间服务将暂时不可用。 ",-1))]),_:1}),n(x,{quaternary:"",circle:"",size:"small",onClick:ve},{icon:c(()=>[n(v,{name:"log-out",size:18})]),_:1})])]),o("main",ut,[n(_e,null,{default:c(({Component:e})=>[n(we,{name:"page",mode:"out-in"},{default:c(()=>[(l(),D(ze(e)))]),_:2},1024)]),_:1})])]),n(G,{show:I.value,"onUpdate:show":s[8]||(s[8]=e=>I.value=e),preset:"dialog",type:"warning",title:"安全提醒","positive-text":"前往修改",onPositiveClick:de,closable:"","mask-closable":""},{default:c(()=>[...s[19]||(s[19]=[y(" 检测到当前 Web 面板使用的是默认密码，存在安全风险，请尽快修改。 ",-1)])]),_:1},8,["show"]),n(G,{show:L.value,"onUpdate:show":s[10]||(s[10]=e=>L.value=e),preset:"card",title:"机器人详情",style:U({width:u.value?"95vw":"600px",maxWidth:"600px",background:"var(--bg2)"})},{default:c(()=>[p.value?(l(),i("div",pt,[o("div",vt,[p.value.avatar?(l(),D(be,{key:0,src:p.value.avatar,size:72,round:""},null,8,["src"])):(l(),i("div",mt,d((p.value.name||p.value.bot_qq).charAt(0)),1)),o("div",_t,[o("div",bt,d(p.value.name||"未知机器人"),1),o("div",ft,"QQ: "+d(p.value.qq||p.value.bot_qq),1),s[20]||(s[20]=o("div",{class:"bd-sub"},"OneBot v11 协议机器人",-1))])]),n(fe,{column:2,"label-placement":"left",size:"small",class:"bd-info"},{default:c(()=>[n(T,{label:"机器人开关"},{default:c(()=>[n(W,{size:"small",value:p.value.enabled!==!1,loading:A.value===p.value.bot_qq,"onUpdate:value":s[9]||(s[9]=e=>M(p.value,e))},null,8,["value","loading"])]),_:1}),n(T,{label:"状态"},{default:c(()=>[n(m,{type:p.value.connected?"success":"error",size:"small"},{default:c(()=>[y(d(p.value.connected?"已连接":"未连接"),1)]),_:1},8,["type"])]),_:1}),n(T,{label:"连接方式"},{default:c(()=>[y(d(p.value.connection_type||"WebSocket"),1)]),_:1})]),_:1})])):f("",!0)]),_:1},8,["show","style"])])}}},St=Se(kt,[["__scopeId","data-v-d6ce85ee"]]);export{St as default};
@@ -1,2 +1,2 @@
 var ae=Object.defineProperty,oe=Object.defineProperties;var ne=Object.getOwnPropertyDescriptors;var $=Object.getOwnPropertySymbols;var le=Object.prototype.hasOwnProperty,ce=Object.prototype.propertyIsEnumerable;var G=(d,r,u)=>r in d?ae(d,r,{enumerable:!0,configurable:!0,writable:!0,value:u}):d[r]=u,I=(d,r)=>{for(var u in r||(r={}))le.call(r,u)&&G(d,u,r[u]);if($)for(var u of $(r))ce.call(r,u)&&G(d,u,r[u]);return d},V=(d,r)=>oe(d,ne(r));var E=(d,r,u)=>new Promise((p,w)=>{var f=_=>{try{y(u.next(_))}catch(k){w(k)}},C=_=>{try{y(u.throw(_))}catch(k){w(k)}},y=_=>_.done?p(_.value):Promise.resolve(_.value).then(f,C);y((u=u.apply(d,r)).next())});import{w as re,o as ie,E as ue,a1 as s,a2 as n,F as b,R as j,L as m,a7 as o,l as _e,a9 as de,j as pe,a6 as i,r as g,c as T,X as a,n as ge}from"./vue.js";import{u as ve}from"./app.js";import{o as F,a as H}from"./ws.js";import{i as X}from"./index.js";import{_ as me}from"./_plugin-vue_export-helper.js";import"./vendor.js";import"./naive.js";const fe={class:"log-page"},ye={class:"log-toolbar"},ke={class:"log-tabs ui-pills"},he=["onClick"],be={class:"log-actions"},we={class:"auto-label"},Ce={key:0,class:"term-empty"},xe={class:"t-time"},qe={key:0,class:"t-bot"},Le={key:1,class:"t-dir t-dir-send"},Ee={key:2,class:"t-dir t-dir-recv"},Ne={key:3,class:"t-uid"},Se={key:4,class:"t-gid"},Me=["innerHTML"],Oe=["onClick"],Ie={key:6,class:"t-detail"},Te={class:"t-traceback"},Ae={class:"t-time"},Be={key:0,class:"t-source"},Re={class:"t-content"},Je={class:"t-time"},De={key:0,class:"t-bot"},Ue={key:1,class:"t-uid"},$e={key:2,class:"t-gid"},Ge=["onClick"],Ve={key:4,class:"t-detail"},je={class:"t-traceback"},Fe={class:"t-time"},He={class:"t-login-ip"},Xe={key:0,class:"t-login-fail"},ze={key:1,class:"t-login-first"},Pe={class:"t-time"},We={key:0,class:"t-bot-qq"},Ke={key:1,class:"t-source"},Qe={class:"t-err-actions"},Ye=["onClick"],Ze=["onClick"],et=["onClick"],tt={key:2,class:"t-detail"},st={key:0,class:"t-traceback"},at={key:1,class:"t-traceback"},ot={key:2,class:"t-traceback"},z=500,nt={__name:"Logs",setup(d){const r=ve(),u=[{key:"message",label:"消息"},{key:"lifecycle",label:"事件"},{key:"framework",label:"框架"},{key:"error",label:"错误"},{key:"login",label:"登录日志"}],p=g("message"),w=g(!0),f=g([]),C=g([]),y=g([]),_=g([]),k=g([]),A=g(null),x=g({}),v=g({}),q=g({});function N(t){return t?t.replace(/&/g,"&amp;").replace(/</g,"&lt;").replace(/>/g,"&gt;").replace(/\n/g,'<span class="t-nl">↵</span>'):""}function P(t){var h;if(!t)return"";const l=t.indexOf(`
-[keyboard] `);if(l===-1)return N(t);const e=t.slice(l+12);let c=e;if(e.startsWith("{"))try{const L=JSON.parse(e);c=(((h=L==null?void 0:L.content)==null?void 0:h.rows)||[]).flatMap(se=>(se.buttons||[]).map(O=>{var U;return((U=O==null?void 0:O.render_data)==null?void 0:U.label)||"?"})).join(" | ")}catch(L){}return N(t.slice(0,l))+'<span class="t-nl">↵</span>[keyboard] '+N(c)}function W(t){q.value[t]=!q.value[t]}function S(t,l){v.value[t]=v.value[t]===l?null:l}function B(t){if(!t)return"";try{return JSON.stringify(JSON.parse(t),null,2)}catch(l){return t}}function K(t){if(!t)return"无";if(typeof t=="string")try{return JSON.stringify(JSON.parse(t),null,2)}catch(l){return t}return JSON.stringify(t,null,2)}const Q=T(()=>r.currentBotId?f.value.filter(t=>t.bot_qq===r.currentBotId):f.value),Y=T(()=>r.currentBotId?_.value.filter(t=>t.bot_qq===r.currentBotId):_.value),M=T(()=>p.value==="message"?Q.value:p.value==="framework"?C.value:p.value==="lifecycle"?Y.value:p.value==="login"?k.value:y.value);function Z(t,l){const e=t==="message"?f:t==="framework"?C:t==="lifecycle"||t==="event"?_:y;e.value.push(l),e.value.length>z&&e.value.splice(0,e.value.length-z)}function R(t){if(!t)return;const l=t.log_type||"message",e=I({},t);delete e.log_type,Z(l,e)}function J(){f.value.length||D()}function ee(){f.value=[],C.value=[],y.value=[],_.value=[],k.value=[],x.value={},v.value={},q.value={}}function D(){return E(this,null,function*(){try{const t=yield X.get("/api/logs/recent");t.data.message&&(f.value=t.data.message),t.data.framework&&(C.value=t.data.framework),t.data.error&&(y.value=t.data.error),t.data.lifecycle&&(_.value=t.data.lifecycle)}catch(t){}te()})}function te(){return E(this,null,function*(){try{const t=yield X.get("/api/logs/login");t.data.data&&(k.value=t.data.data.map(l=>V(I({},l),{timestamp:l.last_access?l.last_access.replace("T"," ").slice(0,19):""})))}catch(t){}})}return re(M,()=>E(this,null,function*(){if(w.value){yield ge();const t=A.value;t&&(t.scrollTop=t.scrollHeight)}}),{deep:!0}),ie(()=>{D(),F("new_log",R),F("init",J)}),ue(()=>{H("new_log",R),H("init",J)}),(t,l)=>(a(),s("div",fe,[n("div",ye,[n("div",ke,[(a(),s(b,null,j(u,e=>n("button",{key:e.key,class:m(["ui-pill",{active:p.value===e.key}]),onClick:c=>p.value=e.key},o(e.label),11,he)),64))]),n("div",be,[n("label",we,[_e(n("input",{type:"checkbox","onUpdate:modelValue":l[0]||(l[0]=e=>w.value=e)},null,512),[[de,w.value]]),l[1]||(l[1]=pe(" 自动滚动 ",-1))]),n("button",{class:"tool-btn",onClick:ee},"清空")])]),n("div",{class:"terminal",ref_key:"logContainer",ref:A},[M.value.length?i("",!0):(a(),s("div",Ce,"等待日志...")),(a(!0),s(b,null,j(M.value,(e,c)=>(a(),s("div",{key:c,class:"term-line"},[p.value==="message"?(a(),s(b,{key:0},[n("span",xe,o(e.timestamp),1),e.bot_name?(a(),s("span",qe,"["+o(e.bot_name)+"]",1)):i("",!0),e.direction==="send"?(a(),s("span",Le,"发送")):e.direction==="receive"?(a(),s("span",Ee,"接收")):i("",!0),e.user_id?(a(),s("span",Ne,"U:"+o(e.user_id),1)):i("",!0),e.group_id?(a(),s("span",Se,"G:"+o(e.group_id),1)):i("",!0),n("span",{class:"t-content",innerHTML:P(e.content)},null,8,Me),e.raw_message?(a(),s("span",{key:5,class:m(["t-expand-btn",{active:q.value[c]}]),onClick:h=>W(c)},"原始事件",10,Oe)):i("",!0),q.value[c]&&e.raw_message?(a(),s("div",Ie,[n("pre",Te,o(B(e.raw_message)),1)])):i("",!0)],64)):p.value==="framework"?(a(),s(b,{key:1},[n("span",Ae,o(e.timestamp),1),n("span",{class:m(["t-level",(e.level||"INFO").toLowerCase()])},o(e.level||"INFO"),3),e.source?(a(),s("span",Be,"["+o(e.source)+"]",1)):i("",!0),n("span",Re,o(e.content||e.message||""),1)],64)):p.value==="lifecycle"?(a(),s(b,{key:2},[n("span",Je,o(e.timestamp),1),e.bot_qq?(a(),s("span",De,"["+o(e.bot_qq)+"]",1)):i("",!0),n("span",{class:m(["t-lc-type","t-lc-"+(e.event_type||e.type||"")])},o({group_add:"入群",group_del:"退群",group_member_add:"用户入群",group_member_del:"用户退群",group_increase:"用户入群",group_decrease:"用户退群",group_recall:"撤回消息",friend_recall:"撤回消息",friend_add:"加好友",friend_del:"删好友",group_admin:"管理变动",group_ban:"禁言",group_upload:"群文件",notify:"提醒",poke:"戳一戳",honor:"群荣誉",lucky_king:"运气王",group_msg_reject:"关闭主动消息",group_msg_receive:"开启主动消息",MESSAGE_REACTION_ADD:"表态",MESSAGE_REACTION_REMOVE:"取消表态",GUILD_UPDATE:"频道更新"}[e.event_type||e.type]||e.event_type||e.type),3),e.user_id?(a(),s("span",Ue,"U:"+o(e.user_id),1)):i("",!0),e.group_id?(a(),s("span",$e,"G:"+o(e.group_id),1)):i("",!0),e.raw_message||e.content?(a(),s("span",{key:3,class:m(["t-expand-btn",{active:x.value[c]}]),onClick:h=>x.value[c]=!x.value[c]},"原始响应",10,Ge)):i("",!0),x.value[c]&&(e.raw_message||e.content)?(a(),s("div",Ve,[n("pre",je,o(B(e.raw_message||e.content)),1)])):i("",!0)],64)):p.value==="login"?(a(),s(b,{key:3},[n("span",Fe,o(e.timestamp),1),n("span",He,o(e.ip),1),n("span",{class:m(["t-login-status",e.is_banned?"banned":"ok"])},o(e.is_banned?"已封禁":"正常"),3),e.fail_count?(a(),s("span",Xe,"失败 "+o(e.fail_count)+" 次",1)):i("",!0),e.first_access?(a(),s("span",ze,"首次: "+o(e.first_access.replace("T"," ").slice(0,19)),1)):i("",!0)],64)):(a(),s(b,{key:4},[n("span",Pe,o(e.timestamp),1),l[2]||(l[2]=n("span",{class:"t-level error"},"ERROR",-1)),e.bot_qq&&e.bot_qq!=="0000"?(a(),s("span",We,"("+o(e.bot_qq)+")",1)):i("",!0),e.module_type||e.module_name?(a(),s("span",Ke," ["+o([e.module_type,e.module_name].filter(Boolean).join(":"))+"] ",1)):i("",!0),n("div",Qe,[n("span",{class:m(["t-expand-btn",{active:v.value[c]==="raw"}]),onClick:h=>S(c,"raw")},"原始消息",10,Ye),n("span",{class:m(["t-expand-btn",{active:v.value[c]==="payload"}]),onClick:h=>S(c,"payload")},"发送内容",10,Ze),n("span",{class:m(["t-expand-btn",{active:v.value[c]==="resp"}]),onClick:h=>S(c,"resp")},"响应对象",10,et)]),v.value[c]?(a(),s("div",tt,[v.value[c]==="raw"?(a(),s("pre",st,o(e.content||"无"),1)):v.value[c]==="payload"?(a(),s("pre",at,o(K(e.context)),1)):v.value[c]==="resp"?(a(),s("pre",ot,o(e.traceback||"无"),1)):i("",!0)])):i("",!0)],64))]))),128))],512)]))}},vt=me(nt,[["__scopeId","data-v-b5124a8f"]]);export{vt as default};
+[keyboard] `);if(l===-1)return N(t);const e=t.slice(l+12);let c=e;if(e.startsWith("{"))try{const L=JSON.parse(e);c=(((h=L==null?void 0:L.content)==null?void 0:h.rows)||[]).flatMap(se=>(se.buttons||[]).map(O=>{var U;return((U=O==null?void 0:O.render_data)==null?void 0:U.label)||"?"})).join(" | ")}catch(L){}return N(t.slice(0,l))+'<span class="t-nl">↵</span>[keyboard] '+N(c)}function W(t){q.value[t]=!q.value[t]}function S(t,l){v.value[t]=v.value[t]===l?null:l}function B(t){if(!t)return"";try{return JSON.stringify(JSON.parse(t),null,2)}catch(l){return t}}function K(t){if(!t)return"无";if(typeof t=="string")try{return JSON.stringify(JSON.parse(t),null,2)}catch(l){return t}return JSON.stringify(t,null,2)}const Q=T(()=>r.currentBotId?f.value.filter(t=>t.bot_qq===r.currentBotId):f.value),Y=T(()=>r.currentBotId?_.value.filter(t=>t.bot_qq===r.currentBotId):_.value),M=T(()=>p.value==="message"?Q.value:p.value==="framework"?C.value:p.value==="lifecycle"?Y.value:p.value==="login"?k.value:y.value);function Z(t,l){const e=t==="message"?f:t==="framework"?C:t==="lifecycle"||t==="event"?_:y;e.value.push(l),e.value.length>z&&e.value.splice(0,e.value.length-z)}function R(t){if(!t)return;const l=t.log_type||"message",e=I({},t);delete e.log_type,Z(l,e)}function J(){f.value.length||D()}function ee(){f.value=[],C.value=[],y.value=[],_.value=[],k.value=[],x.value={},v.value={},q.value={}}function D(){return E(this,null,function*(){try{const t=yield X.get("/api/logs/recent");t.data.message&&(f.value=t.data.message),t.data.framework&&(C.value=t.data.framework),t.data.error&&(y.value=t.data.error),t.data.lifecycle&&(_.value=t.data.lifecycle)}catch(t){}te()})}function te(){return E(this,null,function*(){try{const t=yield X.get("/api/logs/login");t.data.data&&(k.value=t.data.data.map(l=>V(I({},l),{timestamp:l.last_access?l.last_access.replace("T"," ").slice(0,19):""})))}catch(t){}})}return re(M,()=>E(this,null,function*(){if(w.value){yield ge();const t=A.value;t&&(t.scrollTop=t.scrollHeight)}}),{deep:!0}),ie(()=>{D(),F("new_log",R),F("init",J),F("resync",D)}),ue(()=>{H("new_log",R),H("init",J),H("resync",D)}),(t,l)=>(a(),s("div",fe,[n("div",ye,[n("div",ke,[(a(),s(b,null,j(u,e=>n("button",{key:e.key,class:m(["ui-pill",{active:p.value===e.key}]),onClick:c=>p.value=e.key},o(e.label),11,he)),64))]),n("div",be,[n("label",we,[_e(n("input",{type:"checkbox","onUpdate:modelValue":l[0]||(l[0]=e=>w.value=e)},null,512),[[de,w.value]]),l[1]||(l[1]=pe(" 自动滚动 ",-1))]),n("button",{class:"tool-btn",onClick:ee},"清空")])]),n("div",{class:"terminal",ref_key:"logContainer",ref:A},[M.value.length?i("",!0):(a(),s("div",Ce,"等待日志...")),(a(!0),s(b,null,j(M.value,(e,c)=>(a(),s("div",{key:c,class:"term-line"},[p.value==="message"?(a(),s(b,{key:0},[n("span",xe,o(e.timestamp),1),e.bot_name?(a(),s("span",qe,"["+o(e.bot_name)+"]",1)):i("",!0),e.direction==="send"?(a(),s("span",Le,"发送")):e.direction==="receive"?(a(),s("span",Ee,"接收")):i("",!0),e.user_id?(a(),s("span",Ne,"U:"+o(e.user_id),1)):i("",!0),e.group_id?(a(),s("span",Se,"G:"+o(e.group_id),1)):i("",!0),n("span",{class:"t-content",innerHTML:P(e.content)},null,8,Me),e.raw_message?(a(),s("span",{key:5,class:m(["t-expand-btn",{active:q.value[c]}]),onClick:h=>W(c)},"原始事件",10,Oe)):i("",!0),q.value[c]&&e.raw_message?(a(),s("div",Ie,[n("pre",Te,o(B(e.raw_message)),1)])):i("",!0)],64)):p.value==="framework"?(a(),s(b,{key:1},[n("span",Ae,o(e.timestamp),1),n("span",{class:m(["t-level",(e.level||"INFO").toLowerCase()])},o(e.level||"INFO"),3),e.source?(a(),s("span",Be,"["+o(e.source)+"]",1)):i("",!0),n("span",Re,o(e.content||e.message||""),1)],64)):p.value==="lifecycle"?(a(),s(b,{key:2},[n("span",Je,o(e.timestamp),1),e.bot_qq?(a(),s("span",De,"["+o(e.bot_qq)+"]",1)):i("",!0),n("span",{class:m(["t-lc-type","t-lc-"+(e.event_type||e.type||"")])},o({group_add:"入群",group_del:"退群",group_member_add:"用户入群",group_member_del:"用户退群",group_increase:"用户入群",group_decrease:"用户退群",group_recall:"撤回消息",friend_recall:"撤回消息",friend_add:"加好友",friend_del:"删好友",group_admin:"管理变动",group_ban:"禁言",group_upload:"群文件",notify:"提醒",poke:"戳一戳",honor:"群荣誉",lucky_king:"运气王",group_msg_reject:"关闭主动消息",group_msg_receive:"开启主动消息",MESSAGE_REACTION_ADD:"表态",MESSAGE_REACTION_REMOVE:"取消表态",GUILD_UPDATE:"频道更新"}[e.event_type||e.type]||e.event_type||e.type),3),e.user_id?(a(),s("span",Ue,"U:"+o(e.user_id),1)):i("",!0),e.group_id?(a(),s("span",$e,"G:"+o(e.group_id),1)):i("",!0),e.raw_message||e.content?(a(),s("span",{key:3,class:m(["t-expand-btn",{active:x.value[c]}]),onClick:h=>x.value[c]=!x.value[c]},"原始响应",10,Ge)):i("",!0),x.value[c]&&(e.raw_message||e.content)?(a(),s("div",Ve,[n("pre",je,o(B(e.raw_message||e.content)),1)])):i("",!0)],64)):p.value==="login"?(a(),s(b,{key:3},[n("span",Fe,o(e.timestamp),1),n("span",He,o(e.ip),1),n("span",{class:m(["t-login-status",e.is_banned?"banned":"ok"])},o(e.is_banned?"已封禁":"正常"),3),e.fail_count?(a(),s("span",Xe,"失败 "+o(e.fail_count)+" 次",1)):i("",!0),e.first_access?(a(),s("span",ze,"首次: "+o(e.first_access.replace("T"," ").slice(0,19)),1)):i("",!0)],64)):(a(),s(b,{key:4},[n("span",Pe,o(e.timestamp),1),l[2]||(l[2]=n("span",{class:"t-level error"},"ERROR",-1)),e.bot_qq&&e.bot_qq!=="0000"?(a(),s("span",We,"("+o(e.bot_qq)+")",1)):i("",!0),e.module_type||e.module_name?(a(),s("span",Ke," ["+o([e.module_type,e.module_name].filter(Boolean).join(":"))+"] ",1)):i("",!0),n("div",Qe,[n("span",{class:m(["t-expand-btn",{active:v.value[c]==="raw"}]),onClick:h=>S(c,"raw")},"原始消息",10,Ye),n("span",{class:m(["t-expand-btn",{active:v.value[c]==="payload"}]),onClick:h=>S(c,"payload")},"发送内容",10,Ze),n("span",{class:m(["t-expand-btn",{active:v.value[c]==="resp"}]),onClick:h=>S(c,"resp")},"响应对象",10,et)]),v.value[c]?(a(),s("div",tt,[v.value[c]==="raw"?(a(),s("pre",st,o(e.content||"无"),1)):v.value[c]==="payload"?(a(),s("pre",at,o(K(e.context)),1)):v.value[c]==="resp"?(a(),s("pre",ot,o(e.traceback||"无"),1)):i("",!0)])):i("",!0)],64))]))),128))],512)]))}},vt=me(nt,[["__scopeId","data-v-b5124a8f"]]);export{vt as default};
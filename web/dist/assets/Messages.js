@@ -1,2 +1,2 @@
 var $=(u,g,p)=>new Promise((E,k)=>{var N=M=>{try{O(p.next(M))}catch(T){k(T)}},w=M=>{try{O(p.throw(M))}catch(T){k(T)}},O=M=>M.done?E(M.value):Promise.resolve(M.value).then(N,w);O((p=p.apply(u,g)).next())});import{w as fe,o as Gt,E as Yt,a1 as a,a2 as o,L as H,Z as C,Y as I,F as S,R as oe,N as Xt,a7 as v,a6 as f,a5 as ge,ac as Zt,j as J,l as Te,aa as lt,ab as es,r as _,W as me,n as be,c as ie,X as n,ad as ot}from"./vue.js";import{u as ts}from"./app.js";import{o as ss,a as as}from"./ws.js";import{i as U}from"./index.js";import{_ as ns}from"./_plugin-vue_export-helper.js";import"./vendor.js";import"./naive.js";function ls(u){if(!u)return null;if(typeof u=="object")return u;if(typeof u!="string"||!u.trim().startsWith("{"))return null;try{return JSON.parse(u)}catch(g){return null}}function os(u){return u?Array.isArray(u)?u:[u]:[]}function is(u,g){for(const p of os(u)){if(typeof p!="string")continue;const E=p.includes("?")?p.slice(p.indexOf("?")+1):p,k=new URLSearchParams(E);for(const N of g){const w=k.get(N);if(w)return w}}return""}function rs(u,g){return!Array.isArray(u)||!u.length?null:u.find(p=>(p==null?void 0:p.msg_idx)&&p.msg_idx===g)||u[0]}function us(u,g){if(!u&&!g)return null;const p=(u==null?void 0:u.author)||{};return{id:g||(u==null?void 0:u.msg_idx)||"",author:p.username||p.id||(p.bot?"Bot":"引用消息"),text:String((u==null?void 0:u.content)||"").replace(/\s+/g," ").trim()}}function cs(u){const g=(u==null?void 0:u.d)||u;if(!g||typeof g!="object")return null;const p=g.message_scene||{},E=is(p.ext,["ref_msg_idx","ref_msg_id","reference_id","message_reference_id"]),k=rs(g.msg_elements,E);return!E&&!k?null:us(k,E)}function ds(u){if(!u||typeof u!="object")return null;const p=(u.message_reference||{}).message_id||u.message_reference_id||u.reference_message_id||"";return p?{id:String(p),author:"",text:""}:null}function vs(u){const g=ls(u==null?void 0:u.raw_message);return cs(g)||ds(g)}const _s={class:"msg-page"},ps={class:"msg-layout"},fs={class:"panel-header"},gs={class:"chat-items"},ms=["onClick"],bs={class:"chat-avatar-wrap"},hs=["src"],ys=["src"],ks=["src"],ws={key:3,class:"chat-avatar-fallback"},xs={key:4,class:"chat-avatar-badge"},qs={class:"chat-info"},Cs={class:"chat-nick"},Ms={key:0,class:"chat-id"},$s={class:"chat-preview"},Es={class:"chat-meta"},Ls={class:"chat-time"},Ss={key:0,class:"chat-count"},Ts=["onClick"],Rs={key:0,class:"chat-empty"},Bs={key:0,class:"chat-pager"},As=["disabled"],Is=["disabled"],Us={class:"panel-header"},Ns={key:1,class:"panel-header-remark"},Os={key:0,class:"history-hint"},js={key:1,class:"history-hint"},zs={key:0,class:"event-wrap"},Ds={class:"event-box"},Hs=["src"],Vs={key:1,class:"event-avatar-fallback"},Qs={class:"event-uid"},Ps={class:"event-text"},Js={class:"bubble-avatar-wrap"},Ws=["src"],Fs={key:1,class:"msg-avatar-bot"},Ks=["src"],Gs={key:3,class:"msg-avatar-fallback"},Ys={class:"bubble-main"},Xs={class:"bubble-name"},Zs={key:0,class:"bubble-src-tag"},ea={key:2,class:"bubble-role-tag role-bot"},ta={key:3,class:"bubble-uid"},sa={class:"bubble-row"},aa={key:0,class:"bubble-quote-ref"},na={class:"bubble-quote-author"},la={class:"bubble-quote-content"},oa={key:1,class:"recalled-tag"},ia={key:2,class:"recalled-tag audit-reject"},ra={key:3,class:"audit-tag"},ua={key:4,class:"bubble-segs",style:{"word-break":"break-all","overflow-wrap":"anywhere","white-space":"pre-wrap"}},ca={key:0},da={key:1,class:"bubble-at"},va=["data-src"],_a=["src","onClick"],pa=["src"],fa=["src"],ga={key:5,class:"bubble-media-text"},ma={key:0,class:"bubble-media-text"},ba=["data-src"],ha=["src","onClick"],ya=["src"],ka=["src"],wa=["href"],xa=["innerHTML"],qa={class:"bubble-actions"},Ca=["onClick"],Ma=["onClick"],$a=["disabled","onClick"],Ea={class:"bubble-ts"},La={key:0,class:"raw-data-box"},Sa={key:2,class:"chat-empty",style:{"padding-top":"48px"}},Ta={class:"send-area"},Ra={key:0,class:"quote-preview"},Ba={class:"quote-main"},Aa={class:"quote-title"},Ia={class:"quote-text"},Ua={class:"send-toolbar"},Na={key:1,class:"send-img-label",title:"选择图片"},Oa={key:2,class:"send-img-tag"},ja=["src"],za={class:"send-input-row"},Da={key:0,class:"mobile-type-options"},Ha=["onClick"],Va={key:0,class:"mobile-type-options"},Qa=["onClick"],Pa=["placeholder"],Ja=["disabled"],Wa={key:1,class:"send-hint"},Fa={key:2,class:"send-error"},Ka={key:1,class:"no-chat"},Ga={viewBox:"0 0 24 24",fill:"none",stroke:"currentColor","stroke-width":"1.5",style:{width:"48px",height:"48px",color:"var(--text3)","margin-bottom":"12px"}},Ya=["src"],Xa={style:{padding:"8px 0"}},Za={style:{"margin-bottom":"8px","font-size":"13px",color:"var(--text2)"}},en={style:{padding:"8px 0"}},he=50,tn=12e4,sn={__name:"Messages",setup(u){const g=ts();let p=!1;const E={},k=_(window.innerWidth<768),N=_("list"),w=_("group"),O=_(1),M=_(""),T=_([]),R=_(1),te=_(0),b=_(null),h=_([]),W=_(null),x=_("text"),se=_(""),j=_(null),F=_(!1),z=_(""),ae=_(""),ye=_(null),y=_(null),D=_(""),L=_(!0),K=_(!1),V=_("1"),G=_(""),re=_(!1),ue=_(!1),Re=[{value:"text",label:"普通消息"},{value:"media",label:"富媒体"}],Be=[{value:"1",label:"图片"},{value:"2",label:"视频"},{value:"3",label:"语音"},{value:"4",label:"文件"}],B=ie(()=>w.value),Q=_({}),Y=_(""),ce=_(""),P=_(null),X=_(!1),ne=_(!1),ke=_(""),we=_(""),it=_(""),rt=ie(()=>x.value==="media"?"输入资源 URL... (Ctrl+Enter 发送)":"输入消息内容... (Ctrl+Enter 发送)"),ut=ie(()=>y.value?He(y.value):""),ct=ie(()=>{var e;return((e=Re.find(t=>t.value===x.value))==null?void 0:e.label)||"MD"}),dt=ie(()=>{var e;return((e=Be.find(t=>t.value===V.value))==null?void 0:e.label)||"图片"}),vt=/\[(图片|语音|视频|文件|媒体|media)](\S+)/;function Ae(){k.value=window.innerWidth<768}function _t(){N.value="list",b.value=null}function de(){re.value=!1,ue.value=!1}function pt(e){x.value=e,de()}function ft(e){V.value=e,de()}function Ie(e){const t=g.bots.find(l=>l.bot_qq===e);return(t==null?void 0:t.avatar)||""}function xe(e){return`http://q1.qlogo.cn/g?b=qq&nk=${e}&s=100`}function gt(e){return`http://p.qlogo.cn/gh/${e}/${e}/100/`}function Ue(e,t){return xe(t)}const ve=_("");function qe(e){ve.value=e}function Ne(){ve.value=""}const mt=["myqcloud.com","aliyuncs.com","cos.ap-"];function Oe(e){return mt.some(t=>e.includes(t))}function je(e){const t=e.currentTarget,l=t.dataset.src;if(l){const r=document.createElement("img");r.src=l,r.className="bubble-media-img",r.style.cssText="max-width:160px;max-height:120px;width:auto;height:auto;border-radius:6px;display:block;cursor:pointer",r.referrerPolicy="no-referrer",r.loading="lazy",r.onclick=()=>qe(l),t.replaceWith(r)}}function bt(e){return e?e.length>10?e.slice(11,16):e:""}function ht(e){if(!e)return"";const t=e.match(/^\d{4}-(\d{2}-\d{2}\s+\d{2}:\d{2}(:\d{2})?)$/);return t?t[1]:e}function Ce(e){return e&&e.startsWith("msg_auditid_")}function yt(e){return!!e.message_id&&!Ce(e.message_id)}function ze(e){return!!e.message_id&&!Ce(e.message_id)&&!e._recalled&&!e._audit_rejected}function kt(e){ye.value=ye.value===e?null:e}function wt(e){if(e.raw_message){try{return JSON.stringify(JSON.parse(e.raw_message),null,2)}catch(t){}return e.raw_message}return JSON.stringify({message_id:e.message_id,user_id:e.user_id,content:e.content,timestamp:e.timestamp,source:e.source,is_self:e.is_self,bot_qq:e.bot_qq},null,2)}function De(e){return e.is_self?"我":e.nickname||e.user_id||"未知用户"}function He(e){return e._segments?e._segments.map(l=>l.kind==="text"?l.text:l.kind==="at"?Pe(l):l.kind==="image"?"[图片]":l.kind==="audio"?"[语音]":l.kind==="video"?"[视频]":l.text||"").join("").replace(/\s+/g," ").trim()||"空消息":e._media?[e._media.type?`[${e._media.type}]`:"[媒体]",e._media.text,e._media.src].filter(Boolean).join(" "):String(e.content||"").replace(/\n\[keyboard\] [\s\S]*$/,"").replace(/\s+/g," ").trim()||"空消息"}function xt(e){return(e==null?void 0:e.text)||(e!=null&&e.id?`ID: ${e.id}`:"引用消息")}function Me(e){return e._segments=St(e),e._media=e._segments?null:Et(e.content),e._recalled=!!e.recalled,e._quote=vs(e),e}function $e(e){const t={},l={};for(const r of e)r.reference_id&&(t[r.reference_id]=r),r.message_id&&(l[r.message_id]=r);for(const r of e){const i=r._quote;if(!(i!=null&&i.id))continue;const d=t[i.id]||l[i.id];!d||d===r||(i.author=De(d),i.text=He(d),i.message_id=d.message_id||"")}}function qt(e){ze(e)&&(y.value=e)}function Ve(){y.value=null}function Ct(e){return $(this,null,function*(){var t,l,r,i,d;if(!(ae.value||!e.message_id)){ae.value=e.message_id;try{const s=yield U.post("/api/message/recall",{chat_type:B.value,chat_id:((t=b.value)==null?void 0:t.chat_id)||"",bot_qq:e.bot_qq||g.currentBotId||"",message_id:e.message_id});(l=s.data)!=null&&l.success?e._recalled=!0:z.value=((r=s.data)==null?void 0:r.message)||"撤回失败"}catch(s){z.value=((d=(i=s.response)==null?void 0:i.data)==null?void 0:d.message)||s.message||"撤回失败"}finally{ae.value=""}}})}function Qe(e){return e.replace(/&/g,"&amp;").replace(/</g,"&lt;").replace(/>/g,"&gt;").replace(/"/g,"&quot;")}const Mt=/(?:<[^>]*>)*<(https?:\/\/[^>]*(?:multimedia\.nt\.qq\.com\.cn|qqbot\.ugcimg\.cn|gchat\.qpic\.cn)[^>]*)>/,$t=/!\[[^\]]*\]\(([^)]+)\)/;function Et(e){if(!e)return null;const t=e.match(vt);if(t){const i=e.replace(t[0],"").replace(/^\n+|\n+$/g,"").trim();return{type:t[1],src:t[2],text:i}}const l=e.match(Mt);if(l){const i=e.replace(l[0],"").replace(/^\n+|\n+$/g,"").trim();return{type:"图片",src:l[1],text:i}}const r=e.match($t);if(r){const i=e.replace(r[0],"").replace(/^\n+|\n+$/g,"").trim();return{type:"图片",src:r[1],text:i}}return null}function Lt(e){var d;if(!e)return"";let t=e,l="";const r=e.indexOf(`
-[keyboard] `);if(r!==-1){t=e.slice(0,r);try{const s=JSON.parse(e.slice(r+12)),c=((d=s==null?void 0:s.content)==null?void 0:d.rows)||[],m='width="9" height="9" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" style="flex-shrink:0"',q={0:`<svg ${m}><path d="M10 13a5 5 0 0 0 7.54.54l3-3a5 5 0 0 0-7.07-7.07l-1.72 1.71"/><path d="M14 11a5 5 0 0 0-7.54-.54l-3 3a5 5 0 0 0 7.07 7.07l1.71-1.71"/></svg>`,1:`<svg ${m}><polyline points="9 10 4 15 9 20"/><path d="M20 4v7a4 4 0 0 1-4 4H4"/></svg>`,2:`<svg ${m}><line x1="22" y1="2" x2="11" y2="13"/><polygon points="22 2 15 22 11 13 2 9 22 2"/></svg>`},ee=c.map(Ft=>`<div class="kb-row">${(Ft.buttons||[]).map(tt=>{var nt;const st=tt.render_data||{},le=tt.action||{},at=["kb-btn",`kb-t${(nt=le.type)!=null?nt:2}`];st.style===1&&at.push("kb-primary");const pe=[];le.data&&pe.push(le.data),le.enter&&pe.push("回车发送");const Kt=q[le.type]||q[2];return`<span class="${at.join(" ")}"${pe.length?` title="${pe.join(" · ")}"`:""}>${Kt}${Qe(st.label||"?")}</span>`}).join("")}</div>`);ee.length&&(l=`<div class="kb-wrap">${ee.join("")}</div>`)}catch(s){}}let i=Qe(t);return i=i.replace(/```([\s\S]*?)```/g,'<pre class="md-code-block">$1</pre>'),i=i.replace(/`([^`]+)`/g,'<code class="md-code">$1</code>'),i=i.replace(/\*\*(.+?)\*\*/g,"<b>$1</b>"),i=i.replace(/\*(.+?)\*/g,"<i>$1</i>"),i=i.replace(/~~(.+?)~~/g,"<s>$1</s>"),i=i.replace(/!\[([^\]]*)\]\(([^)]+)\)/g,""),i=i.replace(/\[([^\]]+)]\(([^)]+)\)/g,'<a href="$2" target="_blank" class="md-link">$1</a>'),i=i.replace(/\n/g,"<br>"),i+l}function St(e){var r,i;if(!e.raw_message||typeof e.raw_message!="string"||e.raw_message[0]!=="{")return null;let t;try{t=JSON.parse(e.raw_message).message}catch(d){return null}if(!Array.isArray(t)||!t.length)return null;const l=[];for(const d of t){if(!d||typeof d!="object")continue;const s=d.data||{};switch(d.type){case"text":((r=s.text)!=null?r:"")!==""&&l.push({kind:"text",text:String(s.text)});break;case"at":l.push({kind:"at",qq:String((i=s.qq)!=null?i:""),name:s.name?String(s.name):""});break;case"image":l.push({kind:"image",src:String(s.url||s.file||"")});break;case"face":l.push({kind:"tag",text:"[表情]"});break;case"record":l.push({kind:"audio",src:String(s.url||s.file||"")});break;case"video":l.push({kind:"video",src:String(s.url||s.file||"")});break;case"reply":break;default:l.push({kind:"tag",text:`[${d.type}]`})}}return l.length?l:null}function Pe(e){return e.qq==="all"?"@全体成员":`@${e.name||e.qq}`}let Z=null;function A(){return $(this,null,function*(){var e,t,l,r;if(!p)try{const i=yield U.post("/api/message/chats",{type:w.value,search:M.value,bot_qq:g.currentBotId||"",page:R.value,page_size:he,days:O.value});if(p)return;T.value=((t=(e=i.data)==null?void 0:e.data)==null?void 0:t.chats)||[],te.value=((r=(l=i.data)==null?void 0:l.data)==null?void 0:r.total)||T.value.length}catch(i){p||(T.value=[],te.value=0)}})}function Je(e){return Q.value[e]||{}}function Ee(e){return String(e.role||Je(e.user_id).role||"")}function Tt(e){return e==="owner"?"群主":e==="admin"?"管理":e?"群员":""}function Rt(e){return e==="owner"?"role-owner":e==="admin"?"role-admin":"role-member"}function Bt(e){const t=Number(e);return t?t>=2854e6&&t<=2855e6||t>=3889e6&&t<=389e7||t>=401e7&&t<=4019999999||t===3328144510||t===666e5:!1}function At(e){return!!Je(e).is_bot||Bt(e)}const We={};function It(e){return $(this,null,function*(){var l;if(!e){Q.value={};return}const t=We[e];if(t&&Date.now()-t.ts<tn){Q.value=t.data;return}try{const i=((l=(yield U.post("/api/message/group-roles",{group_id:e})).data)==null?void 0:l.data)||{};We[e]={data:i,ts:Date.now()},Q.value=i}catch(r){Q.value={}}})}function Fe(){return $(this,null,function*(){if(P.value)try{yield U.post("/api/message/remarks",{group_id:P.value,remark:Y.value.trim(),group_qq:ce.value.trim()}),X.value=!1,P.value=null,Y.value="",ce.value="",A()}catch(e){}})}function Ut(e){P.value=e.chat_id,Y.value=e.remark||"",ce.value=e.group_qq||"",X.value=!0}function Nt(){X.value=!1,P.value=null,Y.value="",ce.value=""}function Ke(){return $(this,null,function*(){const e=ke.value.trim();if(e)try{yield U.post("/api/message/remarks",{group_id:e,remark:we.value.trim(),group_qq:it.value.trim()}),ne.value=!1,A()}catch(t){}})}function Ot(){ne.value=!1}function jt(){Z||(Z=setTimeout(()=>{Z=null,A()},5e3))}let Le=0;function zt(e){return $(this,null,function*(){var l,r,i,d,s,c;const t=++Le;b.value=e,se.value="",z.value="",j.value=null,y.value=null,L.value=!0,D.value="",K.value=!1,Q.value={},k.value&&(N.value="chat"),h.value=[];try{const m=yield U.post("/api/message/history",{chat_type:B.value,chat_id:e.chat_id,bot_qq:g.currentBotId||""});if(t!==Le)return;const q=((r=(l=m.data)==null?void 0:l.data)==null?void 0:r.messages)||[];for(const ee of q)Me(ee);$e(q),h.value=q,B.value==="group"&&It(e.chat_id),D.value=((d=(i=m.data)==null?void 0:i.data)==null?void 0:d.oldest_date)||"",L.value=((c=(s=m.data)==null?void 0:s.data)==null?void 0:c.has_more)!==!1,yield be(),_e(),Vt()}catch(m){t===Le&&(h.value=[],L.value=!1)}})}function Dt(){return $(this,null,function*(){var e,t,l,r,i,d;if(!(K.value||!L.value||!b.value||!D.value)){K.value=!0;try{const s=yield U.post("/api/message/history",{chat_type:B.value,chat_id:b.value.chat_id,bot_qq:g.currentBotId||"",before_date:D.value}),c=((t=(e=s.data)==null?void 0:e.data)==null?void 0:t.messages)||[];if(!c.length){L.value=!1;return}for(const ee of c)Me(ee);const m=W.value,q=m?m.scrollHeight:0;h.value=[...c,...h.value],$e(h.value),D.value=((r=(l=s.data)==null?void 0:l.data)==null?void 0:r.oldest_date)||D.value,L.value=((d=(i=s.data)==null?void 0:i.data)==null?void 0:d.has_more)!==!1,yield be(),m&&(m.scrollTop=m.scrollHeight-q)}catch(s){L.value=!1}finally{K.value=!1}}})}function Ht(){const e=W.value;e&&e.scrollTop<60&&L.value&&!K.value&&Dt()}function Ge(){const e=W.value;return e?e.scrollHeight-e.scrollTop-e.clientHeight<80:!0}function _e(){const e=W.value;e&&(e.scrollTop=e.scrollHeight)}let Se=!1;function Vt(){Se=!0;const e=W.value;if(!e)return;const t=()=>{Se=!1,e.removeEventListener("wheel",t),e.removeEventListener("touchmove",t)};e.addEventListener("wheel",t,{once:!0,passive:!0}),e.addEventListener("touchmove",t,{once:!0,passive:!0});const l=()=>{Se&&_e()};e.querySelectorAll("img").forEach(r=>{r.complete||r.addEventListener("load",l,{once:!0})}),setTimeout(t,3e3)}function Ye(e){return $(this,null,function*(){var t,l;if(!e)return"未知用户";if(E[e])return E[e];try{const r=((l=(t=(yield U.post("/api/message/nickname",{user_id:e})).data)==null?void 0:t.data)==null?void 0:l.nickname)||`用户${e.slice(-6)}`;return E[e]=r,r}catch(r){return`用户${e.slice(-6)}`}})}function Xe(e){return $(this,null,function*(){var i;if(!e||p)return;if(e.log_type==="audit"){Pt(e);return}if(e.log_type==="lifecycle"){Qt(e);return}if(e.log_type!=="message"||(jt(),!b.value))return;const t=e.group_id||"",l=e.user_id||"",r=b.value.chat_id;if(B.value==="group"&&t===r||B.value==="user"&&l===r&&!t){const d=e.direction==="send",s=d?e.bot_name||"Bot":yield Ye(l);if(p)return;const c=Me({id:h.value.length,message_id:e.message_id||"",reference_id:e.reference_id||"",user_id:l,bot_qq:e.bot_qq||((i=g.currentBot)==null?void 0:i.bot_qq)||"",bot_qq:d&&e.bot_qq||"",nickname:s,content:e.content||"",timestamp:e.timestamp||"",is_self:d,source:e.source||"",raw_message:e.raw_message||""});h.value.push(c),$e(h.value),Ge()&&be(_e)}})}function Qt(e){return $(this,null,function*(){var s;if(!b.value||B.value!=="group")return;const t=e.type||"";if(t!=="group_member_add"&&t!=="group_member_del")return;const l=e.group_id||"",r=e.user_id||"",i=b.value.chat_id;if(l!==i)return;const d=yield Ye(r);p||(h.value.push({id:`lc_rt_${Date.now()}`,message_id:"",reference_id:"",user_id:r,bot_qq:e.bot_qq||((s=g.currentBot)==null?void 0:s.bot_qq)||"",bot_qq:"",nickname:d,content:"",timestamp:e.timestamp||"",is_self:!1,source:"",raw_message:"",recalled:!1,event_type:t==="group_member_add"?"member_add":"member_remove"}),Ge()&&be(_e))})}function Pt(e){if(!e.audit_id)return;const t=h.value.find(l=>l.message_id===e.audit_id);t&&(e.passed&&e.message_id?t.message_id=e.message_id:e.passed||(t._audit_rejected=!0))}function Jt(e){var l;const t=(l=e.target.files)==null?void 0:l[0];t&&(j.value=t,G.value=URL.createObjectURL(t)),e.target.value=""}function Ze(){G.value&&URL.revokeObjectURL(G.value),j.value=null,G.value=""}function Wt(e){e.key==="Enter"&&!e.shiftKey&&(e.preventDefault(),et())}function et(){return $(this,null,function*(){var e,t,l,r;if(!(F.value||!b.value)){F.value=!0,z.value="";try{const i=se.value.trim();if(!i&&!j.value){F.value=!1;return}const d=new FormData;d.append("chat_type",B.value),d.append("chat_id",b.value.chat_id),d.append("bot_qq",g.currentBotId||b.value.bot_qq||""),d.append("msg_type",x.value),d.append("content",i),y.value&&(y.value.reference_id&&d.append("message_reference_id",y.value.reference_id),y.value.message_id&&d.append("quote_message_id",y.value.message_id)),j.value&&x.value==="text"&&d.append("image",j.value),x.value==="media"&&d.append("media_file_type",V.value);const s=yield U.post("/api/message/send",d);(e=s.data)!=null&&e.success?(se.value="",Ze(),Ve()):z.value=((t=s.data)==null?void 0:t.message)||"发送失败"}catch(i){z.value=((r=(l=i.response)==null?void 0:l.data)==null?void 0:r.message)||i.message||"发送失败"}finally{F.value=!1}}})}return fe(w,()=>{b.value=null,y.value=null,h.value=[],T.value=[],D.value="",L.value=!0,R.value=1,P.value=null,Q.value={},A()}),fe(O,()=>{R.value=1,A()}),fe(M,()=>{R.value=1,A()}),fe(()=>g.currentBotId,()=>{b.value=null,y.value=null,h.value=[],D.value="",L.value=!0,R.value=1,A()}),Gt(()=>{A(),ss("new_log",Xe),window.addEventListener("resize",Ae),document.addEventListener("click",de)}),Yt(()=>{p=!0,as("new_log",Xe),window.removeEventListener("resize",Ae),document.removeEventListener("click",de),Z&&(clearTimeout(Z),Z=null)}),(e,t)=>{const l=me("n-radio-button"),r=me("n-radio-group"),i=me("n-input"),d=me("n-modal");return n(),a("div",_s,[o("div",ps,[o("div",{class:H(["chat-list-panel",{"mobile-hidden":k.value&&N.value!=="list"}])},[o("div",fs,[t[35]||(t[35]=o("span",null,"聊天列表",-1)),C(r,{value:w.value,"onUpdate:value":t[0]||(t[0]=s=>w.value=s),size:"tiny"},{default:I(()=>[C(l,{value:"group"},{default:I(()=>[...t[30]||(t[30]=[J("群",-1)])]),_:1}),C(l,{value:"user"},{default:I(()=>[...t[31]||(t[31]=[J("好友",-1)])]),_:1})]),_:1},8,["value"]),C(r,{value:O.value,"onUpdate:value":t[1]||(t[1]=s=>O.value=s),size:"tiny",class:"days-sel"},{default:I(()=>[C(l,{value:1},{default:I(()=>[...t[32]||(t[32]=[J("1天",-1)])]),_:1}),C(l,{value:2},{default:I(()=>[...t[33]||(t[33]=[J("2天",-1)])]),_:1}),C(l,{value:3},{default:I(()=>[...t[34]||(t[34]=[J("3天",-1)])]),_:1})]),_:1},8,["value"])]),C(i,{value:M.value,"onUpdate:value":t[2]||(t[2]=s=>M.value=s),placeholder:"搜索...",size:"small",clearable:"",class:"chat-search"},null,8,["value"]),o("div",gs,[(n(!0),a(S,null,oe(T.value,s=>{var c;return n(),a("div",{key:s.chat_id,class:H(["chat-item",{active:((c=b.value)==null?void 0:c.chat_id)===s.chat_id}]),onClick:m=>zt(s)},[o("div",bs,[w.value==="user"&&s.chat_id?(n(),a("img",{key:0,class:"chat-avatar",src:xe(s.chat_id),loading:"lazy",onError:t[3]||(t[3]=m=>m.target.style.display="none")},null,40,hs)):w.value==="group"&&s.chat_id?(n(),a("img",{key:1,class:"chat-avatar",src:gt(s.chat_id),loading:"lazy",onError:t[4]||(t[4]=m=>m.target.style.display="none")},null,40,ys)):Xt(g).isAllBots&&s.bot_qq&&Ie(s.bot_qq)?(n(),a("img",{key:2,class:"chat-avatar",src:Ie(s.bot_qq),loading:"lazy",onError:t[5]||(t[5]=m=>m.target.style.display="none")},null,40,ks)):(n(),a("div",ws,v((s.nickname||s.chat_id||"?").charAt(0)),1)),s.is_full_access?(n(),a("span",xs,"全")):f("",!0)]),o("div",qs,[o("div",Cs,v(s.nickname||s.chat_id),1),s.nickname&&s.nickname!==s.chat_id?(n(),a("div",Ms,v(s.chat_id),1)):f("",!0),o("div",$s,v(s.last_content||""),1)]),o("div",Es,[o("div",Ls,v(bt(s.last_time)),1),s.msg_count?(n(),a("div",Ss,v(s.msg_count),1)):f("",!0),w.value!=="user"?(n(),a("button",{key:1,class:"remark-btn",title:"备注",onClick:ge(m=>Ut(s),["stop"])},"✎",8,Ts)):f("",!0)])],10,ms)}),128)),T.value.length?f("",!0):(n(),a("div",Rs,"暂无聊天"))]),te.value>he?(n(),a("div",Bs,[o("button",{disabled:R.value<=1,onClick:t[6]||(t[6]=s=>{R.value--,A()})},"<",8,As),o("span",null,v(R.value)+" / "+v(Math.ceil(te.value/he)),1),o("button",{disabled:R.value>=Math.ceil(te.value/he),onClick:t[7]||(t[7]=s=>{R.value++,A()})},">",8,Is)])):f("",!0)],2),o("div",{class:H(["chat-history-panel",{"mobile-hidden":k.value&&N.value!=="chat"}])},[b.value?(n(),a(S,{key:0},[o("div",Us,[k.value?(n(),a("button",{key:0,class:"mobile-back-btn",onClick:_t},[...t[36]||(t[36]=[o("svg",{viewBox:"0 0 24 24",fill:"none",stroke:"currentColor","stroke-width":"2","stroke-linecap":"round","stroke-linejoin":"round"},[o("path",{d:"M15 18l-6-6 6-6"})],-1)])])):f("",!0),o("span",null,v(b.value.nickname||b.value.chat_id),1),b.value.nickname&&b.value.nickname!==b.value.chat_id?(n(),a("span",Ns,"("+v(b.value.chat_id)+")",1)):f("",!0)]),o("div",{class:"history-body",ref_key:"historyRef",ref:W,onScroll:Ht},[K.value?(n(),a("div",Os,"加载中...")):!L.value&&h.value.length?(n(),a("div",js,"没有更多消息了")):f("",!0),(n(!0),a(S,null,oe(h.value,s=>(n(),a(S,{key:s.id},[s.event_type?(n(),a("div",zs,[o("div",Ds,[s.user_id?(n(),a("img",{key:0,class:"event-avatar",src:Ue(s.bot_qq,s.user_id),loading:"lazy",onError:t[8]||(t[8]=c=>c.target.style.display="none")},null,40,Hs)):(n(),a("div",Vs,v((s.nickname||"?").charAt(0)),1)),o("span",Qs,v(s.user_id),1),o("span",Ps,v(s.event_type==="member_add"?"已加入本群":"已退出本群"),1)])])):(n(),a("div",{key:1,class:H(["bubble-wrap",{self:s.is_self===!0}])},[o("div",Js,[s.is_self&&s.bot_qq?(n(),a("img",{key:0,class:"msg-avatar",src:xe(s.bot_qq),loading:"lazy",onError:t[9]||(t[9]=c=>c.target.style.display="none")},null,40,Ws)):s.is_self?(n(),a("div",Fs,[...t[37]||(t[37]=[Zt('<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="1.5" data-v-619d5b6f><rect x="3" y="4" width="18" height="14" rx="3" data-v-619d5b6f></rect><circle cx="9" cy="11" r="1.5" fill="currentColor" data-v-619d5b6f></circle><circle cx="15" cy="11" r="1.5" fill="currentColor" data-v-619d5b6f></circle><path d="M12 2v2M6 20l2-2M18 20l-2-2" data-v-619d5b6f></path></svg>',1)])])):s.user_id?(n(),a("img",{key:2,class:"msg-avatar",src:Ue(s.bot_qq,s.user_id),loading:"lazy",onError:t[10]||(t[10]=c=>c.target.style.display="none")},null,40,Ks)):(n(),a("div",Gs,v((s.nickname||"?").charAt(0)),1))]),o("div",Ys,[o("div",Xs,[J(v(s.nickname)+" ",1),s.source==="web_panel"?(n(),a("span",Zs,"Web")):f("",!0),Ee(s)&&!s.is_self&&B.value==="group"?(n(),a("span",{key:1,class:H(["bubble-role-tag",Rt(Ee(s))])},v(Tt(Ee(s))),3)):f("",!0),At(s.user_id)&&!s.is_self&&B.value==="group"?(n(),a("span",ea,"Bot")):f("",!0),s.user_id&&!s.is_self?(n(),a("span",ta,v(s.user_id),1)):f("",!0)]),o("div",sa,[o("div",{class:H(["bubble",{"bubble-self":s.is_self}])},[s._quote?(n(),a("div",aa,[o("div",na,"引用 "+v(s._quote.author||"消息"),1),o("div",la,v(xt(s._quote)),1)])):f("",!0),s._recalled?(n(),a("span",oa,"已撤回")):s._audit_rejected?(n(),a("span",ia,"审核未通过")):s.is_self&&Ce(s.message_id)?(n(),a("span",ra,"审核中")):f("",!0),s._segments?(n(),a("div",ua,[(n(!0),a(S,null,oe(s._segments,(c,m)=>(n(),a(S,{key:m},[c.kind==="text"?(n(),a("span",ca,v(c.text),1)):c.kind==="at"?(n(),a("span",da,v(Pe(c)),1)):c.kind==="image"?(n(),a(S,{key:2},[Oe(c.src)?(n(),a("span",{key:0,class:"bubble-media-placeholder","data-src":c.src,onClick:t[11]||(t[11]=q=>je(q))},"🖼 点击加载图片 (外部存储)",8,va)):(n(),a("img",{key:1,src:c.src,class:"bubble-media-img",style:{"max-width":"160px","max-height":"120px",width:"auto",height:"auto"},referrerpolicy:"no-referrer",onClick:q=>qe(c.src),onError:t[12]||(t[12]=q=>q.target.style.display="none"),loading:"lazy"},null,40,_a))],64)):c.kind==="audio"?(n(),a("audio",{key:3,src:c.src,controls:"",preload:"none",class:"bubble-media-audio"},null,8,pa)):c.kind==="video"?(n(),a("video",{key:4,src:c.src,controls:"",preload:"none",class:"bubble-media-video"},null,8,fa)):c.kind==="tag"?(n(),a("span",ga,v(c.text),1)):f("",!0)],64))),128))])):s._media?(n(),a(S,{key:5},[s._media.text?(n(),a("span",ma,v(s._media.text),1)):f("",!0),["图片","media"].includes(s._media.type)?(n(),a(S,{key:1},[Oe(s._media.src)?(n(),a("span",{key:0,class:"bubble-media-placeholder","data-src":s._media.src,onClick:t[13]||(t[13]=c=>je(c))},"🖼 点击加载图片 (外部存储)",8,ba)):(n(),a("img",{key:1,src:s._media.src,class:"bubble-media-img",style:{"max-width":"160px","max-height":"120px",width:"auto",height:"auto"},referrerpolicy:"no-referrer",onClick:c=>qe(s._media.src),onError:t[14]||(t[14]=c=>c.target.style.display="none"),loading:"lazy"},null,40,ha))],64)):s._media.type==="语音"?(n(),a("audio",{key:2,src:s._media.src,controls:"",preload:"none",class:"bubble-media-audio"},null,8,ya)):s._media.type==="视频"?(n(),a("video",{key:3,src:s._media.src,controls:"",preload:"none",class:"bubble-media-video"},null,8,ka)):(n(),a("a",{key:4,href:s._media.src,target:"_blank",class:"bubble-media-link"}," 📁 "+v(s._media.src.split("/").pop()),9,wa))],64)):(n(),a("div",{key:6,innerHTML:Lt(s.content),style:{"word-break":"break-all","overflow-wrap":"anywhere","white-space":"pre-wrap"}},null,8,xa))],2),o("div",qa,[ze(s)?(n(),a("button",{key:0,class:"action-btn",title:"引用这条消息",onClick:c=>qt(s)},"引",8,Ca)):f("",!0),o("button",{class:"action-btn",title:"原始数据",onClick:c=>kt(s)},"{ }",8,Ma),yt(s)&&!s._recalled?(n(),a("button",{key:1,class:"action-btn recall",disabled:ae.value===s.message_id,title:"撤回",onClick:c=>Ct(s)},v(ae.value===s.message_id?"...":"↩"),9,$a)):f("",!0)])]),o("span",Ea,v(ht(s.timestamp)),1),ye.value===s?(n(),a("pre",La,v(wt(s)),1)):f("",!0)])],2))],64))),128)),h.value.length?f("",!0):(n(),a("div",Sa,"暂无消息记录，可在下方发送消息"))],544),o("div",Ta,[y.value?(n(),a("div",Ra,[o("div",Ba,[o("span",Aa,"引用 "+v(De(y.value)),1),o("span",Ia,v(ut.value),1)]),o("button",{class:"quote-clear",title:"取消引用",onClick:Ve},"×")])):f("",!0),o("div",Ua,[Te(o("select",{"onUpdate:modelValue":t[15]||(t[15]=s=>x.value=s),class:"send-type-select"},[...t[38]||(t[38]=[o("option",{value:"text"},"普通消息",-1),o("option",{value:"media"},"富媒体",-1)])],512),[[lt,x.value]]),x.value==="media"?Te((n(),a("select",{key:0,"onUpdate:modelValue":t[16]||(t[16]=s=>V.value=s),class:"send-type-select"},[...t[39]||(t[39]=[o("option",{value:"1"},"图片",-1),o("option",{value:"2"},"视频",-1),o("option",{value:"3"},"语音",-1),o("option",{value:"4"},"文件",-1)])],512)),[[lt,V.value]]):f("",!0),x.value==="text"?(n(),a("label",Na,[o("input",{type:"file",accept:"image/*",onChange:Jt,hidden:""},null,32),t[40]||(t[40]=o("svg",{viewBox:"0 0 24 24",fill:"none",stroke:"currentColor","stroke-width":"1.5",class:"send-icon"},[o("rect",{x:"3",y:"3",width:"18",height:"18",rx:"3"}),o("circle",{cx:"8.5",cy:"8.5",r:"1.5",fill:"currentColor"}),o("path",{d:"M21 15l-5-5L5 21"})],-1))])):f("",!0),j.value?(n(),a("span",Oa,[G.value?(n(),a("img",{key:0,src:G.value,class:"send-img-preview"},null,8,ja)):f("",!0),J(" "+v(j.value.name)+" ",1),o("span",{class:"send-img-remove",onClick:Ze},"×")])):f("",!0)]),o("div",za,[o("div",{class:"mobile-type-menu",onClick:t[18]||(t[18]=ge(()=>{},["stop"]))},[o("button",{type:"button",class:"mobile-type-trigger",onClick:t[17]||(t[17]=s=>re.value=!re.value)},[o("span",null,v(ct.value),1),t[41]||(t[41]=o("span",{class:"mobile-type-caret"},null,-1))]),re.value?(n(),a("div",Da,[(n(),a(S,null,oe(Re,s=>o("button",{key:s.value,type:"button",class:H({active:x.value===s.value}),onClick:c=>pt(s.value)},v(s.label),11,Ha)),64))])):f("",!0)]),x.value==="media"?(n(),a("div",{key:0,class:"mobile-type-menu mobile-media-menu",onClick:t[20]||(t[20]=ge(()=>{},["stop"]))},[o("button",{type:"button",class:"mobile-type-trigger",onClick:t[19]||(t[19]=s=>ue.value=!ue.value)},[o("span",null,v(dt.value),1),t[42]||(t[42]=o("span",{class:"mobile-type-caret"},null,-1))]),ue.value?(n(),a("div",Va,[(n(),a(S,null,oe(Be,s=>o("button",{key:s.value,type:"button",class:H({active:V.value===s.value}),onClick:c=>ft(s.value)},v(s.label),11,Qa)),64))])):f("",!0)])):f("",!0),Te(o("textarea",{"onUpdate:modelValue":t[21]||(t[21]=s=>se.value=s),class:"send-input",rows:"2",placeholder:rt.value,onKeydown:Wt},null,40,Pa),[[es,se.value]]),o("button",{class:"send-btn",onClick:et,disabled:F.value},v(F.value?"...":"发送"),9,Ja)]),x.value==="media"?(n(),a("div",Wa," 输入资源 URL, 将以富媒体消息 ("+v({1:"图片",2:"视频",3:"语音",4:"文件"}[V.value])+") 发送 ",1)):f("",!0),z.value?(n(),a("div",Fa,v(z.value),1)):f("",!0)])],64)):(n(),a("div",Ka,[(n(),a("svg",Ga,[...t[43]||(t[43]=[o("path",{d:"M21 15a2 2 0 01-2 2H7l-4 4V5a2 2 0 012-2h14a2 2 0 012 2z"},null,-1)])])),t[44]||(t[44]=o("div",null,"选择一个聊天查看消息",-1))]))],2)]),ve.value?(n(),a("div",{key:0,class:"lightbox-overlay",onClick:Ne},[o("img",{src:ve.value,class:"lightbox-img",referrerpolicy:"no-referrer",onClick:t[22]||(t[22]=ge(()=>{},["stop"]))},null,8,Ya),o("span",{class:"lightbox-close",onClick:Ne},"×")])):f("",!0),C(d,{show:X.value,"onUpdate:show":t[25]||(t[25]=s=>X.value=s),preset:"dialog",title:"群备注","positive-text":"保存","negative-text":"取消",onPositiveClick:Fe,onNegativeClick:Nt,style:{width:"380px"}},{default:I(()=>[o("div",Xa,[o("div",Za,"群号: "+v(P.value),1),C(i,{value:Y.value,"onUpdate:value":t[23]||(t[23]=s=>Y.value=s),placeholder:"备注名称（留空则清除备注）",onKeydown:t[24]||(t[24]=ot(s=>{Fe(),X.value=!1},["enter"]))},null,8,["value"])])]),_:1},8,["show"]),C(d,{show:ne.value,"onUpdate:show":t[29]||(t[29]=s=>ne.value=s),preset:"dialog",title:"添加群备注","positive-text":"保存","negative-text":"取消",onPositiveClick:Ke,onNegativeClick:Ot,style:{width:"380px"}},{default:I(()=>[o("div",en,[C(i,{value:ke.value,"onUpdate:value":t[26]||(t[26]=s=>ke.value=s),placeholder:"群号",style:{"margin-bottom":"8px"},autofocus:""},null,8,["value"]),C(i,{value:we.value,"onUpdate:value":t[27]||(t[27]=s=>we.value=s),placeholder:"备注名称",onKeydown:t[28]||(t[28]=ot(s=>{Ke(),ne.value=!1},["enter"]))},null,8,["value"])])]),_:1},8,["show"])])}}},_n=ns(sn,[["__scopeId","data-v-619d5b6f"]]);export{_n as default};
+[keyboard] `);if(r!==-1){t=e.slice(0,r);try{const s=JSON.parse(e.slice(r+12)),c=((d=s==null?void 0:s.content)==null?void 0:d.rows)||[],m='width="9" height="9" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" style="flex-shrink:0"',q={0:`<svg ${m}><path d="M10 13a5 5 0 0 0 7.54.54l3-3a5 5 0 0 0-7.07-7.07l-1.72 1.71"/><path d="M14 11a5 5 0 0 0-7.54-.54l-3 3a5 5 0 0 0 7.07 7.07l1.71-1.71"/></svg>`,1:`<svg ${m}><polyline points="9 10 4 15 9 20"/><path d="M20 4v7a4 4 0 0 1-4 4H4"/></svg>`,2:`<svg ${m}><line x1="22" y1="2" x2="11" y2="13"/><polygon points="22 2 15 22 11 13 2 9 22 2"/></svg>`},ee=c.map(Ft=>`<div class="kb-row">${(Ft.buttons||[]).map(tt=>{var nt;const st=tt.render_data||{},le=tt.action||{},at=["kb-btn",`kb-t${(nt=le.type)!=null?nt:2}`];st.style===1&&at.push("kb-primary");const pe=[];le.data&&pe.push(le.data),le.enter&&pe.push("回车发送");const Kt=q[le.type]||q[2];return`<span class="${at.join(" ")}"${pe.length?` title="${pe.join(" · ")}"`:""}>${Kt}${Qe(st.label||"?")}</span>`}).join("")}</div>`);ee.length&&(l=`<div class="kb-wrap">${ee.join("")}</div>`)}catch(s){}}let i=Qe(t);return i=i.replace(/```([\s\S]*?)```/g,'<pre class="md-code-block">$1</pre>'),i=i.replace(/`([^`]+)`/g,'<code class="md-code">$1</code>'),i=i.replace(/\*\*(.+?)\*\*/g,"<b>$1</b>"),i=i.replace(/\*(.+?)\*/g,"<i>$1</i>"),i=i.replace(/~~(.+?)~~/g,"<s>$1</s>"),i=i.replace(/!\[([^\]]*)\]\(([^)]+)\)/g,""),i=i.replace(/\[([^\]]+)]\(([^)]+)\)/g,'<a href="$2" target="_blank" class="md-link">$1</a>'),i=i.replace(/\n/g,"<br>"),i+l}function St(e){var r,i;if(!e.raw_message||typeof e.raw_message!="string"||e.raw_message[0]!=="{")return null;let t;try{t=JSON.parse(e.raw_message).message}catch(d){return null}if(!Array.isArray(t)||!t.length)return null;const l=[];for(const d of t){if(!d||typeof d!="object")continue;const s=d.data||{};switch(d.type){case"text":((r=s.text)!=null?r:"")!==""&&l.push({kind:"text",text:String(s.text)});break;case"at":l.push({kind:"at",qq:String((i=s.qq)!=null?i:""),name:s.name?String(s.name):""});break;case"image":l.push({kind:"image",src:String(s.url||s.file||"")});break;case"face":l.push({kind:"tag",text:"[表情]"});break;case"record":l.push({kind:"audio",src:String(s.url||s.file||"")});break;case"video":l.push({kind:"video",src:String(s.url||s.file||"")});break;case"reply":break;default:l.push({kind:"tag",text:`[${d.type}]`})}}return l.length?l:null}function Pe(e){return e.qq==="all"?"@全体成员":`@${e.name||e.qq}`}let Z=null;function A(){return $(this,null,function*(){var e,t,l,r;if(!p)try{const i=yield U.post("/api/message/chats",{type:w.value,search:M.value,bot_qq:g.currentBotId||"",page:R.value,page_size:he,days:O.value});if(p)return;T.value=((t=(e=i.data)==null?void 0:e.data)==null?void 0:t.chats)||[],te.value=((r=(l=i.data)==null?void 0:l.data)==null?void 0:r.total)||T.value.length}catch(i){p||(T.value=[],te.value=0)}})}function Je(e){return Q.value[e]||{}}function Ee(e){return String(e.role||Je(e.user_id).role||"")}function Tt(e){return e==="owner"?"群主":e==="admin"?"管理":e?"群员":""}function Rt(e){return e==="owner"?"role-owner":e==="admin"?"role-admin":"role-member"}function Bt(e){const t=Number(e);return t?t>=2854e6&&t<=2855e6||t>=3889e6&&t<=389e7||t>=401e7&&t<=4019999999||t===3328144510||t===666e5:!1}function At(e){return!!Je(e).is_bot||Bt(e)}const We={};function It(e){return $(this,null,function*(){var l;if(!e){Q.value={};return}const t=We[e];if(t&&Date.now()-t.ts<tn){Q.value=t.data;return}try{const i=((l=(yield U.post("/api/message/group-roles",{group_id:e})).data)==null?void 0:l.data)||{};We[e]={data:i,ts:Date.now()},Q.value=i}catch(r){Q.value={}}})}function Fe(){return $(this,null,function*(){if(P.value)try{yield U.post("/api/message/remarks",{group_id:P.value,remark:Y.value.trim(),group_qq:ce.value.trim()}),X.value=!1,P.value=null,Y.value="",ce.value="",A()}catch(e){}})}function Ut(e){P.value=e.chat_id,Y.value=e.remark||"",ce.value=e.group_qq||"",X.value=!0}function Nt(){X.value=!1,P.value=null,Y.value="",ce.value=""}function Ke(){return $(this,null,function*(){const e=ke.value.trim();if(e)try{yield U.post("/api/message/remarks",{group_id:e,remark:we.value.trim(),group_qq:it.value.trim()}),ne.value=!1,A()}catch(t){}})}function Ot(){ne.value=!1}function jt(){Z||(Z=setTimeout(()=>{Z=null,A()},5e3))}let Le=0;function zt(e){return $(this,null,function*(){var l,r,i,d,s,c;const t=++Le;b.value=e,se.value="",z.value="",j.value=null,y.value=null,L.value=!0,D.value="",K.value=!1,Q.value={},k.value&&(N.value="chat"),h.value=[];try{const m=yield U.post("/api/message/history",{chat_type:B.value,chat_id:e.chat_id,bot_qq:g.currentBotId||""});if(t!==Le)return;const q=((r=(l=m.data)==null?void 0:l.data)==null?void 0:r.messages)||[];for(const ee of q)Me(ee);$e(q),h.value=q,B.value==="group"&&It(e.chat_id),D.value=((d=(i=m.data)==null?void 0:i.data)==null?void 0:d.oldest_date)||"",L.value=((c=(s=m.data)==null?void 0:s.data)==null?void 0:c.has_more)!==!1,yield be(),_e(),Vt()}catch(m){t===Le&&(h.value=[],L.value=!1)}})}function Dt(){return $(this,null,function*(){var e,t,l,r,i,d;if(!(K.value||!L.value||!b.value||!D.value)){K.value=!0;try{const s=yield U.post("/api/message/history",{chat_type:B.value,chat_id:b.value.chat_id,bot_qq:g.currentBotId||"",before_id:(h.value[0]||{}).id,before_date:D.value}),c=((t=(e=s.data)==null?void 0:e.data)==null?void 0:t.messages)||[];if(!c.length){L.value=!1;return}for(const ee of c)Me(ee);const m=W.value,q=m?m.scrollHeight:0;h.value=[...c,...h.value],$e(h.value),D.value=((r=(l=s.data)==null?void 0:l.data)==null?void 0:r.oldest_date)||D.value,L.value=((d=(i=s.data)==null?void 0:i.data)==null?void 0:d.has_more)!==!1,yield be(),m&&(m.scrollTop=m.scrollHeight-q)}catch(s){L.value=!1}finally{K.value=!1}}})}function Ht(){const e=W.value;e&&e.scrollTop<60&&L.value&&!K.value&&Dt()}function Ge(){const e=W.value;return e?e.scrollHeight-e.scrollTop-e.clientHeight<80:!0}function _e(){const e=W.value;e&&(e.scrollTop=e.scrollHeight)}let Se=!1;function Vt(){Se=!0;const e=W.value;if(!e)return;const t=()=>{Se=!1,e.removeEventListener("wheel",t),e.removeEventListener("touchmove",t)};e.addEventListener("wheel",t,{once:!0,passive:!0}),e.addEventListener("touchmove",t,{once:!0,passive:!0});const l=()=>{Se&&_e()};e.querySelectorAll("img").forEach(r=>{r.complete||r.addEventListener("load",l,{once:!0})}),setTimeout(t,3e3)}function Ye(e){return $(this,null,function*(){var t,l;if(!e)return"未知用户";if(E[e])return E[e];try{const r=((l=(t=(yield U.post("/api/message/nickname",{user_id:e})).data)==null?void 0:t.data)==null?void 0:l.nickname)||`用户${e.slice(-6)}`;return E[e]=r,r}catch(r){return`用户${e.slice(-6)}`}})}function Xe(e){return $(this,null,function*(){var i;if(!e||p)return;if(e.log_type==="audit"){Pt(e);return}if(e.log_type==="lifecycle"){Qt(e);return}if(e.log_type!=="message"||(jt(),!b.value))return;const t=e.group_id||"",l=e.user_id||"",r=b.value.chat_id;if(B.value==="group"&&t===r||B.value==="user"&&l===r&&!t){const d=e.direction==="send",s=d?e.bot_name||"Bot":yield Ye(l);if(p)return;const c=Me({id:h.value.length,message_id:e.message_id||"",reference_id:e.reference_id||"",user_id:l,bot_qq:e.bot_qq||((i=g.currentBot)==null?void 0:i.bot_qq)||"",bot_qq:d&&e.bot_qq||"",nickname:s,content:e.content||"",timestamp:e.timestamp||"",is_self:d,source:e.source||"",raw_message:e.raw_message||""});h.value.push(c),$e(h.value),Ge()&&be(_e)}})}function Qt(e){return $(this,null,function*(){var s;if(!b.value||B.value!=="group")return;const t=e.type||"";if(t!=="group_member_add"&&t!=="group_member_del")return;const l=e.group_id||"",r=e.user_id||"",i=b.value.chat_id;if(l!==i)return;const d=yield Ye(r);p||(h.value.push({id:`lc_rt_${Date.now()}`,message_id:"",reference_id:"",user_id:r,bot_qq:e.bot_qq||((s=g.currentBot)==null?void 0:s.bot_qq)||"",bot_qq:"",nickname:d,content:"",timestamp:e.timestamp||"",is_self:!1,source:"",raw_message:"",recalled:!1,event_type:t==="group_member_add"?"member_add":"member_remove"}),Ge()&&be(_e))})}function Pt(e){if(!e.audit_id)return;const t=h.value.find(l=>l.message_id===e.audit_id);t&&(e.passed&&e.message_id?t.message_id=e.message_id:e.passed||(t._audit_rejected=!0))}function Jt(e){var l;const t=(l=e.target.files)==null?void 0:l[0];t&&(j.value=t,G.value=URL.createObjectURL(t)),e.target.value=""}function Ze(){G.value&&URL.revokeObjectURL(G.value),j.value=null,G.value=""}function Wt(e){e.key==="Enter"&&!e.shiftKey&&(e.preventDefault(),et())}function et(){return $(this,null,function*(){var e,t,l,r;if(!(F.value||!b.value)){F.value=!0,z.value="";try{const i=se.value.trim();if(!i&&!j.value){F.value=!1;return}const d=new FormData;d.append("chat_type",B.value),d.append("chat_id",b.value.chat_id),d.append("bot_qq",g.currentBotId||b.value.bot_qq||""),d.append("msg_type",x.value),d.append("content",i),y.value&&(y.value.reference_id&&d.append("message_reference_id",y.value.reference_id),y.value.message_id&&d.append("quote_message_id",y.value.message_id)),j.value&&x.value==="text"&&d.append("image",j.value),x.value==="media"&&d.append("media_file_type",V.value);const s=yield U.post("/api/message/send",d);(e=s.data)!=null&&e.success?(se.value="",Ze(),Ve()):z.value=((t=s.data)==null?void 0:t.message)||"发送失败"}catch(i){z.value=((r=(l=i.response)==null?void 0:l.data)==null?void 0:r.message)||i.message||"发送失败"}finally{F.value=!1}}})}return fe(w,()=>{b.value=null,y.value=null,h.value=[],T.value=[],D.value="",L.value=!0,R.value=1,P.value=null,Q.value={},A()}),fe(O,()=>{R.value=1,A()}),fe(M,()=>{R.value=1,A()}),fe(()=>g.currentBotId,()=>{b.value=null,y.value=null,h.value=[],D.value="",L.value=!0,R.value=1,A()}),Gt(()=>{A(),ss("new_log",Xe),window.addEventListener("resize",Ae),document.addEventListener("click",de)}),Yt(()=>{p=!0,as("new_log",Xe),window.removeEventListener("resize",Ae),document.removeEventListener("click",de),Z&&(clearTimeout(Z),Z=null)}),(e,t)=>{const l=me("n-radio-button"),r=me("n-radio-group"),i=me("n-input"),d=me("n-modal");return n(),a("div",_s,[o("div",ps,[o("div",{class:H(["chat-list-panel",{"mobile-hidden":k.value&&N.value!=="list"}])},[o("div",fs,[t[35]||(t[35]=o("span",null,"聊天列表",-1)),C(r,{value:w.value,"onUpdate:value":t[0]||(t[0]=s=>w.value=s),size:"tiny"},{default:I(()=>[C(l,{value:"group"},{default:I(()=>[...t[30]||(t[30]=[J("群",-1)])]),_:1}),C(l,{value:"user"},{default:I(()=>[...t[31]||(t[31]=[J("好友",-1)])]),_:1})]),_:1},8,["value"]),C(r,{value:O.value,"onUpdate:value":t[1]||(t[1]=s=>O.value=s),size:"tiny",class:"days-sel"},{default:I(()=>[C(l,{value:1},{default:I(()=>[...t[32]||(t[32]=[J("1天",-1)])]),_:1}),C(l,{value:2},{default:I(()=>[...t[33]||(t[33]=[J("2天",-1)])]),_:1}),C(l,{value:3},{default:I(()=>[...t[34]||(t[34]=[J("3天",-1)])]),_:1})]),_:1},8,["value"])]),C(i,{value:M.value,"onUpdate:value":t[2]||(t[2]=s=>M.value=s),placeholder:"搜索...",size:"small",clearable:"",class:"chat-search"},null,8,["value"]),o("div",gs,[(n(!0),a(S,null,oe(T.value,s=>{var c;return n(),a("div",{key:s.chat_id,class:H(["chat-item",{active:((c=b.value)==null?void 0:c.chat_id)===s.chat_id}]),onClick:m=>zt(s)},[o("div",bs,[w.value==="user"&&s.chat_id?(n(),a("img",{key:0,class:"chat-avatar",src:xe(s.chat_id),loading:"lazy",onError:t[3]||(t[3]=m=>m.target.style.display="none")},null,40,hs)):w.value==="group"&&s.chat_id?(n(),a("img",{key:1,class:"chat-avatar",src:gt(s.chat_id),loading:"lazy",onError:t[4]||(t[4]=m=>m.target.style.display="none")},null,40,ys)):Xt(g).isAllBots&&s.bot_qq&&Ie(s.bot_qq)?(n(),a("img",{key:2,class:"chat-avatar",src:Ie(s.bot_qq),loading:"lazy",onError:t[5]||(t[5]=m=>m.target.style.display="none")},null,40,ks)):(n(),a("div",ws,v((s.nickname||s.chat_id||"?").charAt(0)),1)),s.is_full_access?(n(),a("span",xs,"全")):f("",!0)]),o("div",qs,[o("div",Cs,v(s.nickname||s.chat_id),1),s.nickname&&s.nickname!==s.chat_id?(n(),a("div",Ms,v(s.chat_id),1)):f("",!0),o("div",$s,v(s.last_content||""),1)]),o("div",Es,[o("div",Ls,v(bt(s.last_time)),1),s.msg_count?(n(),a("div",Ss,v(s.msg_count),1)):f("",!0),w.value!=="user"?(n(),a("button",{key:1,class:"remark-btn",title:"备注",onClick:ge(m=>Ut(s),["stop"])},"✎",8,Ts)):f("",!0)])],10,ms)}),128)),T.value.length?f("",!0):(n(),a("div",Rs,"暂无聊天"))]),te.value>he?(n(),a("div",Bs,[o("button",{disabled:R.value<=1,onClick:t[6]||(t[6]=s=>{R.value--,A()})},"<",8,As),o("span",null,v(R.value)+" / "+v(Math.ceil(te.value/he)),1),o("button",{disabled:R.value>=Math.ceil(te.value/he),onClick:t[7]||(t[7]=s=>{R.value++,A()})},">",8,Is)])):f("",!0)],2),o("div",{class:H(["chat-history-panel",{"mobile-hidden":k.value&&N.value!=="chat"}])},[b.value?(n(),a(S,{key:0},[o("div",Us,[k.value?(n(),a("button",{key:0,class:"mobile-back-btn",onClick:_t},[...t[36]||(t[36]=[o("svg",{viewBox:"0 0 24 24",fill:"none",stroke:"currentColor","stroke-width":"2","stroke-linecap":"round","stroke-linejoin":"round"},[o("path",{d:"M15 18l-6-6 6-6"})],-1)])])):f("",!0),o("span",null,v(b.value.nickname||b.value.chat_id),1),b.value.nickname&&b.value.nickname!==b.value.chat_id?(n(),a("span",Ns,"("+v(b.value.chat_id)+")",1)):f("",!0)]),o("div",{class:"history-body",ref_key:"historyRef",ref:W,onScroll:Ht},[K.value?(n(),a("div",Os,"加载中...")):!L.value&&h.value.length?(n(),a("div",js,"没有更多消息了")):f("",!0),(n(!0),a(S,null,oe(h.value,s=>(n(),a(S,{key:s.id},[s.event_type?(n(),a("div",zs,[o("div",Ds,[s.user_id?(n(),a("img",{key:0,class:"event-avatar",src:Ue(s.bot_qq,s.user_id),loading:"lazy",onError:t[8]||(t[8]=c=>c.target.style.display="none")},null,40,Hs)):(n(),a("div",Vs,v((s.nickname||"?").charAt(0)),1)),o("span",Qs,v(s.user_id),1),o("span",Ps,v(s.event_type==="member_add"?"已加入本群":"已退出本群"),1)])])):(n(),a("div",{key:1,class:H(["bubble-wrap",{self:s.is_self===!0}])},[o("div",Js,[s.is_self&&s.bot_qq?(n(),a("img",{key:0,class:"msg-avatar",src:xe(s.bot_qq),loading:"lazy",onError:t[9]||(t[9]=c=>c.target.style.display="none")},null,40,Ws)):s.is_self?(n(),a("div",Fs,[...t[37]||(t[37]=[Zt('<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="1.5" data-v-619d5b6f><rect x="3" y="4" width="18" height="14" rx="3" data-v-619d5b6f></rect><circle cx="9" cy="11" r="1.5" fill="currentColor" data-v-619d5b6f></circle><circle cx="15" cy="11" r="1.5" fill="currentColor" data-v-619d5b6f></circle><path d="M12 2v2M6 20l2-2M18 20l-2-2" data-v-619d5b6f></path></svg>',1)])])):s.user_id?(n(),a("img",{key:2,class:"msg-avatar",src:Ue(s.bot_qq,s.user_id),loading:"lazy",onError:t[10]||(t[10]=c=>c.target.style.display="none")},null,40,Ks)):(n(),a("div",Gs,v((s.nickname||"?").charAt(0)),1))]),o("div",Ys,[o("div",Xs,[J(v(s.nickname)+" ",1),s.source==="web_panel"?(n(),a("span",Zs,"Web")):f("",!0),Ee(s)&&!s.is_self&&B.value==="group"?(n(),a("span",{key:1,class:H(["bubble-role-tag",Rt(Ee(s))])},v(Tt(Ee(s))),3)):f("",!0),At(s.user_id)&&!s.is_self&&B.value==="group"?(n(),a("span",ea,"Bot")):f("",!0),s.user_id&&!s.is_self?(n(),a("span",ta,v(s.user_id),1)):f("",!0)]),o("div",sa,[o("div",{class:H(["bubble",{"bubble-self":s.is_self}])},[s._quote?(n(),a("div",aa,[o("div",na,"引用 "+v(s._quote.author||"消息"),1),o("div",la,v(xt(s._quote)),1)])):f("",!0),s._recalled?(n(),a("span",oa,"已撤回")):s._audit_rejected?(n(),a("span",ia,"审核未通过")):s.is_self&&Ce(s.message_id)?(n(),a("span",ra,"审核中")):f("",!0),s._segments?(n(),a("div",ua,[(n(!0),a(S,null,oe(s._segments,(c,m)=>(n(),a(S,{key:m},[c.kind==="text"?(n(),a("span",ca,v(c.text),1)):c.kind==="at"?(n(),a("span",da,v(Pe(c)),1)):c.kind==="image"?(n(),a(S,{key:2},[Oe(c.src)?(n(),a("span",{key:0,class:"bubble-media-placeholder","data-src":c.src,onClick:t[11]||(t[11]=q=>je(q))},"🖼 点击加载图片 (外部存储)",8,va)):(n(),a("img",{key:1,src:c.src,class:"bubble-media-img",style:{"max-width":"160px","max-height":"120px",width:"auto",height:"auto"},referrerpolicy:"no-referrer",onClick:q=>qe(c.src),onError:t[12]||(t[12]=q=>q.target.style.display="none"),loading:"lazy"},null,40,_a))],64)):c.kind==="audio"?(n(),a("audio",{key:3,src:c.src,controls:"",preload:"none",class:"bubble-media-audio"},null,8,pa)):c.kind==="video"?(n(),a("video",{key:4,src:c.src,controls:"",preload:"none",class:"bubble-media-video"},null,8,fa)):c.kind==="tag"?(n(),a("span",ga,v(c.text),1)):f("",!0)],64))),128))])):s._media?(n(),a(S,{key:5},[s._media.text?(n(),a("span",ma,v(s._media.text),1)):f("",!0),["图片","media"].includes(s._media.type)?(n(),a(S,{key:1},[Oe(s._media.src)?(n(),a("span",{key:0,class:"bubble-media-placeholder","data-src":s._media.src,onClick:t[13]||(t[13]=c=>je(c))},"🖼 点击加载图片 (外部存储)",8,ba)):(n(),a("img",{key:1,src:s._media.src,class:"bubble-media-img",style:{"max-width":"160px","max-height":"120px",width:"auto",height:"auto"},referrerpolicy:"no-referrer",onClick:c=>qe(s._media.src),onError:t[14]||(t[14]=c=>c.target.style.display="none"),loading:"lazy"},null,40,ha))],64)):s._media.type==="语音"?(n(),a("audio",{key:2,src:s._media.src,controls:"",preload:"none",class:"bubble-media-audio"},null,8,ya)):s._media.type==="视频"?(n(),a("video",{key:3,src:s._media.src,controls:"",preload:"none",class:"bubble-media-video"},null,8,ka)):(n(),a("a",{key:4,href:s._media.src,target:"_blank",class:"bubble-media-link"}," 📁 "+v(s._media.src.split("/").pop()),9,wa))],64)):(n(),a("div",{key:6,innerHTML:Lt(s.content),style:{"word-break":"break-all","overflow-wrap":"anywhere","white-space":"pre-wrap"}},null,8,xa))],2),o("div",qa,[ze(s)?(n(),a("button",{key:0,class:"action-btn",title:"引用这条消息",onClick:c=>qt(s)},"引",8,Ca)):f("",!0),o("button",{class:"action-btn",title:"原始数据",onClick:c=>kt(s)},"{ }",8,Ma),yt(s)&&!s._recalled?(n(),a("button",{key:1,class:"action-btn recall",disabled:ae.value===s.message_id,title:"撤回",onClick:c=>Ct(s)},v(ae.value===s.message_id?"...":"↩"),9,$a)):f("",!0)])]),o("span",Ea,v(ht(s.timestamp)),1),ye.value===s?(n(),a("pre",La,v(wt(s)),1)):f("",!0)])],2))],64))),128)),h.value.length?f("",!0):(n(),a("div",Sa,"暂无消息记录，可在下方发送消息"))],544),o("div",Ta,[y.value?(n(),a("div",Ra,[o("div",Ba,[o("span",Aa,"引用 "+v(De(y.value)),1),o("span",Ia,v(ut.value),1)]),o("button",{class:"quote-clear",title:"取消引用",onClick:Ve},"×")])):f("",!0),o("div",Ua,[Te(o("select",{"onUpdate:modelValue":t[15]||(t[15]=s=>x.value=s),class:"send-type-select"},[...t[38]||(t[38]=[o("option",{value:"text"},"普通消息",-1),o("option",{value:"media"},"富媒体",-1)])],512),[[lt,x.value]]),x.value==="media"?Te((n(),a("select",{key:0,"onUpdate:modelValue":t[16]||(t[16]=s=>V.value=s),class:"send-type-select"},[...t[39]||(t[39]=[o("option",{value:"1"},"图片",-1),o("option",{value:"2"},"视频",-1),o("option",{value:"3"},"语音",-1),o("option",{value:"4"},"文件",-1)])],512)),[[lt,V.value]]):f("",!0),x.value==="text"?(n(),a("label",Na,[o("input",{type:"file",accept:"image/*",onChange:Jt,hidden:""},null,32),t[40]||(t[40]=o("svg",{viewBox:"0 0 24 24",fill:"none",stroke:"currentColor","stroke-width":"1.5",class:"send-icon"},[o("rect",{x:"3",y:"3",width:"18",height:"18",rx:"3"}),o("circle",{cx:"8.5",cy:"8.5",r:"1.5",fill:"currentColor"}),o("path",{d:"M21 15l-5-5L5 21"})],-1))])):f("",!0),j.value?(n(),a("span",Oa,[G.value?(n(),a("img",{key:0,src:G.value,class:"send-img-preview"},null,8,ja)):f("",!0),J(" "+v(j.value.name)+" ",1),o("span",{class:"send-img-remove",onClick:Ze},"×")])):f("",!0)]),o("div",za,[o("div",{class:"mobile-type-menu",onClick:t[18]||(t[18]=ge(()=>{},["stop"]))},[o("button",{type:"button",class:"mobile-type-trigger",onClick:t[17]||(t[17]=s=>re.value=!re.value)},[o("span",null,v(ct.value),1),t[41]||(t[41]=o("span",{class:"mobile-type-caret"},null,-1))]),re.value?(n(),a("div",Da,[(n(),a(S,null,oe(Re,s=>o("button",{key:s.value,type:"button",class:H({active:x.value===s.value}),onClick:c=>pt(s.value)},v(s.label),11,Ha)),64))])):f("",!0)]),x.value==="media"?(n(),a("div",{key:0,class:"mobile-type-menu mobile-media-menu",onClick:t[20]||(t[20]=ge(()=>{},["stop"]))},[o("button",{type:"button",class:"mobile-type-trigger",onClick:t[19]||(t[19]=s=>ue.value=!ue.value)},[o("span",null,v(dt.value),1),t[42]||(t[42]=o("span",{class:"mobile-type-caret"},null,-1))]),ue.value?(n(),a("div",Va,[(n(),a(S,null,oe(Be,s=>o("button",{key:s.value,type:"button",class:H({active:V.value===s.value}),onClick:c=>ft(s.value)},v(s.label),11,Qa)),64))])):f("",!0)])):f("",!0),Te(o("textarea",{"onUpdate:modelValue":t[21]||(t[21]=s=>se.value=s),class:"send-input",rows:"2",placeholder:rt.value,onKeydown:Wt},null,40,Pa),[[es,se.value]]),o("button",{class:"send-btn",onClick:et,disabled:F.value},v(F.value?"...":"发送"),9,Ja)]),x.value==="media"?(n(),a("div",Wa," 输入资源 URL, 将以富媒体消息 ("+v({1:"图片",2:"视频",3:"语音",4:"文件"}[V.value])+") 发送 ",1)):f("",!0),z.value?(n(),a("div",Fa,v(z.value),1)):f("",!0)])],64)):(n(),a("div",Ka,[(n(),a("svg",Ga,[...t[43]||(t[43]=[o("path",{d:"M21 15a2 2 0 01-2 2H7l-4 4V5a2 2 0 012-2h14a2 2 0 012 2z"},null,-1)])])),t[44]||(t[44]=o("div",null,"选择一个聊天查看消息",-1))]))],2)]),ve.value?(n(),a("div",{key:0,class:"lightbox-overlay",onClick:Ne},[o("img",{src:ve.value,class:"lightbox-img",referrerpolicy:"no-referrer",onClick:t[22]||(t[22]=ge(()=>{},["stop"]))},null,8,Ya),o("span",{class:"lightbox-close",onClick:Ne},"×")])):f("",!0),C(d,{show:X.value,"onUpdate:show":t[25]||(t[25]=s=>X.value=s),preset:"dialog",title:"群备注","positive-text":"保存","negative-text":"取消",onPositiveClick:Fe,onNegativeClick:Nt,style:{width:"380px"}},{default:I(()=>[o("div",Xa,[o("div",Za,"群号: "+v(P.value),1),C(i,{value:Y.value,"onUpdate:value":t[23]||(t[23]=s=>Y.value=s),placeholder:"备注名称（留空则清除备注）",onKeydown:t[24]||(t[24]=ot(s=>{Fe(),X.value=!1},["enter"]))},null,8,["value"])])]),_:1},8,["show"]),C(d,{show:ne.value,"onUpdate:show":t[29]||(t[29]=s=>ne.value=s),preset:"dialog",title:"添加群备注","positive-text":"保存","negative-text":"取消",onPositiveClick:Ke,onNegativeClick:Ot,style:{width:"380px"}},{default:I(()=>[o("div",en,[C(i,{value:ke.value,"onUpdate:value":t[26]||(t[26]=s=>ke.value=s),placeholder:"群号",style:{"margin-bottom":"8px"},autofocus:""},null,8,["value"]),C(i,{value:we.value,"onUpdate:value":t[27]||(t[27]=s=>we.value=s),placeholder:"备注名称",onKeydown:t[28]||(t[28]=ot(s=>{Ke(),ne.value=!1},["enter"]))},null,8,["value"])])]),_:1},8,["show"])])}}},_n=ns(sn,[["__scopeId","data-v-619d5b6f"]]);export{_n as default};
@@ -1,7 +1,7 @@
-var Le=Object.defineProperty,Ve=Object.defineProperties;var Ie=Object.getOwnPropertyDescriptors;var ve=Object.getOwnPropertySymbols;var je=Object.prototype.hasOwnProperty,We=Object.prototype.propertyIsEnumerable;var he=($,c,h)=>c in $?Le($,c,{enumerable:!0,configurable:!0,writable:!0,value:h}):$[c]=h,Z=($,c)=>{for(var h in c||(c={}))je.call(c,h)&&he($,h,c[h]);if(ve)for(var h of ve(c))We.call(c,h)&&he($,h,c[h]);return $},Q=($,c)=>Ve($,Ie(c));var C=($,c,h)=>new Promise((V,P)=>{var I=y=>{try{O(h.next(y))}catch(A){P(A)}},U=y=>{try{O(h.throw(y))}catch(A){P(A)}},O=y=>y.done?V(y.value):Promise.resolve(y.value).then(I,U);O((h=h.apply($,c)).next())});import{o as Ee,a1 as l,a2 as a,Z as f,l as X,aa as Pe,ab as se,a6 as u,a7 as p,F as D,R as L,I as be,L as S,a5 as N,j as b,N as ae,a9 as Je,r as G,c as ne,e as H,k as Te,m as _,X as o}from"./vue.js";import{i as z}from"./index.js";import{u as Xe}from"./app.js";import{S as g}from"./SvgIcon.js";import{_ as Ge}from"./_plugin-vue_export-helper.js";import{u as He}from"./naive.js";import"./vendor.js";const Ke={class:"plugins-page"},Re={class:"ui-page-head"},Ye={class:"ui-page-head-main"},Ze={class:"ui-page-icon"},Qe={class:"plugins-toolbar"},et={key:0,class:"p-btn upload-btn"},tt={key:1,class:"p-btn upload-btn"},st=["disabled"],at={key:0,class:"p-loading"},nt={key:1,class:"p-empty"},lt={key:2,class:"plugins-list"},ot=["onClick"],it={class:"p-dir-left"},rt={class:"p-dir-name"},ct=["title"],dt={class:"p-tag"},pt={key:0,class:"p-dir-desc"},ut=["title"],ft=["checked","disabled","onChange"],gt=["onClick"],mt=["onClick"],_t={key:0,class:"p-dir-files"},yt={key:0,class:"p-empty-inline"},vt={class:"p-file-left"},ht={class:"p-file-name"},bt={class:"p-file-size"},kt={class:"p-file-actions"},wt=["onClick"],Ct=["onClick"],zt={class:"p-dir-left"},$t={class:"p-dir-name"},xt={key:0,class:"p-tag"},Mt={key:1,class:"p-tag"},qt={key:2,class:"p-tag"},Bt={key:3,class:"p-tag"},St={key:0,class:"p-meta-author"},Ut={key:1,class:"p-dir-desc"},Dt=["href"],Nt=["onClick"],Ot=["onClick"],At=["onClick"],Ft=["checked","onChange"],Lt=["src"],Vt={class:"bot-bind-id"},It={key:1,class:"p-dir-cmds"},jt=["title"],Wt={key:2,class:"p-dir-files"},Et={class:"p-file-left"},Pt={class:"p-file-name"},Jt={class:"p-file-size"},Tt={class:"p-file-actions"},Xt=["onClick"],Gt={key:3,class:"p-dir-files"},Ht={class:"p-file-left"},Kt={class:"p-file-name"},Rt={key:0,class:"p-file-meta"},Yt={class:"p-file-size"},Zt={class:"p-file-time"},Qt={class:"p-file-actions"},es=["onClick","title"],ts=["title"],ss=["checked","disabled","onChange"],as=["onClick"],ns=["onClick"],ls={class:"bot-bind-title"},os=["checked","onChange"],is=["src"],rs={class:"bot-bind-id"},cs={class:"p-uninstall-confirm"},ds={class:"p-uninstall-msg"},ps={class:"p-uninstall-check"},us={class:"p-uninstall-btns"},fs=["disabled"],gs={class:"p-modal"},ms={class:"p-modal-head"},_s={class:"p-modal-title"},ys={key:0,class:"p-tag warn"},vs={key:1,class:"p-tag accent"},hs={class:"p-modal-actions"},bs={class:"p-modal-body"},ks=["readonly"],ws={class:"p-modal cfg-modal"},Cs={class:"p-modal-head"},zs={class:"p-modal-title"},$s={key:0,class:"p-tag accent"},xs={class:"p-modal-actions"},Ms={key:0,class:"cv-mode-tabs"},qs={class:"p-modal-body cfg-body"},Bs={key:0,class:"cfg-visual"},Ss=50*1024,Us={__name:"Plugins",setup($){const c=He(),h=Xe(),V=G([]),P=G([]),I=G(""),U=G("all"),O=G(!1),y=H({}),A=H({}),v=H({show:!1,filename:"",content:"",originalContent:"",path:"",readonly:!1,modified:!1,saving:!1}),d=H({show:!1,filename:"",path:"",format:"raw",raw:"",parsed:null,comments:{},viewMode:"visual",modified:!1,saving:!1}),K=Te({name:"ConfigNode",props:{data:{required:!0},path:{type:Array,default:()=>[]},comments:{type:Object,default:()=>({})}},emits:["update"],setup(s,{emit:e}){function t(i,m){e("update",i,m)}function r(i){return s.comments[i.join(".")]||""}return()=>{const i=s.data;if(i==null)return _("div",{class:"cfg-row"},[_("span",{class:"cfg-key"},s.path.length?s.path[s.path.length-1]:"null"),_("span",{class:"cfg-val null"},"null")]);if(typeof i=="object"&&!Array.isArray(i)){const q=Object.entries(i);return _("div",{class:"cfg-section"},q.map(([B,k])=>{const x=[...s.path,B],n=r(x);return k!==null&&typeof k=="object"?_("details",{class:"cfg-group",open:!0},[_("summary",{class:"cfg-group-title"},[B,n?_("span",{class:"cfg-comment"},n):null]),_(K,{data:k,path:x,comments:s.comments,onUpdate:t})]):_(K,{data:k,path:x,comments:s.comments,onUpdate:t})}))}if(Array.isArray(i)){const q=i.map((k,x)=>{const n=[...s.path,x];return _("div",{class:"cfg-array-item"},[_("span",{class:"cfg-idx"},`[${x}]`),_(K,{data:k,path:n,comments:s.comments,onUpdate:t}),_("button",{class:"cfg-arr-btn remove",title:"删除",onClick:()=>{const F=[...i];F.splice(x,1),t(s.path,F)}},"×")])}),B=()=>{if(!i.length)return"";const k=i[0];return k&&typeof k=="object"&&!Array.isArray(k)?Object.fromEntries(Object.entries(k).map(([x,n])=>[x,typeof n=="boolean"?!1:typeof n=="number"?0:""])):typeof k=="boolean"?!1:typeof k=="number"?0:""};return q.push(_("button",{class:"cfg-arr-btn add",onClick:()=>t(s.path,[...i,B()])},"+ 添加")),_("div",{class:"cfg-section"},q)}const m=s.path.length?s.path[s.path.length-1]:"",W=r(s.path),Y=typeof i=="boolean",E=typeof i=="number";return _("div",{class:"cfg-row"},[_("span",{class:"cfg-key"},String(m)),Y?_("label",{class:"cfg-toggle"},[_("input",{type:"checkbox",checked:i,onChange:q=>t(s.path,q.target.checked)}),_("span",{class:"cfg-toggle-slider"}),_("span",{class:"cfg-toggle-label"},i?"true":"false")]):_("input",{class:"cfg-input"+(E?" num":""),type:E?"number":"text",value:String(i),onInput:q=>{let B=q.target.value;E&&(B=Number(B)||0),t(s.path,B)}}),W?_("span",{class:"cfg-comment"},W):null])}}}),le=ne(()=>{if(U.value==="plugin")return[];const s=I.value.toLowerCase();let e=P.value;return s&&(e=e.filter(t=>t.name.toLowerCase().includes(s)||(t.display_name||"").toLowerCase().includes(s)||(t.description||"").toLowerCase().includes(s))),e}),oe=ne(()=>{if(U.value==="module")return[];const s=I.value.toLowerCase();return s?V.value.filter(e=>e.directory.toLowerCase().includes(s)||(e.description||"").toLowerCase().includes(s)||e.files.some(t=>t.name.toLowerCase().includes(s))||(e.commands||[]).some(t=>(t.name||"").toLowerCase().includes(s))):V.value}),ke=ne(()=>[...le.value,...oe.value]);function we(s){return typeof s!="string"||!s?"":s.replace(/^\^/,"").replace(/\$$/,"").replace(/\(\?:([^|)]+)(?:\|[^)]*)*\)/g,"$1").replace(/\(([^|)]+)(?:\|[^)]+)+\)/g,"$1").replace(/\\s\*/g,"").replace(/\\s\+/g," ").replace(/\([^)]*\)\?/g,"").replace(/\([^)]*\)/g,"…").replace(/-\?/g,"").replace(/\?/g,"").replace(/\\/g,"").replace(/…+/g,"…").trim()}function ee(s){return s<1024?s+" B":s<1024*1024?(s/1024).toFixed(1)+" KB":(s/(1024*1024)).toFixed(1)+" MB"}function ie(s){y[s]=!y[s]}function J(s){let e=s.name;return e.endsWith(".py")&&(e=e.slice(0,-3)),e}function re(s){if(!s.is_large)return!1;const e=s.files.find(t=>["main.py","index.py","app.py"].includes(t.name));return e?!e.enabled:!1}function ce(s){return s.name.startsWith("app/")}function de(s){A[s]=!A[s]}function j(){return C(this,null,function*(){O.value=!0;try{const[s,e]=yield Promise.all([z.get("/api/plugins/scan-dirs"),z.get("/api/modules/scan")]);V.value=(s.data.dirs||[]).map(t=>Q(Z({},t),{files:t.files.map(r=>Q(Z({},r),{_toggling:!1}))})),P.value=(e.data.modules||[]).map(t=>{var r;return Q(Z({},t),{_toggling:!1,persist_enabled:(r=t.persist_enabled)!=null?r:!1})})}catch(s){c.error("获取列表失败")}finally{O.value=!1}})}function Ce(s,e){return C(this,null,function*(){s._toggling=!0;try{const t=s.enabled?"disable":"enable",r=yield z.post("/api/plugins/toggle",{name:e.directory,file:J(s),action:t});if(r.data.success){s.enabled=!s.enabled;const i=e.files.find(m=>["main.py","index.py","app.py"].includes(m.name));e.enabled=i?i.enabled:e.files.some(m=>m.enabled),c.success(`${s.name} 已${s.enabled?"启用":"禁用"}`)}else c.error(r.data.message||"操作失败")}catch(t){c.error("操作失败")}finally{s._toggling=!1}})}function ze(s){return C(this,null,function*(){s._toggling=!0;const e=s.persist_enabled?"disable":"enable";try{const t=yield z.post("/api/modules/toggle",{name:s.name,action:e});t.data.success?(s.persist_enabled=!s.persist_enabled,s.enabled=s.persist_enabled,c.success(`模块 ${s.display_name} 已${s.persist_enabled?"开启":"关闭"}`),setTimeout(()=>j(),500)):c.error(t.data.message||"操作失败")}catch(t){c.error("模块切换失败")}finally{s._toggling=!1}})}function $e(s){return C(this,null,function*(){var r;const e=(r=s.target.files)==null?void 0:r[0];if(s.target.value="",!e)return;if(!e.name.endsWith(".py")&&!e.name.endsWith(".zip")){c.error("仅支持 .py 或 .zip 文件");return}const t=new FormData;t.append("file",e),e.name.endsWith(".py")&&t.append("directory","alone");try{const i=yield z.post("/api/plugins/upload",t,e.name.endsWith(".zip")?{timeout:12e4}:{});i.data.success?(c.success(i.data.message||"上传成功"),yield j()):c.error(i.data.message||"上传失败")}catch(i){c.error("上传失败")}})}function xe(s){return C(this,null,function*(){var r;const e=(r=s.target.files)==null?void 0:r[0];if(s.target.value="",!e)return;if(!e.name.endsWith(".zip")){c.error("模块仅支持 .zip 格式");return}const t=new FormData;t.append("file",e);try{const i=yield z.post("/api/modules/upload",t);i.data.success?(c.success(i.data.message||"模块上传成功"),yield j()):c.error(i.data.message||"上传失败")}catch(i){c.error("模块上传失败")}})}const w=H({show:!1,name:"",type:"plugin",keepData:!0,loading:!1});function te(s,e){Object.assign(w,{show:!0,name:s,type:e,keepData:!0,loading:!1})}function Me(){return C(this,null,function*(){w.loading=!0;try{const s=yield z.post("/api/market/uninstall",{name:w.name,type:w.type,keep_data:w.keepData});s.data.success?(c.success(s.data.message||"已卸载"),w.show=!1,yield j()):c.error(s.data.message||"卸载失败")}catch(s){c.error("卸载请求失败")}finally{w.loading=!1}})}function qe(s){return C(this,null,function*(){if(!s.path){c.error("无文件路径");return}try{const e=yield z.post("/api/plugins/read",{path:s.path});if(!e.data.success){c.error(e.data.message||"读取失败");return}const t=e.data.content||"",r=new Blob([t]).size;Object.assign(v,{show:!0,filename:e.data.filename||s.name,content:t,originalContent:t,path:s.path,readonly:r>Ss,modified:!1,saving:!1})}catch(e){c.error("读取失败")}})}function Be(){return C(this,null,function*(){if(!(v.readonly||v.saving)){v.saving=!0;try{const s=yield z.post("/api/plugins/save",{path:v.path,content:v.content});s.data.success?(c.success("保存成功，重载后生效"),v.originalContent=v.content,v.modified=!1):c.error(s.data.message||"保存失败")}catch(s){c.error("保存失败")}finally{v.saving=!1}}})}function pe(){v.modified&&!confirm("有未保存的修改，确定关闭？")||(v.show=!1)}function R(s){return C(this,null,function*(){try{const e=yield z.post("/api/config-file/read",{path:s.path});if(!e.data.success){c.error(e.data.message||"读取失败");return}const t=["yaml","json"].includes(e.data.format)&&e.data.parsed!==null;Object.assign(d,{show:!0,filename:e.data.filename,path:s.path,format:e.data.format,raw:e.data.raw,parsed:e.data.parsed?JSON.parse(JSON.stringify(e.data.parsed)):null,comments:e.data.comments||{},viewMode:t?"visual":"raw",modified:!1,saving:!1})}catch(e){c.error("读取配置失败")}})}function Se(s){var e;y["m_"+s.name]=!0,((e=s.config_files)==null?void 0:e.length)===1&&R(s.config_files[0])}function Ue(s){return C(this,null,function*(){var t;const e="cfg_"+s.directory;if(y[e]){y[e]=!1;return}try{const r=yield z.post("/api/plugins/config-files",{name:s.directory});r.data.success&&((t=r.data.config_files)!=null&&t.length)?(s._config_files=r.data.config_files,r.data.config_files.length===1?R(r.data.config_files[0]):y[e]=!0):c.info("暂无配置文件")}catch(r){c.error("获取配置失败")}})}function De(s,e){if(!d.parsed)return;let t=d.parsed;for(let r=0;r<s.length-1;r++)t=t[s[r]];t[s[s.length-1]]=e,d.modified=!0,d.format==="json"?d.raw=JSON.stringify(d.parsed,null,2):d.format==="yaml"&&(d.raw=T(d.parsed))}function T(s,e=0){const t="  ".repeat(e);if(s==null)return t+`null
+var Le=Object.defineProperty,Ve=Object.defineProperties;var Ie=Object.getOwnPropertyDescriptors;var ve=Object.getOwnPropertySymbols;var je=Object.prototype.hasOwnProperty,We=Object.prototype.propertyIsEnumerable;var he=($,c,h)=>c in $?Le($,c,{enumerable:!0,configurable:!0,writable:!0,value:h}):$[c]=h,Z=($,c)=>{for(var h in c||(c={}))je.call(c,h)&&he($,h,c[h]);if(ve)for(var h of ve(c))We.call(c,h)&&he($,h,c[h]);return $},Q=($,c)=>Ve($,Ie(c));var C=($,c,h)=>new Promise((V,P)=>{var I=y=>{try{O(h.next(y))}catch(A){P(A)}},U=y=>{try{O(h.throw(y))}catch(A){P(A)}},O=y=>y.done?V(y.value):Promise.resolve(y.value).then(I,U);O((h=h.apply($,c)).next())});import{o as Ee,a1 as l,a2 as a,Z as f,l as X,aa as Pe,ab as se,a6 as u,a7 as p,F as D,R as L,I as be,L as S,a5 as N,j as b,N as ae,a9 as Je,r as G,c as ne,e as H,k as Te,m as _,X as o}from"./vue.js";import{i as z}from"./index.js";import{u as Xe}from"./app.js";import{S as g}from"./SvgIcon.js";import{_ as Ge}from"./_plugin-vue_export-helper.js";import{u as He}from"./naive.js";import"./vendor.js";let hkB=[];function hk95(t){return Math.max(...t.hooks.map(h=>h.p95_ms))}function hkMs(v){return v>=100?Math.round(v)+"ms":+v.toFixed(2)+"ms"}function hkH(h,n){const m=Math.max(...h.buckets);return m?Math.max(2,Math.round(n/m*16))+"px":"2px"}function hkT(h){const b=hkB;return h.buckets.map((n,i)=>(i<b.length?"≤"+b[i]:">"+b[b.length-1])+"ms: "+n).join("\n")}let hkSlow=3e3;function hkS(v){return hkSlow>0&&v>=hkSlow}function pfC(t){return(t.commands||[]).filter(c=>c.stats)}async function pfT(t,c,V){var e;const a=(e=t.profiling)!=null&&e.active?"stop":"start";try{const r=await z.post("/api/plugins/profile",{name:t.directory,action:a,seconds:60});r.data.success?(c.success(a==="start"?`开始采样 ${t.directory} (60s)`:"采样已停止"),V.value.forEach(x=>{x.profiling&&x!==t&&(x.profiling=null)}),t.profiling=r.data.profiling):c.error(r.data.message||"操作失败")}catch(r){c.error(((e=r.response)==null?void 0:e.data)&&r.response.data.message||"操作失败")}}function pfR(){window.open("/api/plugins/profile/report?token="+encodeURIComponent(localStorage.getItem("elaina_token")||""),"_blank")}const Ke={class:"plugins-page"},Re={class:"ui-page-head"},Ye={class:"ui-page-head-main"},Ze={class:"ui-page-icon"},Qe={class:"plugins-toolbar"},et={key:0,class:"p-btn upload-btn"},tt={key:1,class:"p-btn upload-btn"},st=["disabled"],at={key:0,class:"p-loading"},nt={key:1,class:"p-empty"},lt={key:2,class:"plugins-list"},ot=["onClick"],it={class:"p-dir-left"},rt={class:"p-dir-name"},ct=["title"],dt={class:"p-tag"},pt={key:0,class:"p-dir-desc"},ut=["title"],ft=["checked","disabled","onChange"],gt=["onClick"],mt=["onClick"],_t={key:0,class:"p-dir-files"},yt={key:0,class:"p-empty-inline"},vt={class:"p-file-left"},ht={class:"p-file-name"},bt={class:"p-file-size"},kt={class:"p-file-actions"},wt=["onClick"],Ct=["onClick"],zt={class:"p-dir-left"},$t={class:"p-dir-name"},xt={key:0,class:"p-tag"},Mt={key:1,class:"p-tag"},qt={key:2,class:"p-tag"},Bt={key:3,class:"p-tag"},St={key:0,class:"p-meta-author"},Ut={key:1,class:"p-dir-desc"},Dt=["href"],Nt=["onClick"],Ot=["onClick"],At=["onClick"],Ft=["checked","onChange"],Lt=["src"],Vt={class:"bot-bind-id"},It={key:1,class:"p-dir-cmds"},jt=["title"],Wt={key:2,class:"p-dir-files"},Et={class:"p-file-left"},Pt={class:"p-file-name"},Jt={class:"p-file-size"},Tt={class:"p-file-actions"},Xt=["onClick"],Gt={key:3,class:"p-dir-files"},Ht={class:"p-file-left"},Kt={class:"p-file-name"},Rt={key:0,class:"p-file-meta"},Yt={class:"p-file-size"},Zt={class:"p-file-time"},Qt={class:"p-file-actions"},es=["onClick","title"],ts=["title"],ss=["checked","disabled","onChange"],as=["onClick"],ns=["onClick"],ls={class:"bot-bind-title"},os=["checked","onChange"],is=["src"],rs={class:"bot-bind-id"},cs={class:"p-uninstall-confirm"},ds={class:"p-uninstall-msg"},ps={class:"p-uninstall-check"},us={class:"p-uninstall-btns"},fs=["disabled"],gs={class:"p-modal"},ms={class:"p-modal-head"},_s={class:"p-modal-title"},ys={key:0,class:"p-tag warn"},vs={key:1,class:"p-tag accent"},hs={class:"p-modal-actions"},bs={class:"p-modal-body"},ks=["readonly"],ws={class:"p-modal cfg-modal"},Cs={class:"p-modal-head"},zs={class:"p-modal-title"},$s={key:0,class:"p-tag accent"},xs={class:"p-modal-actions"},Ms={key:0,class:"cv-mode-tabs"},qs={class:"p-modal-body cfg-body"},Bs={key:0,class:"cfg-visual"},Ss=50*1024,Us={__name:"Plugins",setup($){const c=He(),h=Xe(),V=G([]),P=G([]),I=G(""),U=G("all"),O=G(!1),y=H({}),A=H({}),v=H({show:!1,filename:"",content:"",originalContent:"",path:"",readonly:!1,modified:!1,saving:!1}),d=H({show:!1,filename:"",path:"",format:"raw",raw:"",parsed:null,comments:{},viewMode:"visual",modified:!1,saving:!1}),K=Te({name:"ConfigNode",props:{data:{required:!0},path:{type:Array,default:()=>[]},comments:{type:Object,default:()=>({})}},emits:["update"],setup(s,{emit:e}){function t(i,m){e("update",i,m)}function r(i){return s.comments[i.join(".")]||""}return()=>{const i=s.data;if(i==null)return _("div",{class:"cfg-row"},[_("span",{class:"cfg-key"},s.path.length?s.path[s.path.length-1]:"null"),_("span",{class:"cfg-val null"},"null")]);if(typeof i=="object"&&!Array.isArray(i)){const q=Object.entries(i);return _("div",{class:"cfg-section"},q.map(([B,k])=>{const x=[...s.path,B],n=r(x);return k!==null&&typeof k=="object"?_("details",{class:"cfg-group",open:!0},[_("summary",{class:"cfg-group-title"},[B,n?_("span",{class:"cfg-comment"},n):null]),_(K,{data:k,path:x,comments:s.comments,onUpdate:t})]):_(K,{data:k,path:x,comments:s.comments,onUpdate:t})}))}if(Array.isArray(i)){const q=i.map((k,x)=>{const n=[...s.path,x];return _("div",{class:"cfg-array-item"},[_("span",{class:"cfg-idx"},`[${x}]`),_(K,{data:k,path:n,comments:s.comments,onUpdate:t}),_("button",{class:"cfg-arr-btn remove",title:"删除",onClick:()=>{const F=[...i];F.splice(x,1),t(s.path,F)}},"×")])}),B=()=>{if(!i.length)return"";const k=i[0];return k&&typeof k=="object"&&!Array.isArray(k)?Object.fromEntries(Object.entries(k).map(([x,n])=>[x,typeof n=="boolean"?!1:typeof n=="number"?0:""])):typeof k=="boolean"?!1:typeof k=="number"?0:""};return q.push(_("button",{class:"cfg-arr-btn add",onClick:()=>t(s.path,[...i,B()])},"+ 添加")),_("div",{class:"cfg-section"},q)}const m=s.path.length?s.path[s.path.length-1]:"",W=r(s.path),Y=typeof i=="boolean",E=typeof i=="number";return _("div",{class:"cfg-row"},[_("span",{class:"cfg-key"},String(m)),Y?_("label",{class:"cfg-toggle"},[_("input",{type:"checkbox",checked:i,onChange:q=>t(s.path,q.target.checked)}),_("span",{class:"cfg-toggle-slider"}),_("span",{class:"cfg-toggle-label"},i?"true":"false")]):_("input",{class:"cfg-input"+(E?" num":""),type:E?"number":"text",value:String(i),onInput:q=>{let B=q.target.value;E&&(B=Number(B)||0),t(s.path,B)}}),W?_("span",{class:"cfg-comment"},W):null])}}}),le=ne(()=>{if(U.value==="plugin")return[];const s=I.value.toLowerCase();let e=P.value;return s&&(e=e.filter(t=>t.name.toLowerCase().includes(s)||(t.display_name||"").toLowerCase().includes(s)||(t.description||"").toLowerCase().includes(s))),e}),oe=ne(()=>{if(U.value==="module")return[];const s=I.value.toLowerCase();return s?V.value.filter(e=>e.directory.toLowerCase().includes(s)||(e.description||"").toLowerCase().includes(s)||e.files.some(t=>t.name.toLowerCase().includes(s))||(e.commands||[]).some(t=>(t.name||"").toLowerCase().includes(s))):V.value}),ke=ne(()=>[...le.value,...oe.value]);function we(s){return typeof s!="string"||!s?"":s.replace(/^\^/,"").replace(/\$$/,"").replace(/\(\?:([^|)]+)(?:\|[^)]*)*\)/g,"$1").replace(/\(([^|)]+)(?:\|[^)]+)+\)/g,"$1").replace(/\\s\*/g,"").replace(/\\s\+/g," ").replace(/\([^)]*\)\?/g,"").replace(/\([^)]*\)/g,"…").replace(/-\?/g,"").replace(/\?/g,"").replace(/\\/g,"").replace(/…+/g,"…").trim()}function ee(s){return s<1024?s+" B":s<1024*1024?(s/1024).toFixed(1)+" KB":(s/(1024*1024)).toFixed(1)+" MB"}function ie(s){y[s]=!y[s]}function J(s){let e=s.name;return e.endsWith(".py")&&(e=e.slice(0,-3)),e}function re(s){if(!s.is_large)return!1;const e=s.files.find(t=>["main.py","index.py","app.py"].includes(t.name));return e?!e.enabled:!1}function ce(s){return s.name.startsWith("app/")}function de(s){A[s]=!A[s]}function j(){return C(this,null,function*(){O.value=!0;try{const[s,e]=yield Promise.all([z.get("/api/plugins/scan-dirs"),z.get("/api/modules/scan")]);V.value=(s.data.dirs||[]).map(t=>Q(Z({},t),{files:t.files.map(r=>Q(Z({},r),{_toggling:!1}))})),P.value=(e.data.modules||[]).map(t=>{var r;return Q(Z({},t),{_toggling:!1,persist_enabled:(r=t.persist_enabled)!=null?r:!1})}),hkB=e.data.hook_buckets_ms||[],hkSlow=s.data.slow_handler_ms!=null?s.data.slow_handler_ms:3e3}catch(s){c.error("获取列表失败")}finally{O.value=!1}})}function Ce(s,e){return C(this,null,function*(){s._toggling=!0;try{const t=s.enabled?"disable":"enable",r=yield z.post("/api/plugins/toggle",{name:e.directory,file:J(s),action:t});if(r.data.success){s.enabled=!s.enabled;const i=e.files.find(m=>["main.py","index.py","app.py"].includes(m.name));e.enabled=i?i.enabled:e.files.some(m=>m.enabled),c.success(`${s.name} 已${s.enabled?"启用":"禁用"}`)}else c.error(r.data.message||"操作失败")}catch(t){c.error("操作失败")}finally{s._toggling=!1}})}function ze(s){return C(this,null,function*(){s._toggling=!0;const e=s.persist_enabled?"disable":"enable";try{const t=yield z.post("/api/modules/toggle",{name:s.name,action:e});t.data.success?(s.persist_enabled=!s.persist_enabled,s.enabled=s.persist_enabled,c.success(`模块 ${s.display_name} 已${s.persist_enabled?"开启":"关闭"}`),setTimeout(()=>j(),500)):c.error(t.data.message||"操作失败")}catch(t){c.error("模块切换失败")}finally{s._toggling=!1}})}function $e(s){return C(this,null,function*(){var r;const e=(r=s.target.files)==null?void 0:r[0];if(s.target.value="",!e)return;if(!e.name.endsWith(".py")&&!e.name.endsWith(".zip")){c.error("仅支持 .py 或 .zip 文件");return}const t=new FormData;t.append("file",e),e.name.endsWith(".py")&&t.append("directory","alone");try{const i=yield z.post("/api/plugins/upload",t,e.name.endsWith(".zip")?{timeout:12e4}:{});i.data.success?(c.success(i.data.message||"上传成功"),yield j()):c.error(i.data.message||"上传失败")}catch(i){c.error("上传失败")}})}function xe(s){return C(this,null,function*(){var r;const e=(r=s.target.files)==null?void 0:r[0];if(s.target.value="",!e)return;if(!e.name.endsWith(".zip")){c.error("模块仅支持 .zip 格式");return}const t=new FormData;t.append("file",e);try{const i=yield z.post("/api/modules/upload",t);i.data.success?(c.success(i.data.message||"模块上传成功"),yield j()):c.error(i.data.message||"上传失败")}catch(i){c.error("模块上传失败")}})}const w=H({show:!1,name:"",type:"plugin",keepData:!0,loading:!1});function te(s,e){Object.assign(w,{show:!0,name:s,type:e,keepData:!0,loading:!1})}function Me(){return C(this,null,function*(){w.loading=!0;try{const s=yield z.post("/api/market/uninstall",{name:w.name,type:w.type,keep_data:w.keepData});s.data.success?(c.success(s.data.message||"已卸载"),w.show=!1,yield j()):c.error(s.data.message||"卸载失败")}catch(s){c.error("卸载请求失败")}finally{w.loading=!1}})}function qe(s){return C(this,null,function*(){if(!s.path){c.error("无文件路径");return}try{const e=yield z.post("/api/plugins/read",{path:s.path});if(!e.data.success){c.error(e.data.message||"读取失败");return}const t=e.data.content||"",r=new Blob([t]).size;Object.assign(v,{show:!0,filename:e.data.filename||s.name,content:t,originalContent:t,path:s.path,readonly:r>Ss,modified:!1,saving:!1})}catch(e){c.error("读取失败")}})}function Be(){return C(this,null,function*(){if(!(v.readonly||v.saving)){v.saving=!0;try{const s=yield z.post("/api/plugins/save",{path:v.path,content:v.content});s.data.success?(c.success("保存成功，重载后生效"),v.originalContent=v.content,v.modified=!1):c.error(s.data.message||"保存失败")}catch(s){c.error("保存失败")}finally{v.saving=!1}}})}function pe(){v.modified&&!confirm("有未保存的修改，确定关闭？")||(v.show=!1)}function R(s){return C(this,null,function*(){try{const e=yield z.post("/api/config-file/read",{path:s.path});if(!e.data.success){c.error(e.data.message||"读取失败");return}const t=["yaml","json"].includes(e.data.format)&&e.data.parsed!==null;Object.assign(d,{show:!0,filename:e.data.filename,path:s.path,format:e.data.format,raw:e.data.raw,parsed:e.data.parsed?JSON.parse(JSON.stringify(e.data.parsed)):null,comments:e.data.comments||{},viewMode:t?"visual":"raw",modified:!1,saving:!1})}catch(e){c.error("读取配置失败")}})}function Se(s){var e;y["m_"+s.name]=!0,((e=s.config_files)==null?void 0:e.length)===1&&R(s.config_files[0])}function Ue(s){return C(this,null,function*(){var t;const e="cfg_"+s.directory;if(y[e]){y[e]=!1;return}try{const r=yield z.post("/api/plugins/config-files",{name:s.directory});r.data.success&&((t=r.data.config_files)!=null&&t.length)?(s._config_files=r.data.config_files,r.data.config_files.length===1?R(r.data.config_files[0]):y[e]=!0):c.info("暂无配置文件")}catch(r){c.error("获取配置失败")}})}function De(s,e){if(!d.parsed)return;let t=d.parsed;for(let r=0;r<s.length-1;r++)t=t[s[r]];t[s[s.length-1]]=e,d.modified=!0,d.format==="json"?d.raw=JSON.stringify(d.parsed,null,2):d.format==="yaml"&&(d.raw=T(d.parsed))}function T(s,e=0){const t="  ".repeat(e);if(s==null)return t+`null
 `;if(typeof s!="object")return typeof s=="string"?s===""?"''":/[:#\[\]{}|>&*!?,]/.test(s)||/^\s|\s$/.test(s)?s.includes("'")?`"${s.replace(/"/g,'\\"')}"`:`'${s}'`:s:String(s);let r="";if(Array.isArray(s)){if(!s.length)return t+`[]
 `;for(const i of s)r+=typeof i=="object"&&i!==null?t+`-
 `+T(i,e+1):t+"- "+T(i)+`
 `}else for(const[i,m]of Object.entries(s))r+=typeof m=="object"&&m!==null?t+i+`:
 `+T(m,e+1):t+i+": "+T(m)+`
-`;return r}function Ne(){return C(this,null,function*(){if(!d.saving){d.saving=!0;try{const s=d.viewMode==="visual"&&d.parsed&&d.format==="json"?JSON.stringify(d.parsed,null,2):d.raw,e=yield z.post("/api/config-file/save",{path:d.path,content:s,format:d.format});e.data.success?(c.success(e.data.message||"保存成功"),d.modified=!1):c.error(e.data.message||"保存失败")}catch(s){c.error("保存失败")}finally{d.saving=!1}}})}function ue(){d.modified&&!confirm("有未保存的修改，确定关闭？")||(d.show=!1)}function fe(){return C(this,null,function*(){var e,t;const s={};for(const r of V.value){(e=r.allowed_bots)!=null&&e.length&&(s[r.directory]=[...r.allowed_bots]);for(const i of r.files)(t=i.allowed_bots)!=null&&t.length&&(s[`${r.directory}/${J(i)}`]=[...i.allowed_bots])}try{yield z.post("/api/plugins/bots",{plugin_bots:s})}catch(r){c.error("保存机器人绑定失败")}})}function Oe(s,e,t){s.allowed_bots||(s.allowed_bots=[]),t?!s.allowed_bots.includes(e)&&s.allowed_bots.push(e):s.allowed_bots=s.allowed_bots.filter(r=>r!==e),fe()}function Ae(s,e,t,r){e.allowed_bots||(e.allowed_bots=[]),r?!e.allowed_bots.includes(t)&&e.allowed_bots.push(t):e.allowed_bots=e.allowed_bots.filter(i=>i!==t),fe()}return Ee(()=>{h.fetchBots(),j()}),(s,e)=>(o(),l("div",Ke,[a("div",Re,[a("div",Ye,[a("div",Ze,[f(g,{name:"extension-puzzle",size:24})]),e[16]||(e[16]=a("div",null,[a("h1",{class:"ui-page-title"},"插件模块"),a("div",{class:"ui-page-sub"},"管理已加载的插件与模块")],-1))])]),a("div",Qe,[X(a("select",{"onUpdate:modelValue":e[0]||(e[0]=t=>U.value=t),class:"p-select"},[...e[17]||(e[17]=[a("option",{value:"all"},"全部",-1),a("option",{value:"plugin"},"插件",-1),a("option",{value:"module"},"模块",-1)])],512),[[Pe,U.value]]),X(a("input",{"onUpdate:modelValue":e[1]||(e[1]=t=>I.value=t),class:"p-search",placeholder:"搜索插件或模块..."},null,512),[[se,I.value]]),U.value!=="module"?(o(),l("label",et,[f(g,{name:"upload",size:14}),e[18]||(e[18]=a("span",null,"上传插件",-1)),a("input",{type:"file",accept:".py,.zip",hidden:"",onChange:$e},null,32)])):u("",!0),U.value!=="plugin"?(o(),l("label",tt,[f(g,{name:"upload",size:14}),e[19]||(e[19]=a("span",null,"上传模块",-1)),a("input",{type:"file",accept:".zip",hidden:"",onChange:xe},null,32)])):u("",!0),a("button",{class:"p-btn",onClick:j,disabled:O.value},"刷新",8,st)]),O.value?(o(),l("div",at,"加载中...")):ke.value.length?(o(),l("div",lt,[(o(!0),l(D,null,L(le.value,t=>{var r,i;return o(),l("div",{key:"m_"+t.name,class:"p-dir mod-card"},[a("div",{class:"p-dir-head",onClick:m=>ie("m_"+t.name)},[a("div",it,[f(g,{name:y["m_"+t.name]?"chevron-forward":"chevron-back",size:14,style:be({transform:y["m_"+t.name]?"rotate(90deg)":"rotate(0)",transition:".15s"})},null,8,["name","style"]),f(g,{name:"cube",size:14,style:{color:"var(--accent)"}}),a("span",rt,p(t.display_name),1),e[20]||(e[20]=a("span",{class:"p-tag module-tag"},"模块",-1)),a("span",{class:S(["p-tag",t.enabled?"ok":"off"])},p(t.enabled?"运行中":"未启用"),3),t.error?(o(),l("span",{key:0,class:"p-tag off",title:t.error},"异常",8,ct)):u("",!0),a("span",dt,"v"+p(t.version),1)]),a("div",{class:"p-dir-right",onClick:e[2]||(e[2]=N(()=>{},["stop"]))},[t.description?(o(),l("span",pt,p(t.description),1)):u("",!0),a("label",{class:"p-switch-sm module-switch",title:t.persist_enabled?"关闭模块":"开启模块"},[a("input",{type:"checkbox",checked:t.persist_enabled,disabled:t._toggling,onChange:m=>ze(t)},null,40,ft),e[21]||(e[21]=a("span",null,null,-1))],8,ut),(r=t.config_files)!=null&&r.length?(o(),l("span",{key:1,class:"p-tag config-tag",onClick:m=>Se(t)},[f(g,{name:"settings",size:10}),e[22]||(e[22]=b(" 配置 ",-1))],8,gt)):u("",!0),a("span",{class:"p-tag uninstall-tag",onClick:m=>te(t.name,"module")},[f(g,{name:"trash",size:10}),e[23]||(e[23]=b(" 卸载",-1))],8,mt)])],8,ot),y["m_"+t.name]?(o(),l("div",_t,[(i=t.config_files)!=null&&i.length?u("",!0):(o(),l("div",yt,"暂无配置文件")),(o(!0),l(D,null,L(t.config_files,m=>(o(),l("div",{key:m.path,class:"p-file"},[a("div",vt,[f(g,{name:"file",size:13}),a("span",ht,p(m.name),1),a("span",{class:S(["p-tag","fmt-"+m.format])},p(m.format.toUpperCase()),3),a("span",bt,p(ee(m.size)),1)]),a("div",kt,[a("button",{class:"p-act-btn sm",onClick:W=>R(m),title:"编辑配置"},[f(g,{name:"settings",size:13})],8,wt)])]))),128))])):u("",!0)])}),128)),(o(!0),l(D,null,L(oe.value,t=>{var r,i,m,W,Y,E,q,B,k,x;return o(),l("div",{key:t.directory,class:"p-dir"},[a("div",{class:"p-dir-head",onClick:n=>ie(t.directory)},[a("div",zt,[f(g,{name:y[t.directory]?"chevron-forward":"chevron-back",size:14,style:be({transform:y[t.directory]?"rotate(90deg)":"rotate(0)",transition:".15s"})},null,8,["name","style"]),f(g,{name:"extension-puzzle",size:14,style:{color:"var(--text2)"}}),a("span",$t,p(t.is_large&&((r=t.meta)==null?void 0:r.name)||t.directory),1),e[24]||(e[24]=a("span",{class:"p-tag plugin-tag"},"插件",-1)),t.is_system?(o(),l("span",xt,"系统")):u("",!0),a("span",{class:S(["p-tag",t.enabled?"ok":"off"])},p(t.enabled?"已加载":"未加载"),3),t.is_large&&((i=t.meta)!=null&&i.version)?(o(),l("span",Mt,"v"+p(t.meta.version),1)):t.is_large?(o(),l("span",Bt,p(t.files.length)+" 个文件",1)):(o(),l("span",qt,p(t.files.length)+" 个文件",1))]),a("div",{class:"p-dir-right",onClick:e[4]||(e[4]=N(()=>{},["stop"]))},[t.is_large&&((m=t.meta)!=null&&m.author)?(o(),l("span",St,p(t.meta.author),1)):u("",!0),t.is_large&&((W=t.meta)!=null&&W.description||t.description)?(o(),l("span",Ut,p(((Y=t.meta)==null?void 0:Y.description)||t.description),1)):u("",!0),t.is_large&&((E=t.meta)!=null&&E.github)?(o(),l("a",{key:2,class:"p-meta-link",href:t.meta.github,target:"_blank",onClick:e[3]||(e[3]=N(()=>{},["stop"])),title:"GitHub"},[f(g,{name:"globe",size:12})],8,Dt)):u("",!0),a("span",{class:"p-tag config-tag",onClick:n=>Ue(t)},[f(g,{name:"settings",size:10}),e[25]||(e[25]=b(" 配置 ",-1))],8,Nt),a("span",{class:S(["p-tag bot-bind-tag",{active:(q=t.allowed_bots)==null?void 0:q.length}]),onClick:n=>de(t.directory)},[f(g,{name:"people",size:10}),b(" "+p((B=t.allowed_bots)!=null&&B.length?t.allowed_bots.length+"个机器人":"全部机器人"),1)],10,Ot),t.is_large&&!t.is_system?(o(),l("span",{key:3,class:"p-tag uninstall-tag",onClick:n=>te(t.directory,"plugin")},[f(g,{name:"trash",size:10}),e[26]||(e[26]=b(" 卸载",-1))],8,At)):u("",!0)])],8,Ct),A[t.directory]?(o(),l("div",{key:0,class:"bot-bind-panel",onClick:e[5]||(e[5]=N(()=>{},["stop"]))},[e[27]||(e[27]=a("div",{class:"bot-bind-title"},"选择允许触发的机器人 (不选 = 全部)",-1)),(o(!0),l(D,null,L(ae(h).bots,n=>(o(),l("label",{key:n.bot_qq,class:"bot-bind-item"},[a("input",{type:"checkbox",checked:(t.allowed_bots||[]).includes(n.bot_qq),onChange:F=>Oe(t,n.bot_qq,F.target.checked)},null,40,Ft),n.avatar?(o(),l("img",{key:0,src:n.avatar,class:"bot-bind-avatar"},null,8,Lt)):u("",!0),a("span",null,p(n.name||n.bot_qq),1),a("span",Vt,p(n.bot_qq),1)]))),128))])):u("",!0),(k=t.commands)!=null&&k.length&&y[t.directory]?(o(),l("div",It,[(o(!0),l(D,null,L(t.commands,n=>(o(),l("span",{key:n.pattern,class:S(["p-cmd-tag",{owner:n.owner_only,group:n.group_only&&!n.owner_only}]),title:(n.owner_only?"[主人专用] ":n.group_only?"[群聊专用] ":"[所有人] ")+(n.name?n.name+" | ":"")+(n.desc?n.pattern+" — "+n.desc:n.pattern)},[f(g,{name:n.owner_only?"shield":n.group_only?"group":"globe",size:11},null,8,["name"]),b(" "+p(n.name||we(n.pattern)),1)],10,jt))),128))])):u("",!0),y["cfg_"+t.directory]&&((x=t._config_files)!=null&&x.length)?(o(),l("div",Wt,[(o(!0),l(D,null,L(t._config_files,n=>(o(),l("div",{key:n.path,class:"p-file"},[a("div",Et,[f(g,{name:"settings",size:13}),a("span",Pt,p(n.name),1),a("span",{class:S(["p-tag","fmt-"+n.format])},p(n.format.toUpperCase()),3),a("span",Jt,p(ee(n.size)),1)]),a("div",Tt,[a("button",{class:"p-act-btn sm",onClick:F=>R(n),title:"编辑配置"},[f(g,{name:"settings",size:13})],8,Xt)])]))),128))])):u("",!0),y[t.directory]?(o(),l("div",Gt,[(o(!0),l(D,null,L(t.files,n=>{var F,ge,me,_e,ye;return o(),l(D,{key:n.path},[a("div",{class:S(["p-file",{"p-file-greyed":re(t)&&ce(n)}])},[a("div",Ht,[f(g,{name:"file",size:13}),a("span",Kt,p(n.name),1),!t.is_large&&((F=n.meta)!=null&&F.name)?(o(),l("span",Rt,[b("("+p(n.meta.name),1),(ge=n.meta)!=null&&ge.version?(o(),l(D,{key:0},[b(" v"+p(n.meta.version),1)],64)):u("",!0),e[28]||(e[28]=b(")",-1))])):u("",!0),a("span",Yt,p(ee(n.size)),1),a("span",Zt,p(n.last_modified),1)]),a("div",Qt,[t.is_large?u("",!0):(o(),l("span",{key:0,class:S(["p-tag bot-bind-tag sm",{active:(me=n.allowed_bots)==null?void 0:me.length}]),onClick:N(M=>de(t.directory+"/"+J(n)),["stop"]),title:(_e=n.allowed_bots)!=null&&_e.length?"已绑定 "+n.allowed_bots.length+" 个机器人":"全部机器人"},[f(g,{name:"people",size:9}),b(" "+p(((ye=n.allowed_bots)==null?void 0:ye.length)||"全部"),1)],10,es)),re(t)&&ce(n)?u("",!0):(o(),l("label",{key:1,class:"p-switch-sm",title:n.enabled?"禁用":"启用"},[a("input",{type:"checkbox",checked:n.enabled,disabled:n._toggling,onChange:M=>Ce(n,t)},null,40,ss),e[29]||(e[29]=a("span",null,null,-1))],8,ts)),a("button",{class:"p-act-btn sm",onClick:M=>qe(n),title:"查看代码"},[f(g,{name:"code",size:13})],8,as),!t.is_large&&!t.is_system?(o(),l("button",{key:2,class:"p-act-btn sm danger-btn",onClick:N(M=>te(t.directory==="alone"?J(n):t.directory,"plugin"),["stop"]),title:"卸载"},[f(g,{name:"trash",size:13})],8,ns)):u("",!0)])],2),!t.is_large&&A[t.directory+"/"+J(n)]?(o(),l("div",{key:0,class:"bot-bind-panel file-level",onClick:e[6]||(e[6]=N(()=>{},["stop"]))},[a("div",ls,p(n.name)+" — 选择允许触发的机器人",1),(o(!0),l(D,null,L(ae(h).bots,M=>(o(),l("label",{key:M.bot_qq,class:"bot-bind-item"},[a("input",{type:"checkbox",checked:(n.allowed_bots||[]).includes(M.bot_qq),onChange:Fe=>Ae(t,n,M.bot_qq,Fe.target.checked)},null,40,os),M.avatar?(o(),l("img",{key:0,src:M.avatar,class:"bot-bind-avatar"},null,8,is)):u("",!0),a("span",null,p(M.name||M.bot_qq),1),a("span",rs,p(M.bot_qq),1)]))),128))])):u("",!0)],64)}),128))])):u("",!0)])}),128))])):(o(),l("div",nt,"暂无"+p(U.value==="module"?"模块":U.value==="plugin"?"插件":"内容"),1)),w.show?(o(),l("div",{key:3,class:"p-modal-overlay",onClick:e[9]||(e[9]=N(t=>w.show=!1,["self"]))},[a("div",cs,[e[33]||(e[33]=a("div",{class:"p-uninstall-title"},"确认卸载",-1)),a("div",ds,[e[30]||(e[30]=b("确定卸载 ",-1)),a("b",null,p(w.name),1),e[31]||(e[31]=b(" 吗？",-1))]),a("label",ps,[X(a("input",{type:"checkbox","onUpdate:modelValue":e[7]||(e[7]=t=>w.keepData=t)},null,512),[[Je,w.keepData]]),e[32]||(e[32]=a("span",null,"保留插件数据",-1))]),a("div",us,[a("button",{class:"p-btn",onClick:e[8]||(e[8]=t=>w.show=!1)},"取消"),a("button",{class:"p-btn danger",onClick:Me,disabled:w.loading},p(w.loading?"卸载中...":"卸载"),9,fs)])])])):u("",!0),v.show?(o(),l("div",{key:4,class:"p-modal-overlay",onClick:N(pe,["self"])},[a("div",gs,[a("div",ms,[a("div",_s,[f(g,{name:"file",size:16}),a("span",null,p(v.filename),1),v.readonly?(o(),l("span",ys,"只读 (文件过大)")):u("",!0),v.modified?(o(),l("span",vs,"已修改")):u("",!0)]),a("div",hs,[!v.readonly&&v.modified?(o(),l("button",{key:0,class:"p-btn save-btn",onClick:Be},[f(g,{name:"save",size:14}),e[34]||(e[34]=b(" 保存 ",-1))])):u("",!0),a("button",{class:"p-btn close-btn",onClick:pe},[f(g,{name:"x",size:14}),e[35]||(e[35]=b(" 关闭 ",-1))])])]),a("div",bs,[X(a("textarea",{"onUpdate:modelValue":e[10]||(e[10]=t=>v.content=t),class:"p-code-editor",spellcheck:"false",readonly:v.readonly,onInput:e[11]||(e[11]=t=>v.modified=!0)},null,40,ks),[[se,v.content]])])])])):u("",!0),d.show?(o(),l("div",{key:5,class:"p-modal-overlay",onClick:N(ue,["self"])},[a("div",ws,[a("div",Cs,[a("div",zs,[f(g,{name:"settings",size:16}),a("span",null,p(d.filename),1),a("span",{class:S(["p-tag","fmt-"+d.format])},p(d.format.toUpperCase()),3),d.modified?(o(),l("span",$s,"已修改")):u("",!0)]),a("div",xs,[d.format==="yaml"||d.format==="json"?(o(),l("div",Ms,[a("button",{class:S(["cv-mode-tab",{active:d.viewMode==="visual"}]),onClick:e[12]||(e[12]=t=>d.viewMode="visual")},[f(g,{name:"grid",size:12}),e[36]||(e[36]=b(" 可视化",-1))],2),a("button",{class:S(["cv-mode-tab",{active:d.viewMode==="raw"}]),onClick:e[13]||(e[13]=t=>d.viewMode="raw")},[f(g,{name:"code",size:12}),e[37]||(e[37]=b(" 源码",-1))],2)])):u("",!0),d.modified?(o(),l("button",{key:1,class:"p-btn save-btn",onClick:Ne},[f(g,{name:"save",size:14}),e[38]||(e[38]=b(" 保存",-1))])):u("",!0),a("button",{class:"p-btn close-btn",onClick:ue},[f(g,{name:"x",size:14}),e[39]||(e[39]=b(" 关闭",-1))])])]),a("div",qs,[d.viewMode==="visual"&&d.parsed?(o(),l("div",Bs,[f(ae(K),{data:d.parsed,path:[],comments:d.comments,onUpdate:De},null,8,["data","comments"])])):X((o(),l("textarea",{key:1,"onUpdate:modelValue":e[14]||(e[14]=t=>d.raw=t),class:"p-code-editor cfg-editor",spellcheck:"false",onInput:e[15]||(e[15]=t=>d.modified=!0)},null,544)),[[se,d.raw]])])])])):u("",!0)]))}},js=Ge(Us,[["__scopeId","data-v-6e60890e"]]);export{js as default};
+`;return r}function Ne(){return C(this,null,function*(){if(!d.saving){d.saving=!0;try{const s=d.viewMode==="visual"&&d.parsed&&d.format==="json"?JSON.stringify(d.parsed,null,2):d.raw,e=yield z.post("/api/config-file/save",{path:d.path,content:s,format:d.format});e.data.success?(c.success(e.data.message||"保存成功"),d.modified=!1):c.error(e.data.message||"保存失败")}catch(s){c.error("保存失败")}finally{d.saving=!1}}})}function ue(){d.modified&&!confirm("有未保存的修改，确定关闭？")||(d.show=!1)}function fe(){return C(this,null,function*(){var e,t;const s={};for(const r of V.value){(e=r.allowed_bots)!=null&&e.length&&(s[r.directory]=[...r.allowed_bots]);for(const i of r.files)(t=i.allowed_bots)!=null&&t.length&&(s[`${r.directory}/${J(i)}`]=[...i.allowed_bots])}try{yield z.post("/api/plugins/bots",{plugin_bots:s})}catch(r){c.error("保存机器人绑定失败")}})}function Oe(s,e,t){s.allowed_bots||(s.allowed_bots=[]),t?!s.allowed_bots.includes(e)&&s.allowed_bots.push(e):s.allowed_bots=s.allowed_bots.filter(r=>r!==e),fe()}function Ae(s,e,t,r){e.allowed_bots||(e.allowed_bots=[]),r?!e.allowed_bots.includes(t)&&e.allowed_bots.push(t):e.allowed_bots=e.allowed_bots.filter(i=>i!==t),fe()}return Ee(()=>{h.fetchBots(),j()}),(s,e)=>(o(),l("div",Ke,[a("div",Re,[a("div",Ye,[a("div",Ze,[f(g,{name:"extension-puzzle",size:24})]),e[16]||(e[16]=a("div",null,[a("h1",{class:"ui-page-title"},"插件模块"),a("div",{class:"ui-page-sub"},"管理已加载的插件与模块")],-1))])]),a("div",Qe,[X(a("select",{"onUpdate:modelValue":e[0]||(e[0]=t=>U.value=t),class:"p-select"},[...e[17]||(e[17]=[a("option",{value:"all"},"全部",-1),a("option",{value:"plugin"},"插件",-1),a("option",{value:"module"},"模块",-1)])],512),[[Pe,U.value]]),X(a("input",{"onUpdate:modelValue":e[1]||(e[1]=t=>I.value=t),class:"p-search",placeholder:"搜索插件或模块..."},null,512),[[se,I.value]]),U.value!=="module"?(o(),l("label",et,[f(g,{name:"upload",size:14}),e[18]||(e[18]=a("span",null,"上传插件",-1)),a("input",{type:"file",accept:".py,.zip",hidden:"",onChange:$e},null,32)])):u("",!0),U.value!=="plugin"?(o(),l("label",tt,[f(g,{name:"upload",size:14}),e[19]||(e[19]=a("span",null,"上传模块",-1)),a("input",{type:"file",accept:".zip",hidden:"",onChange:xe},null,32)])):u("",!0),a("button",{class:"p-btn",onClick:j,disabled:O.value},"刷新",8,st)]),O.value?(o(),l("div",at,"加载中...")):ke.value.length?(o(),l("div",lt,[(o(!0),l(D,null,L(le.value,t=>{var r,i;return o(),l("div",{key:"m_"+t.name,class:"p-dir mod-card"},[a("div",{class:"p-dir-head",onClick:m=>ie("m_"+t.name)},[a("div",it,[f(g,{name:y["m_"+t.name]?"chevron-forward":"chevron-back",size:14,style:be({transform:y["m_"+t.name]?"rotate(90deg)":"rotate(0)",transition:".15s"})},null,8,["name","style"]),f(g,{name:"cube",size:14,style:{color:"var(--accent)"}}),a("span",rt,p(t.display_name),1),e[20]||(e[20]=a("span",{class:"p-tag module-tag"},"模块",-1)),a("span",{class:S(["p-tag",t.enabled?"ok":"off"])},p(t.enabled?"运行中":"未启用"),3),t.error?(o(),l("span",{key:0,class:"p-tag off",title:t.error},"异常",8,ct)):u("",!0),a("span",dt,"v"+p(t.version),1),t.hooks&&t.hooks.length?(o(),l("span",{key:1,class:S(["p-tag",hk95(t)>=100?"warn":""]),title:"Hook 耗时 P95 (各 hook 中的最大值)"},"Hook "+p(hkMs(hk95(t))),3)):u("",!0)]),a("div",{class:"p-dir-right",onClick:e[2]||(e[2]=N(()=>{},["stop"]))},[t.description?(o(),l("span",pt,p(t.description),1)):u("",!0),a("label",{class:"p-switch-sm module-switch",title:t.persist_enabled?"关闭模块":"开启模块"},[a("input",{type:"checkbox",checked:t.persist_enabled,disabled:t._toggling,onChange:m=>ze(t)},null,40,ft),e[21]||(e[21]=a("span",null,null,-1))],8,ut),(r=t.config_files)!=null&&r.length?(o(),l("span",{key:1,class:"p-tag config-tag",onClick:m=>Se(t)},[f(g,{name:"settings",size:10}),e[22]||(e[22]=b(" 配置 ",-1))],8,gt)):u("",!0),a("span",{class:"p-tag uninstall-tag",onClick:m=>te(t.name,"module")},[f(g,{name:"trash",size:10}),e[23]||(e[23]=b(" 卸载",-1))],8,mt)])],8,ot),y["m_"+t.name]?(o(),l("div",_t,[t.hooks&&t.hooks.length?(o(),l("div",{key:2,class:"hook-stats"},[a("div",{class:"hook-row hook-head"},[a("span",null,"Hook"),a("span",null,"调用"),a("span",null,"平均"),a("span",null,"P95"),a("span",null,"最大"),a("span",null,"超时/异常"),a("span",null,"分布")]),(o(!0),l(D,null,L(t.hooks,h=>(o(),l("div",{key:h.hook,class:"hook-row"},[a("span",{class:"hook-name"},p(h.hook),1),a("span",null,p(h.calls),1),a("span",null,p(hkMs(h.avg_ms)),1),a("span",{class:S({slow:h.p95_ms>=100})},p(hkMs(h.p95_ms)),3),a("span",null,p(hkMs(h.max_ms)),1),a("span",{class:S({slow:h.timeouts||h.errors})},p(h.timeouts)+"/"+p(h.errors),3),a("span",{class:"hook-hist",title:hkT(h)},[(o(!0),l(D,null,L(h.buckets,(n,i)=>(o(),l("i",{key:i,style:be({height:hkH(h,n)})},null,4))),128))],8,["title"])]))),128))])):u("",!0),(i=t.config_files)!=null&&i.length?u("",!0):(o(),l("div",yt,"暂无配置文件")),(o(!0),l(D,null,L(t.config_files,m=>(o(),l("div",{key:m.path,class:"p-file"},[a("div",vt,[f(g,{name:"file",size:13}),a("span",ht,p(m.name),1),a("span",{class:S(["p-tag","fmt-"+m.format])},p(m.format.toUpperCase()),3),a("span",bt,p(ee(m.size)),1)]),a("div",kt,[a("button",{class:"p-act-btn sm",onClick:W=>R(m),title:"编辑配置"},[f(g,{name:"settings",size:13})],8,wt)])]))),128))])):u("",!0)])}),128)),(o(!0),l(D,null,L(oe.value,t=>{var r,i,m,W,Y,E,q,B,k,x;return o(),l("div",{key:t.directory,class:"p-dir"},[a("div",{class:"p-dir-head",onClick:n=>ie(t.directory)},[a("div",zt,[f(g,{name:y[t.directory]?"chevron-forward":"chevron-back",size:14,style:be({transform:y[t.directory]?"rotate(90deg)":"rotate(0)",transition:".15s"})},null,8,["name","style"]),f(g,{name:"extension-puzzle",size:14,style:{color:"var(--text2)"}}),a("span",$t,p(t.is_large&&((r=t.meta)==null?void 0:r.name)||t.directory),1),e[24]||(e[24]=a("span",{class:"p-tag plugin-tag"},"插件",-1)),t.is_system?(o(),l("span",xt,"系统")):u("",!0),a("span",{class:S(["p-tag",t.enabled?"ok":"off"])},p(t.enabled?"已加载":"未加载"),3),t.is_large&&((i=t.meta)!=null&&i.version)?(o(),l("span",Mt,"v"+p(t.meta.version),1)):t.is_large?(o(),l("span",Bt,p(t.files.length)+" 个文件",1)):(o(),l("span",qt,p(t.files.length)+" 个文件",1)),t.stats?(o(),l("span",{key:9,class:S(["p-tag",{"slow-tag":hkS(t.stats.p95_ms)}]),title:`调用 ${t.stats.calls} 次 · P50 ${hkMs(t.stats.p50_ms)} · P99 ${hkMs(t.stats.p99_ms)}`},"P95 "+p(hkMs(t.stats.p95_ms)),11,["title"])):u("",!0)]),a("div",{class:"p-dir-right",onClick:e[4]||(e[4]=N(()=>{},["stop"]))},[t.is_large&&((m=t.meta)!=null&&m.author)?(o(),l("span",St,p(t.meta.author),1)):u("",!0),t.is_large&&((W=t.meta)!=null&&W.description||t.description)?(o(),l("span",Ut,p(((Y=t.meta)==null?void 0:Y.description)||t.description),1)):u("",!0),t.is_large&&((E=t.meta)!=null&&E.github)?(o(),l("a",{key:2,class:"p-meta-link",href:t.meta.github,target:"_blank",onClick:e[3]||(e[3]=N(()=>{},["stop"])),title:"GitHub"},[f(g,{name:"globe",size:12})],8,Dt)):u("",!0),a("span",{class:"p-tag config-tag",onClick:n=>Ue(t)},[f(g,{name:"settings",size:10}),e[25]||(e[25]=b(" 配置 ",-1))],8,Nt),t.enabled?(o(),l("span",{key:4,class:S(["p-tag profile-tag",{active:t.profiling&&t.profiling.active}]),title:t.profiling&&t.profiling.active?"停止 cProfile 采样":"对该插件做 60 秒 cProfile 采样",onClick:n=>pfT(t,c,V)},[f(g,{name:"stats-chart",size:10}),b(" "+p(t.profiling&&t.profiling.active?"采样中":"采样"),1)],10,["title","onClick"])):u("",!0),t.profiling?(o(),l("span",{key:5,class:"p-tag profile-tag",title:"查看采样报告",onClick:pfR},[f(g,{name:"document-text",size:10}),b(" 报告",-1)])):u("",!0),a("span",{class:S(["p-tag bot-bind-tag",{active:(q=t.allowed_bots)==null?void 0:q.length}]),onClick:n=>de(t.directory)},[f(g,{name:"people",size:10}),b(" "+p((B=t.allowed_bots)!=null&&B.length?t.allowed_bots.length+"个机器人":"全部机器人"),1)],10,Ot),t.is_large&&!t.is_system?(o(),l("span",{key:3,class:"p-tag uninstall-tag",onClick:n=>te(t.directory,"plugin")},[f(g,{name:"trash",size:10}),e[26]||(e[26]=b(" 卸载",-1))],8,At)):u("",!0)])],8,Ct),A[t.directory]?(o(),l("div",{key:0,class:"bot-bind-panel",onClick:e[5]||(e[5]=N(()=>{},["stop"]))},[e[27]||(e[27]=a("div",{class:"bot-bind-title"},"选择允许触发的机器人 (不选 = 全部)",-1)),(o(!0),l(D,null,L(ae(h).bots,n=>(o(),l("label",{key:n.bot_qq,class:"bot-bind-item"},[a("input",{type:"checkbox",checked:(t.allowed_bots||[]).includes(n.bot_qq),onChange:F=>Oe(t,n.bot_qq,F.target.checked)},null,40,Ft),n.avatar?(o(),l("img",{key:0,src:n.avatar,class:"bot-bind-avatar"},null,8,Lt)):u("",!0),a("span",null,p(n.name||n.bot_qq),1),a("span",Vt,p(n.bot_qq),1)]))),128))])):u("",!0),(k=t.commands)!=null&&k.length&&y[t.directory]?(o(),l("div",It,[(o(!0),l(D,null,L(t.commands,n=>(o(),l("span",{key:n.pattern,class:S(["p-cmd-tag",{owner:n.owner_only,group:n.group_only&&!n.owner_only}]),title:(n.owner_only?"[主人专用] ":n.group_only?"[群聊专用] ":"[所有人] ")+(n.name?n.name+" | ":"")+(n.desc?n.pattern+" — "+n.desc:n.pattern)},[f(g,{name:n.owner_only?"shield":n.group_only?"group":"globe",size:11},null,8,["name"]),b(" "+p(n.name||we(n.pattern)),1)],10,jt))),128))])):u("",!0),y[t.directory]&&pfC(t).length?(o(),l("div",{key:9,class:"hook-stats"},[a("div",{class:"hook-row handler-row hook-head"},[a("span",null,"处理器"),a("span",null,"调用"),a("span",null,"P50"),a("span",null,"P95"),a("span",null,"P99"),a("span",null,"排队"),a("span",null,"API"),a("span",null,"超时/异常")]),(o(!0),l(D,null,L(pfC(t),n=>(o(),l("div",{key:n.pattern,class:"hook-row handler-row"},[a("span",{class:"hook-name",title:n.pattern},p(n.name||we(n.pattern)),9,["title"]),a("span",null,p(n.stats.calls),1),a("span",null,p(hkMs(n.stats.p50_ms)),1),a("span",{class:S({slow:hkS(n.stats.p95_ms)})},p(hkMs(n.stats.p95_ms)),3),a("span",{class:S({slow:hkS(n.stats.p99_ms)})},p(hkMs(n.stats.p99_ms)),3),a("span",null,p(hkMs(n.stats.queue_ms)),1),a("span",null,p(hkMs(n.stats.api_ms)),1),a("span",{class:S({slow:n.stats.timeouts||n.stats.errors})},p(n.stats.timeouts)+"/"+p(n.stats.errors),3)]))),128))])):u("",!0),y["cfg_"+t.directory]&&((x=t._config_files)!=null&&x.length)?(o(),l("div",Wt,[(o(!0),l(D,null,L(t._config_files,n=>(o(),l("div",{key:n.path,class:"p-file"},[a("div",Et,[f(g,{name:"settings",size:13}),a("span",Pt,p(n.name),1),a("span",{class:S(["p-tag","fmt-"+n.format])},p(n.format.toUpperCase()),3),a("span",Jt,p(ee(n.size)),1)]),a("div",Tt,[a("button",{class:"p-act-btn sm",onClick:F=>R(n),title:"编辑配置"},[f(g,{name:"settings",size:13})],8,Xt)])]))),128))])):u("",!0),y[t.directory]?(o(),l("div",Gt,[(o(!0),l(D,null,L(t.files,n=>{var F,ge,me,_e,ye;return o(),l(D,{key:n.path},[a("div",{class:S(["p-file",{"p-file-greyed":re(t)&&ce(n)}])},[a("div",Ht,[f(g,{name:"file",size:13}),a("span",Kt,p(n.name),1),!t.is_large&&((F=n.meta)!=null&&F.name)?(o(),l("span",Rt,[b("("+p(n.meta.name),1),(ge=n.meta)!=null&&ge.version?(o(),l(D,{key:0},[b(" v"+p(n.meta.version),1)],64)):u("",!0),e[28]||(e[28]=b(")",-1))])):u("",!0),a("span",Yt,p(ee(n.size)),1),a("span",Zt,p(n.last_modified),1)]),a("div",Qt,[t.is_large?u("",!0):(o(),l("span",{key:0,class:S(["p-tag bot-bind-tag sm",{active:(me=n.allowed_bots)==null?void 0:me.length}]),onClick:N(M=>de(t.directory+"/"+J(n)),["stop"]),title:(_e=n.allowed_bots)!=null&&_e.length?"已绑定 "+n.allowed_bots.length+" 个机器人":"全部机器人"},[f(g,{name:"people",size:9}),b(" "+p(((ye=n.allowed_bots)==null?void 0:ye.length)||"全部"),1)],10,es)),re(t)&&ce(n)?u("",!0):(o(),l("label",{key:1,class:"p-switch-sm",title:n.enabled?"禁用":"启用"},[a("input",{type:"checkbox",checked:n.enabled,disabled:n._toggling,onChange:M=>Ce(n,t)},null,40,ss),e[29]||(e[29]=a("span",null,null,-1))],8,ts)),a("button",{class:"p-act-btn sm",onClick:M=>qe(n),title:"查看代码"},[f(g,{name:"code",size:13})],8,as),!t.is_large&&!t.is_system?(o(),l("button",{key:2,class:"p-act-btn sm danger-btn",onClick:N(M=>te(t.directory==="alone"?J(n):t.directory,"plugin"),["stop"]),title:"卸载"},[f(g,{name:"trash",size:13})],8,ns)):u("",!0)])],2),!t.is_large&&A[t.directory+"/"+J(n)]?(o(),l("div",{key:0,class:"bot-bind-panel file-level",onClick:e[6]||(e[6]=N(()=>{},["stop"]))},[a("div",ls,p(n.name)+" — 选择允许触发的机器人",1),(o(!0),l(D,null,L(ae(h).bots,M=>(o(),l("label",{key:M.bot_qq,class:"bot-bind-item"},[a("input",{type:"checkbox",checked:(n.allowed_bots||[]).includes(M.bot_qq),onChange:Fe=>Ae(t,n,M.bot_qq,Fe.target.checked)},null,40,os),M.avatar?(o(),l("img",{key:0,src:M.avatar,class:"bot-bind-avatar"},null,8,is)):u("",!0),a("span",null,p(M.name||M.bot_qq),1),a("span",rs,p(M.bot_qq),1)]))),128))])):u("",!0)],64)}),128))])):u("",!0)])}),128))])):(o(),l("div",nt,"暂无"+p(U.value==="module"?"模块":U.value==="plugin"?"插件":"内容"),1)),w.show?(o(),l("div",{key:3,class:"p-modal-overlay",onClick:e[9]||(e[9]=N(t=>w.show=!1,["self"]))},[a("div",cs,[e[33]||(e[33]=a("div",{class:"p-uninstall-title"},"确认卸载",-1)),a("div",ds,[e[30]||(e[30]=b("确定卸载 ",-1)),a("b",null,p(w.name),1),e[31]||(e[31]=b(" 吗？",-1))]),a("label",ps,[X(a("input",{type:"checkbox","onUpdate:modelValue":e[7]||(e[7]=t=>w.keepData=t)},null,512),[[Je,w.keepData]]),e[32]||(e[32]=a("span",null,"保留插件数据",-1))]),a("div",us,[a("button",{class:"p-btn",onClick:e[8]||(e[8]=t=>w.show=!1)},"取消"),a("button",{class:"p-btn danger",onClick:Me,disabled:w.loading},p(w.loading?"卸载中...":"卸载"),9,fs)])])])):u("",!0),v.show?(o(),l("div",{key:4,class:"p-modal-overlay",onClick:N(pe,["self"])},[a("div",gs,[a("div",ms,[a("div",_s,[f(g,{name:"file",size:16}),a("span",null,p(v.filename),1),v.readonly?(o(),l("span",ys,"只读 (文件过大)")):u("",!0),v.modified?(o(),l("span",vs,"已修改")):u("",!0)]),a("div",hs,[!v.readonly&&v.modified?(o(),l("button",{key:0,class:"p-btn save-btn",onClick:Be},[f(g,{name:"save",size:14}),e[34]||(e[34]=b(" 保存 ",-1))])):u("",!0),a("button",{class:"p-btn close-btn",onClick:pe},[f(g,{name:"x",size:14}),e[35]||(e[35]=b(" 关闭 ",-1))])])]),a("div",bs,[X(a("textarea",{"onUpdate:modelValue":e[10]||(e[10]=t=>v.content=t),class:"p-code-editor",spellcheck:"false",readonly:v.readonly,onInput:e[11]||(e[11]=t=>v.modified=!0)},null,40,ks),[[se,v.content]])])])])):u("",!0),d.show?(o(),l("div",{key:5,class:"p-modal-overlay",onClick:N(ue,["self"])},[a("div",ws,[a("div",Cs,[a("div",zs,[f(g,{name:"settings",size:16}),a("span",null,p(d.filename),1),a("span",{class:S(["p-tag","fmt-"+d.format])},p(d.format.toUpperCase()),3),d.modified?(o(),l("span",$s,"已修改")):u("",!0)]),a("div",xs,[d.format==="yaml"||d.format==="json"?(o(),l("div",Ms,[a("button",{class:S(["cv-mode-tab",{active:d.viewMode==="visual"}]),onClick:e[12]||(e[12]=t=>d.viewMode="visual")},[f(g,{name:"grid",size:12}),e[36]||(e[36]=b(" 可视化",-1))],2),a("button",{class:S(["cv-mode-tab",{active:d.viewMode==="raw"}]),onClick:e[13]||(e[13]=t=>d.viewMode="raw")},[f(g,{name:"code",size:12}),e[37]||(e[37]=b(" 源码",-1))],2)])):u("",!0),d.modified?(o(),l("button",{key:1,class:"p-btn save-btn",onClick:Ne},[f(g,{name:"save",size:14}),e[38]||(e[38]=b(" 保存",-1))])):u("",!0),a("button",{class:"p-btn close-btn",onClick:ue},[f(g,{name:"x",size:14}),e[39]||(e[39]=b(" 关闭",-1))])])]),a("div",qs,[d.viewMode==="visual"&&d.parsed?(o(),l("div",Bs,[f(ae(K),{data:d.parsed,path:[],comments:d.comments,onUpdate:De},null,8,["data","comments"])])):X((o(),l("textarea",{key:1,"onUpdate:modelValue":e[14]||(e[14]=t=>d.raw=t),class:"p-code-editor cfg-editor",spellcheck:"false",onInput:e[15]||(e[15]=t=>d.modified=!0)},null,544)),[[se,d.raw]])])])])):u("",!0)]))}},js=Ge(Us,[["__scopeId","data-v-6e60890e"]]);export{js as default};
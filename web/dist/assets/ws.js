@@ -1 +1 @@
-let e=null,t=null,s={},c=null,i=0;const S=3e3,m=2;function d(){i>=m?h():g()}function k(){c&&(clearTimeout(c),c=null),e&&(e.close(),e=null),t&&(t.close(),t=null)}function w(o,n){s[o]||(s[o]=[]),s[o].push(n)}function y(o,n){s[o]&&(s[o]=s[o].filter(l=>l!==n))}function g(){if(e&&e.readyState<=1)return;const o=localStorage.getItem("elaina_token"),l=`${location.protocol==="https:"?"wss":"ws"}://${location.host}/ws/panel?token=${o||""}`;e=new WebSocket(l),e.onopen=()=>{i=0,a("open"),f()},e.onmessage=r=>{u(r.data)},e.onclose=()=>{i++,a("close"),p()},e.onerror=()=>{e.close()}}function h(){if(t&&t.readyState<=1)return;const o=localStorage.getItem("elaina_token"),n=`${location.origin}/api/sse/panel?token=${o||""}`;t=new EventSource(n),t.onopen=()=>{a("open"),f()},t.onmessage=l=>{u(l.data)},t.onerror=()=>{t.close(),t=null,a("close"),p()}}function u(o){try{const n=JSON.parse(o);a(n.type,n.data)}catch(n){}}function a(o,n){for(const l of s[o]||[])try{l(n)}catch(r){}}function f(){c&&(clearTimeout(c),c=null)}function p(){c||(c=setTimeout(()=>{c=null,d()},S))}export{y as a,d as c,k as d,w as o};
+function D(B){const y8=new Uint8Array(B),V=new DataView(y8.buffer,y8.byteOffset,y8.byteLength),T=new TextDecoder;let P=0;const Q=n=>{const r=T.decode(y8.subarray(P,P+n));return P+=n,r},U=n=>{const r=y8.slice(P,P+n);return P+=n,r},A=n=>{const r=new Array(n);for(let l=0;l<n;l++)r[l]=R();return r},M=n=>{const r={};for(let l=0;l<n;l++){const j=R();r[j]=R()}return r},E=()=>y8[P++],F=()=>{const n=V.getUint16(P);return P+=2,n},G=()=>{const n=V.getUint32(P);return P+=4,n};function R(){const n=y8[P++];if(n<128)return n;if(n<144)return M(n&15);if(n<160)return A(n&15);if(n<192)return Q(n&31);if(n>=224)return n-256;let r;switch(n){case 192:return null;case 194:return!1;case 195:return!0;case 196:return U(E());case 197:return U(F());case 198:return U(G());case 202:return r=V.getFloat32(P),P+=4,r;case 203:return r=V.getFloat64(P),P+=8,r;case 204:return E();case 205:return F();case 206:return G();case 207:return r=Number(V.getBigUint64(P)),P+=8,r;case 208:return V.getInt8(P++);case 209:return r=V.getInt16(P),P+=2,r;case 210:return r=V.getInt32(P),P+=4,r;case 211:return r=Number(V.getBigInt64(P)),P+=8,r;case 217:return Q(E());case 218:return Q(F());case 219:return Q(G());case 220:return A(F());case 221:return A(G());case 222:return M(F());case 223:return M(G())}throw new Error("msgpack: 不支持的类型 0x"+n.toString(16))}return R()}let e=null,t=null,s={},c=null,i=0,v=null,q=0,z="";function O(){const o=v?`&sub=${encodeURIComponent(JSON.stringify(v))}`:"";return z?`${o}&resume_from=${q}&epoch=${z}`:o}const S=3e3,m=2;function d(){i>=m?h():g()}function k(){c&&(clearTimeout(c),c=null),e&&(e.close(),e=null),t&&(t.close(),t=null)}function w(o,n){s[o]||(s[o]=[]),s[o].push(n)}function x(o){v=o||null,e&&e.readyState===1?b():t&&(t.close(),t=null,h())}function b(){e.send(JSON.stringify({type:"subscribe",data:v||{}}))}function y(o,n){s[o]&&(s[o]=s[o].filter(l=>l!==n))}function g(){if(e&&e.readyState<=1)return;const o=localStorage.getItem("elaina_token"),l=`${location.protocol==="https:"?"wss":"ws"}://${location.host}/ws/panel?token=${o||""}${localStorage.getItem("elaina_ws_format")==="msgpack"?"&format=msgpack":""}${O()}`;e=new WebSocket(l),e.binaryType="arraybuffer",e.onopen=()=>{i=0,a("open"),f()},e.onmessage=r=>{typeof r.data=="string"?u(r.data):K(r.data)},e.onclose=()=>{i++,a("close"),p()},e.onerror=()=>{e.close()}}function h(){if(t&&t.readyState<=1)return;const o=localStorage.getItem("elaina_token"),n=`${location.origin}/api/sse/panel?token=${o||""}${O()}`;t=new EventSource(n),t.onopen=()=>{a("open"),f()},t.onmessage=l=>{u(l.data)},t.onerror=()=>{t.close(),t=null,a("close"),p()}}function u(o){try{N(JSON.parse(o))}catch(n){}}function K(o){try{N(D(o))}catch(n){}}function N(n){if(n.type==="batch")for(const l of n.data)J(l);else J(n)}function J(n){n.seq>q&&(q=n.seq),n.type==="init"&&n.data.epoch!==z&&(z=n.data.epoch,q=n.data.seq),n.type==="resumed"&&!n.data.complete&&a("resync"),a(n.type,n.data)}function a(o,n){for(const l of s[o]||[])try{l(n)}catch(r){}}function f(){c&&(clearTimeout(c),c=null)}function p(){c||(c=setTimeout(()=>{c=null,d()},S))}export{y as a,d as c,k as d,w as o,x as s};
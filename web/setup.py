@@ -1,6 +1,5 @@
 """Web 面板集成入口"""
 
-import gzip
 import logging
 import os
 
@@ -8,6 +7,7 @@ from aiohttp import web
 
 import web.api as _panel_api
 import web.auth as _auth
+import web.static as _static
 import web.ws as _ws
 
 log = logging.getLogger('ElainaBot.web')
@@ -46,6 +46,7 @@ class _WebPanelLogHandler(logging.Handler):
 def setup_web(app: web.Application, bot_manager, base_dir: str):
     """将 Web 面板挂载到 aiohttp 应用 (bot_manager 即 Application 实例)"""
     _auth.init(base_dir)
+    app.on_cleanup.append(_auth.on_cleanup)  # 会话 / IP 记录为延迟写回, 关闭前落盘
     _panel_api.set_context(bot_manager, base_dir)
 
     # 注入日志/错误实时推送
@@ -64,7 +65,7 @@ def setup_web(app: web.Application, bot_manager, base_dir: str):
             })
             svc = getattr(bot_manager, '_log_service', None)
             if svc:
-                svc.add('error', {
+                svc.add_nowait('error', {
                     'timestamp': error_data.get('timestamp', ''),
                     'source': f"{error_data.get('module_type', '')}.{error_data.get('module_name', '')}",
                     'level': 'ERROR',
@@ -95,88 +96,13 @@ def setup_web(app: web.Application, bot_manager, base_dir: str):
     app.router.add_get('/web', _redirect_to_web)
 
     if os.path.isdir(dist_dir):
-        app.router.add_get('/web/{path:.*}', _make_spa_handler(dist_dir))
+        app.router.add_get('/web/{path:.*}', _static.make_spa_handler(app, dist_dir))
         log.info(f'Web 面板已挂载 (dist: {dist_dir})')
     else:
         app.router.add_get('/web/{path:.*}', _dev_placeholder)
         log.warning(f'Web 面板未找到编译产物 (期望: {dist_dir})')
 
 
-_MIME = {
-    '.js': 'application/javascript',
-    '.css': 'text/css',
-    '.html': 'text/html',
-    '.json': 'application/json',
-    '.svg': 'image/svg+xml',
-    '.png': 'image/png',
-    '.ico': 'image/x-icon',
-    '.woff': 'font/woff',
-    '.woff2': 'font/woff2',
-}
-# 可压缩的文本资源类型
-_COMPRESSIBLE = {'.js', '.css', '.html', '.json', '.svg'}
-# gzip 结果内存缓存: path -> (mtime, original_size, gzipped_bytes)
-_gz_cache: dict = {}
-
-
-def _gzipped(file_path: str) -> bytes:
-    """返回文件的 gzip 压缩字节, 按文件 mtime 缓存, 避免重复压缩"""
-    mtime = os.path.getmtime(file_path)
-    cached = _gz_cache.get(file_path)
-    if cached and cached[0] == mtime:
-        return cached[1]
-    with open(file_path, 'rb') as f:
-        raw = f.read()
-    data = gzip.compress(raw, 6)
-    _gz_cache[file_path] = (mtime, data)
-    return data
-
-
-def _cache_headers(path: str) -> dict:
-    """带 hash 的构建产物可长期不可变缓存; index.html 等不缓存"""
-    if path.startswith('assets/'):
-        return {'Cache-Control': 'public, max-age=31536000, immutable'}
-    return {'Cache-Control': 'no-cache'}
-
-
-def _make_spa_handler(dist_dir: str):
-    def _serve(file_path: str, path: str, request: web.Request):
-        ext = os.path.splitext(file_path)[1].lower()
-        headers = _cache_headers(path)
-        ct = _MIME.get(ext)
-        if ct:
-            headers['Content-Type'] = ct
-
-        accepts_gzip = 'gzip' in request.headers.get('Accept-Encoding', '')
-        if ext in _COMPRESSIBLE and accepts_gzip:
-            try:
-                body = _gzipped(file_path)
-                headers['Content-Encoding'] = 'gzip'
-                headers['Vary'] = 'Accept-Encoding'
-                return web.Response(body=body, headers=headers)
-            except Exception:
-                pass
-        return web.FileResponse(file_path, headers=headers)
-
-    async def handler(request: web.Request):
-        path = request.match_info.get('path', '')
-        if not path or path == '/':
-            path = 'index.html'
-
-        file_path = os.path.join(dist_dir, path.replace('/', os.sep))
-
-        if os.path.isfile(file_path):
-            return _serve(file_path, path, request)
-
-        index = os.path.join(dist_dir, 'index.html')
-        if os.path.isfile(index):
-            return _serve(index, 'index.html', request)
-
-        return web.Response(text='Not Found', status=404)
-
-    return handler
-
-
 async def _redirect_to_web(request: web.Request):
     raise web.HTTPFound('/web/')
 
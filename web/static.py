@@ -0,0 +1,261 @@
+"""面板静态资源 — 预压缩 + 内容哈希 ETag + sendfile
+
+启动时在后台线程把 web/dist 中的文本资源压缩为同目录的 .br (需安装 brotli) / .gz 兄弟文件,
+已是最新的跳过; 也可在构建后手动执行:
+
+    python -m web.static [dist 目录]
+
+请求时按 Accept-Encoding 选择变体, 用 FileResponse 直接 sendfile 发送, 不在内存中拷贝文件内容。
+ETag 取原文件内容的 sha256 (各编码变体加后缀区分), If-None-Match 命中返回 304。
+dist 只读无法写入兄弟文件时, 回退为内存 gzip 缓存 (按总字节数 LRU 淘汰)。
+"""
+
+import asyncio
+import contextlib
+import gzip
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+
+from aiohttp import web
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+log = logging.getLogger('ElainaBot.web.static')
+
+_MIME = {
+    '.js': 'application/javascript',
+    '.css': 'text/css',
+    '.html': 'text/html',
+    '.json': 'application/json',
+    '.svg': 'image/svg+xml',
+    '.png': 'image/png',
+    '.ico': 'image/x-icon',
+    '.woff': 'font/woff',
+    '.woff2': 'font/woff2',
+}
+# 可压缩的文本资源类型
+_COMPRESSIBLE = {'.js', '.css', '.html', '.json', '.svg'}
+_MIN_SIZE = 512       # 小于此大小不压缩
+_MIN_SAVING = 0.95    # 压缩后不小于原文件的 95% 时不保留变体
+# (编码, 兄弟文件后缀, 压缩函数), 按优先级排列
+_CODECS = [('gzip', '.gz', lambda raw: gzip.compress(raw, 9, mtime=0))]
+if brotli is not None:
+    _CODECS.insert(0, ('br', '.br', lambda raw: brotli.compress(raw, quality=11)))
+
+_ETAG_KEY = 'static_etag'  # request 上暂存的内容 ETag
+_GZ_CACHE_MAX_BYTES = 16 * 1024 * 1024
+_gz_cache: OrderedDict = OrderedDict()  # 只读回退: path -> (mtime_ns, gzipped_bytes)
+_gz_cache_bytes = 0
+
+
+class _Asset:
+    """单个静态文件: 原文件状态 + 内容 ETag + 可用编码变体 {编码: 路径}"""
+
+    __slots__ = ('path', 'mtime_ns', 'size', 'etag', 'content_type', 'variants', 'memory_gzip')
+
+    def __init__(self, path, st, digest, content_type, variants, memory_gzip=False):
+        self.path = path
+        self.mtime_ns = st.st_mtime_ns
+        self.size = st.st_size
+        self.etag = f'"{digest}"'
+        self.content_type = content_type
+        self.variants = variants
+        self.memory_gzip = memory_gzip  # 兄弟文件写入失败 (dist 只读), 改用内存 gzip
+
+    def etag_for(self, encoding) -> str:
+        return f'"{self.etag[1:-1]}-{encoding}"' if encoding else self.etag
+
+
+def _write_bytes(path: str, data: bytes):
+    """原子写入: 同目录临时文件 → os.replace"""
+    fd, tmp = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}.', suffix='.tmp', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+def _sibling(path: str, raw: bytes, st, suffix: str, compress) -> str | None:
+    """返回最新的压缩兄弟文件路径; 过期则重新生成, 不值得压缩返回 None, 写入失败抛 OSError"""
+    dst = path + suffix
+    # 兄弟文件的 mtime 与原文件完全一致才视为最新 (更新器 copy2 会保留上游 mtime, 不能只比新旧)
+    with contextlib.suppress(OSError):
+        if os.stat(dst).st_mtime_ns == st.st_mtime_ns:
+            return dst
+    data = compress(raw)
+    if len(data) >= len(raw) * _MIN_SAVING:
+        with contextlib.suppress(OSError):
+            os.remove(dst)
+        return None
+    _write_bytes(dst, data)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+    return dst
+
+
+def _build(path: str) -> _Asset:
+    """读取并哈希文件, 生成 / 校验压缩变体 (阻塞, 在线程中调用)"""
+    st = os.stat(path)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    ext = os.path.splitext(path)[1].lower()
+    variants, memory_gzip = {}, False
+    if ext in _COMPRESSIBLE and len(raw) >= _MIN_SIZE:
+        for encoding, suffix, compress in _CODECS:
+            try:
+                dst = _sibling(path, raw, st, suffix, compress)
+            except OSError as e:
+                log.debug(f'无法写入 {path}{suffix}: {e}')
+                memory_gzip = True
+                break
+            if dst:
+                variants[encoding] = dst
+    return _Asset(path, st, hashlib.sha256(raw).hexdigest()[:32], _MIME.get(ext), variants, memory_gzip)
+
+
+def precompress(dist_dir: str) -> dict:
+    """为 dist 下所有资源建立清单 (并生成压缩变体), 返回 {绝对路径: _Asset}"""
+    assets = {}
+    for root, _dirs, files in os.walk(dist_dir):
+        for name in files:
+            if name.endswith(('.br', '.gz', '.tmp')):
+                continue
+            path = os.path.join(root, name)
+            try:
+                assets[path] = _build(path)
+            except OSError as e:
+                log.debug(f'跳过 {path}: {e}')
+    return assets
+
+
+def _gzipped(asset: _Asset) -> bytes:
+    """只读 dist 的回退: 内存 gzip 缓存, 按总字节数 LRU 淘汰 (阻塞, 在线程中调用)"""
+    global _gz_cache_bytes
+    cached = _gz_cache.get(asset.path)
+    if cached and cached[0] == asset.mtime_ns:
+        _gz_cache.move_to_end(asset.path)
+        return cached[1]
+    with open(asset.path, 'rb') as f:
+        data = gzip.compress(f.read(), 6)
+    if cached:
+        _gz_cache_bytes -= len(cached[1])
+    _gz_cache[asset.path] = (asset.mtime_ns, data)
+    _gz_cache_bytes += len(data)
+    while _gz_cache_bytes > _GZ_CACHE_MAX_BYTES and len(_gz_cache) > 1:
+        _, (_, old) = _gz_cache.popitem(last=False)
+        _gz_cache_bytes -= len(old)
+    return data
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') == etag for tag in header.split(','))
+
+
+async def _apply_etag(request: web.Request, response: web.StreamResponse):
+    """on_response_prepare: FileResponse 会写入自己的 mtime ETag, 发送前替换为内容 ETag"""
+    etag = request.get(_ETAG_KEY)
+    if etag:
+        response.headers['ETag'] = etag
+
+
+def make_spa_handler(app: web.Application, dist_dir: str):
+    """dist 静态资源 + SPA 回退处理器; 启动后在后台线程预压缩"""
+    dist_root = os.path.realpath(dist_dir)
+    assets: dict = {}
+    tasks = set()
+
+    async def _warmup(_app):
+        async def _run():
+            t0 = time.perf_counter()
+            built = await asyncio.to_thread(precompress, dist_root)
+            for path, asset in built.items():
+                assets.setdefault(path, asset)
+            n = sum(1 for a in built.values() if a.variants)
+            log.info(f'静态资源预压缩完成: {len(built)} 个文件, {n} 个含压缩变体 ({time.perf_counter() - t0:.1f}s)')
+
+        task = asyncio.create_task(_run())
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    app.on_startup.append(_warmup)
+    app.on_response_prepare.append(_apply_etag)
+
+    async def _asset(file_path: str):
+        asset = assets.get(file_path)
+        if asset is not None:
+            # 构建产物文件名不带哈希, 原地更新时需重新生成
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return None
+            if st.st_mtime_ns == asset.mtime_ns and st.st_size == asset.size:
+                return asset
+        elif not os.path.isfile(file_path):
+            return None
+        try:
+            asset = await asyncio.to_thread(_build, file_path)
+        except OSError:
+            return None
+        assets[file_path] = asset
+        return asset
+
+    async def _serve(asset: _Asset, request: web.Request):
+        # 与 FileResponse 一致按子串匹配编码名; 传入的是变体文件本身, 它不会再自行挑选兄弟文件
+        accept = request.headers.get('Accept-Encoding', '').lower()
+        encoding = next((e for e in asset.variants if e in accept), None)
+        if encoding is None and asset.memory_gzip and 'gzip' in accept:
+            encoding = 'gzip'
+        etag = asset.etag_for(encoding)
+        headers = {'Cache-Control': 'no-cache', 'ETag': etag}
+        if asset.variants or asset.memory_gzip:
+            headers['Vary'] = 'Accept-Encoding'
+        if _etag_matches(request.headers.get('If-None-Match', ''), etag):
+            return web.Response(status=304, headers=headers)
+        if asset.content_type:
+            headers['Content-Type'] = asset.content_type
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        if encoding and encoding not in asset.variants:
+            return web.Response(body=await asyncio.to_thread(_gzipped, asset), headers=headers)
+        request[_ETAG_KEY] = etag
+        return web.FileResponse(asset.variants[encoding] if encoding else asset.path, headers=headers)
+
+    async def handler(request: web.Request):
+        path = request.match_info.get('path', '') or 'index.html'
+        file_path = os.path.realpath(os.path.join(dist_root, path.replace('/', os.sep)))
+        asset = None
+        if os.path.commonpath([dist_root, file_path]) == dist_root:
+            asset = await _asset(file_path)
+        if asset is None:
+            asset = await _asset(os.path.join(dist_root, 'index.html'))
+        if asset is None:
+            return web.Response(text='Not Found', status=404)
+        return await _serve(asset, request)
+
+    return handler
+
+
+if __name__ == '__main__':
+    _dist = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dist')
+    _t0 = time.perf_counter()
+    _built = precompress(_dist)
+    for _a in sorted(_built.values(), key=lambda a: a.path):
+        if _a.variants:
+            _sizes = ', '.join(f'{e} {os.path.getsize(p) / 1024:.1f}K' for e, p in _a.variants.items())
+            print(f'{os.path.relpath(_a.path, _dist)}: {_a.size / 1024:.1f}K -> {_sizes}')
+    print(f'{len(_built)} 个文件, 用时 {time.perf_counter() - _t0:.2f}s' + ('' if brotli else ' (未安装 brotli, 仅生成 .gz)'))
@@ -29,6 +29,14 @@ def log_service():
     return getattr(_app, 'log_service', None) if _app else None
 
 
+def int_arg(args, name: str, default: int = 0) -> int:
+    """从请求参数 (query / JSON body) 读取整数, 缺失或非法时返回默认值"""
+    try:
+        return int(args.get(name, default) or default)
+    except (TypeError, ValueError):
+        return default
+
+
 def connected_ids() -> list:
     """已连接的 self_id 列表 (即机器人 QQ); 过滤正向连接的临时占位 id"""
     ad = adapter()
@@ -52,6 +60,14 @@ async def query_log(log_type: str, sql: str, params=None, bot_qq: str = '') -> l
     return await svc.query(log_type, sql, params, bot_qq=bot_qq)
 
 
+async def find_log(log_type: str, bot_qq: str = '', **kwargs) -> list:
+    """日志范围查询 (LogBackend.find), 与存储引擎无关"""
+    svc = log_service()
+    if not svc:
+        return []
+    return await svc.find(log_type, bot_qq, **kwargs)
+
+
 # ── 昵称缓存 (通过 OneBot get_stranger_info) ──
 
 _nick_cache: dict[str, tuple[float, str]] = {}
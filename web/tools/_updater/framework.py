@@ -258,10 +258,9 @@ class FrameworkUpdater:
 
             # 读取日志目录名 (默认 'log')
             try:
-                import yaml
+                from core.base import yaml_io
 
-                with open(self.base_dir / 'config' / 'settings.yaml', encoding='utf-8') as f:
-                    _s = yaml.safe_load(f) or {}
+                _s = yaml_io.load(str(self.base_dir / 'config' / 'settings.yaml'), {})
                 log_dir_name = (_s.get('logging') or {}).get('dir', 'log')
             except Exception:
                 log_dir_name = 'log'
@@ -1,9 +1,12 @@
 """配置文件管理 — settings.yaml 读写 (OneBot)"""
 
 import os
+import shutil
 
 from aiohttp import web
 
+from core.base import yaml_io
+
 _base_dir = ''
 _ALLOWED = ('settings',)
 
@@ -39,23 +42,17 @@ async def handle_save_config(request: web.Request):
             return web.json_response({'success': False, 'error': '内容不能为空'}, status=400)
 
         # 校验 YAML 合法
-        import yaml
         try:
-            yaml.safe_load(content)
-        except yaml.YAMLError as e:
+            yaml_io.loads(content)
+        except yaml_io.YAMLError as e:
             return web.json_response({'success': False, 'error': f'YAML 格式错误: {e}'}, status=400)
 
         cdir = _config_dir()
         path = os.path.join(cdir, f'{file_name}.yaml')
 
         if os.path.exists(path):
-            with open(path, encoding='utf-8') as f:
-                original = f.read()
-            with open(path + '.bak', 'w', encoding='utf-8') as fb:
-                fb.write(original)
-
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(content)
+            shutil.copy2(path, path + '.bak')
+        yaml_io.write_text(path, content)
 
         # 触发热重载
         from core.base.config import cfg
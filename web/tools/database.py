@@ -1,18 +1,40 @@
-"""数据库浏览器 — 查询/浏览/删除 (OneBot)"""
+"""数据库浏览器 — 查询/浏览/删除/整理/快照 (OneBot)
 
+所有 SQLite 访问都在工作线程中执行; 浏览与只读查询复用小型只读连接池, 单条语句受 _QUERY_TIMEOUT 时限约束。
+表行数默认为估算值 (log_meta / sqlite_stat1 / MAX(rowid)), 需要时传 exact=true 精确计数。
+"""
+
+import asyncio
+import contextlib
+import json
 import logging
 import os
 import re
 import sqlite3
+import threading
+import time
 
 from aiohttp import web
 
+from core.storage import codec
+
 log = logging.getLogger('ElainaBot.web.database')
 
 _app = None
 _base_dir = ''
 _READ_PATTERN = re.compile(r'^\s*(SELECT|PRAGMA|EXPLAIN|WITH)\b', re.IGNORECASE)
 
+_POOL_SIZE = 2  # 每个库保留的空闲只读连接数
+_QUERY_TIMEOUT = 10  # 单条语句时限 (秒), 由 progress_handler 中断
+_PROGRESS_OPS = 10000  # 每执行这么多条 VM 指令检查一次时限
+_META_TTL = 30  # 表结构 / 估算行数缓存时长 (秒)
+_COUNT_BUDGET = 0.2  # 无估算来源的表先限时精确计数, 超时再退化为 MAX(rowid)
+_STREAM_CHUNK = 200
+
+_pool: dict[str, list] = {}  # {库路径: [空闲只读连接]}
+_pool_lock = threading.Lock()
+_meta_cache: dict[str, dict] = {}
+
 
 def set_context(app_instance, base_dir: str):
     global _app, _base_dir
@@ -51,7 +73,29 @@ def _collect(result, directory, label):
                 'path': fpath.replace('\\', '/'),
                 'size': os.path.getsize(fpath),
                 'date': label if re.match(r'^\d{4}-\d{2}-\d{2}$', label) else '',
+                **_file_stats(fpath),
+            })
+
+
+def _file_stats(fpath):
+    """WAL 大小与页级碎片率 (freelist 页占比); 读取失败时只返回 WAL 大小"""
+    wal = fpath + '-wal'
+    stats = {'wal_size': os.path.getsize(wal) if os.path.exists(wal) else 0}
+    with contextlib.suppress(Exception):
+        conn = sqlite3.connect(f'file:{fpath}?mode=ro', uri=True, timeout=1)
+        try:
+            pages = conn.execute('PRAGMA page_count').fetchone()[0]
+            free = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            stats.update({
+                'page_size': conn.execute('PRAGMA page_size').fetchone()[0],
+                'page_count': pages,
+                'freelist_count': free,
+                'fragmentation': round(free * 100 / pages, 1) if pages else 0,
+                'auto_vacuum': ('none', 'full', 'incremental')[conn.execute('PRAGMA auto_vacuum').fetchone()[0]],
             })
+        finally:
+            conn.close()
+    return stats
 
 
 def _validate_db_path(db_path):
@@ -72,11 +116,221 @@ def _open(db_path, readonly=True):
     return conn
 
 
+# ──────────── 只读连接池 / 查询时限 / 表元数据缓存 ────────────
+
+def _acquire(abs_path):
+    with _pool_lock:
+        idle = _pool.get(abs_path)
+        if idle:
+            return idle.pop()
+    return _open(abs_path)
+
+
+def _release(abs_path, conn):
+    with _pool_lock:
+        idle = _pool.setdefault(abs_path, [])
+        if len(idle) < _POOL_SIZE:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+def _invalidate(abs_path):
+    """写入 / 删行后丢弃该库的元数据缓存 (表结构或行数可能已变)"""
+    _meta_cache.pop(abs_path, None)
+
+
+@contextlib.contextmanager
+def _deadline(conn, seconds=None):
+    """超过时限 (默认 _QUERY_TIMEOUT) 由 progress_handler 中断当前语句 (sqlite3.OperationalError: interrupted)"""
+    end = time.monotonic() + (seconds or _QUERY_TIMEOUT)
+    conn.set_progress_handler(lambda: time.monotonic() > end, _PROGRESS_OPS)
+    try:
+        yield
+    finally:
+        conn.set_progress_handler(None, 0)
+
+
+class _ThreadBudget:
+    """只计语句在工作线程内执行的时间: 每次调用前按剩余额度重设截止时间 (等待客户端接收的时间不计入)"""
+
+    def __init__(self, seconds=None):
+        self.left = seconds or _QUERY_TIMEOUT
+        self.end = 0.0
+
+    def call(self, fn, *args):
+        t0 = time.monotonic()
+        self.end = t0 + self.left
+        try:
+            return fn(*args)
+        finally:
+            self.left -= time.monotonic() - t0
+
+
+@contextlib.contextmanager
+def _thread_budget(conn, seconds=None):
+    """_deadline 的分段计时版本, 供流式输出: 经 budget.call 在工作线程中执行 execute / fetchmany"""
+    budget = _ThreadBudget(seconds)
+    conn.set_progress_handler(lambda: time.monotonic() > budget.end, _PROGRESS_OPS)
+    try:
+        yield budget
+    finally:
+        conn.set_progress_handler(None, 0)
+
+
+def _error_message(e):
+    if isinstance(e, sqlite3.OperationalError) and 'interrupted' in str(e):
+        return f'查询超过 {_QUERY_TIMEOUT} 秒, 已中止'
+    return str(e)
+
+
+def _exact_count(conn, table):
+    with _deadline(conn):
+        return conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+
+
+def _estimate_counts(conn, names):
+    """{表名: (估算行数, True)}; 取 log_meta 维护的行数 / sqlite_stat1, 都没有则由 _quick_count 计数"""
+    counts = {}
+    with contextlib.suppress(sqlite3.Error):
+        if 'log' in names and 'log_meta' in names:
+            row = conn.execute("SELECT value FROM log_meta WHERE key = 'row_count'").fetchone()
+            if row:
+                counts['log'] = (int(row[0] or 0), True)
+    with contextlib.suppress(sqlite3.Error):
+        if 'sqlite_stat1' in {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'")}:
+            for tbl, stat in conn.execute('SELECT tbl, stat FROM sqlite_stat1'):
+                if tbl in names and tbl not in counts and stat:
+                    counts[tbl] = (int(str(stat).split()[0]), True)
+    return counts
+
+
+def _quick_count(conn, table):
+    """限时精确计数; 超时则以 MAX(rowid) 作为估算 (WITHOUT ROWID 表无法估算时返回 None)"""
+    try:
+        with _deadline(conn, _COUNT_BUDGET):
+            return conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0], False
+    except sqlite3.OperationalError as e:
+        if 'interrupted' not in str(e):
+            raise
+    with contextlib.suppress(sqlite3.Error):
+        return conn.execute(f'SELECT MAX(rowid) FROM "{table}"').fetchone()[0], True
+    return None, True
+
+
+def _table_meta(abs_path, conn):
+    """表结构与估算行数, 缓存 _META_TTL 秒 (日志库持续写入, 估算值本就不追求实时)"""
+    cached = _meta_cache.get(abs_path)
+    if cached and time.monotonic() - cached['at'] < _META_TTL:
+        return cached
+    tables = {}
+    for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name"):
+        name = row['name']
+        tables[name] = [{'name': c['name'], 'type': c['type'], 'notnull': bool(c['notnull']), 'pk': bool(c['pk'])}
+                        for c in conn.execute(f'PRAGMA table_info("{name}")')]
+    meta = {'at': time.monotonic(), 'tables': tables, 'counts': _estimate_counts(conn, set(tables))}
+    _meta_cache[abs_path] = meta
+    return meta
+
+
+def _jsonable(row) -> dict:
+    """BLOB 列无法直接序列化: raw_blob 解码为原始 JSON, 其他二进制显示为占位说明"""
+    d = dict(row)
+    for k, v in d.items():
+        if isinstance(v, (bytes, memoryview)):
+            text = codec.decode(v) if k == 'raw_blob' else ''
+            d[k] = text or f'<BLOB {len(v)} 字节>'
+    return d
+
+
 async def handle_list_databases(request: web.Request):
-    return web.json_response({'success': True, 'databases': _find_databases()})
+    databases = await asyncio.to_thread(_find_databases)
+    return web.json_response({'success': True, 'databases': databases})
+
+
+def _log_key(abs_path):
+    """日志库路径 → (log_type, bot_qq), 供 LogService 的整理/快照接口使用"""
+    rel = os.path.relpath(abs_path, os.path.abspath(_log_base_dir())).replace('\\', '/')
+    parts = rel.split('/')
+    log_type = parts[-1][:-3]
+    return log_type, parts[0] if len(parts) == 2 else ''
+
+
+async def _maintenance(request, action):
+    body = await request.json()
+    valid, abs_path = _validate_db_path(body.get('path', ''))
+    if not valid:
+        return web.json_response({'success': False, 'message': '无效路径'}, status=403)
+    svc = getattr(_app, 'log_service', None) if _app else None
+    if not svc:
+        return web.json_response({'success': False, 'message': '日志服务未启动'}, status=503)
+    log_type, bot_qq = _log_key(abs_path)
+    try:
+        if action == 'backup':
+            dest = await svc.backup(log_type, bot_qq)
+            return web.json_response({'success': True, 'path': dest.replace('\\', '/'), 'size': os.path.getsize(dest)})
+        result = await svc.compact(log_type, bot_qq)
+        return web.json_response({'success': True, **result})
+    except NotImplementedError as e:
+        return web.json_response({'success': False, 'message': f'当前存储引擎不支持该操作: {e}'}, status=501)
+    except Exception as e:
+        log.warning(f'数据库{action}失败: {e}')
+        return web.json_response({'success': False, 'message': str(e)}, status=500)
+
+
+async def handle_archive_logs(request: web.Request):
+    """按 机器人/日期 分区归档日志 (已归档的日期跳过); 可选 log_type / bot_qq / overwrite"""
+    try:
+        body = await request.json()
+    except Exception:
+        body = {}
+    svc = getattr(_app, 'log_service', None) if _app else None
+    if not svc:
+        return web.json_response({'success': False, 'message': '日志服务未启动'}, status=503)
+    log_type = body.get('log_type') or ''
+    if log_type and log_type not in ('message', 'lifecycle', 'framework', 'error'):
+        return web.json_response({'success': False, 'message': '无效的日志类型'}, status=400)
+    bot_qq = str(body.get('bot_qq') or '')
+    try:
+        summary = await svc.archive(
+            log_types=[log_type] if log_type else None,
+            bots=[bot_qq] if bot_qq else None,
+            overwrite=bool(body.get('overwrite')),
+        )
+        return web.json_response({'success': True, **summary})
+    except Exception as e:
+        log.warning(f'日志归档失败: {e}')
+        return web.json_response({'success': False, 'message': str(e)}, status=500)
+
+
+async def handle_backup_database(request: web.Request):
+    """VACUUM INTO 快照 (限速, 不阻塞日志写入)"""
+    return await _maintenance(request, 'backup')
+
+
+async def handle_compact_database(request: web.Request):
+    """回收空闲页; 旧库会做一次完整 VACUUM (期间写入等待)"""
+    return await _maintenance(request, 'compact')
+
+
+def _list_tables_sync(abs_path, exact=False):
+    conn = _acquire(abs_path)
+    try:
+        meta = _table_meta(abs_path, conn)
+        tables = []
+        for name, columns in meta['tables'].items():
+            if exact:
+                count, estimated = _exact_count(conn, name), False
+            else:
+                count, estimated = meta['counts'].get(name) or _quick_count(conn, name)
+            tables.append({'name': name, 'count': count, 'estimated': estimated, 'columns': columns})
+        return tables
+    finally:
+        _release(abs_path, conn)
 
 
 async def handle_list_tables(request: web.Request):
+    """表列表与估算行数; body.exact=true 时逐表精确 COUNT(*) (受查询时限约束)"""
     body = await request.json()
     db_path = body.get('path', '')
     if not db_path:
@@ -85,18 +339,34 @@ async def handle_list_tables(request: web.Request):
     if not valid:
         return web.json_response({'success': False, 'message': '无效路径'}, status=403)
     try:
-        conn = _open(abs_path)
-        tables = []
-        for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name"):
-            tname = row['name']
-            count = conn.execute(f'SELECT COUNT(*) AS c FROM "{tname}"').fetchone()['c']
-            columns = [{'name': c['name'], 'type': c['type'], 'notnull': bool(c['notnull']), 'pk': bool(c['pk'])}
-                       for c in conn.execute(f'PRAGMA table_info("{tname}")')]
-            tables.append({'name': tname, 'count': count, 'columns': columns})
-        conn.close()
+        tables = await asyncio.to_thread(_list_tables_sync, abs_path, bool(body.get('exact')))
         return web.json_response({'success': True, 'tables': tables})
     except Exception as e:
-        return web.json_response({'success': False, 'message': str(e)}, status=500)
+        return web.json_response({'success': False, 'message': _error_message(e)}, status=500)
+
+
+def _query_table_sync(abs_path, table, page, page_size, order_clause, exact):
+    conn = _acquire(abs_path)
+    try:
+        meta = _table_meta(abs_path, conn)
+        if table not in meta['tables']:
+            _invalidate(abs_path)
+            meta = _table_meta(abs_path, conn)
+        if table not in meta['tables']:
+            raise ValueError(f'表不存在: {table}')
+        if exact:
+            total, estimated = _exact_count(conn, table), False
+        else:
+            total, estimated = meta['counts'].get(table) or _quick_count(conn, table)
+        with _deadline(conn):
+            rows = conn.execute(
+                f'SELECT rowid AS _rowid, * FROM "{table}" {order_clause} LIMIT ? OFFSET ?',
+                (page_size, (page - 1) * page_size),
+            ).fetchall()
+        columns = [{'name': c['name'], 'type': c['type']} for c in meta['tables'][table]]
+        return [_jsonable(r) for r in rows], columns, total, estimated
+    finally:
+        _release(abs_path, conn)
 
 
 async def handle_query_table(request: web.Request):
@@ -119,22 +389,72 @@ async def handle_query_table(request: web.Request):
         order_dir = 'DESC'
 
     try:
-        conn = _open(abs_path)
-        total = conn.execute(f'SELECT COUNT(*) AS c FROM "{table}"').fetchone()['c']
         order_clause = f'ORDER BY "{order_by}" {order_dir}' if order_by and re.match(r'^[\w]+$', order_by) else 'ORDER BY rowid DESC'
-        offset = (page - 1) * page_size
-        rows = conn.execute(
-            f'SELECT rowid AS _rowid, * FROM "{table}" {order_clause} LIMIT ? OFFSET ?',
-            (page_size, offset),
-        ).fetchall()
-        data = [dict(r) for r in rows]
-        columns = [{'name': c['name'], 'type': c['type']} for c in conn.execute(f'PRAGMA table_info("{table}")')]
-        conn.close()
-        return web.json_response({'success': True, 'data': data, 'columns': columns,
-                                  'total': total, 'page': page, 'page_size': page_size})
+        data, columns, total, estimated = await asyncio.to_thread(
+            _query_table_sync, abs_path, table, page, page_size, order_clause, bool(body.get('exact')))
+        return web.json_response({'success': True, 'data': data, 'columns': columns, 'total': total,
+                                  'total_estimated': estimated, 'page': page, 'page_size': page_size})
     except Exception as e:
         log.warning(f'查询表失败: {e}')
-        return web.json_response({'success': False, 'message': str(e)}, status=500)
+        return web.json_response({'success': False, 'message': _error_message(e)}, status=500)
+
+
+async def _stream_select(request, abs_path, sql):
+    """只读查询: 池内连接 + 时限, 结果按块写出 JSON (服务端只保留一个分块)
+
+    响应头发出后无法再改状态码: 中途超时 / 出错时以 success=false 与已输出的部分行结束。
+    """
+    conn = await asyncio.to_thread(_acquire, abs_path)
+    cursor = None
+    resp = None
+    try:
+        with _thread_budget(conn) as budget:
+            cursor = await asyncio.to_thread(budget.call, conn.execute, sql)
+            columns = [{'name': d[0], 'type': ''} for d in cursor.description] if cursor.description else []
+            resp = web.StreamResponse(headers={'Content-Type': 'application/json; charset=utf-8'})
+            await resp.prepare(request)
+            await resp.write(('{"columns": ' + json.dumps(columns, ensure_ascii=False) + ', "data": [').encode())
+            total, error = 0, ''
+            try:
+                while True:
+                    rows = await asyncio.to_thread(budget.call, cursor.fetchmany, _STREAM_CHUNK)
+                    if not rows:
+                        break
+                    body = ','.join(json.dumps(_jsonable(r), ensure_ascii=False) for r in rows)
+                    await resp.write((body if not total else ',' + body).encode())
+                    total += len(rows)
+            except sqlite3.Error as e:
+                error = _error_message(e)
+        tail = {'success': not error, 'total': total}
+        if error:
+            tail['message'] = error
+        await resp.write(('], ' + json.dumps(tail, ensure_ascii=False)[1:]).encode())
+        await resp.write_eof()
+        return resp
+    except Exception as e:
+        if resp is not None:
+            raise
+        return web.json_response({'success': False, 'message': _error_message(e)}, status=400)
+    finally:
+        if cursor is not None:
+            cursor.close()
+        _release(abs_path, conn)
+
+
+def _execute_write_sync(abs_path, sql):
+    conn = _open(abs_path, readonly=False)
+    try:
+        statements = [s.strip() for s in sql.split(';') if s.strip()]
+        with _deadline(conn):
+            if len(statements) > 1:
+                conn.executescript(sql)
+                return len(statements), -1
+            affected = conn.execute(sql).rowcount
+            conn.commit()
+        return 1, affected
+    finally:
+        conn.close()
+        _invalidate(abs_path)
 
 
 async def handle_execute_sql(request: web.Request):
@@ -147,29 +467,29 @@ async def handle_execute_sql(request: web.Request):
     if not valid:
         return web.json_response({'success': False, 'message': '无效路径'}, status=403)
 
-    is_read = _READ_PATTERN.match(sql)
-    if is_read and not re.search(r'\bLIMIT\b', sql, re.IGNORECASE):
-        sql = sql.rstrip(';') + ' LIMIT 1000'
+    if _READ_PATTERN.match(sql):
+        if not re.search(r'\bLIMIT\b', sql, re.IGNORECASE):
+            sql = sql.rstrip(';') + ' LIMIT 1000'
+        return await _stream_select(request, abs_path, sql)
     try:
-        conn = _open(abs_path, readonly=False)
-        statements = [s.strip() for s in sql.split(';') if s.strip()]
-        if len(statements) > 1 and not is_read:
-            conn.executescript(sql)
-            conn.close()
-            return web.json_response({'success': True, 'message': f'已执行 {len(statements)} 条语句', 'affected': -1})
-        cursor = conn.execute(sql)
-        if is_read:
-            rows = cursor.fetchall()
-            columns = [{'name': d[0], 'type': ''} for d in cursor.description] if cursor.description else []
-            data = [dict(r) for r in rows]
-            conn.close()
-            return web.json_response({'success': True, 'data': data, 'columns': columns, 'total': len(data)})
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
+        count, affected = await asyncio.to_thread(_execute_write_sync, abs_path, sql)
+        if count > 1:
+            return web.json_response({'success': True, 'message': f'已执行 {count} 条语句', 'affected': -1})
         return web.json_response({'success': True, 'message': f'执行成功, 影响 {affected} 行', 'affected': affected})
     except Exception as e:
-        return web.json_response({'success': False, 'message': str(e)}, status=400)
+        return web.json_response({'success': False, 'message': _error_message(e)}, status=400)
+
+
+def _delete_rows_sync(abs_path, table, rowids):
+    conn = _open(abs_path, readonly=False)
+    try:
+        placeholders = ','.join('?' * len(rowids))
+        deleted = conn.execute(f'DELETE FROM "{table}" WHERE rowid IN ({placeholders})', rowids).rowcount
+        conn.commit()
+        return deleted
+    finally:
+        conn.close()
+        _invalidate(abs_path)
 
 
 async def handle_delete_rows(request: web.Request):
@@ -187,12 +507,7 @@ async def handle_delete_rows(request: web.Request):
     if not valid:
         return web.json_response({'success': False, 'message': '无效路径'}, status=403)
     try:
-        conn = _open(abs_path, readonly=False)
-        placeholders = ','.join('?' * len(rowids))
-        cursor = conn.execute(f'DELETE FROM "{table}" WHERE rowid IN ({placeholders})', rowids)
-        deleted = cursor.rowcount
-        conn.commit()
-        conn.close()
+        deleted = await asyncio.to_thread(_delete_rows_sync, abs_path, table, rowids)
         return web.json_response({'success': True, 'deleted': deleted})
     except Exception as e:
         return web.json_response({'success': False, 'message': str(e)}, status=500)
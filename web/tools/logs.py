@@ -1,12 +1,18 @@
 """日志查询 — 最近日志 / 分页 / 登录日志 (异步架构)"""
 
+import asyncio
+import json
+import logging
+import time
+
 from aiohttp import web
 
 import web.auth as auth
 from web.tools import _common
 
+log = logging.getLogger('ElainaBot.web.logs')
+
 _RECENT_LIMIT = 200
-_LOG_SQL = f'SELECT * FROM log ORDER BY id DESC LIMIT {_RECENT_LIMIT}'
 
 
 def set_context(app_instance):
@@ -14,7 +20,7 @@ def set_context(app_instance):
 
 
 async def _query_recent(log_type: str, bot_qq: str = '') -> list:
-    rows = await _common.query_log(log_type, _LOG_SQL, bot_qq=bot_qq)
+    rows = await _common.find_log(log_type, bot_qq, limit=_RECENT_LIMIT)
     rows.reverse()  # 升序: 旧 → 新
     return rows
 
@@ -55,38 +61,103 @@ def _transform_lifecycle_rows(rows: list, bot_qq: str = '') -> list:
 
 async def handle_recent_logs(request: web.Request):
     bot_qq = _common.primary_bot_qq()
-    msg_rows = await _query_recent('message', bot_qq=bot_qq)
-    lc_rows = await _query_recent('lifecycle', bot_qq=bot_qq)
+    t0 = time.perf_counter()
+    # 四类日志分属不同库, 并发查询
+    msg_rows, lc_rows, fw_rows, err_rows = await asyncio.gather(
+        _query_recent('message', bot_qq=bot_qq),
+        _query_recent('lifecycle', bot_qq=bot_qq),
+        _query_recent('framework'),
+        _query_recent('error'),
+    )
+    elapsed = round((time.perf_counter() - t0) * 1000, 2)
+    log.debug(f'recent logs 查询耗时 {elapsed}ms')
     payload = {
         'message': _transform_message_rows(msg_rows, bot_qq),
-        'framework': await _query_recent('framework'),
-        'error': await _query_recent('error'),
+        'framework': fw_rows,
+        'error': err_rows,
         'lifecycle': _transform_lifecycle_rows(lc_rows, bot_qq),
+        'elapsed_ms': elapsed,
     }
     return web.json_response(payload)
 
 
+_PAGE_MAX = 5000
+_STREAM_THRESHOLD = 500  # 超过该条数的页改为分块流式输出 JSON
+
+
+async def _stream_logs(request: web.Request, meta: dict, log_type: str, bot_qq: str, page_size: int, **find_args):
+    """以 {"logs": [...], ...meta} 形式分块写出, 服务端内存只保留一个分块
+
+    与普通分页一样多取一条判断 has_more, 游标字段写在数组之后, 两种路径的响应结构一致。
+    """
+    resp = web.StreamResponse(headers={'Content-Type': 'application/json; charset=utf-8'})
+    await resp.prepare(request)
+    await resp.write(b'{"logs": [')
+    written, first_id, last_id, has_more = 0, None, None, False
+    async for chunk in _common.log_service().iter_find(log_type, bot_qq, limit=page_size + 1, **find_args):
+        rows = chunk[:page_size - written]
+        if len(rows) < len(chunk):
+            has_more = True
+        if rows:
+            body = ','.join(json.dumps(r, ensure_ascii=False) for r in rows)
+            await resp.write((',' + body if written else body).encode())
+            first_id = rows[0]['id'] if first_id is None else first_id
+            last_id = rows[-1]['id']
+            written += len(rows)
+    tail = {**meta, 'has_more': has_more, 'next_before_id': last_id, 'prev_after_id': first_id}
+    await resp.write(('], ' + json.dumps(tail, ensure_ascii=False)[1:]).encode())
+    await resp.write_eof()
+    return resp
+
+
 async def handle_get_logs(request: web.Request):
+    """分页日志: 优先 before_id / after_id 游标 (按主键定位, 深翻页不变慢); page 参数仅作兼容"""
     log_type = request.match_info.get('log_type', 'message')
     if log_type not in ('message', 'framework', 'error', 'lifecycle'):
         return web.json_response({'error': '无效的日志类型'}, status=400)
 
-    page = int(request.query.get('page', '1'))
-    page_size = int(request.query.get('size', '50'))
-    offset = (page - 1) * page_size
-
-    rows = await _common.query_log(
-        log_type,
-        f'SELECT * FROM log ORDER BY id DESC LIMIT {page_size} OFFSET {offset}',
-    )
-    total_rows = await _common.query_log(log_type, 'SELECT MAX(id) AS cnt FROM log')
-    total = (total_rows[0].get('cnt') or 0) if total_rows else 0
-    return web.json_response({
-        'logs': rows,
+    q = request.query
+    bot_qq = q.get('bot_qq', '') or (_common.primary_bot_qq() if log_type in ('message', 'lifecycle') else '')
+    page_size = max(1, min(_common.int_arg(q, 'size', 50), _PAGE_MAX))
+    before_id, after_id = _common.int_arg(q, 'before_id'), _common.int_arg(q, 'after_id')
+    page = max(_common.int_arg(q, 'page', 1), 1)
+
+    # 统一按 id 降序返回; after_id 先升序取紧邻的更新记录再翻转
+    if after_id > 0:
+        find_args = {'after_id': after_id, 'order': 'asc'}
+    elif before_id > 0:
+        find_args = {'before_id': before_id, 'order': 'desc'}
+    else:
+        find_args = {'offset': (page - 1) * page_size, 'order': 'desc'} if page > 1 else {'order': 'desc'}
+
+    svc = _common.log_service()
+    total = await svc.count(log_type, bot_qq=bot_qq) if svc else 0
+    meta = {
         'total': total,
         'page': page,
         'page_size': page_size,
-        'total_pages': (total + page_size - 1) // page_size if page_size else 0,
+        'total_pages': (total + page_size - 1) // page_size,
+    }
+
+    if svc and page_size > _STREAM_THRESHOLD and find_args['order'] == 'desc' and 'offset' not in find_args:
+        # after_id 需整体翻转、page 偏移需跳过前面的行, 这两种仍走普通分页
+        return await _stream_logs(request, meta, log_type, bot_qq, page_size, **find_args)
+    return await _paged_logs(log_type, bot_qq, page_size, after_id, meta, **find_args)
+
+
+async def _paged_logs(log_type: str, bot_qq: str, page_size: int, after_id: int, meta: dict, **find_args):
+    """多取一条判断 has_more; 返回按 id 降序"""
+    rows = await _common.find_log(log_type, bot_qq, limit=page_size + 1, **find_args)
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if after_id > 0:
+        rows.reverse()
+    return web.json_response({
+        'logs': rows,
+        **meta,
+        'has_more': has_more,
+        'next_before_id': rows[-1]['id'] if rows else None,
+        'prev_after_id': rows[0]['id'] if rows else (after_id or None),
     })
 
 
@@ -4,10 +4,12 @@ import contextlib
 import json
 import os
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from aiohttp import web
 
+from core.services.live_stats import live_stats
+from core.storage import fts
 from web.tools import _common
 
 _base_dir = ''
@@ -60,14 +62,9 @@ async def handle_get_nicknames_batch(request: web.Request):
 # ──────────── 聊天列表 ────────────
 
 async def _db_stats(chat_type):
-    """从消息日志聚合每个会话的最近时间与消息数, 返回 {chat_id: {...}}"""
-    if chat_type == 'user':
-        sql = ("SELECT user_id AS chat_id, MAX(id) AS last_id, MAX(timestamp) AS last_time, "
-               "COUNT(*) AS msg_count FROM log WHERE user_id != '' AND group_id = '' GROUP BY user_id")
-    else:
-        sql = ("SELECT group_id AS chat_id, MAX(id) AS last_id, MAX(timestamp) AS last_time, "
-               "COUNT(*) AS msg_count FROM log WHERE group_id != '' GROUP BY group_id")
-    rows = await _q(sql)
+    """每个会话的最近消息与消息数 (汇总表 stat_chats, 见 rollup.py), 返回 {chat_id: {...}}"""
+    rows = await _q('SELECT chat_id, last_id, last_time, cnt AS msg_count FROM stat_chats WHERE kind = ?',
+                    ('user' if chat_type == 'user' else 'group',))
     stats = {}
     for r in rows:
         cid = str(r.get('chat_id', ''))
@@ -171,8 +168,8 @@ async def handle_get_chats(request: web.Request):
     if chat_type not in ('group', 'user'):
         chat_type = 'group'
     search = body.get('search', '').lower()
-    page = max(int(body.get('page', 1)), 1)
-    page_size = min(int(body.get('page_size', 50)), 100)
+    page = max(_common.int_arg(body, 'page', 1), 1)
+    page_size = max(1, min(_common.int_arg(body, 'page_size', 50), 100))
 
     now = time.time()
     c = _chat_cache.get(chat_type)
@@ -195,19 +192,38 @@ async def handle_get_chats(request: web.Request):
 
 # ──────────── 历史消息 ────────────
 
-async def _query_messages(chat_type, chat_id, limit=300):
-    if chat_type == 'group':
-        sql = f"SELECT * FROM log WHERE group_id = ? ORDER BY id DESC LIMIT {limit}"
-        params = (chat_id,)
-    else:
-        sql = f"SELECT * FROM log WHERE user_id = ? AND group_id = '' ORDER BY id DESC LIMIT {limit}"
-        params = (chat_id,)
-    rows = await _q(sql, params)
-    rows.reverse()
-    return rows
+_HISTORY_PAGE = 100
+_HISTORY_MAX = 500
+
+
+async def _query_messages(chat_type, chat_id, limit=_HISTORY_PAGE, before_id=0, after_id=0, before_date=''):
+    """按 id 游标取一页会话消息 (升序返回); 多取一条用于判断该方向是否还有更多"""
+    args = {'group_id': chat_id} if chat_type == 'group' else {'user_id': chat_id, 'private': True}
+    if after_id > 0:
+        args['after_id'] = after_id
+    elif before_id > 0:
+        args['before_id'] = before_id
+    elif before_date:
+        args['end'] = _second_before(before_date)  # 旧版前端只回传 oldest_date
+    order = 'asc' if after_id > 0 else 'desc'
+    rows = await _common.find_log('message', _primary_id(), limit=limit + 1, order=order, **args)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if order == 'desc':
+        rows.reverse()
+    return rows, has_more
+
+
+def _second_before(ts: str) -> str:
+    """find 的 end 为闭区间; 'timestamp < ts' 换算为 'timestamp <= ts 前一秒'"""
+    try:
+        return (datetime.strptime(ts, '%Y-%m-%d %H:%M:%S') - timedelta(seconds=1)).strftime('%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return ts
 
 
 async def handle_get_chat_history(request: web.Request):
+    """会话历史: 默认最新一页; before_id 向前加载更早消息, after_id 增量拉取更新消息"""
     try:
         body = await request.json()
     except Exception:
@@ -217,7 +233,10 @@ async def handle_get_chat_history(request: web.Request):
     if not chat_id:
         return web.json_response({'success': True, 'data': {'messages': [], 'has_more': False}})
 
-    rows = await _query_messages(chat_type, chat_id, 300)
+    limit = max(1, min(_common.int_arg(body, 'page_size', _HISTORY_PAGE), _HISTORY_MAX))
+    before_id, after_id = _common.int_arg(body, 'before_id'), _common.int_arg(body, 'after_id')
+    rows, has_more = await _query_messages(
+        chat_type, chat_id, limit, before_id, after_id, str(body.get('before_date', '') or ''))
 
     # 预解析 extra（接收消息为 JSON，发送/撤回为字符串标记）
     parsed = []
@@ -225,7 +244,7 @@ async def handle_get_chat_history(request: web.Request):
     for r in rows:
         ex = r.get('extra', '')
         is_self = ex == 'send'
-        recalled = ex == 'recalled'
+        recalled = bool(r.get('recalled')) or ex == 'recalled'  # 旧版把撤回标记写在 extra
         meta = {}
         if ex and ex not in ('send', 'recalled') and ex.startswith('{'):
             with contextlib.suppress(Exception):
@@ -266,10 +285,74 @@ async def handle_get_chat_history(request: web.Request):
             'recalled': recalled,
         })
 
+    # has_more 指请求方向上是否还有: 默认/before_id 为更早消息, after_id 为更新消息
     return web.json_response({
         'success': True,
         'data': {'messages': messages, 'last_msg_id': last_msg_id,
-                 'oldest_date': datetime.now().strftime('%Y-%m-%d'), 'has_more': False},
+                 'oldest_id': rows[0]['id'] if rows else before_id or None,
+                 'newest_id': rows[-1]['id'] if rows else after_id or None,
+                 'oldest_date': rows[0].get('timestamp', '') if rows else '',
+                 'has_more': has_more},
+    })
+
+
+# ──────────── 全文搜索 ────────────
+
+async def handle_search_messages(request: web.Request):
+    """消息内容搜索 (由存储引擎实现: SQLite 为 FTS5 trigram / LIKE), 按 id 倒序 + before_id 游标分页"""
+    try:
+        body = await request.json()
+    except Exception:
+        body = {}
+    terms = fts.split_terms(str(body.get('keyword', '')))
+    if not terms:
+        return web.json_response({'success': False, 'message': '缺少关键词'}, status=400)
+    bot_qq = str(body.get('bot_qq', '') or _primary_id())
+    page_size = max(1, min(_common.int_arg(body, 'page_size', 50), 100))
+    before_id = _common.int_arg(body, 'before_id')
+
+    svc = _common.log_service()
+    if not svc:
+        return web.json_response({'success': True, 'data': {'results': [], 'has_more': False}})
+    end = str(body.get('end', '') or '')
+    rows, mode = await svc.search(
+        'message', bot_qq, terms, limit=page_size + 1,
+        start=str(body.get('start', '') or ''), end=end + ' 23:59:59' if len(end) == 10 else end,
+        group_id=body.get('group_id', ''), user_id=body.get('user_id', ''),
+        private=body.get('chat_type') == 'user', before_id=before_id,
+    )
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    results = []
+    for r in rows:
+        ex = r.get('extra', '') or ''
+        nickname = ''
+        if ex.startswith('{'):
+            with contextlib.suppress(Exception):
+                nickname = json.loads(ex).get('nickname', '')
+        gid = str(r.get('group_id', '') or '')
+        results.append({
+            'id': r.get('id'),
+            'message_id': str(r.get('message_id', '')),
+            'timestamp': r.get('timestamp', ''),
+            'user_id': str(r.get('user_id', '')),
+            'group_id': gid,
+            'chat_type': 'group' if gid else 'user',
+            'chat_id': gid or str(r.get('user_id', '')),
+            'nickname': nickname,
+            'is_self': ex == 'send',
+            'content': r.get('content', ''),
+            'snippet': r.get('snippet', ''),
+        })
+    return web.json_response({
+        'success': True,
+        'data': {
+            'results': results,
+            'has_more': has_more,
+            'next_before_id': results[-1]['id'] if results and has_more else None,
+            'mode': mode,
+        },
     })
 
 
@@ -278,6 +361,7 @@ async def handle_get_chat_history(request: web.Request):
 async def _log_sent(chat_type, chat_id, content, message_id):
     ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     bot_qq = _primary_id()
+    live_stats.record_message(bot_qq, chat_id if chat_type == 'group' else '', '' if chat_type == 'group' else chat_id)
     svc = _common.log_service()
     if svc:
         await svc.add('message', {
@@ -389,9 +473,7 @@ async def _mark_recalled(message_id):
     svc = _common.log_service()
     if not svc:
         return
-    with contextlib.suppress(Exception):
-        await svc.execute('message', "UPDATE log SET extra='recalled' WHERE message_id=?",
-                    (str(message_id),), bot_qq=_primary_id())
+    svc.mark_recalled(str(message_id), bot_qq=_primary_id())
 
 
 # ──────────── 群备注 ────────────
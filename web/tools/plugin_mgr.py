@@ -10,11 +10,14 @@ import shutil
 import tempfile
 import zipfile
 from datetime import datetime
+from functools import lru_cache
 from typing import cast
 
-import yaml
 from aiohttp import BodyPartReader, web
 
+from core.base import yaml_io
+from core.module.hook import HookManager
+
 log = logging.getLogger('ElainaBot.web.plugin_mgr')
 
 _app = None
@@ -155,6 +158,7 @@ def _scan_plugin_dirs():
     pm = get_pm()
     plugin_info_map = pm.get_web_plugin_info() if pm else {}
     disabled_set = pm.get_disabled_plugins() if pm else set()
+    profiling = pm.profiling_status() if pm else None
 
     for dir_name in sorted(os.listdir(pdir)):
         dir_path = os.path.join(pdir, dir_name)
@@ -200,6 +204,8 @@ def _scan_plugin_dirs():
             'commands': pinfo.get('commands', []),
             'description': pinfo.get('description', ''),
             'meta': pinfo.get('meta', {}),
+            'stats': pinfo.get('stats'),
+            'profiling': profiling if profiling and profiling['plugin'] == dir_name else None,
         })
     dirs.sort(key=lambda d: (not d['enabled'], d['directory']))
     return dirs
@@ -210,7 +216,37 @@ async def handle_scan_plugins(request: web.Request):
 
 
 async def handle_scan_plugin_dirs(request: web.Request):
-    return web.json_response({'success': True, 'dirs': _scan_plugin_dirs()})
+    pm = get_pm()
+    return web.json_response({'success': True, 'dirs': _scan_plugin_dirs(), 'slow_handler_ms': pm.slow_handler_ms() if pm else 0})
+
+
+# ════════════════ 性能采样 ════════════════
+
+async def handle_profile_plugin(request: web.Request):
+    body = await request.json()
+    name = body.get('name', '')
+    action = body.get('action', 'start')
+    pm = get_pm()
+    if not pm:
+        return web.json_response({'success': False, 'message': '插件管理器未初始化'}, status=503)
+    if action == 'stop':
+        pm.stop_profiling()
+        return web.json_response({'success': True, 'message': '采样已停止', 'profiling': pm.profiling_status()})
+    if action != 'start' or name not in pm.plugins:
+        return web.json_response({'success': False, 'message': f'插件未加载: {name}'}, status=400)
+    try:
+        seconds = float(body.get('seconds', 60))
+    except (TypeError, ValueError):
+        return web.json_response({'success': False, 'message': '无效的采样时长'}, status=400)
+    pm.start_profiling(name, seconds)
+    return web.json_response({'success': True, 'message': f'开始采样 {name}', 'profiling': pm.profiling_status()})
+
+
+async def handle_profile_report(request: web.Request):
+    pm = get_pm()
+    if not pm:
+        return web.json_response({'success': False, 'message': '插件管理器未初始化'}, status=503)
+    return web.Response(text=pm.profile_report(request.query.get('sort', 'cumulative')), content_type='text/plain')
 
 
 # ════════════════ 插件启停 / 重载 ════════════════
@@ -478,6 +514,8 @@ def _scan_modules():
         return result
     mm = get_mm()
     runtime = {m['name']: m for m in mm.list_modules()} if mm else {}
+    hm = getattr(_app, 'hook_manager', None) if _app else None
+    hook_stats = hm.stats_by_owner() if hm else {}
     persist_map = {}
     enabled_file = os.path.join(mdir, 'modules_enabled.json')
     if os.path.isfile(enabled_file):
@@ -504,12 +542,13 @@ def _scan_modules():
             'error': rt.get('error'),
             'last_modified': datetime.fromtimestamp(os.path.getmtime(entry)).strftime('%Y-%m-%d %H:%M:%S'),
             'config_files': list_config_files(os.path.join(mod_dir, 'data')),
+            'hooks': hook_stats.get(rt.get('display_name') or name, []),
         })
     return result
 
 
 async def handle_scan_modules(request: web.Request):
-    return web.json_response({'success': True, 'modules': _scan_modules()})
+    return web.json_response({'success': True, 'modules': _scan_modules(), 'hook_buckets_ms': HookManager.BUCKETS_MS})
 
 
 async def handle_module_toggle(request: web.Request):
@@ -636,7 +675,9 @@ def _rebuild_yaml(data, cmt, pre='', ind=0):
     return out
 
 
+@lru_cache(maxsize=32)
 def _extract_yaml_comments(raw_text):
+    """按原文缓存: 配置页反复打开同一文件时不再逐行正则扫描 (返回值勿修改)"""
     comments = {}
     pending = None
     stack = []
@@ -681,14 +722,18 @@ async def handle_read_config(request: web.Request):
     if not os.path.isfile(abs_path):
         return web.json_response({'success': False, 'message': '文件不存在'}, status=404)
     fmt = detect_config_format(os.path.splitext(abs_path)[1].lower())
-    with open(abs_path, encoding='utf-8') as f:
-        raw = f.read()
     parsed, comments = None, {}
     if fmt == 'yaml':
-        with contextlib.suppress(Exception):
-            parsed = yaml.safe_load(raw)
+        try:
+            raw, parsed = yaml_io.read(abs_path)  # 文件未变时直接取缓存的解析结果
             comments = _extract_yaml_comments(raw)
-    elif fmt == 'json':
+        except Exception:
+            with open(abs_path, encoding='utf-8') as f:
+                raw = f.read()
+    else:
+        with open(abs_path, encoding='utf-8') as f:
+            raw = f.read()
+    if fmt == 'json':
         with contextlib.suppress(Exception):
             parsed = json.loads(raw)
     return web.json_response({'success': True, 'format': fmt, 'raw': raw, 'parsed': parsed,
@@ -706,7 +751,7 @@ async def handle_save_config(request: web.Request):
         return err
     if fmt == 'yaml':
         try:
-            parsed = yaml.safe_load(content)
+            parsed = yaml_io.loads(content)
         except Exception as e:
             return web.json_response({'success': False, 'message': f'YAML 格式错误: {e}'}, status=400)
         if isinstance(parsed, dict) and os.path.isfile(abs_path):
@@ -722,8 +767,7 @@ async def handle_save_config(request: web.Request):
             return web.json_response({'success': False, 'message': f'JSON 格式错误: {e}'}, status=400)
     if os.path.isfile(abs_path):
         shutil.copy2(abs_path, abs_path + '.backup')
-    with open(abs_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    yaml_io.write_text(abs_path, content)  # 原子替换, 监视线程不会读到写了一半的文件
 
     reloaded = ''
     mdir = os.path.abspath(modules_dir())
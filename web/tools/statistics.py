@@ -1,12 +1,17 @@
-"""统计数据 — 基于 message.db 聚合 (异步架构)"""
+"""统计数据 — 基于 message.db / lifecycle.db 的汇总表 (异步架构)"""
 
+import asyncio
+import logging
 import time
 from datetime import datetime, timedelta
 
 from aiohttp import web
 
+from core.services.live_stats import live_stats
 from web.tools import _common
 
+log = logging.getLogger('ElainaBot.web.statistics')
+
 _base_dir = ''
 _CACHE_TTL = 10
 _stats_cache: dict = {}
@@ -45,14 +50,24 @@ def _bots_count():
     return len(_common.connected_ids())
 
 
-# ──────────── 聚合函数 ────────────
+# ──────────── 聚合函数 (今日读内存实时计数, 其它日期读 LogService 维护的汇总表) ────────────
+
+def _live(date, bot=None):
+    """今日数据直接取 live_stats 快照 (O(1)); 非今日返回 None, 由调用方查汇总表"""
+    if date != live_stats.day:
+        return None
+    return live_stats.snapshot(bot if bot is not None else _common.primary_bot_qq())
+
 
 async def _gather_summary(date, bot=None):
+    snap = _live(date, bot)
+    if snap is not None:
+        return {'total_messages': snap['total_messages'], 'private_messages': snap['private_messages'],
+                'bots_count': _bots_count()}
     rows = await _q(
-        "SELECT COUNT(*) AS cnt, "
-        "COUNT(CASE WHEN group_id='' THEN 1 END) AS private "
-        "FROM log WHERE timestamp LIKE ?",
-        (date + '%',),
+        "SELECT COALESCE(SUM(total), 0) AS cnt, COALESCE(SUM(private), 0) AS private "
+        "FROM stat_hourly WHERE day = ?",
+        (date,),
         bot,
     )
     total = rows[0].get('cnt', 0) if rows else 0
@@ -61,11 +76,13 @@ async def _gather_summary(date, bot=None):
 
 
 async def _gather_active(date, bot=None):
+    snap = _live(date, bot)
+    if snap is not None:
+        return {'active_users': snap['active_users'], 'active_groups': snap['active_groups']}
     rows = await _q(
-        "SELECT COUNT(DISTINCT CASE WHEN user_id!='' THEN user_id END) AS users, "
-        "COUNT(DISTINCT CASE WHEN group_id!='' THEN group_id END) AS groups_ "
-        "FROM log WHERE timestamp LIKE ?",
-        (date + '%',),
+        "SELECT (SELECT COUNT(*) FROM stat_user_daily WHERE day = ?) AS users, "
+        "(SELECT COUNT(*) FROM stat_group_daily WHERE day = ?) AS groups_",
+        (date, date),
         bot,
     )
     return {
@@ -75,9 +92,11 @@ async def _gather_active(date, bot=None):
 
 
 async def _gather_top(date, bot=None):
-    like = (date + '%',)
-    groups = await _q("SELECT group_id AS k, COUNT(*) AS c FROM log WHERE group_id!='' AND timestamp LIKE ? GROUP BY k ORDER BY c DESC LIMIT 10", like, bot)
-    users = await _q("SELECT user_id AS k, COUNT(*) AS c FROM log WHERE user_id!='' AND timestamp LIKE ? GROUP BY k ORDER BY c DESC LIMIT 10", like, bot)
+    snap = _live(date, bot)
+    if snap is not None:
+        return {'top_groups': snap['top_groups'], 'top_users': snap['top_users'], 'top_commands': snap['top_commands']}
+    groups = await _q("SELECT group_id AS k, cnt AS c FROM stat_group_daily WHERE day = ? ORDER BY cnt DESC LIMIT 10", (date,), bot)
+    users = await _q("SELECT user_id AS k, cnt AS c FROM stat_user_daily WHERE day = ? ORDER BY cnt DESC LIMIT 10", (date,), bot)
     return {
         'top_groups': [{'group_id': r['k'], 'message_count': r['c']} for r in groups],
         'top_users': [{'user_id': r['k'], 'message_count': r['c']} for r in users],
@@ -95,7 +114,7 @@ _LIFECYCLE_MAP = {
 
 async def _gather_events(date, bot=None):
     ev = {'group_join_count': 0, 'group_leave_count': 0, 'friend_add_count': 0, 'friend_remove_count': 0}
-    rows = await _ql("SELECT message_type AS t, COUNT(*) AS c FROM log WHERE timestamp LIKE ? GROUP BY t", (date + '%',), bot)
+    rows = await _ql("SELECT event_type AS t, cnt AS c FROM stat_event_daily WHERE day = ?", (date,), bot)
     for r in rows:
         key = _LIFECYCLE_MAP.get(r.get('t', ''))
         if key:
@@ -105,8 +124,7 @@ async def _gather_events(date, bot=None):
 
 async def _gather_totals(bot=None):
     rows = await _q(
-        "SELECT COUNT(DISTINCT CASE WHEN user_id!='' THEN user_id END) AS users, "
-        "COUNT(DISTINCT CASE WHEN group_id!='' THEN group_id END) AS groups_ FROM log",
+        "SELECT (SELECT COUNT(*) FROM stat_users) AS users, (SELECT COUNT(*) FROM stat_groups) AS groups_",
         None,
         bot,
     )
@@ -143,12 +161,16 @@ async def _friend_count(bot=None) -> int:
 
 
 async def _hourly(date, bot=None):
-    rows = await _q("SELECT substr(timestamp,12,2) AS hr, COUNT(*) AS c FROM log WHERE timestamp LIKE ? GROUP BY hr", (date + '%',), bot)
+    snap = _live(date, bot)
+    if snap is not None:
+        return snap['hourly']
+    rows = await _q("SELECT hour AS hr, total AS c FROM stat_hourly WHERE day = ?", (date,), bot)
     h = {}
     for r in rows:
-        hr = r.get('hr', '')
-        if hr:
-            h[hr] = h.get(hr, 0) + r.get('c', 0)
+        hr = r.get('hr')
+        if hr is not None:
+            key = f'{int(hr):02d}'
+            h[key] = h.get(key, 0) + r.get('c', 0)
     return h
 
 
@@ -170,25 +192,40 @@ async def handle_get_statistics(request: web.Request):
             return web.json_response({'success': True, 'data': c[1]})
     try:
         has_selected = bool(request.query.get('date', ''))
+        t0 = time.perf_counter()
         data = await _gather_all(date, has_selected, bot)
+        elapsed = _elapsed_ms(t0, 'statistics')
         _stats_cache[key] = (now, data)
-        return web.json_response({'success': True, 'data': data})
+        return web.json_response({'success': True, 'data': data, 'elapsed_ms': elapsed})
     except Exception as e:
         return web.json_response({'success': False, 'error': str(e)}, status=500)
 
 
+def _elapsed_ms(t0, name):
+    """记录接口耗时 (debug 日志), 返回毫秒数供响应携带"""
+    ms = round((time.perf_counter() - t0) * 1000, 2)
+    log.debug(f'{name} 查询耗时 {ms}ms')
+    return ms
+
+
+async def _none():
+    return None
+
+
 async def _gather_all(date, has_selected, bot=None):
-    summary = await _gather_summary(date, bot)
-    active = await _gather_active(date, bot)
-    top = await _gather_top(date, bot)
-    events = await _gather_events(date, bot)
-    totals = await _gather_totals(bot)
-    hourly = await _hourly(date, bot)
+    # 各项互不依赖, 并发执行 (只读连接池上并行查询; 今日数据直接取内存计数)
+    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    summary, active, top, events, totals, hourly, yh = await asyncio.gather(
+        _gather_summary(date, bot),
+        _gather_active(date, bot),
+        _gather_top(date, bot),
+        _gather_events(date, bot),
+        _gather_totals(bot),
+        _hourly(date, bot),
+        _hourly(yesterday, bot) if not has_selected else _none(),
+    )
     peak_h = max(hourly, key=hourly.get) if hourly else '00'
-    yesterday_dist = None
-    if not has_selected:
-        yh = await _hourly((datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'), bot)
-        yesterday_dist = _hourly_list(yh)
+    yesterday_dist = _hourly_list(yh) if yh is not None else None
     return {
         'today': {
             'message_stats': {
@@ -251,7 +288,9 @@ async def handle_get_hourly_statistics(request: web.Request):
     c = _chart_cache.get(key)
     if c and now - c[0] < _CACHE_TTL:
         return web.json_response(c[1])
+    t0 = time.perf_counter()
     payload = await _hourly_payload(bot)
+    payload['elapsed_ms'] = _elapsed_ms(t0, 'hourly')
     _chart_cache[key] = (now, payload)
     return web.json_response(payload)
 
@@ -259,11 +298,12 @@ async def handle_get_hourly_statistics(request: web.Request):
 async def _hourly_payload(bot=None):
     today = _today()
     yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    th, yh = await asyncio.gather(_hourly(today, bot), _hourly(yesterday, bot))
     return {
         'success': True,
         'data': {
-            'today_hourly_distribution': _hourly_list(await _hourly(today, bot)),
-            'yesterday_hourly_distribution': _hourly_list(await _hourly(yesterday, bot)),
+            'today_hourly_distribution': _hourly_list(th),
+            'yesterday_hourly_distribution': _hourly_list(yh),
         },
     }
 
@@ -276,34 +316,56 @@ async def handle_get_chart_data(request: web.Request):
     c = _chart_cache.get(key)
     if c and now - c[0] < _CACHE_TTL:
         return web.json_response(c[1])
+    t0 = time.perf_counter()
     payload = await _chart_payload(days, bot)
+    payload['elapsed_ms'] = _elapsed_ms(t0, f'chart({days}d)')
     _chart_cache[key] = (now, payload)
     return web.json_response(payload)
 
 
 async def _chart_payload(days, bot=None):
+    """按日期区间一次性 GROUP BY (4 条查询覆盖全部天数, 并发执行), 而非逐日查询"""
+    today = datetime.now().date()
+    dates = [today - timedelta(days=i) for i in range(days - 1, -1, -1)]
+    start, end = dates[0].strftime('%Y-%m-%d'), dates[-1].strftime('%Y-%m-%d')
+    rng = (start, end)
+    msg_rows, user_rows, group_rows, ev_rows, totals, total_friends = await asyncio.gather(
+        _q("SELECT day, SUM(total) AS total, SUM(private) AS private FROM stat_hourly "
+           "WHERE day BETWEEN ? AND ? GROUP BY day", rng, bot),
+        _q("SELECT day, COUNT(*) AS c FROM stat_user_daily WHERE day BETWEEN ? AND ? GROUP BY day", rng, bot),
+        _q("SELECT day, COUNT(*) AS c FROM stat_group_daily WHERE day BETWEEN ? AND ? GROUP BY day", rng, bot),
+        _ql("SELECT day, event_type AS t, cnt AS c FROM stat_event_daily WHERE day BETWEEN ? AND ?", rng, bot),
+        _gather_totals(bot),
+        _friend_count(bot),
+    )
+    msgs = {r['day']: r for r in msg_rows}
+    users = {r['day']: r['c'] for r in user_rows}
+    groups = {r['day']: r['c'] for r in group_rows}
+    events = {}
+    for r in ev_rows:
+        key = _LIFECYCLE_MAP.get(r.get('t', ''))
+        if key:
+            ev = events.setdefault(r['day'], {})
+            ev[key] = ev.get(key, 0) + (r.get('c', 0) or 0)
+
     labels, msg_total, msg_private, msg_group = [], [], [], []
     active_users, active_groups = [], []
     ev_join, ev_leave, ev_fadd, ev_frem = [], [], [], []
-    today = datetime.now().date()
-    for i in range(days - 1, -1, -1):
-        d = today - timedelta(days=i)
+    for d in dates:
         ds = d.strftime('%Y-%m-%d')
         labels.append(d.strftime('%m-%d'))
-        s = await _gather_summary(ds, bot)
-        a = await _gather_active(ds, bot)
-        e = await _gather_events(ds, bot)
-        msg_total.append(s['total_messages'])
-        msg_private.append(s['private_messages'])
-        msg_group.append(s['total_messages'] - s['private_messages'])
-        active_users.append(a['active_users'])
-        active_groups.append(a['active_groups'])
-        ev_join.append(e['group_join_count'])
-        ev_leave.append(e['group_leave_count'])
-        ev_fadd.append(e['friend_add_count'])
-        ev_frem.append(e['friend_remove_count'])
-    totals = await _gather_totals(bot)
-    total_friends = await _friend_count(bot)
+        m = msgs.get(ds) or {}
+        total, priv = m.get('total', 0) or 0, m.get('private', 0) or 0
+        e = events.get(ds, {})
+        msg_total.append(total)
+        msg_private.append(priv)
+        msg_group.append(total - priv)
+        active_users.append(users.get(ds, 0))
+        active_groups.append(groups.get(ds, 0))
+        ev_join.append(e.get('group_join_count', 0))
+        ev_leave.append(e.get('group_leave_count', 0))
+        ev_fadd.append(e.get('friend_add_count', 0))
+        ev_frem.append(e.get('friend_remove_count', 0))
     return {
         'success': True,
         'data': {
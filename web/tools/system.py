@@ -15,6 +15,8 @@ from datetime import datetime
 import psutil
 from aiohttp import web
 
+from core.services.live_stats import live_stats
+from core.services.loop_monitor import loop_monitor
 from web.tools import _common
 
 log = logging.getLogger('ElainaBot.web.sysinfo')
@@ -70,33 +72,19 @@ def _cpu_model():
 
 
 async def _message_stats():
-    """从 message.db 聚合今日消息统计"""
-    today = datetime.now().strftime('%Y-%m-%d')
-    out = {'today_messages': 0, 'today_active': 0, 'active_groups': 0,
-           'total_users': 0, 'total_groups': 0}
+    """今日计数取内存实时统计, 累计用户/群数读 message.db 汇总表"""
     bot_qq = _common.primary_bot_qq()
+    snap = live_stats.snapshot(bot_qq)
+    out = {'today_messages': snap['total_messages'], 'today_active': snap['active_users'],
+           'active_groups': snap['active_groups'], 'total_users': 0, 'total_groups': 0}
     rows = await _common.query_log(
         'message',
-        "SELECT COUNT(*) AS cnt, "
-        "COUNT(DISTINCT CASE WHEN user_id!='' THEN user_id END) AS users, "
-        "COUNT(DISTINCT CASE WHEN group_id!='' THEN group_id END) AS groups_ "
-        "FROM log WHERE timestamp LIKE ?",
-        (today + '%',),
+        "SELECT (SELECT COUNT(*) FROM stat_users) AS total_users, (SELECT COUNT(*) FROM stat_groups) AS total_groups",
         bot_qq=bot_qq,
     )
     if rows:
-        out['today_messages'] = rows[0].get('cnt', 0) or 0
-        out['today_active'] = rows[0].get('users', 0) or 0
-        out['active_groups'] = rows[0].get('groups_', 0) or 0
-    total = await _common.query_log(
-        'message',
-        "SELECT COUNT(DISTINCT CASE WHEN user_id!='' THEN user_id END) AS users, "
-        "COUNT(DISTINCT CASE WHEN group_id!='' THEN group_id END) AS groups_ FROM log",
-        bot_qq=bot_qq,
-    )
-    if total:
-        out['total_users'] = total[0].get('users', 0) or 0
-        out['total_groups'] = total[0].get('groups_', 0) or 0
+        out['total_users'] = rows[0].get('total_users', 0) or 0
+        out['total_groups'] = rows[0].get('total_groups', 0) or 0
     return out
 
 
@@ -167,6 +155,7 @@ async def get_system_info() -> dict:
         'active_groups': ms['active_groups'],
         'total_users': ms['total_users'],
         'total_groups': ms['total_groups'],
+        'loop': loop_monitor.snapshot(),
     })
     return hw
 
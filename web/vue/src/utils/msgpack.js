@@ -0,0 +1,52 @@
+// 精简 MessagePack 解码器 — 仅用于面板 WS 二进制帧 (不支持 ext 类型)
+export function decode(buffer) {
+  const bytes = new Uint8Array(buffer)
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength)
+  const td = new TextDecoder()
+  let pos = 0
+
+  const str = n => { const s = td.decode(bytes.subarray(pos, pos + n)); pos += n; return s }
+  const bin = n => { const b = bytes.slice(pos, pos + n); pos += n; return b }
+  const arr = n => { const a = new Array(n); for (let i = 0; i < n; i++) a[i] = read(); return a }
+  const map = n => { const o = {}; for (let i = 0; i < n; i++) { const k = read(); o[k] = read() } return o }
+  const u8 = () => bytes[pos++]
+  const u16 = () => { const v = view.getUint16(pos); pos += 2; return v }
+  const u32 = () => { const v = view.getUint32(pos); pos += 4; return v }
+
+  function read() {
+    const b = bytes[pos++]
+    if (b < 0x80) return b
+    if (b < 0x90) return map(b & 0x0f)
+    if (b < 0xa0) return arr(b & 0x0f)
+    if (b < 0xc0) return str(b & 0x1f)
+    if (b >= 0xe0) return b - 0x100
+    let v
+    switch (b) {
+      case 0xc0: return null
+      case 0xc2: return false
+      case 0xc3: return true
+      case 0xc4: return bin(u8())
+      case 0xc5: return bin(u16())
+      case 0xc6: return bin(u32())
+      case 0xca: v = view.getFloat32(pos); pos += 4; return v
+      case 0xcb: v = view.getFloat64(pos); pos += 8; return v
+      case 0xcc: return u8()
+      case 0xcd: return u16()
+      case 0xce: return u32()
+      case 0xcf: v = Number(view.getBigUint64(pos)); pos += 8; return v
+      case 0xd0: return view.getInt8(pos++)
+      case 0xd1: v = view.getInt16(pos); pos += 2; return v
+      case 0xd2: v = view.getInt32(pos); pos += 4; return v
+      case 0xd3: v = Number(view.getBigInt64(pos)); pos += 8; return v
+      case 0xd9: return str(u8())
+      case 0xda: return str(u16())
+      case 0xdb: return str(u32())
+      case 0xdc: return arr(u16())
+      case 0xdd: return arr(u32())
+      case 0xde: return map(u16())
+      case 0xdf: return map(u32())
+    }
+    throw new Error('msgpack: 不支持的类型 0x' + b.toString(16))
+  }
+  return read()
+}
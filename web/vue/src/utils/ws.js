@@ -1,8 +1,14 @@
+import { decode } from './msgpack'
+
 let ws = null
 let sse = null
 let listeners = {}
 let reconnectTimer = null
 let wsFailCount = 0
+let subscription = null
+// 断线续传: 记录最后收到的消息序号, 重连时带上, 服务端从内存补发错过的消息
+let lastSeq = 0
+let epoch = ''
 
 const RECONNECT_DELAY = 3000
 const MAX_WS_FAILS = 2
@@ -22,21 +28,40 @@ export function on(event, handler) {
   listeners[event].push(handler)
 }
 
+// 服务端按订阅过滤实时推送 (字段: types / log_types / bots / groups, 缺省为不限); 重连后自动重发
+export function subscribe(sub) {
+  subscription = sub || null
+  if (ws && ws.readyState === 1) sendSubscription()
+  else if (sse) { sse.close(); sse = null; connectSSE() }
+}
+
+function sendSubscription() {
+  ws.send(JSON.stringify({ type: 'subscribe', data: subscription || {} }))
+}
+
 export function off(event, handler) {
   if (listeners[event]) {
     listeners[event] = listeners[event].filter(h => h !== handler)
   }
 }
 
+function connectParams() {
+  const sub = subscription ? `&sub=${encodeURIComponent(JSON.stringify(subscription))}` : ''
+  return epoch ? `${sub}&resume_from=${lastSeq}&epoch=${epoch}` : sub
+}
+
 function connectWS() {
   if (ws && ws.readyState <= 1) return
   const token = localStorage.getItem('elaina_token')
   const proto = location.protocol === 'https:' ? 'wss' : 'ws'
-  const url = `${proto}://${location.host}/ws/panel?token=${token || ''}`
+  // 二进制帧需手动开启: localStorage.elaina_ws_format = 'msgpack' (服务端未装 msgpack 时仍发 JSON)
+  const fmt = localStorage.getItem('elaina_ws_format') === 'msgpack' ? '&format=msgpack' : ''
+  const url = `${proto}://${location.host}/ws/panel?token=${token || ''}${fmt}${connectParams()}`
 
   ws = new WebSocket(url)
+  ws.binaryType = 'arraybuffer'
   ws.onopen = () => { wsFailCount = 0; emit('open'); clearReconnect() }
-  ws.onmessage = (e) => { handleMessage(e.data) }
+  ws.onmessage = (e) => { typeof e.data === 'string' ? handleMessage(e.data) : handleBinary(e.data) }
   ws.onclose = () => { wsFailCount++; emit('close'); scheduleReconnect() }
   ws.onerror = () => { ws.close() }
 }
@@ -44,7 +69,7 @@ function connectWS() {
 function connectSSE() {
   if (sse && sse.readyState <= 1) return
   const token = localStorage.getItem('elaina_token')
-  const url = `${location.origin}/api/sse/panel?token=${token || ''}`
+  const url = `${location.origin}/api/sse/panel?token=${token || ''}${connectParams()}`
 
   sse = new EventSource(url)
   sse.onopen = () => { emit('open'); clearReconnect() }
@@ -53,10 +78,25 @@ function connectSSE() {
 }
 
 function handleMessage(raw) {
-  try {
-    const msg = JSON.parse(raw)
-    emit(msg.type, msg.data)
-  } catch {}
+  try { dispatch(JSON.parse(raw)) } catch {}
+}
+
+function handleBinary(buf) {
+  try { dispatch(decode(buf)) } catch {}
+}
+
+function dispatch(msg) {
+  // 服务端每 ~75ms 合帧: 多条更新打包为 batch, 按原顺序逐条分发
+  if (msg.type === 'batch') { for (const m of msg.data) deliver(m) }
+  else deliver(msg)
+}
+
+function deliver(msg) {
+  if (msg.seq > lastSeq) lastSeq = msg.seq
+  if (msg.type === 'init' && msg.data.epoch !== epoch) { epoch = msg.data.epoch; lastSeq = msg.data.seq }
+  // 无法补全 (服务端重启或缺口过大) 时通知页面整体重新加载
+  if (msg.type === 'resumed' && !msg.data.complete) emit('resync')
+  emit(msg.type, msg.data)
 }
 
 function emit(event, data) {
@@ -4,63 +4,343 @@ import asyncio
 import contextlib
 import json
 import logging
+import time
+import zlib
+from collections import deque
 from datetime import datetime
 
 from aiohttp import WSMsgType, web
 
 import web.auth as auth
+from core.services import metrics
+
+try:
+    import msgpack
+except ImportError:  # 可选: 装了 msgpack 才提供二进制帧
+    msgpack = None
 
 log = logging.getLogger('ElainaBot.web.ws')
 
 
 # ==================== WSBroadcast ====================
 
+_FLUSH_INTERVAL = 0.075  # 合帧间隔(秒): 窗口内的所有更新编码成一帧
+_PENDING_MAX = 2000      # 单个窗口最多缓存的消息数, 超出丢最旧的并在帧内附带 dropped 计数
+_CLIENT_QUEUE = 64       # 每个客户端最多积压的帧数, 满了丢最旧的
+_SEND_TIMEOUT = 10       # 单帧发送超时(秒), 超时视为断线
+_RING_SIZE = 500         # 每个频道在内存中保留的最近消息数, 供断线重连补发
+_STATE_CHANNELS = {'system_info': 1}  # 状态类频道只保留最新若干条, 丢旧的不算缺口
+
+_frames_dropped = metrics.registry.counter('elaina_panel_frames_dropped_total', '面板慢客户端队列溢出丢弃的帧数')
+
+
+class _Frame:
+    """一次合帧的编码结果, 所有客户端共用同一份字节; SSE / MessagePack 形式在首次用到时生成"""
+
+    __slots__ = ('body', 'msgs', 'seq', '_sse', '_packed')
+
+    def __init__(self, body: bytes, msgs: list):
+        self.body = body
+        self.msgs = msgs
+        self.seq = max((m.get('seq', 0) for m in msgs), default=0)
+        self._sse: bytes | None = None
+        self._packed: bytes | None = None
+
+    @property
+    def sse(self) -> bytes:
+        """带 id 行的 SSE 事件: 浏览器重连时以 Last-Event-ID 回传"""
+        if self._sse is None:
+            head = b'id: %d\n' % self.seq if self.seq else b''
+            self._sse = head + b'data: ' + self.body + b'\n\n'
+        return self._sse
+
+    @property
+    def packed(self) -> bytes:
+        if self._packed is None:
+            obj = self.msgs[0] if len(self.msgs) == 1 else {'type': 'batch', 'data': self.msgs}
+            self._packed = msgpack.packb(obj, default=str, use_bin_type=True)
+        return self._packed
+
+
+def _message(msg_type: str, data) -> dict:
+    return {'type': msg_type, 'data': data}
+
+
+def _encode(msg: dict) -> str:
+    return json.dumps(msg, ensure_ascii=False, default=str)
+
+
+def _single(msg: dict) -> _Frame:
+    return _Frame(_encode(msg).encode(), [msg])
+
+
+class _Item:
+    """一条待推送 / 缓冲中的消息; JSON 在首次发送时才编码 (无人在线时只进环形缓冲)"""
+
+    __slots__ = ('msg', 'route', '_json')
+
+    def __init__(self, msg: dict, route: tuple):
+        self.msg = msg
+        self.route = route
+        self._json: str | None = None
+
+    @property
+    def seq(self) -> int:
+        return self.msg.get('seq', 0)
+
+    @property
+    def json(self) -> str:
+        if self._json is None:
+            self._json = _encode(self.msg)
+        return self._json
+
+
+def _batch(items: list) -> _Frame:
+    """多条消息 → 一帧 (单条原样, 多条打包为 batch)"""
+    parts = [p.json for p in items]
+    body = parts[0] if len(parts) == 1 else '{"type":"batch","data":[' + ','.join(parts) + ']}'
+    return _Frame(body.encode(), [p.msg for p in items])
+
+
+def _route(msg_type: str, data) -> tuple:
+    """消息的路由键 (type, log_type, bot_qq, group_id), 供订阅匹配"""
+    if msg_type == 'new_log' and isinstance(data, dict):
+        return msg_type, data.get('log_type', ''), str(data.get('bot_qq') or ''), str(data.get('group_id') or '')
+    return msg_type, '', '', ''
+
+
+class Subscription:
+    """客户端订阅: 各字段为 None 表示不限
+
+    types      消息类型 (new_log / system_info ...)
+    log_types  new_log 的日志类型 (message / lifecycle / framework / error ...)
+    bots       只要这些机器人的消息 / 事件; 不带 bot_qq 的日志 (框架 / 错误) 不受影响
+    groups     只要这些群的消息 / 事件; 私聊与非群日志不受影响
+    """
+
+    __slots__ = ('types', 'log_types', 'bots', 'groups', 'key')
+
+    FIELDS = ('types', 'log_types', 'bots', 'groups')
+
+    def __init__(self, types=None, log_types=None, bots=None, groups=None):
+        self.types, self.log_types, self.bots, self.groups = types, log_types, bots, groups
+        self.key = (types, log_types, bots, groups)
+
+    @classmethod
+    def parse(cls, data) -> 'Subscription':
+        """从客户端消息解析; 字段缺省、为 null 或空列表均视为不限"""
+        if not isinstance(data, dict):
+            return ALL
+        values = []
+        for name in cls.FIELDS:
+            v = data.get(name)
+            if isinstance(v, (str, int)):
+                v = [v]
+            items = frozenset(str(x) for x in v if str(x)) if isinstance(v, list) else None
+            values.append(items or None)
+        return cls(*values)
+
+    def matches(self, route: tuple) -> bool:
+        msg_type, log_type, bot, group = route
+        if self.types is not None and msg_type not in self.types:
+            return False
+        if self.log_types is not None and log_type and log_type not in self.log_types:
+            return False
+        if self.bots is not None and bot and bot not in self.bots:
+            return False
+        return not (self.groups is not None and group and group not in self.groups)
+
+    def to_dict(self) -> dict:
+        return {k: sorted(v) if v is not None else None for k, v in zip(self.FIELDS, self.key, strict=True)}
+
+
+ALL = Subscription()
+
+
+class PanelClient:
+    """单个面板连接的发送队列: 有界, 满了丢最旧的帧, 下次发送前补一条 dropped 通知"""
+
+    __slots__ = ('kind', 'fmt', 'sub', 'joined_seq', 'frames', 'dropped', 'closed', '_wakeup', 'task')
+
+    def __init__(self, kind: str, fmt: str = 'json'):
+        self.kind = kind  # 'ws' / 'sse'
+        self.fmt = fmt    # 'json' / 'msgpack' (仅 WS)
+        self.sub = ALL
+        self.joined_seq = 0  # 加入时已分发到的序号, 之后的消息走正常推送, 补发只补到这里
+        self.frames: deque[_Frame] = deque()
+        self.dropped = 0
+        self.closed = False
+        self._wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    def put(self, frame: _Frame):
+        if len(self.frames) >= _CLIENT_QUEUE:
+            self.frames.popleft()
+            self.dropped += 1
+            _frames_dropped.inc()
+        self.frames.append(frame)
+        self._wakeup.set()
+
+    def put_first(self, frame: _Frame):
+        """补发的帧插到队首, 保证先于加入后的新消息送达"""
+        self.frames.appendleft(frame)
+        self._wakeup.set()
+
+    def close(self):
+        self.closed = True
+        self._wakeup.set()
+
+    async def get(self, timeout: float | None = None):
+        """取下一帧; 超时返回 None, 已关闭抛 ConnectionResetError"""
+        while not self.frames:
+            if self.closed:
+                raise ConnectionResetError
+            self._wakeup.clear()
+            if timeout is None:
+                await self._wakeup.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except TimeoutError:
+                    return None
+        if self.dropped:
+            n, self.dropped = self.dropped, 0
+            return _single(_message('dropped', {'count': n}))
+        return self.frames.popleft()
+
 
 class WSBroadcast:
-    """WebSocket/SSE 广播管理 (封装模块级全局状态)"""
+    """WebSocket/SSE 广播管理 (封装模块级全局状态)
+
+    push_log / schedule_broadcast 只把消息放进待发列表, 每 _FLUSH_INTERVAL 秒合成一帧:
+    单条消息原样发送, 多条打包为 {"type": "batch", "data": [...]}; 帧只编码一次,
+    再分发到各客户端自己的有界队列, 由各自的写任务发送, 慢客户端不会拖住其他人。
+
+    客户端按订阅分组 (_subs 索引): 每组只组装一次帧, 只含该组订阅匹配的消息;
+    未订阅的客户端在 ALL 组, 照旧收到全部消息。
+
+    每条消息带全局递增的 seq, 并按频道 (日志类型 / 消息类型) 存入有界环形缓冲;
+    重连的客户端带上最后收到的 seq (与 epoch) 即可从内存补发错过的消息, 无需重新查库。
+    """
 
     def __init__(self):
         self._clients: set = set()
-        self._sse_queues: set = set()
+        self._subs: dict = {}  # {Subscription.key: (Subscription, set[PanelClient])}
+        self.epoch = f'{time.time_ns():x}'  # 进程重启后 seq 从头计数, 以 epoch 区分
+        self._seq = 0
+        self._rings: dict = {}    # {channel: deque[_Item]}
+        self._evicted: dict = {}  # {channel: 被挤出环形缓冲的最大 seq}
+        self._pending = deque()
+        self._overflow = 0
+        self._flush_handle = None
+        metrics.registry.gauge_func(
+            'elaina_panel_clients', '面板实时推送连接数', lambda: {(k,): self.count(k) for k in ('ws', 'sse')}, ('kind',))
 
     @property
     def clients(self):
         return self._clients
 
-    @property
-    def sse_queues(self):
-        return self._sse_queues
-
     def has_clients(self) -> bool:
-        return bool(self._clients or self._sse_queues)
+        return bool(self._clients)
+
+    def add_client(self, kind: str, sub: Subscription = ALL, fmt: str = 'json') -> PanelClient:
+        client = PanelClient(kind, fmt)
+        client.joined_seq = self._seq - len(self._pending)  # 待发列表总是最新的一段连续消息
+        self._clients.add(client)
+        self.subscribe(client, sub)
+        return client
+
+    def remove_client(self, client: PanelClient):
+        client.close()
+        self._clients.discard(client)
+        self._unindex(client)
+
+    def _unindex(self, client: PanelClient):
+        entry = self._subs.get(client.sub.key)
+        if entry:
+            entry[1].discard(client)
+            if not entry[1]:
+                del self._subs[client.sub.key]
+
+    def subscribe(self, client: PanelClient, sub: Subscription):
+        """更换客户端订阅 (同一订阅的客户端共用一个分组)"""
+        self._unindex(client)
+        client.sub = sub
+        self._subs.setdefault(sub.key, (sub, set()))[1].add(client)
+
+    def count(self, kind: str) -> int:
+        return sum(1 for c in self._clients if c.kind == kind)
+
+    def _enqueue(self, loop, msg_type: str, data):
+        self._seq += 1
+        route = _route(msg_type, data)
+        item = _Item({'type': msg_type, 'data': data, 'seq': self._seq}, route)
+        channel = route[1] or msg_type
+        ring = self._rings.get(channel)
+        if ring is None:
+            ring = self._rings[channel] = deque(maxlen=_STATE_CHANNELS.get(channel, _RING_SIZE))
+        if len(ring) == ring.maxlen:
+            self._evicted[channel] = ring[0].seq
+        ring.append(item)
+        if not (self._clients or self._pending):
+            return
+        if len(self._pending) >= _PENDING_MAX:
+            self._pending.popleft()
+            self._overflow += 1
+        self._pending.append(item)
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(_FLUSH_INTERVAL, self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        if not self._pending:
+            return
+        pending = list(self._pending)
+        self._pending.clear()
+        if self._overflow:
+            pending.append(_Item(_message('dropped', {'count': self._overflow}), ('dropped', '', '', '')))
+            self._overflow = 0
+        for sub, clients in self._subs.values():
+            items = pending if sub is ALL else [p for p in pending if p.route[0] == 'dropped' or sub.matches(p.route)]
+            if not items:
+                continue
+            frame = _batch(items)
+            for client in clients:
+                client.put(frame)
+
+    def resume(self, client: PanelClient, since: int, epoch: str = ''):
+        """补发 seq 在 (since, 加入时] 之间且符合订阅的消息, 随后发送 resumed 通知
+
+        complete=False 表示无法补全 (epoch 不符或所需消息已被挤出缓冲), 前端应整体重新加载。
+        """
+        items: list[_Item] = []
+        complete = epoch == self.epoch
+        if complete and since < client.joined_seq:
+            for channel, ring in self._rings.items():
+                if channel not in _STATE_CHANNELS and self._evicted.get(channel, 0) > since \
+                        and client.sub.matches((ring[-1].route[0], ring[-1].route[1], '', '')):
+                    complete = False
+                items.extend(p for p in ring if since < p.seq <= client.joined_seq and client.sub.matches(p.route))
+            items.sort(key=lambda p: p.seq)
+        notice = _single(_message('resumed', {'count': len(items), 'complete': complete, 'seq': client.joined_seq}))
+        client.put_first(notice)
+        if items:
+            client.put_first(_batch(items))
 
     async def broadcast(self, msg_type: str, data: dict):
-        """向所有连接的面板客户端广播消息 (WS + SSE)"""
-        if not self.has_clients():
-            return
-        payload = json.dumps({'type': msg_type, 'data': data}, ensure_ascii=False, default=str)
-        # WebSocket
-        dead = set()
-        for ws in list(self._clients):
-            try:
-                await ws.send_str(payload)
-            except Exception:
-                dead.add(ws)
-        self._clients.difference_update(dead)
-        # SSE
-        for q in list(self._sse_queues):
-            with contextlib.suppress(Exception):
-                q.put_nowait(payload)
+        """向所有连接的面板客户端广播消息 (WS + SSE), 随下一帧发出"""
+        self.schedule_broadcast(msg_type, data)
 
     def schedule_broadcast(self, msg_type: str, data: dict):
-        """安全调度广播任务 (无事件循环时静默忽略)"""
-        if not self.has_clients():
+        """编号并存入环形缓冲; 有客户端时加入待发列表 (无事件循环时静默忽略)"""
+        try:
+            loop = asyncio.get_running_loop()  # 只在事件循环线程中记录, 缓冲区无需加锁
+        except RuntimeError:
             return
-        with contextlib.suppress(RuntimeError):
-            asyncio.get_running_loop().create_task(self.broadcast(msg_type, data))
+        self._enqueue(loop, msg_type, data)
 
     def push_log(self, log_type: str, entry: dict):
-        """实时推送日志到面板 (不缓存, 仅广播)"""
+        """实时推送日志到面板: 编号后存入该日志类型的环形缓冲 (无人在线也保留, 供重连补发), 有客户端时随下一帧发出"""
         if 'timestamp' not in entry:
             entry['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         self.schedule_broadcast('new_log', {'log_type': log_type, **entry})
@@ -71,22 +351,24 @@ class WSBroadcast:
 
     def clear(self):
         """清理所有连接 (用于测试隔离)"""
+        for client in self._clients:
+            client.close()
         self._clients.clear()
-        self._sse_queues.clear()
+        self._subs.clear()
+        self._pending.clear()
+        self._rings.clear()
+        self._evicted.clear()
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
 
     def shutdown(self):
         """服务器关闭时主动断开所有面板连接，避免阻塞 aiohttp runner.shutdown()
 
-        WebSocket: 发送 Close Frame (code=1001 Going Away)
-        SSE: 清空队列集合（handler 在下一次 queue 操作时自然退出）
+        WebSocket: 写任务退出后由 handler 发送 Close Frame (code=1001 Going Away)
+        SSE: 关闭队列, handler 在下一次取帧时退出
         """
-        for ws in list(self._clients):
-            with contextlib.suppress(Exception, RuntimeError):
-                asyncio.get_running_loop().create_task(
-                    ws.close(code=1001, message=b'Server shutdown')
-                )
-        self._clients.clear()
-        self._sse_queues.clear()
+        self.clear()
 
 
 # 模块级单例
@@ -128,40 +410,109 @@ def push_system_info(data: dict):
 
 
 async def handle_ws(request: web.Request) -> web.WebSocketResponse:
-    """WebSocket 端点: /ws/panel?token=xxx"""
+    """WebSocket 端点: /ws/panel?token=xxx[&format=msgpack][&sub=..&resume_from=..&epoch=..]
+
+    浏览器支持时协商 permessage-deflate; format=msgpack 且服务端装了 msgpack 时改发二进制帧,
+    实际采用的格式在 init 消息的 data.format 中告知前端。带 resume_from 时从内存补发错过的消息。
+    """
     # 验证 token
     token = request.query.get('token', '')
     if not token or token not in auth.valid_sessions:
         return web.Response(status=401, text='Unauthorized')  # type: ignore[return-value]  # auth failure before WS upgrade
 
-    ws = web.WebSocketResponse(heartbeat=30)
+    fmt = 'msgpack' if msgpack and request.query.get('format') == 'msgpack' else 'json'
+    sub, since, epoch = _connect_params(request)
+    ws = web.WebSocketResponse(heartbeat=30, compress=True)
     await ws.prepare(request)
-    _broadcast.clients.add(ws)
-    log.debug(f'面板 WebSocket 已连接 ({len(_broadcast.clients)} clients)')
+    client = _broadcast.add_client('ws', sub, fmt)
+    log.debug(f'面板 WebSocket 已连接 ({_broadcast.count("ws")} clients)')
 
     try:
-        # 通知前端已连接, 初始数据由前端通过 API 获取
-        await ws.send_json({'type': 'init', 'data': {}})
+        # 通知前端已连接, 初始数据由前端通过 API 获取; 写任务在 init 之后启动, 保证 init 最先到达
+        await ws.send_json({'type': 'init', 'data': _init_data(client, fmt)})
+        if since is not None:
+            _broadcast.resume(client, since, epoch)
+        client.task = asyncio.create_task(_ws_writer(ws, client))
 
         async for msg in ws:
             if msg.type == WSMsgType.TEXT:
                 try:
                     data = json.loads(msg.data)
-                    await _handle_client_msg(ws, data)
+                    await _handle_client_msg(ws, client, data)
                 except json.JSONDecodeError:
                     pass
             elif msg.type in (WSMsgType.ERROR, WSMsgType.CLOSE):
                 break
     finally:
-        _broadcast.clients.discard(ws)
-        log.debug(f'面板 WebSocket 已断开 ({len(_broadcast.clients)} clients)')
+        _broadcast.remove_client(client)
+        log.debug(f'面板 WebSocket 已断开 ({_broadcast.count("ws")} clients)')
 
     return ws
 
 
-async def _handle_client_msg(ws: web.WebSocketResponse, data: dict):
-    """处理客户端发来的消息"""
-    pass
+def _init_data(client: PanelClient, fmt: str) -> dict:
+    return {'format': fmt, 'epoch': _broadcast.epoch, 'seq': client.joined_seq}
+
+
+async def _ws_writer(ws: web.WebSocketResponse, client: PanelClient):
+    """单个 WS 连接的写任务: 发送超时或出错即断开, 被移除 (含服务器关闭) 时发送 1001"""
+    send_frame = getattr(ws, 'send_frame', None)  # aiohttp >= 3.11 可直接发送已编码的字节
+    binary = client.fmt == 'msgpack'
+    try:
+        while True:
+            frame = await client.get()
+            async with asyncio.timeout(_SEND_TIMEOUT):
+                if binary:
+                    await ws.send_bytes(frame.packed)
+                elif send_frame:
+                    await send_frame(frame.body, WSMsgType.TEXT)
+                else:
+                    await ws.send_str(frame.body.decode())
+    except Exception:
+        pass
+    finally:
+        if not ws.closed:
+            with contextlib.suppress(Exception):
+                await ws.close(code=1001, message=b'Server shutdown' if client.closed else b'Too slow')
+
+
+async def _handle_client_msg(ws: web.WebSocketResponse, client: PanelClient, data: dict):
+    """处理客户端发来的消息
+
+    {"type": "subscribe", "data": {"log_types": [...], "bots": [...], "groups": [...], "types": [...]}}
+        设置订阅 (字段含义见 Subscription), data 为空则恢复接收全部
+    """
+    if not isinstance(data, dict):
+        return
+    if data.get('type') == 'subscribe':
+        body = data.get('data')
+        if not isinstance(body, dict):
+            body = {}
+        sub = Subscription.parse(body)
+        _broadcast.subscribe(client, sub)
+        await ws.send_json({'type': 'subscribed', 'data': sub.to_dict()})
+        # 补发只在连接参数 resume_from 中处理: 写任务启动后再插入队首的旧帧会排在已发出的新帧之后, 造成乱序
+
+
+def _int(value) -> int:
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _connect_params(request: web.Request) -> tuple:
+    """连接参数: ?sub=<JSON>&resume_from=<seq>&epoch=<epoch> (SSE 也认 Last-Event-ID 头)
+
+    返回 (订阅, 续传起点 或 None, epoch)
+    """
+    q = request.query
+    try:
+        sub = Subscription.parse(json.loads(q.get('sub') or 'null'))
+    except ValueError:
+        sub = ALL
+    since = q.get('resume_from') or request.headers.get('Last-Event-ID')
+    return sub, (_int(since) if since else None), q.get('epoch', '')
 
 
 # ==================== SSE 降级通道 ====================
@@ -172,6 +523,7 @@ async def handle_sse(request: web.Request) -> web.StreamResponse:
 
     当 WebSocket 因 Nginx 未配置 upgrade 等原因不可用时,
     前端自动降级到 SSE, 走普通 HTTP 无需特殊代理配置。
+    浏览器声明支持 gzip 时整条流用一个 gzip 压缩器, 每个事件后 SYNC_FLUSH 立即送达。
     """
     token = request.query.get('token', '')
     if not token or token not in auth.valid_sessions:
@@ -181,25 +533,34 @@ async def handle_sse(request: web.Request) -> web.StreamResponse:
     resp.headers['Content-Type'] = 'text/event-stream'
     resp.headers['Cache-Control'] = 'no-cache'
     resp.headers['X-Accel-Buffering'] = 'no'  # 禁止 Nginx 缓冲
+    gz = None
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        gz = zlib.compressobj(6, zlib.DEFLATED, 31)
+        resp.headers['Content-Encoding'] = 'gzip'
+        resp.headers['Vary'] = 'Accept-Encoding'
     await resp.prepare(request)
 
-    queue: asyncio.Queue[str] = asyncio.Queue(maxsize=256)
-    _broadcast.sse_queues.add(queue)
-    log.debug(f'SSE 客户端已连接 (WS:{len(_broadcast.clients)} SSE:{len(_broadcast.sse_queues)})')
+    async def write(data: bytes):
+        await resp.write(gz.compress(data) + gz.flush(zlib.Z_SYNC_FLUSH) if gz else data)
+
+    # SSE 为单向通道, 订阅通过 ?sub=<JSON> 指定, 变更时前端重连
+    sub, since, epoch = _connect_params(request)
+    client = _broadcast.add_client('sse', sub)
+    if since is not None:
+        _broadcast.resume(client, since, epoch)
+    log.debug(f'SSE 客户端已连接 (WS:{_broadcast.count("ws")} SSE:{_broadcast.count("sse")})')
 
     try:
         # 发送初始连接确认
-        await resp.write(b'data: {"type":"init","data":{}}\n\n')
+        await write(b'data: ' + json.dumps({'type': 'init', 'data': _init_data(client, 'json')}).encode() + b'\n\n')
         while True:
-            try:
-                payload = await asyncio.wait_for(queue.get(), timeout=25)
-                await resp.write(f'data: {payload}\n\n'.encode())
-            except TimeoutError:
-                await resp.write(b': keepalive\n\n')
+            frame = await client.get(timeout=25)
+            async with asyncio.timeout(_SEND_TIMEOUT):
+                await write(frame.sse if frame else b': keepalive\n\n')
     except (asyncio.CancelledError, ConnectionResetError, Exception):
         pass
     finally:
-        _broadcast.sse_queues.discard(queue)
-        log.debug(f'SSE 客户端已断开 (WS:{len(_broadcast.clients)} SSE:{len(_broadcast.sse_queues)})')
+        _broadcast.remove_client(client)
+        log.debug(f'SSE 客户端已断开 (WS:{_broadcast.count("ws")} SSE:{_broadcast.count("sse")})')
 
     return resp